@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Página oculta de rendimiento del dashboard (``?admin=perf``).
+
+No vive en ``paginas/`` para no aparecer en el menú; ``streamlit_app.py`` la
+muestra cuando la URL trae ``?admin=perf``.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from app.charts.theme import AxisFormat, apply_exec_style, format_axis_units
+from app.instrumentation import PHASES, loader_stats, page_percentiles, perf_log_path, read_perf_log
+from app.ui_components import kpi, plotly_chart
+from app.warmup import warmup_status
+
+
+def render() -> None:
+    st.title("🛠️ Rendimiento del dashboard")
+    records = read_perf_log()
+    st.caption(f"Fuente: `{perf_log_path()}` · {len(records):,} reruns registrados")
+    if not records:
+        st.info("Aún no hay reruns instrumentados. Navega por las páginas y vuelve aquí.")
+        return
+
+    if len(records) > 50:
+        last_n = st.sidebar.slider("Últimos N reruns", 50, len(records), min(len(records), 2000), step=50)
+        records = records[-last_n:]
+    pages = page_percentiles(records)
+    loaders = loader_stats(records)
+
+    c1, c2, c3 = st.columns(3)
+    kpi(c1, "Página más lenta (p95)", f"{pages['page'].iloc[0]} · {pages['total_p95'].iloc[0]:,.0f} ms")
+    kpi(c2, "Hit rate de cache", f"{loaders['hit_rate'].mul(loaders['calls']).sum() / loaders['calls'].sum():.0%}")
+    kpi(c3, "MB leídos de disco", f"{loaders['bytes_read'].sum() / 2**20:,.1f}")
+
+    st.markdown("### p50 / p95 por página")
+    long = pages.melt(id_vars="page", value_vars=["total_p50", "total_p95"], var_name="percentil", value_name="ms")
+    long["percentil"] = long["percentil"].str.replace("total_", "", regex=False)
+    fig = px.bar(long, x="page", y="ms", color="percentil", barmode="group")
+    format_axis_units(fig, x=AxisFormat(title="Página"), y=AxisFormat(title="ms por rerun", tickformat=",.0f"))
+    apply_exec_style(fig, title="Tiempo por rerun", subtitle="Ordenado por p95", source="logs/dashboard_perf.jsonl")
+    plotly_chart(st, fig)
+
+    st.markdown("### Fases (p95)")
+    phases = pages.melt(id_vars="page", value_vars=[f"{p}_p95" for p in PHASES], var_name="fase", value_name="ms")
+    phases["fase"] = phases["fase"].str.removesuffix("_p95")
+    fig = px.bar(phases, x="page", y="ms", color="fase")
+    format_axis_units(fig, x=AxisFormat(title="Página"), y=AxisFormat(title="ms", tickformat=",.0f"))
+    apply_exec_style(fig, title="Dónde se va el tiempo", subtitle="load · transform · figure · render", source="logs/dashboard_perf.jsonl")
+    plotly_chart(st, fig)
+    st.dataframe(pages.round(1), use_container_width=True, hide_index=True)
+
+    st.markdown("### Precarga")
+    warm = warmup_status()
+    if warm:
+        st.caption(f"Última precarga {warm['started_at']} · {warm['duration_ms']:,.0f} ms · {len(warm['errors'])} errores")
+        st.dataframe(pd.Series(warm["tables"], name="ms").rename_axis("tabla").reset_index(), use_container_width=True, hide_index=True)
+    else:
+        st.caption("La precarga aún no terminó en este proceso (o está desactivada con EGASA_WARMUP=off).")
+
+    st.markdown("### Loaders")
+    st.dataframe(loaders.round(2), use_container_width=True, hide_index=True)
+
+    st.markdown("### Últimos reruns")
+    recent = pd.DataFrame(records[-50:])[["ts", "page", "status", "total_ms", "cache_hits", "cache_misses", "bytes_read"]]
+    st.dataframe(recent.iloc[::-1], use_container_width=True, hide_index=True)
+
+
+__all__ = ["render"]
@@ -0,0 +1,452 @@
+# -*- coding: utf-8 -*-
+"""API HTTP local de solo lectura sobre el data mart.
+
+Sirve las tablas de la snapshot publicada (ver :mod:`etl.publish`) como JSON,
+CSV o Arrow IPC para otros equipos, en lugar de copiar CSVs desde la carpeta
+compartida::
+
+    python -m app.api --port 8765
+    curl 'http://localhost:8765/tables'
+    curl 'http://localhost:8765/tables/generacion_mensual?columns=central,periodo,energia_mwh&desde=202401&hasta=202412'
+    curl 'http://localhost:8765/tables/generacion_15min?desde=202501&central_id=CH1&format=arrow' -o g.arrows
+    curl 'http://localhost:8765/tables/star/fact_generacion_15min?format=csv'
+
+Parámetros de ``/tables/<nombre>``:
+
+- ``format``: ``json`` (default, lista de registros), ``csv`` o ``arrow`` (este
+  último con el extra ``arrow`` instalado; sin él responde ``501``).
+- ``columns``: columnas a devolver, separadas por coma.
+- ``desde`` / ``hasta``: periodo ``YYYYMM`` (o ``YYYY``) inclusive; se aplica
+  sobre ``periodo``, ``anio``/``mes`` o la primera columna de fecha.
+- cualquier otra columna: filtro por igualdad (varios valores separados por coma).
+
+``generacion_15min`` es la unión de las particiones ``generacion_15min_YYYYMM``
+del rango pedido; se leen y envían de a una, así la memoria queda acotada a una
+partición. Cada respuesta lleva un ``ETag`` derivado de la versión de las tablas
+en ``manifest.json``: con ``If-None-Match`` se responde ``304`` sin cuerpo si
+los datos no cambiaron. El cuerpo se comprime con gzip o zstd (este último si
+``zstandard`` está instalado) según ``Accept-Encoding``. Cada conexión se
+atiende en su propio hilo.
+
+Los errores se detectan antes de enviar los encabezados (``400``/``404``, o
+``500`` si son inesperados). Un fallo con el cuerpo ya en curso corta la
+conexión, así el cliente no confunde el cuerpo truncado con uno completo.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import socket
+import struct
+import zlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from etl.publish import current_snapshot, file_etag
+from etl.schemas import apply_dtypes
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_MART = ROOT / "data_mart"
+
+FORMATS = {
+    "json": "application/json; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+TABLE_15MIN = "generacion_15min"
+_NAME = re.compile(r"(star/)?[a-z0-9_]+")
+_PARTITION = re.compile(r"generacion_15min_(\d{6})\.csv$")
+_DATE_COLUMNS = ("fecha_hora", "fecha", "fecha_mes", "fecha_inicio")
+_RESERVED_PARAMS = {"format", "columns", "desde", "hasta"}
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+# -------------------------
+# Resolución de tablas
+# -------------------------
+def list_tables(mart: Path) -> Dict[str, Dict[str, Any]]:
+    """Tablas publicadas con tamaño y versión (del manifest o, sin él, de disco)."""
+
+    return _tables(*current_snapshot(mart))
+
+
+def _tables(base: Path, manifest: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    tables = (manifest or {}).get("tables") or {
+        str(p.relative_to(base)).replace("\\", "/"): {"bytes": p.stat().st_size, "etag": file_etag(p)} for p in sorted(base.rglob("*.csv"))
+    }
+    return {rel[:-4]: info for rel, info in tables.items() if not rel.startswith((".", "snapshots/"))}
+
+
+def _partitions(base: Path, desde: Optional[int], hasta: Optional[int]) -> List[Path]:
+    out = []
+    for path in sorted(base.glob("generacion_15min_*.csv")):
+        match = _PARTITION.search(path.name)
+        periodo = int(match.group(1)) if match else None
+        if periodo is None or (desde and periodo < desde) or (hasta and periodo > hasta):
+            continue
+        out.append(path)
+    return out
+
+
+def resolve(mart: Path, name: str, desde: Optional[int], hasta: Optional[int]) -> Tuple[List[Path], str]:
+    """Archivos de ``name`` en la snapshot vigente y su ETag base.
+
+    El manifest se lee una sola vez: carpeta, lista de tablas y versiones salen
+    de la misma snapshot aunque el ETL publique otra durante la solicitud.
+    """
+
+    if not _NAME.fullmatch(name):
+        raise ApiError(HTTPStatus.NOT_FOUND, f"Tabla inválida: {name}")
+    base, manifest = current_snapshot(mart)
+    tables = _tables(base, manifest)
+    if name == TABLE_15MIN:
+        paths = _partitions(base, desde, hasta)
+    else:
+        paths = [base / f"{name}.csv"]
+        if name not in tables or not paths[0].exists():
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Tabla no encontrada: {name}")
+    versions = []
+    for path in paths:
+        rel = str(path.relative_to(base)).replace("\\", "/")[:-4]
+        versions.append(f"{rel}:{tables.get(rel, {}).get('etag') or file_etag(path)}")
+    return paths, ";".join(versions)
+
+
+# -------------------------
+# Filtros
+# -------------------------
+def parse_period(value: Optional[str], end: bool = False) -> Optional[int]:
+    """``YYYYMM``, ``YYYY-MM`` o ``YYYY`` -> entero ``YYYYMM``."""
+
+    if not value:
+        return None
+    digits = value.replace("-", "").strip()
+    if re.fullmatch(r"\d{6}", digits):
+        return int(digits)
+    if re.fullmatch(r"\d{4}", digits):
+        return int(digits) * 100 + (12 if end else 1)
+    raise ApiError(HTTPStatus.BAD_REQUEST, f"Periodo inválido: {value} (use YYYYMM)")
+
+
+def _period_key(df: pd.DataFrame) -> Optional[pd.Series]:
+    if "periodo" in df.columns:
+        return pd.to_numeric(df["periodo"], errors="coerce")
+    if {"anio", "mes"} <= set(df.columns):
+        return pd.to_numeric(df["anio"], errors="coerce") * 100 + pd.to_numeric(df["mes"], errors="coerce")
+    for col in _DATE_COLUMNS:
+        if col in df.columns:
+            ts = pd.to_datetime(df[col], errors="coerce")
+            return ts.dt.year * 100 + ts.dt.month
+    return None
+
+
+def filter_frame(
+    df: pd.DataFrame,
+    columns: Optional[List[str]],
+    desde: Optional[int],
+    hasta: Optional[int],
+    equals: Dict[str, List[str]],
+) -> pd.DataFrame:
+    unknown = [c for c in [*(columns or []), *equals] if c not in df.columns]
+    if unknown:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Columnas desconocidas: {', '.join(unknown)}")
+    mask = pd.Series(True, index=df.index)
+    if desde or hasta:
+        key = _period_key(df)
+        if key is None:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "La tabla no tiene columna de periodo ni de fecha")
+        if desde:
+            mask &= key >= desde
+        if hasta:
+            mask &= key <= hasta
+    for col, values in equals.items():
+        mask &= df[col].astype(str).isin(values)
+    out = df[mask] if not mask.all() else df
+    return out[columns] if columns else out
+
+
+def _read(path: Path) -> pd.DataFrame:
+    df = pd.read_csv(path, low_memory=False)
+    if "fecha_hora" in df.columns:
+        df["fecha_hora"] = pd.to_datetime(df["fecha_hora"], format="ISO8601", errors="coerce")
+    return apply_dtypes(df, path.stem)
+
+
+def iter_frames(paths: Iterable[Path], query: Dict[str, Any]) -> Iterator[pd.DataFrame]:
+    """Un DataFrame filtrado por archivo (las particiones 15 min se leen de a una)."""
+
+    for path in paths:
+        df = filter_frame(_read(path), query["columns"], query["desde"], query["hasta"], query["equals"])
+        if not df.empty:
+            yield df
+
+
+# -------------------------
+# Codificación y compresión
+# -------------------------
+def encode_json(frames: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+    yield b"["
+    first = True
+    for df in frames:
+        body = df.to_json(orient="records", date_format="iso", force_ascii=False)[1:-1]
+        if body:
+            yield (body if first else "," + body).encode("utf-8")
+            first = False
+    yield b"]"
+
+
+def encode_csv(frames: Iterator[pd.DataFrame]) -> Iterator[bytes]:
+    header = True
+    for df in frames:
+        yield df.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+
+
+def encode_arrow(frames: Iterator[pd.DataFrame], dataset: str) -> Iterator[bytes]:
+    from etl.export import iter_arrow_stream
+
+    return iter_arrow_stream(frames, dataset)
+
+
+def _arrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _zstd_available() -> bool:
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def negotiate_encoding(accept: str) -> Optional[str]:
+    offered = {token.split(";")[0].strip().lower() for token in accept.split(",") if token.strip()}
+    if "zstd" in offered and _zstd_available():
+        return "zstd"
+    if "gzip" in offered:
+        return "gzip"
+    return None
+
+
+def compress(chunks: Iterator[bytes], encoding: Optional[str]) -> Iterator[bytes]:
+    if encoding is None:
+        yield from chunks
+        return
+    if encoding == "zstd":
+        import zstandard
+
+        compressor = zstandard.ZstdCompressor().compressobj()
+        flush: Callable[[], bytes] = compressor.flush
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 = cabecera gzip
+        flush = compressor.flush
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield flush()
+
+
+# -------------------------
+# Servidor
+# -------------------------
+def parse_query(raw: str) -> Dict[str, Any]:
+    params = {k: v[-1] for k, v in parse_qs(raw, keep_blank_values=False).items()}
+    fmt = params.get("format", "json").lower()
+    if fmt not in FORMATS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"Formato inválido: {fmt} (opciones: {', '.join(FORMATS)})")
+    if fmt == "arrow" and not _arrow_available():
+        raise ApiError(HTTPStatus.NOT_IMPLEMENTED, "format=arrow requiere el extra 'arrow' (pyarrow)")
+    columns = [c.strip() for c in params["columns"].split(",") if c.strip()] if params.get("columns") else None
+    return {
+        "format": fmt,
+        "columns": columns,
+        "desde": parse_period(params.get("desde")),
+        "hasta": parse_period(params.get("hasta"), end=True),
+        "equals": {k: [x.strip() for x in v.split(",")] for k, v in sorted(params.items()) if k not in _RESERVED_PARAMS},
+    }
+
+
+def check_query(paths: List[Path], query: Dict[str, Any]) -> None:
+    """Validar columnas contra la cabecera de cada archivo antes de enviar los encabezados.
+
+    Así :func:`filter_frame` no puede rechazar una partición cuando el ``200``
+    ya salió.
+    """
+
+    for path in paths:
+        header = set(pd.read_csv(path, nrows=0).columns)
+        unknown = [c for c in [*(query["columns"] or []), *query["equals"]] if c not in header]
+        if unknown:
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Columnas desconocidas en {path.stem}: {', '.join(unknown)}")
+        if (query["desde"] or query["hasta"]) and not (
+            "periodo" in header or {"anio", "mes"} <= header or header & set(_DATE_COLUMNS)
+        ):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"{path.stem} no tiene columna de periodo ni de fecha")
+
+
+def make_etag(version: str, raw_query: str, encoding: Optional[str]) -> str:
+    """ETag fuerte: versión de las tablas + consulta normalizada + codificación."""
+
+    query = "&".join(sorted(raw_query.split("&")))
+    digest = hashlib.sha1(f"{version}|{query}".encode("utf-8")).hexdigest()[:20]
+    return f'"{digest}{"-" + encoding if encoding else ""}"'
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "EgasaMartAPI/1.0"
+    mart: Path = DATA_MART
+
+    def do_HEAD(self) -> None:  # noqa: N802 - nombre de http.server
+        self._dispatch(send_body=False)
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch(send_body=True)
+
+    def _dispatch(self, send_body: bool) -> None:
+        url = urlsplit(self.path)
+        route = url.path.rstrip("/") or "/"
+        self._streaming = False
+        try:
+            if route in {"/", "/tables"}:
+                base, manifest = current_snapshot(self.mart)
+                self._send_json({"tables": _tables(base, manifest), "manifest": (manifest or {}).get("current")}, send_body)
+            elif route == "/health":
+                self._send_json({"status": "ok"}, send_body)
+            elif route.startswith("/tables/"):
+                self._send_table(route[len("/tables/"):], url.query, send_body)
+            else:
+                raise ApiError(HTTPStatus.NOT_FOUND, f"Ruta desconocida: {route}")
+        except Exception as exc:
+            if self._streaming:
+                # el 200 ya salió: cortar la conexión para que el cliente no tome el cuerpo truncado por completo
+                logger.exception("Error enviando %s; se corta la conexión", url.path)
+                self._abort()
+            elif isinstance(exc, ApiError):
+                self._send_json({"error": str(exc)}, send_body, status=exc.status)
+            else:
+                logger.exception("Error interno en %s", url.path)
+                self._send_json({"error": "Error interno del servidor"}, send_body, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    def _abort(self) -> None:
+        """Cerrar con RST (``SO_LINGER`` 0) en lugar de un fin de cuerpo normal."""
+
+        self.close_connection = True
+        try:
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            self.connection.close()
+        except OSError:
+            pass
+
+    def _send_json(self, payload: Dict[str, Any], send_body: bool, status: HTTPStatus = HTTPStatus.OK) -> None:
+        body = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", FORMATS["json"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_table(self, name: str, raw_query: str, send_body: bool) -> None:
+        query = parse_query(raw_query)
+        paths, version = resolve(self.mart, name, query["desde"], query["hasta"])
+        check_query(paths, query)
+        encoding = negotiate_encoding(self.headers.get("Accept-Encoding", ""))
+        etag = make_etag(version, raw_query, encoding)
+
+        if etag in {t.strip() for t in self.headers.get("If-None-Match", "").split(",")}:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", FORMATS[query["format"]])
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        # HTTP/1.0 sin Content-Length: el cuerpo se envía a medida que se genera
+        self.send_header("Connection", "close")
+        self.end_headers()
+        if not send_body:
+            return
+        self._streaming = True
+        frames = iter_frames(paths, query)
+        if query["format"] == "arrow":
+            chunks = encode_arrow(frames, name)
+        else:
+            chunks = {"json": encode_json, "csv": encode_csv}[query["format"]](frames)
+        try:
+            for chunk in compress(chunks, encoding):
+                self.wfile.write(chunk)
+        except (BrokenPipeError, ConnectionResetError):
+            logger.info("Cliente cerró la conexión durante %s", name)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - firma de http.server
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8765, mart: Path | None = None) -> ThreadingHTTPServer:
+    """Servidor con un hilo por conexión sobre ``mart`` (default: ``data_mart/``)."""
+
+    handler = type("MartHandler", (ApiHandler,), {"mart": Path(mart or DATA_MART)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.api", description="API HTTP local de solo lectura sobre el data mart")
+    parser.add_argument("--host", default="127.0.0.1", help="Interfaz (default: 127.0.0.1; 0.0.0.0 para exponer en la red)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--mart", help="Directorio data_mart (default: ./data_mart)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+    server = make_server(args.host, args.port, Path(args.mart) if args.mart else None)
+    logger.info("API del data mart en http://%s:%s (mart: %s)", args.host, server.server_port, server.RequestHandlerClass.mart)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("API detenida")
+    finally:
+        server.server_close()
+
+
+__all__ = [
+    "ApiError",
+    "encode_csv",
+    "encode_json",
+    "iter_frames",
+    "list_tables",
+    "main",
+    "make_server",
+    "resolve",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -6,31 +6,57 @@ from __future__ import annotations
 import json
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence
 
 import pandas as pd
-import streamlit as st
+
+from app.instrumentation import instrumented_loader, note_bytes_read
+from etl.intervalos import ContractIndex
+from etl.pipelines.cobertura import coverage_table, index_path, read_index
+from etl.publish import MANIFEST, current_dir
+from etl.schemas import apply_dtypes, dtype_policy
+from etl.star import STAR_DIR, fact_spec, join_dimensions
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA_MART = ROOT / "data_mart"
 
+# (raíz, mtime del manifest) -> carpeta publicada; evita releer el manifest en cada loader
+_RESOLVED: Dict[tuple, Path] = {}
+
+
+def mart_dir() -> Path:
+    """Snapshot publicada según ``manifest.json`` (la raíz si el mart no tiene manifest)."""
+
+    try:
+        key = (DATA_MART, (DATA_MART / MANIFEST).stat().st_mtime_ns)
+    except OSError:
+        return DATA_MART
+    if key not in _RESOLVED:
+        _RESOLVED.clear()
+        _RESOLVED[key] = current_dir(DATA_MART)
+    return _RESOLVED[key]
+
 
 def _metadata_path() -> Path:
-    return DATA_MART / "metadata.json"
+    return mart_dir() / "metadata.json"
 
 
 def _metadata_token() -> float:
-    path = _metadata_path()
+    """mtime del manifest (cambia en cada publicación o rollback) o, sin él, de metadata.json."""
+
+    manifest = DATA_MART / MANIFEST
+    path = manifest if manifest.exists() else _metadata_path()
     return path.stat().st_mtime if path.exists() else 0.0
 
 
-@st.cache_data(show_spinner=False)
+@instrumented_loader
 def get_metadata(meta_token: float | None = None) -> Dict[str, Any]:
     """Carga metadata.json. El parámetro meta_token fuerza invalidación."""
 
     path = _metadata_path()
     if not path.exists():
         return {"datasets": {}, "_meta_token": meta_token}
+    note_bytes_read(path.stat().st_size)
     with path.open("r", encoding="utf-8") as fh:
         data = json.load(fh)
     data["_meta_token"] = meta_token
@@ -42,39 +68,121 @@ def dataset_contract(name: str) -> Dict[str, Any]:
     return meta.get("datasets", {}).get(name, {}) if meta else {}
 
 
-@st.cache_data(show_spinner=False)
+def _read_compact(path: Path, parse_dates: Optional[List[str]] = None) -> pd.DataFrame:
+    """Leer un CSV del mart con la política de tipos de ``etl.schemas.DTYPES``.
+
+    Las categorías se crean en el propio ``read_csv``; enteros y float32 se
+    ajustan después porque pueden traer nulos.
+    """
+
+    categories = {col: "category" for col, dtype in dtype_policy(path.stem).items() if dtype == "category"}
+    df = pd.read_csv(path, parse_dates=parse_dates, dtype=categories or None, low_memory=False)
+    return apply_dtypes(df, path.stem)
+
+
+@instrumented_loader
 def load_table(name: str, parse_dates: Optional[List[str]] = None, meta_token: float | None = None) -> pd.DataFrame:
     """Carga un CSV del data mart; se invalida al cambiar metadata.json."""
 
-    path = DATA_MART / name
+    path = mart_dir() / name
     if not path.exists():
         return pd.DataFrame()
-    df = pd.read_csv(path, parse_dates=parse_dates, low_memory=False)
-    return df
+    note_bytes_read(path.stat().st_size)
+    return _read_compact(path, parse_dates=parse_dates)
 
 
-@st.cache_data(show_spinner=False)
+@instrumented_loader
 def load_generacion_15min(yyyymm: str, meta_token: float | None = None) -> pd.DataFrame:
-    path = DATA_MART / f"generacion_15min_{yyyymm}.csv"
+    path = mart_dir() / f"generacion_15min_{yyyymm}.csv"
     if not path.exists():
         return pd.DataFrame()
-    df = pd.read_csv(path, low_memory=False)
+    note_bytes_read(path.stat().st_size)
+    df = _read_compact(path)
     if "fecha_hora" in df.columns:
         df["fecha_hora"] = pd.to_datetime(df["fecha_hora"], errors="coerce")
     return df.dropna(subset=["fecha_hora"])
 
 
+@instrumented_loader
+def load_cobertura_15min(yyyymm: str, meta_token: float | None = None) -> pd.DataFrame:
+    """Cobertura por unidad y día desde el índice binario de la partición (no lee sus filas)."""
+
+    path = index_path(mart_dir() / f"generacion_15min_{yyyymm}.csv")
+    index = read_index(path)
+    if index is None:
+        return pd.DataFrame()
+    note_bytes_read(path.stat().st_size)
+    return coverage_table(index, yyyymm)
+
+
+@instrumented_loader
+def load_contract_index(meta_token: float | None = None) -> ContractIndex:
+    """Índice de vigencias de ``contratos_base`` y ``contratos_riesgo``, construido una vez por publicación."""
+
+    tables = {}
+    for origen in ("base", "riesgo"):
+        path = mart_dir() / f"contratos_{origen}.csv"
+        if path.exists():
+            note_bytes_read(path.stat().st_size)
+            tables[origen] = _read_compact(path)
+    return ContractIndex.from_tables(tables)
+
+
+@instrumented_loader
+def load_star(name: str, join: bool = False, meta_token: float | None = None) -> pd.DataFrame:
+    """Dimensión o hecho de ``data_mart/star/``.
+
+    Con ``join=True`` un hecho se devuelve unido a sus dimensiones (vista plana
+    reconstruida al leer); las dimensiones se leen sin pasar por la cache.
+    """
+
+    path = mart_dir() / STAR_DIR / f"{name}.csv"
+    if not path.exists():
+        return pd.DataFrame()
+    note_bytes_read(path.stat().st_size)
+    df = _read_compact(path)
+    spec = fact_spec(name) if join else None
+    if spec is None:
+        return df
+    dims = {}
+    for dim in spec["dims"]:
+        dim_path = mart_dir() / STAR_DIR / f"{dim}.csv"
+        if dim_path.exists():
+            note_bytes_read(dim_path.stat().st_size)
+            dims[dim] = _read_compact(dim_path)
+    return join_dimensions(df, name, dims)
+
+
 def list_yyyymm_15min(meta_token: float | None = None) -> List[str]:
-    if not DATA_MART.exists():
+    mart = mart_dir()
+    if not mart.exists():
         return []
     out = []
-    for p in DATA_MART.glob("generacion_15min_*.csv"):
+    for p in mart.glob("generacion_15min_*.csv"):
         yyyymm = p.stem.replace("generacion_15min_", "")
         if yyyymm.isdigit() and len(yyyymm) == 6:
             out.append(yyyymm)
     return sorted(out)
 
 
+def stream_15min_arrow(
+    start: str | None = None,
+    end: str | None = None,
+    centrales: Sequence[str] | None = None,
+    unidades: Sequence[str] | None = None,
+    columns: Sequence[str] | None = None,
+) -> Iterator[bytes]:
+    """Ventana 15 min de la snapshot publicada como stream Arrow IPC (ver :mod:`etl.export`).
+
+    No pasa por la cache: las particiones se leen en bloques a medida que se consume.
+    Requiere el extra ``arrow``; el resto del dashboard no depende de ``pyarrow``.
+    """
+
+    from etl.export import iter_arrow_stream, iter_window
+
+    return iter_arrow_stream(iter_window(start, end, centrales, unidades, columns, mart=mart_dir()))
+
+
 def metadata_token() -> float:
     """Exponer token para reuso externo (e.g. st.cache_data inputs)."""
 
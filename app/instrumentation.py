@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""Instrumentación del dashboard: tiempos por rerun, cache y bytes leídos.
+
+``streamlit_app.py`` es el único punto de entrada: ejecuta cada script de
+``paginas/`` con :func:`run_page`, que lo mide entero con :func:`instrument_page`.
+Durante el rerun se acumulan tiempos por fase:
+
+- ``load``: loaders de :mod:`app.data_access` (con hit/miss de cache y bytes
+  leídos de disco por llamada);
+- ``figure``: funciones de tema de :mod:`app.ui_components` y los gráficos
+  de ``line_chart``/``bar_chart``;
+- ``render``: :func:`app.ui_components.plotly_chart` o bloques marcados con
+  :func:`phase`;
+- ``transform``: el resto del tiempo de la página.
+
+Al terminar (también con ``st.stop()`` o un rerun) el registro se agrega a un
+JSONL local que rota al superar ``PERF_LOG_MAX_BYTES``. ``EGASA_PERF_LOG`` cambia la
+ruta del archivo; ``EGASA_PERF_LOG=off`` desactiva la instrumentación.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import runpy
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+import streamlit as st
+
+ROOT = Path(__file__).resolve().parents[1]
+PERF_LOG = ROOT / "logs" / "dashboard_perf.jsonl"
+PERF_LOG_MAX_BYTES = 5 * 2**20
+PHASES = ("load", "transform", "figure", "render")
+
+_LOCAL = threading.local()
+_WRITE_LOCK = threading.Lock()
+
+
+def perf_log_path() -> Optional[Path]:
+    value = os.environ.get("EGASA_PERF_LOG", "").strip()
+    if value.lower() in {"off", "0", "false"}:
+        return None
+    return Path(value) if value else PERF_LOG
+
+
+def _session_id() -> Optional[str]:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+    except ImportError:  # pragma: no cover - versiones antiguas
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def _current() -> Optional[Dict[str, Any]]:
+    return getattr(_LOCAL, "record", None)
+
+
+def _append(record: Dict[str, Any], path: Path) -> None:
+    line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+    with _WRITE_LOCK:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size + len(line) > PERF_LOG_MAX_BYTES:
+            path.replace(path.with_name(path.name + ".1"))
+        with path.open("a", encoding="utf-8") as fh:
+            fh.write(line)
+
+
+@contextmanager
+def instrument_page(page: str) -> Iterator[Dict[str, Any]]:
+    """Medir un rerun completo de ``page`` y registrarlo en el JSONL."""
+
+    path = perf_log_path()
+    if path is None or _current() is not None:
+        yield {}
+        return
+
+    record: Dict[str, Any] = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "page": page,
+        "session": _session_id(),
+        "phases_ms": {name: 0.0 for name in PHASES},
+        "loaders": [],
+        "status": "ok",
+    }
+    _LOCAL.record = record
+    t0 = time.perf_counter()
+    try:
+        yield record
+    except BaseException as exc:
+        # st.stop()/st.rerun() usan excepciones de control: no son errores
+        record["status"] = "error" if isinstance(exc, Exception) else type(exc).__name__.replace("Exception", "").lower()
+        raise
+    finally:
+        _LOCAL.record = None
+        total = (time.perf_counter() - t0) * 1000
+        phases = record["phases_ms"]
+        phases["transform"] = max(total - phases["load"] - phases["figure"] - phases["render"], 0.0)
+        record["total_ms"] = round(total, 1)
+        record["phases_ms"] = {k: round(v, 1) for k, v in phases.items()}
+        record["bytes_read"] = sum(ld["bytes_read"] for ld in record["loaders"])
+        record["cache_hits"] = sum(1 for ld in record["loaders"] if ld["cache"] == "hit")
+        record["cache_misses"] = sum(1 for ld in record["loaders"] if ld["cache"] == "miss")
+        try:
+            _append(record, path)
+        except OSError:
+            pass  # la instrumentación nunca debe romper la página
+
+
+def run_page(path: Path) -> None:
+    """Ejecutar el script de página ``path`` medido como un rerun de ``path.stem``."""
+
+    with instrument_page(path.stem):
+        runpy.run_path(str(path))
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Sumar el tiempo del bloque a la fase ``name`` del rerun en curso.
+
+    Un bloque anidado en la misma fase no vuelve a sumar su tiempo.
+    """
+
+    record = _current()
+    active = getattr(_LOCAL, "phases", set())
+    if record is None or name in active:
+        yield
+        return
+    _LOCAL.phases = active | {name}
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _LOCAL.phases = active
+        record["phases_ms"][name] = record["phases_ms"].get(name, 0.0) + (time.perf_counter() - t0) * 1000
+
+
+def note_bytes_read(nbytes: int) -> None:
+    """Llamado por un loader cuando lee de disco (solo ocurre en cache miss)."""
+
+    _LOCAL.bytes_read = getattr(_LOCAL, "bytes_read", 0) + int(nbytes)
+
+
+def instrumented_loader(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Equivalente a ``st.cache_data(show_spinner=False)`` que además registra cada llamada.
+
+    Un miss se detecta porque la función original solo se ejecuta cuando la
+    cache no tiene el resultado.
+    """
+
+    @functools.wraps(fn)
+    def _compute(*args: Any, **kwargs: Any) -> Any:
+        _LOCAL.miss = True
+        return fn(*args, **kwargs)
+
+    cached = st.cache_data(show_spinner=False)(_compute)
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        record = _current()
+        if record is None:
+            return cached(*args, **kwargs)
+        _LOCAL.miss = False
+        _LOCAL.bytes_read = 0
+        with phase("load"):
+            t0 = time.perf_counter()
+            result = cached(*args, **kwargs)
+            elapsed = (time.perf_counter() - t0) * 1000
+        record["loaders"].append(
+            {
+                "loader": fn.__name__,
+                "key": str(args[0]) if args else "",
+                "ms": round(elapsed, 2),
+                "cache": "miss" if _LOCAL.miss else "hit",
+                "bytes_read": _LOCAL.bytes_read if _LOCAL.miss else 0,
+                "rows": len(result) if isinstance(result, pd.DataFrame) else None,
+            }
+        )
+        return result
+
+    wrapper.clear = cached.clear  # type: ignore[attr-defined]
+    return wrapper
+
+
+def read_perf_log(path: Optional[Path] = None, include_rotated: bool = True) -> List[Dict[str, Any]]:
+    """Registros del JSONL (primero el archivo rotado, si existe)."""
+
+    path = path or perf_log_path() or PERF_LOG
+    files = [path.with_name(path.name + ".1"), path] if include_rotated else [path]
+    records: List[Dict[str, Any]] = []
+    for file in files:
+        if not file.exists():
+            continue
+        for line in file.read_text(encoding="utf-8").splitlines():
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def page_percentiles(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """p50/p95 de total y de cada fase por página (ms), más reruns y bytes."""
+
+    rows = [{"page": r["page"], "total": r.get("total_ms", 0.0), "bytes_read": r.get("bytes_read", 0), **r.get("phases_ms", {})} for r in records]
+    if not rows:
+        return pd.DataFrame(columns=["page", "reruns"])
+    df = pd.DataFrame(rows)
+    metrics = ["total", *PHASES]
+    grouped = df.groupby("page")
+    out = pd.concat(
+        [
+            grouped[metrics].quantile(0.5).add_suffix("_p50"),
+            grouped[metrics].quantile(0.95).add_suffix("_p95"),
+            grouped["bytes_read"].mean().rename("bytes_read_mean"),
+            grouped.size().rename("reruns"),
+        ],
+        axis=1,
+    )
+    return out.reset_index().sort_values("total_p95", ascending=False, ignore_index=True)
+
+
+def loader_stats(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Por loader y clave: llamadas, tasa de hit y p50/p95 de la latencia."""
+
+    rows = [ld for r in records for ld in r.get("loaders", [])]
+    if not rows:
+        return pd.DataFrame(columns=["loader", "key", "calls"])
+    df = pd.DataFrame(rows)
+    df["hit"] = df["cache"].eq("hit")
+    grouped = df.groupby(["loader", "key"])
+    out = pd.concat(
+        [
+            grouped.size().rename("calls"),
+            grouped["hit"].mean().rename("hit_rate"),
+            grouped["ms"].quantile(0.5).rename("ms_p50"),
+            grouped["ms"].quantile(0.95).rename("ms_p95"),
+            grouped["bytes_read"].sum().rename("bytes_read"),
+        ],
+        axis=1,
+    )
+    return out.reset_index().sort_values("ms_p95", ascending=False, ignore_index=True)
+
+
+__all__ = [
+    "PERF_LOG",
+    "PHASES",
+    "instrument_page",
+    "instrumented_loader",
+    "loader_stats",
+    "note_bytes_read",
+    "page_percentiles",
+    "perf_log_path",
+    "phase",
+    "read_perf_log",
+    "run_page",
+]
@@ -1,26 +1,54 @@
 # -*- coding: utf-8 -*-
-"""Componentes reutilizables de Streamlit (KPIs y gráficos simples)."""
+"""Componentes reutilizables de Streamlit (KPIs y gráficos simples).
+
+Las páginas importan ``px``, ``go`` y las funciones de tema desde aquí. ``px`` y
+``go`` son los módulos de Plotly tal cual; las funciones de tema se miden como
+fase ``figure`` del rerun y :func:`plotly_chart` como fase ``render``.
+"""
 
 from __future__ import annotations
 
+import functools
+
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 import streamlit as st
 
-from app.charts.theme import (
-    AxisFormat,
-    PLOTLY_CONFIG,
-    apply_exec_style,
-    apply_soft_markers,
-    apply_thin_lines,
-    format_axis_units,
-)
+from app.charts import theme as _theme
+from app.charts.theme import EXEC_THEME, PLOTLY_CONFIG, AxisFormat, short_spanish_date
+from app.instrumentation import phase
+
+
+def _timed_figure(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with phase("figure"):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+apply_exec_style = _timed_figure(_theme.apply_exec_style)
+apply_soft_markers = _timed_figure(_theme.apply_soft_markers)
+apply_thin_lines = _timed_figure(_theme.apply_thin_lines)
+apply_unified_hover = _timed_figure(_theme.apply_unified_hover)
+format_axis_units = _timed_figure(_theme.format_axis_units)
 
 
 def kpi(col, label: str, value: str):
     col.metric(label, value)
 
 
+def plotly_chart(container, fig, **kwargs):
+    """``container.plotly_chart`` con la config ejecutiva, medido como fase ``render``."""
+
+    kwargs.setdefault("use_container_width", True)
+    kwargs.setdefault("config", PLOTLY_CONFIG)
+    with phase("render"):
+        return container.plotly_chart(fig, **kwargs)
+
+
 def line_chart(
     container,
     df: pd.DataFrame,
@@ -39,16 +67,17 @@ def line_chart(
     if df.empty:
         container.info(f"Sin datos para {title}")
         return
-    fig = px.line(df, x=x, y=y, color=color, title=title)
-    apply_thin_lines(fig)
-    apply_soft_markers(fig)
-    format_axis_units(
-        fig,
-        x=AxisFormat(title=x_label, tickformat=x_tickformat),
-        y=AxisFormat(title=y_label or title, tickformat=y_format),
-    )
-    apply_exec_style(fig, title=title, subtitle=subtitle or "Tendencia mensual", source=source)
-    container.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    with phase("figure"):
+        fig = px.line(df, x=x, y=y, color=color, title=title)
+        apply_thin_lines(fig)
+        apply_soft_markers(fig)
+        format_axis_units(
+            fig,
+            x=AxisFormat(title=x_label, tickformat=x_tickformat),
+            y=AxisFormat(title=y_label or title, tickformat=y_format),
+        )
+        apply_exec_style(fig, title=title, subtitle=subtitle or "Tendencia mensual", source=source)
+    plotly_chart(container, fig)
 
 
 def bar_chart(
@@ -69,11 +98,12 @@ def bar_chart(
     if df.empty:
         container.info(f"Sin datos para {title or 'gráfico'}")
         return
-    fig = px.bar(df, x=x, y=y, color=color, title=title)
-    format_axis_units(
-        fig,
-        x=AxisFormat(title=x_label, tickformat=x_tickformat),
-        y=AxisFormat(title=y_label or (title or y), tickformat=y_format),
-    )
-    apply_exec_style(fig, title=title or "", subtitle=subtitle or "Distribución por periodo", source=source)
-    container.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    with phase("figure"):
+        fig = px.bar(df, x=x, y=y, color=color, title=title)
+        format_axis_units(
+            fig,
+            x=AxisFormat(title=x_label, tickformat=x_tickformat),
+            y=AxisFormat(title=y_label or (title or y), tickformat=y_format),
+        )
+        apply_exec_style(fig, title=title or "", subtitle=subtitle or "Distribución por periodo", source=source)
+    plotly_chart(container, fig)
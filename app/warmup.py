@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Precarga en segundo plano de las tablas de las páginas de entrada.
+
+Un hilo por proceso vigila el token del mart (mtime de ``manifest.json`` o, en
+un mart sin snapshots, de ``metadata.json``).
+Al arrancar y cada vez que el ETL lo cambia, llama en paralelo a los loaders
+de :mod:`app.data_access` con **los mismos argumentos** que usan las páginas
+(:func:`warmup_calls`), así la cache compartida de ``st.cache_data`` ya está
+lista cuando llega el primer analista. ``EGASA_WARMUP=off`` la desactiva.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from app import data_access
+
+logger = logging.getLogger(__name__)
+
+POLL_SECONDS = 15.0
+MAX_WORKERS = 4
+
+Call = Tuple[str, Callable[..., Any], tuple, Dict[str, Any]]
+
+_LOCK = threading.Lock()
+_STATE: Dict[str, Any] = {"thread": None, "status": {}}
+
+
+def warmup_calls(meta_token: float) -> List[Call]:
+    """Llamadas a precargar: las de ``01_Resumen_Ejecutivo`` y la partición por defecto de ``03``.
+
+    La clave de cache depende de los argumentos y su orden; si una página
+    cambia cómo llama a un loader, esta lista debe cambiar igual.
+    """
+
+    load = data_access.load_table
+    calls: List[Call] = [
+        ("generacion_mensual.csv", load, ("generacion_mensual.csv",), {"meta_token": meta_token}),
+        ("balance_perfil_mensual.csv", load, ("balance_perfil_mensual.csv",), {"parse_dates": ["fecha_mes"], "meta_token": meta_token}),
+        ("balance_r_mensual.csv", load, ("balance_r_mensual.csv",), {"parse_dates": ["fecha_mes"], "meta_token": meta_token}),
+        ("precio_medio_mensual.csv", load, ("precio_medio_mensual.csv",), {"meta_token": meta_token}),
+        ("represas_diario.csv", load, ("represas_diario.csv",), {"meta_token": meta_token}),
+    ]
+    months = data_access.list_yyyymm_15min(meta_token=meta_token)
+    if months:
+        calls.append((f"generacion_15min_{months[0]}", data_access.load_generacion_15min, (months[0],), {"meta_token": meta_token}))
+        calls.append(("indicadores_15min_mensual.csv", load, ("indicadores_15min_mensual.csv",), {"meta_token": meta_token}))
+        calls.append((f"cobertura_15min_{months[0]}", data_access.load_cobertura_15min, (months[0],), {"meta_token": meta_token}))
+    return calls
+
+
+def _timed(fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> float:
+    t0 = time.perf_counter()
+    fn(*args, **kwargs)
+    return round((time.perf_counter() - t0) * 1000, 1)
+
+
+def warm_cache(meta_token: float | None = None, max_workers: int = MAX_WORKERS) -> Dict[str, Any]:
+    """Ejecutar la precarga una vez (bloqueante) y devolver el estado."""
+
+    token = data_access.metadata_token() if meta_token is None else meta_token
+    calls = warmup_calls(token)
+    status: Dict[str, Any] = {"meta_token": token, "started_at": datetime.now().isoformat(timespec="seconds"), "tables": {}, "errors": {}}
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warmup") as pool:
+        futures = {label: pool.submit(_timed, fn, args, kwargs) for label, fn, args, kwargs in calls}
+        for label, future in futures.items():
+            try:
+                status["tables"][label] = future.result()
+            except Exception as exc:  # una tabla rota no debe frenar al resto
+                status["errors"][label] = str(exc)
+                logger.warning("Precarga de %s falló: %s", label, exc)
+    status["duration_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    _STATE["status"] = status
+    logger.info("Precarga: %s tablas en %.0f ms", len(status["tables"]), status["duration_ms"])
+    return status
+
+
+class _Warmer(threading.Thread):
+    def __init__(self, poll_seconds: float) -> None:
+        super().__init__(name="cache-warmup", daemon=True)
+        self.poll_seconds = poll_seconds
+        self.stop_event = threading.Event()
+
+    def run(self) -> None:
+        last = None
+        while True:
+            token = data_access.metadata_token()
+            if token != last:
+                try:
+                    warm_cache(token)
+                except Exception:  # pragma: no cover - el hilo no debe morir
+                    logger.exception("Precarga falló")
+                last = token
+            if self.stop_event.wait(self.poll_seconds):
+                return
+
+
+def start_warmup(poll_seconds: float = POLL_SECONDS) -> bool:
+    """Arrancar el hilo de precarga si aún no corre en este proceso (idempotente)."""
+
+    if os.environ.get("EGASA_WARMUP", "").strip().lower() in {"off", "0", "false"}:
+        return False
+    with _LOCK:
+        thread = _STATE["thread"]
+        if thread is not None and thread.is_alive():
+            return False
+        thread = _Warmer(poll_seconds)
+        _STATE["thread"] = thread
+        thread.start()
+    return True
+
+
+def stop_warmup(timeout: float | None = None) -> None:
+    with _LOCK:
+        thread = _STATE["thread"]
+        _STATE["thread"] = None
+    if thread is not None:
+        thread.stop_event.set()
+        thread.join(timeout)
+
+
+def warmup_status() -> Dict[str, Any]:
+    """Última precarga completada (vacío si aún no terminó ninguna)."""
+
+    return dict(_STATE["status"])
+
+
+__all__ = [
+    "start_warmup",
+    "stop_warmup",
+    "warm_cache",
+    "warmup_calls",
+    "warmup_status",
+]
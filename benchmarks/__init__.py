@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmarks del ETL (generador de landing sintético + medición por etapa)."""
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+"""Benchmark del ETL por etapa y completo (``run_etl.main``) a varias escalas.
+
+Para cada escala genera (o reutiliza) un landing sintético, mide cada
+pipeline por separado sobre un data_mart vacío y luego la corrida completa.
+El cache de parseo se desactiva para medir lectura real. El resultado se
+guarda como JSON en ``benchmarks/results/`` para comparar tendencias::
+
+    python -m benchmarks.bench_etl --scales 1 10 50
+    python -m benchmarks.bench_etl --scales 1 --baseline benchmarks/results/etl_<ts>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.generate_landing import GENERATOR_VERSION, generate_landing  # noqa: E402
+from etl import config  # noqa: E402
+
+DEFAULT_SCALES = [1.0, 10.0, 50.0]
+
+
+def _stages(archive: Path) -> List[Tuple[str, Callable[[], Any]]]:
+    from etl import pipelines
+    from etl.represas_historico import backfill_represas
+
+    return [
+        ("produccion", pipelines.run_produccion),
+        ("hidrologia", pipelines.run_hidrologia),
+        ("facturacion", pipelines.run_facturacion),
+        ("contratos", pipelines.run_contratos),
+        ("balance_energia", pipelines.run_balance_energia),
+        ("represas_backfill", lambda: backfill_represas(archive)),
+    ]
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def prepare_scale(workdir: Path, scale: float, seed: int = 0, regenerate: bool = False) -> Dict[str, Any]:
+    """Generar el landing de una escala salvo que ya exista con la misma versión."""
+
+    out = workdir / f"scale_{scale:g}"
+    manifest_path = out / "manifest.json"
+    if manifest_path.exists() and not regenerate:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("generator_version") == GENERATOR_VERSION and manifest.get("seed") == seed:
+            return manifest
+    if out.exists():
+        shutil.rmtree(out)
+    t0 = time.perf_counter()
+    manifest = generate_landing(out, scale=scale, seed=seed)
+    manifest["generate_seconds"] = round(time.perf_counter() - t0, 3)
+    manifest_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    return manifest
+
+
+def _write_config(run_dir: Path, landing: Path, excel_engine: str) -> Path:
+    cfg = run_dir / "config.toml"
+    cfg.write_text(
+        "\n".join(
+            [
+                "[paths]",
+                f'input = "{landing.as_posix()}"',
+                f'output = "{(run_dir / "mart").as_posix()}"',
+                f'reference = "{(run_dir / "reference").as_posix()}"',
+                f'logs = "{(run_dir / "logs").as_posix()}"',
+                f'reports = "{(run_dir / "reports").as_posix()}"',
+                "",
+                "[io]",
+                f'excel_engine = "{excel_engine}"',
+                "parse_cache = false",
+                "",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    return cfg
+
+
+def _fresh_run_dir(base: Path) -> Path:
+    if base.exists():
+        shutil.rmtree(base)
+    base.mkdir(parents=True)
+    return base
+
+
+def time_stages(config_path: Path, archive: Path) -> Dict[str, float]:
+    """Correr cada pipeline una vez (en orden) y devolver segundos por etapa."""
+
+    from etl.utils_io import set_run_context
+
+    config.apply_runtime_overrides(config_path=config_path)
+    set_run_context(run_id="bench", strict=False)
+    config.ensure_directories()
+
+    timings: Dict[str, float] = {}
+    for name, fn in _stages(archive):
+        t0 = time.perf_counter()
+        fn()
+        timings[name] = time.perf_counter() - t0
+    return timings
+
+
+def time_full_run(config_path: Path) -> float:
+    """Medir ``run_etl.main`` completo (CLI en proceso)."""
+
+    from etl import run_etl
+
+    argv = sys.argv
+    sys.argv = ["run_etl", "--config", str(config_path), "--non-strict"]
+    try:
+        t0 = time.perf_counter()
+        run_etl.main()
+        return time.perf_counter() - t0
+    finally:
+        sys.argv = argv
+
+
+def _summary(samples: List[float]) -> Dict[str, Any]:
+    return {
+        "seconds": [round(s, 4) for s in samples],
+        "median": round(statistics.median(samples), 4),
+        "min": round(min(samples), 4),
+    }
+
+
+def bench_scale(workdir: Path, scale: float, repeat: int = 1, excel_engine: str = "auto", seed: int = 0, regenerate: bool = False) -> Dict[str, Any]:
+    manifest = prepare_scale(workdir, scale, seed=seed, regenerate=regenerate)
+    landing = Path(manifest["landing"])
+
+    stage_samples: Dict[str, List[float]] = {}
+    full_samples: List[float] = []
+    for _ in range(repeat):
+        run_dir = _fresh_run_dir(workdir / f"run_{scale:g}")
+        cfg = _write_config(run_dir, landing, excel_engine)
+        for name, seconds in time_stages(cfg, Path(manifest["archive"])).items():
+            stage_samples.setdefault(name, []).append(seconds)
+
+        run_dir = _fresh_run_dir(workdir / f"run_{scale:g}")
+        cfg = _write_config(run_dir, landing, excel_engine)
+        full_samples.append(time_full_run(cfg))
+
+    return {
+        "scale": scale,
+        "params": manifest["params"],
+        "landing_files": manifest["total_files"],
+        "landing_bytes": manifest["total_bytes"],
+        "stages": {name: _summary(samples) for name, samples in stage_samples.items()},
+        "full_etl": _summary(full_samples),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Líneas ``escala/etapa: actual vs base (ratio)`` sobre medianas."""
+
+    base_by_scale = {r["scale"]: r for r in baseline.get("results", [])}
+    lines: List[str] = []
+    for result in current["results"]:
+        base = base_by_scale.get(result["scale"])
+        if not base:
+            continue
+        pairs = [(f"{k}", v["median"], base["stages"].get(k, {}).get("median")) for k, v in result["stages"].items()]
+        pairs.append(("full_etl", result["full_etl"]["median"], base["full_etl"]["median"]))
+        for name, now, before in pairs:
+            if before:
+                lines.append(f"{result['scale']:g}x {name:<18} {now:8.3f}s vs {before:8.3f}s  ({now / before:5.2f}x)")
+    return lines
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark del ETL EGASA")
+    parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=1, help="Repeticiones por escala (se reporta la mediana)")
+    parser.add_argument("--engine", default="auto", choices=["auto", "calamine", "openpyxl"], help="io.excel_engine")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=str(BENCH_DIR / ".work"), help="Landing generado y data_mart temporales")
+    parser.add_argument("--output", default=str(BENCH_DIR / "results"), help="Carpeta de resultados JSON")
+    parser.add_argument("--regenerate", action="store_true", help="Regenerar el landing aunque exista")
+    parser.add_argument("--baseline", help="JSON previo para comparar medianas")
+    args = parser.parse_args(argv)
+
+    # Silenciar el log INFO de los pipelines (run_etl no reconfigura si ya hay handlers)
+    logging.basicConfig(level=logging.WARNING)
+
+    from etl.utils_io import excel_engine
+
+    workdir = Path(args.workdir)
+    results = []
+    for scale in args.scales:
+        result = bench_scale(workdir, scale, repeat=args.repeat, excel_engine=args.engine, seed=args.seed, regenerate=args.regenerate)
+        results.append(result)
+        stages = "  ".join(f"{k}={v['median']:.2f}s" for k, v in result["stages"].items())
+        print(f"{scale:g}x: {result['landing_files']} archivos, {result['landing_bytes'] / 1e6:.1f} MB | {stages} | full_etl={result['full_etl']['median']:.2f}s")
+
+    payload = {
+        "benchmark": "etl",
+        "generated_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "excel_engine": excel_engine(args.engine),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    out_dir = Path(args.output)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    out_path = out_dir / f"etl_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.json"
+    out_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultados: {out_path}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        for line in compare(payload, baseline):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
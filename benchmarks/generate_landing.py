@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+
+"""Generador de archivos landing sintéticos para benchmarks del ETL.
+
+Reproduce los layouts que espera cada pipeline (mismos nombres de archivo,
+hojas y filas de encabezado que los libros reales) a escala configurable:
+
+- histórico mensual: N hojas anuales (``2010``..``2025``) con centrales y grupos;
+- 15-min: M libros mensuales con K medidores;
+- facturación: un libro por año con C clientes;
+- Control Hidrológico, balance 2025 y contratos;
+- BDREPRESAS: el reporte del día en landing y D reportes diarios archivados.
+
+Uso::
+
+    python -m benchmarks.generate_landing --scale 10 --output benchmarks/.work/scale_10
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+from openpyxl import Workbook
+
+from etl.pipelines.produccion import CENTRALES_DEFAULT
+
+GENERATOR_VERSION = "1"
+
+MESES = [
+    "ENERO",
+    "FEBRERO",
+    "MARZO",
+    "ABRIL",
+    "MAYO",
+    "JUNIO",
+    "JULIO",
+    "AGOSTO",
+    "SETIEMBRE",
+    "OCTUBRE",
+    "NOVIEMBRE",
+    "DICIEMBRE",
+]
+
+# (grupo en la fila 0, prefijo del medidor en la fila 1), como en los libros 15-min reales
+GRUPOS_15MIN = [
+    ("C.H. CHARCANI I", "CHAI"),
+    ("C.H. CHARCANI II", "CHAII"),
+    ("C.H. CHARCANI III", "CHAIII"),
+    ("C.H. CHARCANI IV", "CHAIV"),
+    ("C.H. CHARCANI V", "CHAV"),
+    ("C.H. CHARCANI VI", "CHAVI"),
+    ("C.T. CHILINA", "SULZ"),
+    ("C.T. MOLLENDO", "MIR"),
+    ("C.T. PISCO", "TGP"),
+]
+
+RESERVORIOS = ["Aguada Blanca", "El Frayle", "El Pañe", "Pillones", "Chalhuanca", "Bamputañe"]
+HOJAS_VOLUMEN = ["AB", "EF", "EP", "PI", "CH", "BA", "TOTAL"]
+CONCEPTOS_PERFIL = [
+    "Produccion Hidraulica",
+    "Produccion Termica",
+    "Compra de Energia",
+    "Consumos Aux.",
+    "Perdidas",
+    "Venta de Energia",
+    "Venta en COES",
+    "Contratos",
+]
+COLUMNAS_CONTRATOS = [
+    "Nombre del Cliente",
+    "Tipo Contrato",
+    "Vigencia Inicio",
+    "Vigencia Final",
+    "Potencia Total (MW)",
+    "Precio Energia HP (USD/MWh)",
+    "Precio Energia FP (USD/MWh)",
+]
+
+
+def _clamp(value: float, low: int, high: int) -> int:
+    return int(min(max(round(value), low), high))
+
+
+def scale_params(scale: float) -> Dict[str, int]:
+    """Tamaños por fuente para una escala (1x ~ un mes real pequeño).
+
+    Los 15-min (fuente dominante) crecen como ``meses x medidores`` ~ escala;
+    el histórico queda acotado a las hojas 2010-2025 que acepta el pipeline.
+    """
+
+    root = math.sqrt(scale)
+    return {
+        "hist_years": _clamp(2 * scale, 1, 16),
+        "months_15min": _clamp(2 * root, 1, 36),
+        "meters_15min": _clamp(12 * root, 4, 400),
+        "fact_years": _clamp(root, 1, 10),
+        "fact_clients": _clamp(20 * root, 3, 2000),
+        "hydro_years": _clamp(15 * root, 3, 58),
+        "represas_days": _clamp(7 * scale, 2, 3650),
+        "contracts": _clamp(10 * scale, 3, 5000),
+    }
+
+
+def _save(wb: Workbook, path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+    return path
+
+
+def _sheet(wb: Workbook, title: str):
+    return wb.create_sheet(title=title)
+
+
+def write_historico(path: Path, years: int, rng: np.random.Generator) -> Path:
+    wb = Workbook(write_only=True)
+    for year in range(2025 - years + 1, 2026):
+        ws = _sheet(wb, str(year))
+        ws.append([])
+        ws.append([None, f"AÑO {year}"])
+        ws.append([])
+        ws.append([None, "PRODUCIÓN DE ENERGÍA"])
+        ws.append([None, "CENTRAL", None, *MESES, "TOTAL ANUAL"])
+        ws.append([None, None, None, *(["kWh"] * 13)])
+        for _, nombre, _, _, potencia, _ in CENTRALES_DEFAULT:
+            grupos = rng.uniform(0.3, 0.9, size=(2, 12)) * potencia * 1000 * 730 / 2
+            total = grupos.sum(axis=0)
+            ws.append([None, nombre, None, *total.tolist(), float(total.sum())])
+            for g, fila in enumerate(grupos, start=1):
+                ws.append([None, None, f"G{g}", *fila.tolist(), float(fila.sum())])
+    return _save(wb, path)
+
+
+def _month_starts(count: int, first: date = date(2024, 1, 1)) -> Iterable[date]:
+    for i in range(count):
+        yield date(first.year + (first.month - 1 + i) // 12, (first.month - 1 + i) % 12 + 1, 1)
+
+
+def write_15min(path: Path, month: date, meters: int, rng: np.random.Generator) -> Path:
+    """Libro 15-min: fila 0 grupos (celdas combinadas -> vacías), fila 1 medidores."""
+
+    per_group = [meters // len(GRUPOS_15MIN) + (1 if i < meters % len(GRUPOS_15MIN) else 0) for i in range(len(GRUPOS_15MIN))]
+    header_grupos: List[Any] = ["FECHA/HORA"]
+    header_medidores: List[Any] = [None]
+    for (grupo, prefijo), n in zip(GRUPOS_15MIN, per_group):
+        for k in range(1, n + 1):
+            header_grupos.append(grupo if k == 1 else None)
+            header_medidores.append(f"{prefijo}{k} -kWh")
+
+    start = datetime(month.year, month.month, 1)
+    end = datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+    n_rows = int((end - start) / timedelta(minutes=15))
+    base = rng.uniform(0.0, 2000.0, size=meters)
+    values = np.clip(base + rng.normal(0.0, 50.0, size=(n_rows, meters)), 0.0, None)
+    # Algunos huecos (celdas vacías) como en las descargas reales
+    values[rng.random(size=values.shape) < 0.001] = np.nan
+
+    wb = Workbook(write_only=True)
+    ws = _sheet(wb, "Hoja1")
+    ws.append(header_grupos)
+    ws.append(header_medidores)
+    step = timedelta(minutes=15)
+    for i, fila in enumerate(values.tolist()):
+        ws.append([start + step * (i + 1), *(None if v != v else v for v in fila)])
+    ws.append(["TOTAL ENERGÍA", *np.nansum(values, axis=0).tolist()])
+    return _save(wb, path)
+
+
+def write_facturacion(path: Path, clients: int, rng: np.random.Generator) -> Path:
+    wb = Workbook(write_only=True)
+    mwh = rng.uniform(100.0, 20000.0, size=(clients, 12))
+    for title, factor in (("VENTAS (MWh)", 1.0), ("VENTAS (S)", 250.0)):
+        ws = _sheet(wb, title)
+        ws.append(["CLIENTE", *MESES])
+        for c, fila in enumerate(mwh * factor, start=1):
+            ws.append([f"CLIENTE {c:04d}", *fila.tolist()])
+    ws = _sheet(wb, "Ingresos")
+    ws.append(["CONCEPTO", *MESES])
+    for concepto in ("Energía", "Potencia", "Peaje", "Otros"):
+        ws.append([concepto, *rng.uniform(1e5, 1e7, size=12).tolist()])
+    return _save(wb, path)
+
+
+def write_control_hidrologico(path: Path, years: int, rng: np.random.Generator) -> Path:
+    wb = Workbook(write_only=True)
+    anios = list(range(2025 - years + 1, 2026))
+    for hoja in [*HOJAS_VOLUMEN, "CAUDAL"]:
+        ws = _sheet(wb, hoja)
+        ws.append([None, "CONTROL HIDROLOGICO"])
+        ws.append([None, f"REPRESA {hoja}"])
+        ws.append([None, "CAUDAL REGULADO ( m3 / s )" if hoja == "CAUDAL" else "VOLUMENES ALMACENADOS ( , 000 m3 )"])
+        ws.append([])
+        ws.append([None, "AÑO", *MESES])
+        escala = 15.0 if hoja == "CAUDAL" else 30000.0
+        for anio in anios:
+            ws.append([None, anio, *(rng.uniform(0.2, 1.0, size=12) * escala).tolist()])
+    return _save(wb, path)
+
+
+def write_balance(path: Path, years: int, rng: np.random.Generator) -> Path:
+    meses = [datetime(m.year, m.month, 1) for m in _month_starts(12 * years, date(2026 - years, 1, 1))]
+    wb = Workbook(write_only=True)
+    ws = _sheet(wb, "R")
+    for _ in range(6):
+        ws.append([])
+    ws.append([None, "Año", *meses])
+    segmentos = {s: rng.uniform(5e3, 5e4, size=len(meses)) for s in ("COES", "Regulados", "Libres")}
+    for nombre, fila in segmentos.items():
+        ws.append([None, nombre, *fila.tolist()])
+    ws.append([])
+    ws.append([None, "Total", *sum(segmentos.values()).tolist()])
+    ws = _sheet(wb, "Perfil")
+    ws.append([])
+    ws.append([])
+    ws.append([None, "Concepto", *meses])
+    for concepto in CONCEPTOS_PERFIL:
+        ws.append([None, concepto, *rng.uniform(0.0, 120.0, size=len(meses)).tolist()])
+    return _save(wb, path)
+
+
+def write_contratos(path: Path, rows: int, rng: np.random.Generator) -> Path:
+    wb = Workbook(write_only=True)
+    for hoja in ("CONTRATOS BASE DATOS", "RIESGO"):
+        ws = _sheet(wb, hoja)
+        ws.append(COLUMNAS_CONTRATOS)
+        for i in range(rows):
+            inicio = datetime(2020 + int(rng.integers(0, 6)), int(rng.integers(1, 13)), 1)
+            fin = datetime(inicio.year + int(rng.integers(1, 12)), inicio.month, 1)
+            ws.append(
+                [
+                    f"CLIENTE {i + 1:04d}",
+                    "LIBRE" if i % 3 else "REGULADO",
+                    inicio,
+                    fin,
+                    float(rng.uniform(1.0, 60.0)),
+                    float(rng.uniform(30.0, 70.0)),
+                    float(rng.uniform(20.0, 50.0)),
+                ]
+            )
+    return _save(wb, path)
+
+
+def write_informe_represas(path: Path, dia: date, rng: np.random.Generator) -> Path:
+    """Hoja INFORMEDIARIO con el layout de BDREPRESAS (título con fecha + tabla)."""
+
+    wb = Workbook(write_only=True)
+    ws = _sheet(wb, "INFORMEDIARIO")
+    ws.append([f"INFORME DIARIO DE REPRESAS AL {dia.day} DE {MESES[dia.month - 1]} DE {dia.year}"])
+    ws.append([])
+    ws.append([None, "REPRESA", None, None, None, None, None, "VOLUMEN", None])
+    for nombre in RESERVORIOS:
+        capacidad = float(rng.uniform(20.0, 200.0))
+        actual = capacidad * float(rng.uniform(0.2, 1.0))
+        ws.append([None, nombre, capacidad, actual * 0.9, actual, actual / capacidad, 0.01, None, actual * 0.99])
+    return _save(wb, path)
+
+
+def generate_landing(output: Path, scale: float = 1.0, seed: int = 0) -> Dict[str, Any]:
+    """Generar ``output/landing`` y ``output/archivo_represas`` a la escala dada.
+
+    Retorna el manifiesto (también escrito en ``output/manifest.json``).
+    """
+
+    rng = np.random.default_rng(seed)
+    params = scale_params(scale)
+    landing = output / "landing"
+    archive = output / "archivo_represas"
+    files: Dict[str, List[Path]] = {}
+
+    files["produccion_historica"] = [
+        write_historico(landing / "PRODUCCION EGASA DESDE 2010 (NOV2025).xlsx", params["hist_years"], rng)
+    ]
+    files["produccion_15min"] = [
+        write_15min(landing / f"PRODUCCIÓN DE ENERGÍA_{MESES[m.month - 1]} {m.year}.xlsx", m, params["meters_15min"], rng)
+        for m in _month_starts(params["months_15min"])
+    ]
+    files["facturacion"] = [
+        write_facturacion(landing / f"Facturacion {year}.xlsx", params["fact_clients"], rng)
+        for year in range(2026 - params["fact_years"], 2026)
+    ]
+    files["hidrologia_control"] = [write_control_hidrologico(landing / "Control Hidrológico.xlsx", params["hydro_years"], rng)]
+    files["balance_energia"] = [write_balance(landing / "balance 2025.xlsx", params["fact_years"], rng)]
+    files["contratos"] = [write_contratos(landing / "Revision de Volumen Optimo.xlsx", params["contracts"], rng)]
+
+    last_day = date(2025, 12, 31)
+    dias = [last_day - timedelta(days=d) for d in range(params["represas_days"] - 1, -1, -1)]
+    files["represas_archivo"] = [
+        write_informe_represas(archive / f"BDREPRESAS {dia.isoformat()}.xlsx", dia, rng) for dia in dias
+    ]
+    files["hidrologia_represas"] = [write_informe_represas(landing / "BDREPRESAS.xlsx", last_day, rng)]
+
+    all_files = [p for paths in files.values() for p in paths]
+    manifest = {
+        "generator_version": GENERATOR_VERSION,
+        "scale": scale,
+        "seed": seed,
+        "params": params,
+        "landing": str(landing),
+        "archive": str(archive),
+        "files": {k: len(v) for k, v in files.items()},
+        "bytes": {k: sum(p.stat().st_size for p in v) for k, v in files.items()},
+        "total_files": len(all_files),
+        "total_bytes": sum(p.stat().st_size for p in all_files),
+    }
+    (output / "manifest.json").write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    return manifest
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Generar landing sintético para benchmarks del ETL")
+    parser.add_argument("--scale", type=float, default=1.0, help="Factor de escala (1, 10, 50, ...)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True, help="Carpeta destino (se crean landing/ y archivo_represas/)")
+    args = parser.parse_args(argv)
+
+    manifest = generate_landing(Path(args.output), scale=args.scale, seed=args.seed)
+    print(json.dumps(manifest, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@
 
 from __future__ import annotations
 
-from etl.run_etl import main
+from etl.cli import main
 
 
 if __name__ == "__main__":
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+"""Agregación por bloques sobre las particiones ``generacion_15min_YYYYMM``.
+
+Las particiones se leen de a una (u opcionalmente en bloques de
+``chunksize`` filas). Por cada bloque se calculan agregados parciales que
+luego se combinan: suma, conteo, mínimo y máximo por grupo, y un sketch de
+cuantiles con buckets logarítmicos (error relativo ``alpha``, estilo
+DDSketch). La memoria queda acotada por una partición más el tamaño de los
+agregados, sin importar cuántos años de historia haya::
+
+    python -m etl aggregate --by central_id,anio
+    python -m etl aggregate --by unidad,mes --quantiles 0.5,0.95 --start 202401 --end 202412
+    python -m etl aggregate --by central_id,hora --metrics mean,max --output perfil.csv
+
+Claves de tiempo derivables aunque no estén en el CSV: ``anio``, ``mes``,
+``fecha`` y ``hora``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from etl import config, publish
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("sum", "count", "min", "max", "mean")
+TIME_KEYS = ("anio", "mes", "fecha", "hora")
+_PARTITION = re.compile(r"generacion_15min_(\d{6})\.csv$")
+# códigos de bucket del sketch: 0 = cero, >0 positivos, <0 negativos
+_BUCKET_OFFSET = 100_000
+_ZERO = 1e-12
+
+
+def list_partitions(mart: Path | None = None, start: str | None = None, end: str | None = None, periods: Iterable[str] | None = None) -> List[Path]:
+    """Particiones 15 min en orden de periodo, filtradas por rango o lista de periodos."""
+
+    # durante una corrida DATA_MART es el staging; fuera de ella, la snapshot publicada
+    mart = mart or publish.current_dir(config.DATA_MART)
+    wanted = {str(p) for p in periods} if periods is not None else None
+    out = []
+    for path in mart.glob("generacion_15min_*.csv"):
+        match = _PARTITION.search(path.name)
+        if not match:
+            continue
+        periodo = match.group(1)
+        if (start and periodo < start) or (end and periodo > end) or (wanted is not None and periodo not in wanted):
+            continue
+        out.append(path)
+    return sorted(out)
+
+
+def iter_15min(
+    by: Sequence[str] = (),
+    value: str = "energia_mwh",
+    mart: Path | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    periods: Iterable[str] | None = None,
+    chunksize: int | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Bloques con las columnas ``by`` + ``value`` (las claves de tiempo se derivan)."""
+
+    time_keys = [k for k in by if k in TIME_KEYS]
+    for path in list_partitions(mart, start, end, periods):
+        header = pd.read_csv(path, nrows=0).columns
+        usecols = [c for c in (*by, value) if c in header and c not in time_keys]
+        if time_keys:
+            usecols += [c for c in ("fecha_hora", "periodo") if c in header and c not in usecols]
+        reader = pd.read_csv(path, usecols=usecols, chunksize=chunksize, low_memory=False)
+        for chunk in [reader] if chunksize is None else reader:
+            if chunk.empty:
+                continue
+            yield _derive_time_keys(chunk, time_keys)
+
+
+def _derive_time_keys(df: pd.DataFrame, keys: Sequence[str]) -> pd.DataFrame:
+    if not keys:
+        return df
+    if "fecha_hora" in df.columns and (set(keys) & {"fecha", "hora"} or "periodo" not in df.columns):
+        ts = pd.to_datetime(df["fecha_hora"], format="ISO8601", errors="coerce")
+        derived = {"anio": ts.dt.year, "mes": ts.dt.month, "fecha": ts.dt.date.astype(str), "hora": ts.dt.hour}
+    else:
+        periodo = pd.to_numeric(df["periodo"], errors="coerce")
+        derived = {"anio": periodo // 100, "mes": periodo % 100}
+    return df.assign(**{k: derived[k] for k in keys})
+
+
+class ChunkedAggregator:
+    """Agregados parciales combinables por grupo.
+
+    ``update`` incorpora un bloque y ``merge`` otro agregador con las mismas
+    claves; ``result`` entrega una fila por grupo.
+    """
+
+    def __init__(self, by: Sequence[str], value: str = "energia_mwh", quantiles: Sequence[float] = (), alpha: float = 0.01) -> None:
+        self.by = list(by)
+        self.value = value
+        self.quantiles = [float(q) for q in quantiles]
+        self.alpha = alpha
+        self._log_gamma = math.log((1 + alpha) / (1 - alpha))
+        self.rows = 0
+        self._stats: pd.DataFrame | None = None
+        self._sketch: pd.Series | None = None
+
+    # -- sketch -------------------------------------------------------
+    def _bucket(self, values: np.ndarray) -> np.ndarray:
+        mag = np.abs(values)
+        idx = np.ceil(np.log(np.where(mag > _ZERO, mag, 1.0)) / self._log_gamma).astype(np.int64) + _BUCKET_OFFSET
+        return np.where(mag > _ZERO, np.sign(values).astype(np.int64) * idx, 0)
+
+    def _bucket_value(self, codes: np.ndarray) -> np.ndarray:
+        gamma = math.exp(self._log_gamma)
+        idx = np.abs(codes) - _BUCKET_OFFSET
+        rep = 2 * np.power(gamma, idx.astype(float)) / (gamma + 1)
+        return np.where(codes == 0, 0.0, np.sign(codes) * rep)
+
+    # -- acumulación --------------------------------------------------
+    def update(self, chunk: pd.DataFrame) -> "ChunkedAggregator":
+        values = pd.to_numeric(chunk[self.value], errors="coerce")
+        frame = chunk[self.by].assign(**{self.value: values}).dropna(subset=[self.value])
+        if frame.empty:
+            return self
+        self.rows += len(frame)
+        grouped = frame.groupby(self.by, dropna=False, sort=False)[self.value]
+        stats = grouped.agg(["sum", "count", "min", "max"])
+        sketch = None
+        if self.quantiles:
+            frame = frame.assign(_bucket=self._bucket(frame[self.value].to_numpy(dtype=float)))
+            sketch = frame.groupby([*self.by, "_bucket"], dropna=False, sort=False).size()
+        self._combine(stats, sketch)
+        return self
+
+    def merge(self, other: "ChunkedAggregator") -> "ChunkedAggregator":
+        if other.by != self.by or other.value != self.value:
+            raise ValueError("Solo se combinan agregadores con las mismas claves y medida")
+        if other._stats is not None:
+            self.rows += other.rows
+            self._combine(other._stats, other._sketch)
+        return self
+
+    def _combine(self, stats: pd.DataFrame, sketch: pd.Series | None) -> None:
+        if self._stats is None:
+            self._stats, self._sketch = stats, sketch
+            return
+        levels = list(range(len(self.by)))
+        self._stats = pd.concat([self._stats, stats]).groupby(level=levels, dropna=False, sort=False).agg(
+            {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+        )
+        if sketch is not None and self._sketch is not None:
+            self._sketch = pd.concat([self._sketch, sketch]).groupby(level=list(range(len(self.by) + 1)), dropna=False, sort=False).sum()
+
+    # -- resultado ----------------------------------------------------
+    def _quantile_frame(self) -> pd.DataFrame:
+        counts = self._sketch.rename("n").reset_index()
+        counts["_v"] = self._bucket_value(counts["_bucket"].to_numpy())
+        counts = counts.sort_values([*self.by, "_v"], kind="stable", ignore_index=True)
+        grouped = counts.groupby(self.by, dropna=False, sort=False)["n"]
+        cum, total = grouped.cumsum(), grouped.transform("sum")
+        out = []
+        for q in self.quantiles:
+            # rango más cercano: primer bucket cuyo acumulado supera round(q·(n-1))
+            hit = counts[cum > np.floor(q * (total - 1) + 0.5)].groupby(self.by, dropna=False, sort=False)["_v"].first()
+            out.append(hit.rename(f"{self.value}_p{q * 100:g}"))
+        return pd.concat(out, axis=1)
+
+    def result(self, metrics: Sequence[str] = METRICS) -> pd.DataFrame:
+        """Una fila por grupo con ``<value>_<métrica>`` y ``<value>_p<q>``."""
+
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Métricas no soportadas: {sorted(unknown)}")
+        columns = [f"{self.value}_{m}" for m in metrics] + [f"{self.value}_p{q * 100:g}" for q in self.quantiles]
+        if self._stats is None:
+            return pd.DataFrame(columns=[*self.by, *columns])
+        stats = self._stats.assign(mean=self._stats["sum"] / self._stats["count"])
+        out = stats[list(metrics)].add_prefix(f"{self.value}_")
+        if self.quantiles:
+            quant = self._quantile_frame()
+            quant.index = quant.index.set_names(out.index.names)
+            # el sketch es aproximado: se acota al mínimo y máximo exactos
+            out = out.join(quant.clip(lower=stats["min"], upper=stats["max"], axis=0))
+        out = out.reset_index()
+        return out.sort_values(self.by, ignore_index=True, na_position="last")[[*self.by, *columns]]
+
+
+def aggregate_15min(
+    by: Sequence[str],
+    value: str = "energia_mwh",
+    metrics: Sequence[str] = METRICS,
+    quantiles: Sequence[float] = (),
+    mart: Path | None = None,
+    start: str | None = None,
+    end: str | None = None,
+    periods: Iterable[str] | None = None,
+    chunksize: int | None = None,
+    alpha: float = 0.01,
+) -> pd.DataFrame:
+    """Agregar ``value`` por ``by`` sobre todas (o algunas) particiones 15 min.
+
+    Ejemplo: factor de planta anual por central con
+    ``aggregate_15min(["central_id", "anio"], metrics=["sum", "count"])``.
+    """
+
+    agg = ChunkedAggregator(by, value=value, quantiles=quantiles, alpha=alpha)
+    partitions = 0
+    for chunk in iter_15min(by, value, mart=mart, start=start, end=end, periods=periods, chunksize=chunksize):
+        agg.update(chunk)
+        partitions += 1
+    logger.info("Agregación 15min: %s bloques, %s filas, por %s", partitions, agg.rows, ",".join(by))
+    return agg.result(metrics)
+
+
+def _csv_list(text: str | None) -> List[str]:
+    return [t.strip() for t in (text or "").split(",") if t.strip()]
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m etl aggregate", description="Agregación por bloques de las particiones 15 min")
+    parser.add_argument("--by", required=True, help="Claves separadas por coma (columnas o anio,mes,fecha,hora)")
+    parser.add_argument("--value", default="energia_mwh", help="Columna a agregar")
+    parser.add_argument("--metrics", default="sum,count,min,max,mean", help=f"Subconjunto de {','.join(METRICS)}")
+    parser.add_argument("--quantiles", help="Cuantiles aproximados, p. ej. 0.5,0.95")
+    parser.add_argument("--start", help="Periodo inicial YYYYMM")
+    parser.add_argument("--end", help="Periodo final YYYYMM")
+    parser.add_argument("--chunksize", type=int, help="Filas por bloque dentro de cada partición")
+    parser.add_argument("--mart", help="Directorio data_mart (default: paths.output)")
+    parser.add_argument("--output", help="Escribir el resultado a CSV en vez de imprimirlo")
+    args = parser.parse_args(argv)
+
+    result = aggregate_15min(
+        _csv_list(args.by),
+        value=args.value,
+        metrics=_csv_list(args.metrics),
+        quantiles=[float(q) for q in _csv_list(args.quantiles)],
+        mart=Path(args.mart) if args.mart else None,
+        start=args.start,
+        end=args.end,
+        chunksize=args.chunksize,
+    )
+    if args.output:
+        result.to_csv(args.output, index=False)
+        print(f"{len(result)} filas escritas en {args.output}")
+    else:
+        print(result.to_string(index=False))
+
+
+__all__ = [
+    "ChunkedAggregator",
+    "METRICS",
+    "aggregate_15min",
+    "iter_15min",
+    "list_partitions",
+    "main",
+]
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""Punto de entrada de línea de comandos del ETL.
+
+Sin subcomando ejecuta el ETL completo (``etl.run_etl``). Los subcomandos
+despachan al ``main(argv)`` del módulo correspondiente::
+
+    python -m etl --strict
+    python -m etl backfill-represas --archive ruta/a/reportes
+    python -m etl perf --last 20
+    python -m etl aggregate --by central_id,anio --quantiles 0.95
+    python -m etl watch --debounce 60
+    python -m etl snapshots --rollback
+    python -m etl export --format arrow --start 202401 --end 202412 -o g.arrows
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from typing import Dict, List
+
+# subcomando -> módulo que expone main(argv)
+COMMANDS: Dict[str, str] = {
+    "backfill-represas": "etl.represas_historico",
+    "perf": "etl.perf",
+    "aggregate": "etl.aggregate",
+    "watch": "etl.watch",
+    "snapshots": "etl.publish",
+    "export": "etl.export",
+}
+
+
+def main(argv: List[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else list(argv)
+    if args and args[0] in COMMANDS:
+        module = importlib.import_module(COMMANDS[args[0]])
+        module.main(args[1:])
+        return
+
+    from etl.run_etl import main as run_etl_main
+
+    run_etl_main()
+
+
+__all__ = ["COMMANDS", "main"]
@@ -52,6 +52,7 @@ DEFAULT_CONFIG: Dict[str, Any] = {
         },
         "hidrologia_represas": {
             "pattern": "BDREPRESAS.xlsx",
+            "archive_pattern": "BDREPRESAS",
             "sheet": "INFORMEDIARIO",
             "required": True,
         },
@@ -78,6 +79,57 @@ DEFAULT_CONFIG: Dict[str, Any] = {
             "required": False,
         },
     },
+    "io": {
+        "excel_engine": "auto",
+        "max_workers": 4,
+        "parse_cache": True,
+    },
+    "perf": {
+        "regression_factor": 1.5,
+        "window": 10,
+        "min_history": 3,
+    },
+    "watch": {
+        "interval_s": 5,
+        "debounce_s": 30,
+    },
+    "publish": {
+        "snapshots": True,
+        "keep": 5,
+        "staging_max_age_h": 24,
+    },
+    "anomalias": {
+        "ventana": 17,
+        "z_max": 5.0,
+        "mad_min_mwh": 0.001,
+        "plano_min_intervalos": 8,
+    },
+    "reconciliacion": {
+        "tolerancia_pct": 1.0,
+        "tolerancia_mwh": 1.0,
+        "cobertura_min": 0.99,
+    },
+    "compromisos": {
+        "desde": 202501,
+        "hasta": 203612,
+    },
+    "hidro_metricas": {
+        # código de hidro_volumen_mensual -> reservorio de represas_diario (capacidad útil)
+        "reservorios": {
+            "AB": "Aguada Blanca",
+            "BA": "Bamputañe",
+            "CH": "Chalhuanca",
+            "EF": "El Frayle",
+            "EP": "El Pañe",
+            "PI": "Pillones",
+            "TOTAL": "Total",
+        },
+    },
+    "pronostico": {
+        "horizonte_meses": 12,
+        "historia_meses": 120,
+        "volumen_serie": "TOTAL",
+    },
     "tables": {
         "ventas_mensual_mwh": {
             "required_columns": ["cliente"],
@@ -188,7 +240,7 @@ def apply_runtime_overrides(
     - `paths_override`: dict opcional con keys input/output/reference/logs/reports.
     """
 
-    global CONFIG, PATHS, DATA_LANDING, DATA_REFERENCE, DATA_MART, LOGS_DIR, REPORTS_DIR, LANDING_FILES
+    global CONFIG, PATHS, DATA_LANDING, DATA_REFERENCE, DATA_MART, LOGS_DIR, REPORTS_DIR, LANDING_FILES, LOG_FILE
 
     # reset cache y recargar
     global _CONFIG_CACHE
@@ -211,12 +263,18 @@ def apply_runtime_overrides(
     DATA_MART = PATHS["output"]
     LOGS_DIR = PATHS["logs"]
     REPORTS_DIR = PATHS["reports"]
+    LOG_FILE = LOGS_DIR / "etl.log"
 
     LANDING_FILES = _landing_files_from_config(CONFIG)
 
-    # Propagar overrides a módulos ya importados
+    _propagate()
+
+
+def _propagate() -> None:
+    """Propagar rutas a los módulos ya importados (importan las constantes por valor)."""
+
     try:
-        from etl.pipelines import produccion, hidrologia, facturacion, contratos, balance_energia
+        from etl.pipelines import _common, produccion, hidrologia, facturacion, contratos, balance_energia, rollups, indicadores, star_schema, anomalias, cobertura, reconciliacion, compromisos, hidro_metricas, pronostico
 
         produccion.DATA_LANDING = DATA_LANDING
         produccion.DATA_REFERENCE = DATA_REFERENCE
@@ -238,10 +296,50 @@ def apply_runtime_overrides(
         balance_energia.DATA_LANDING = DATA_LANDING
         balance_energia.DATA_MART = DATA_MART
         balance_energia.LANDING_FILES = LANDING_FILES
+
+        _common.DATA_MART = DATA_MART
+        _common.DATA_REFERENCE = DATA_REFERENCE
+
+        rollups.DATA_MART = DATA_MART
+
+        anomalias.DATA_MART = DATA_MART
+        cobertura.DATA_MART = DATA_MART
+
+        reconciliacion.DATA_MART = DATA_MART
+        reconciliacion.DATA_REFERENCE = DATA_REFERENCE
+
+        compromisos.DATA_MART = DATA_MART
+
+        hidro_metricas.DATA_MART = DATA_MART
+
+        pronostico.DATA_MART = DATA_MART
+        pronostico.DATA_REFERENCE = DATA_REFERENCE
+
+        indicadores.DATA_MART = DATA_MART
+        indicadores.DATA_REFERENCE = DATA_REFERENCE
+
+        star_schema.DATA_MART = DATA_MART
+        star_schema.DATA_REFERENCE = DATA_REFERENCE
+
+        from etl import utils_io
+
+        utils_io.LOGS_DIR = LOGS_DIR
+        utils_io.REPORTS_DIR = REPORTS_DIR
     except Exception:
         pass
 
 
+def use_output_dir(path: Path) -> None:
+    """Dirigir las escrituras del ETL a ``path`` (staging de :mod:`etl.publish`).
+
+    ``PATHS["output"]`` no cambia: sigue siendo la raíz publicada del mart.
+    """
+
+    global DATA_MART
+    DATA_MART = path
+    _propagate()
+
+
 # Config cargada (paths y tablas se exponen como constantes legadas)
 CONFIG: Dict[str, Any] = load_config()
 
@@ -271,15 +369,26 @@ LANDING_FILES: Dict[str, str] = _landing_files_from_config(CONFIG)
 OUTPUT_FILES: Dict[str, str] = {
     "generacion_mensual": "generacion_mensual.csv",
     "generacion_15min_template": "generacion_15min_{yyyymm}.csv",
+    "generacion_15min_mensual": "generacion_15min_mensual.csv",
+    "indicadores_15min_diario": "indicadores_15min_diario.csv",
+    "indicadores_15min_mensual": "indicadores_15min_mensual.csv",
+    "anomalias_15min": "anomalias_15min.csv",
+    "cobertura_15min": "cobertura_15min.csv",
+    "reconciliacion_mensual": "reconciliacion_mensual.csv",
     "hidro_volumen_mensual": "hidro_volumen_mensual.csv",
     "hidro_caudal_mensual": "hidro_caudal_mensual.csv",
     "represas_diario": "represas_diario.csv",
+    "represas_historico_template": "represas_historico/represas_diario_{yyyy}.csv",
     "ventas_mensual_mwh": "ventas_mensual_mwh.csv",
     "ventas_mensual_soles": "ventas_mensual_soles.csv",
     "ingresos_mensual": "ingresos_mensual.csv",
     "precio_medio_mensual": "precio_medio_mensual.csv",
     "contratos_base": "contratos_base.csv",
     "contratos_riesgo": "contratos_riesgo.csv",
+    "contratos_compromiso_mensual": "contratos_compromiso_mensual.csv",
+    "hidro_metricas_mensual": "hidro_metricas_mensual.csv",
+    "pronostico_parametros": "pronostico_parametros.csv",
+    "pronostico_generacion_mensual": "pronostico_generacion_mensual.csv",
     "balance_perfil_mensual": "balance_perfil_mensual.csv",
     "balance_r_mensual": "balance_r_mensual.csv",
 }
@@ -299,6 +408,49 @@ def get_source(name: str) -> Dict[str, Any]:
     return CONFIG.get("sources", {}).get(name, {})
 
 
+def io_settings() -> Dict[str, Any]:
+    return CONFIG.get("io", {})
+
+
+def perf_settings() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG["perf"], **CONFIG.get("perf", {})}
+
+
+def watch_settings() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG["watch"], **CONFIG.get("watch", {})}
+
+
+def publish_settings() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG["publish"], **CONFIG.get("publish", {})}
+
+
+def anomaly_settings() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG["anomalias"], **CONFIG.get("anomalias", {})}
+
+
+def reconciliation_settings() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG["reconciliacion"], **CONFIG.get("reconciliacion", {})}
+
+
+def commitment_settings() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG["compromisos"], **CONFIG.get("compromisos", {})}
+
+
+def hydrology_metrics_settings() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG["hidro_metricas"], **CONFIG.get("hidro_metricas", {})}
+
+
+def forecast_settings() -> Dict[str, Any]:
+    return {**DEFAULT_CONFIG["pronostico"], **CONFIG.get("pronostico", {})}
+
+
+def cache_dir() -> Path:
+    """Carpeta del cache de parseo (``paths.cache`` o ``<output>/.cache``)."""
+
+    custom = CONFIG.get("paths", {}).get("cache")
+    return BASE_DIR / custom if custom else PATHS["output"] / ".cache"
+
+
 def table_rules(name: str) -> Dict[str, Any]:
     return CONFIG.get("tables", {}).get(name, {})
 
@@ -317,6 +469,17 @@ __all__ = [
     "LOG_FILE",
     "ensure_directories",
     "get_source",
+    "io_settings",
+    "perf_settings",
+    "watch_settings",
+    "publish_settings",
+    "anomaly_settings",
+    "reconciliation_settings",
+    "commitment_settings",
+    "hydrology_metrics_settings",
+    "forecast_settings",
+    "use_output_dir",
+    "cache_dir",
     "table_rules",
     "load_config",
     "apply_runtime_overrides",
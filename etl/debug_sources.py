@@ -16,7 +16,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from etl import config
-from etl.utils_io import detect_header_row
+from etl.utils_io import detect_header_row, excel_engine, excel_file, open_sheet_stream, read_excel
 
 logging.basicConfig(
     level=logging.INFO,
@@ -38,7 +38,7 @@ def _print_header_row(df_preview: pd.DataFrame, keywords: List[str]) -> None:
 
 def check_historico(path: Path) -> None:
     logger.info("== Histórico 2010 ==")
-    preview = pd.read_excel(path, sheet_name="2010", header=None)
+    preview = read_excel(path, sheet_name="2010", header=None)
     logger.info("Shape hoja 2010: %s", preview.shape)
     _print_header_row(preview.head(40), ["central", "enero", "diciembre"])
     match_rows = preview.apply(
@@ -51,24 +51,34 @@ def check_historico(path: Path) -> None:
 
 def check_15min(path: Path) -> None:
     logger.info("== Producción 15-min ==")
-    df = pd.read_excel(path, header=None)
-    logger.info("Shape: %s", df.shape)
-    a1 = df.iat[0, 0] if not df.empty else None
+    # Lectura streaming: no carga el libro completo para el diagnóstico.
+    n_rows = 0
+    width = 0
+    a1 = None
+    header_like: List[tuple] = []
+    with open_sheet_stream(path) as ws:
+        for idx, row in enumerate(ws.iter_rows(values_only=True)):
+            if idx == 0 and row:
+                a1 = row[0]
+            n_rows += 1
+            width = max(width, len(row))
+            if len(header_like) < 5 and any(str(v).upper().startswith("FECHA") for v in row if v is not None):
+                header_like.append((idx, list(row)))
+    logger.info("Shape: %s", (n_rows, width))
     logger.info("Celda A1: %s", a1)
-    header_like = df[df.apply(lambda r: any(str(v).upper().startswith("FECHA") for v in r), axis=1)]
-    logger.info("Filas con FECHA/HORA (primeras 5):\n%s", header_like.head())
+    logger.info("Filas con FECHA/HORA (primeras 5):\n%s", "\n".join(f"{i}: {r}" for i, r in header_like))
 
 
 def check_control_hidrologico(path: Path) -> None:
     logger.info("== Control Hidrológico ==")
-    xls = pd.ExcelFile(path)
+    xls = excel_file(path)
     logger.info("Hojas: %s", xls.sheet_names)
 
     for hoja in ["CH", "CAUDAL"]:
         if hoja not in xls.sheet_names:
             logger.warning("Hoja %s no encontrada", hoja)
             continue
-        df = pd.read_excel(path, sheet_name=hoja, header=None)
+        df = read_excel(xls, sheet_name=hoja, header=None)
         logger.info("Hoja %s shape: %s", hoja, df.shape)
         header_rows = df[df.apply(lambda r: "AÑO" in [str(v).upper() for v in r], axis=1)]
         if not header_rows.empty:
@@ -80,10 +90,10 @@ def check_control_hidrologico(path: Path) -> None:
 
 def check_bd_represas(path: Path) -> None:
     logger.info("== BDREPRESAS ==")
-    xls = pd.ExcelFile(path)
+    xls = excel_file(path)
     logger.info("Hojas: %s", xls.sheet_names)
     if "INFORMEDIARIO" in xls.sheet_names:
-        df = pd.read_excel(path, sheet_name="INFORMEDIARIO", header=None)
+        df = read_excel(xls, sheet_name="INFORMEDIARIO", header=None)
         logger.info("Hoja INFORMEDIARIO shape: %s", df.shape)
     else:
         logger.warning("Hoja INFORMEDIARIO no encontrada")
@@ -91,10 +101,10 @@ def check_bd_represas(path: Path) -> None:
 
 def check_facturacion(path: Path) -> None:
     logger.info("== Facturación ==")
-    xls = pd.ExcelFile(path)
+    xls = excel_file(path)
     logger.info("Hojas: %s", xls.sheet_names)
     if "VENTAS (MWh)" in xls.sheet_names:
-        df = pd.read_excel(path, sheet_name="VENTAS (MWh)", header=None)
+        df = read_excel(xls, sheet_name="VENTAS (MWh)", header=None)
         logger.info("VENTAS (MWh) shape: %s", df.shape)
         _print_header_row(df.head(20), ["cliente", "enero"])
     else:
@@ -103,6 +113,7 @@ def check_facturacion(path: Path) -> None:
 
 def main() -> None:
     landing = config.DATA_LANDING
+    logger.info("Motor Excel: %s", excel_engine())
     expected = [
         landing / "PRODUCCION EGASA DESDE 2010 (NOV2025).xlsx",
         landing / "PRODUCCIÓN DE ENERGÍA_ENERO 2025.xlsx",
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+
+"""Exportación de ventanas 15 min como stream Arrow IPC.
+
+Las particiones ``generacion_15min_YYYYMM`` de la ventana se leen de a una y
+en bloques de ``chunksize`` filas. Cada bloque se filtra por central, unidad y
+rango de tiempo y se escribe de inmediato como un record batch: el productor
+no tiene más de un bloque en memoria y el consumidor carga el resultado sin
+parsear con ``pyarrow.ipc.open_stream(path).read_pandas()``::
+
+    python -m etl export --format arrow --start 202401 --end 202412 --central CH1 -o ch1_2024.arrows
+    python -m etl export --format arrow --start 2025-01-15 --end "2025-01-16 06:00" --unidad G1,G2 -o - > g.arrows
+
+Desde Python::
+
+    from etl.export import export_15min
+    export_15min("ch1.arrows", start="202401", end="202412", centrales=["CH1"])
+
+``start`` es inclusivo y ``end`` exclusivo, salvo cuando ``end`` es un mes
+(``YYYYMM``), un año o una fecha sin hora: en ese caso incluye el periodo
+completo. ``centrales`` compara contra ``central_id`` o ``central``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from etl import config
+from etl.aggregate import list_partitions
+from etl.schemas import dtype_policy
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("arrow", "csv")
+DEFAULT_CHUNKSIZE = 200_000
+
+
+def parse_bound(value: str | None, end: bool = False) -> pd.Timestamp | None:
+    """``YYYYMM``, ``YYYY``, fecha o fecha-hora -> instante (``end`` exclusivo)."""
+
+    if not value:
+        return None
+    text = str(value).strip()
+    if re.fullmatch(r"\d{6}", text):
+        ts = pd.Timestamp(year=int(text[:4]), month=int(text[4:]), day=1)
+        return ts + pd.DateOffset(months=1) if end else ts
+    if re.fullmatch(r"\d{4}", text):
+        ts = pd.Timestamp(year=int(text), month=1, day=1)
+        return ts + pd.DateOffset(years=1) if end else ts
+    ts = pd.Timestamp(text)
+    if end and re.fullmatch(r"\d{4}-\d{2}-\d{2}", text):
+        ts += pd.Timedelta(days=1)
+    return ts
+
+
+def _months(start: pd.Timestamp | None, end: pd.Timestamp | None) -> tuple:
+    last = (end - pd.Timedelta(microseconds=1)) if end is not None else None
+    return (start.strftime("%Y%m") if start is not None else None, last.strftime("%Y%m") if last is not None else None)
+
+
+def _matches(df: pd.DataFrame, columns: Sequence[str], values: Iterable[str]) -> pd.Series:
+    wanted = {str(v) for v in values}
+    mask = pd.Series(False, index=df.index)
+    for col in columns:
+        if col in df.columns:
+            mask |= df[col].astype(str).isin(wanted)
+    return mask
+
+
+def iter_window(
+    start: str | None = None,
+    end: str | None = None,
+    centrales: Sequence[str] | None = None,
+    unidades: Sequence[str] | None = None,
+    columns: Sequence[str] | None = None,
+    mart: Path | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """Bloques filtrados de la ventana, partición por partición (lectura perezosa)."""
+
+    t0, t1 = parse_bound(start), parse_bound(end, end=True)
+    first, last = _months(t0, t1)
+    categories = {col: "category" for col, dtype in dtype_policy("generacion_15min").items() if dtype == "category"}
+    for path in list_partitions(mart, first, last):
+        header = pd.read_csv(path, nrows=0).columns
+        filters = {"fecha_hora", *(["central_id", "central"] if centrales else []), *(["unidad"] if unidades else [])}
+        usecols = [c for c in header if columns is None or c in columns or c in filters]
+        reader = pd.read_csv(path, usecols=usecols, dtype={c: t for c, t in categories.items() if c in usecols}, chunksize=chunksize, low_memory=False)
+        for chunk in reader:
+            chunk["fecha_hora"] = pd.to_datetime(chunk["fecha_hora"], format="ISO8601", errors="coerce")
+            mask = chunk["fecha_hora"].notna()
+            if t0 is not None:
+                mask &= chunk["fecha_hora"] >= t0
+            if t1 is not None:
+                mask &= chunk["fecha_hora"] < t1
+            if centrales:
+                mask &= _matches(chunk, ["central_id", "central"], centrales)
+            if unidades:
+                mask &= _matches(chunk, ["unidad"], unidades)
+            chunk = chunk[mask]
+            if columns is not None:
+                chunk = chunk[[c for c in columns if c in chunk.columns]]
+            if not chunk.empty:
+                yield chunk
+
+
+def arrow_schema(df: pd.DataFrame, dataset: str = "generacion_15min") -> pa.Schema:
+    """Esquema fijo del stream: columnas de ``df`` y tipos de ``dtype_policy(dataset)``.
+
+    Los tipos no se infieren de los valores del bloque: una columna toda vacía en
+    el primer bloque (p. ej. ``unidad``) quedaría como ``null`` y los bloques
+    siguientes fallarían con ``ArrowInvalid``. Las categorías van como
+    diccionario de strings con índices ``int32`` (sus códigos cambian entre
+    bloques), las medidas como ``float64`` y ``fecha_hora`` como timestamp. Una
+    columna fuera de la política toma el tipo de su dtype (``object`` -> string).
+    """
+
+    import pyarrow as pa
+
+    policy = dtype_policy(dataset)
+    fields = []
+    for name, dtype in df.dtypes.items():
+        wanted = policy.get(name) or ("category" if isinstance(dtype, pd.CategoricalDtype) else "")
+        if name == "fecha_hora" or pd.api.types.is_datetime64_any_dtype(dtype):
+            typ = pa.timestamp("ns")
+        elif wanted == "category":
+            typ = pa.dictionary(pa.int32(), pa.string())
+        elif wanted.startswith("float"):
+            typ = pa.float64()
+        elif wanted:
+            typ = pa.from_numpy_dtype(np.dtype(wanted))
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            typ = pa.string()
+        else:
+            typ = pa.from_numpy_dtype(getattr(dtype, "numpy_dtype", dtype))
+        fields.append(pa.field(name, typ))
+    return pa.schema(fields)
+
+
+class _Drain:
+    """Destino de escritura que entrega lo acumulado en cada :meth:`take`."""
+
+    closed = False
+
+    def __init__(self) -> None:
+        self._parts: List[bytes] = []
+        self._pos = 0
+
+    def write(self, data: Any) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def writable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        out, self._parts = b"".join(self._parts), []
+        return out
+
+
+def iter_arrow_stream(frames: Iterable[pd.DataFrame], dataset: str = "generacion_15min") -> Iterator[bytes]:
+    """Stream IPC de Arrow: un record batch por bloque, entregado apenas se escribe.
+
+    El esquema sale de las columnas del primer bloque (ver :func:`arrow_schema`);
+    los bloques siguientes se alinean a esas columnas. Una ventana vacía produce
+    un stream válido sin columnas ni batches.
+    Requiere el extra ``arrow`` (``pyarrow``).
+    """
+
+    import pyarrow as pa
+
+    sink = _Drain()
+    writer = None
+    for df in frames:
+        if writer is None:
+            schema = arrow_schema(df, dataset)
+            writer = pa.ipc.new_stream(sink, schema)
+        elif list(df.columns) != schema.names:
+            df = df.reindex(columns=schema.names)
+        writer.write_batch(pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False))
+        yield sink.take()
+    if writer is None:
+        writer = pa.ipc.new_stream(sink, pa.schema([]))
+    writer.close()
+    yield sink.take()
+
+
+def write_arrow_stream(frames: Iterable[pd.DataFrame], sink: BinaryIO) -> int:
+    """Escribir los bloques en ``sink`` como stream IPC; devuelve las filas escritas."""
+
+    rows = 0
+
+    def counted() -> Iterator[pd.DataFrame]:
+        nonlocal rows
+        for df in frames:
+            rows += len(df)
+            yield df
+
+    for data in iter_arrow_stream(counted()):
+        sink.write(data)
+    return rows
+
+
+def export_15min(
+    output: str | Path | BinaryIO,
+    start: str | None = None,
+    end: str | None = None,
+    centrales: Sequence[str] | None = None,
+    unidades: Sequence[str] | None = None,
+    columns: Sequence[str] | None = None,
+    fmt: str = "arrow",
+    mart: Path | None = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Dict[str, Any]:
+    """Exportar una ventana 15 min a ``output`` (ruta o archivo binario abierto)."""
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato inválido: {fmt!r} (opciones: {', '.join(FORMATS)})")
+    if fmt == "arrow":
+        import pyarrow  # noqa: F401 - falla antes de crear ``output`` si falta el extra
+    frames = iter_window(start, end, centrales, unidades, columns, mart, chunksize)
+    t0 = time.perf_counter()
+    owns = not hasattr(output, "write")
+    fh = open(output, "wb") if owns else output  # noqa: SIM115 - se cierra abajo
+    try:
+        if fmt == "arrow":
+            rows = write_arrow_stream(frames, fh)
+        else:
+            rows = 0
+            for i, df in enumerate(frames):
+                fh.write(df.to_csv(index=False, header=i == 0).encode("utf-8"))
+                rows += len(df)
+    finally:
+        if owns:
+            fh.close()
+    stats = {"rows": rows, "format": fmt, "duration_ms": round((time.perf_counter() - t0) * 1000, 1)}
+    logger.info("Exportadas %s filas 15 min (%s) en %.0f ms", rows, fmt, stats["duration_ms"])
+    return stats
+
+
+def _csv_list(value: str | None) -> List[str] | None:
+    return [v.strip() for v in value.split(",") if v.strip()] if value else None
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m etl export", description="Exportar una ventana de generación 15 min")
+    parser.add_argument("--format", choices=FORMATS, default="arrow", help="arrow (stream IPC, default) o csv")
+    parser.add_argument("--start", help="Inicio: YYYYMM, YYYY, fecha o fecha-hora (inclusivo)")
+    parser.add_argument("--end", help="Fin: YYYYMM, YYYY o fecha (incluye el periodo) o fecha-hora (exclusivo)")
+    parser.add_argument("--central", help="central_id o nombre de central, separados por coma")
+    parser.add_argument("--unidad", help="Unidades separadas por coma")
+    parser.add_argument("--columns", help="Columnas a exportar, separadas por coma (default: todas)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="Filas por record batch")
+    parser.add_argument("--mart", help="Directorio data_mart (default: snapshot publicada de paths.output)")
+    parser.add_argument("--config", help="Ruta alternativa a config.yml|toml")
+    parser.add_argument("-o", "--output", required=True, help="Archivo de salida ('-' para stdout)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s - %(message)s", stream=sys.stderr)
+    config.apply_runtime_overrides(config_path=Path(args.config) if args.config else None)
+    export_15min(
+        sys.stdout.buffer if args.output == "-" else Path(args.output),
+        start=args.start,
+        end=args.end,
+        centrales=_csv_list(args.central),
+        unidades=_csv_list(args.unidad),
+        columns=_csv_list(args.columns),
+        fmt=args.format,
+        mart=Path(args.mart) if args.mart else None,
+        chunksize=args.chunksize,
+    )
+
+
+__all__ = [
+    "arrow_schema",
+    "export_15min",
+    "iter_arrow_stream",
+    "iter_window",
+    "main",
+    "parse_bound",
+    "write_arrow_stream",
+]
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""Índice de intervalos sobre la vigencia de los contratos.
+
+``ContractIndex`` se construye una vez con los contratos limpios
+(``clean_contracts``) y responde sin recorrer la tabla:
+
+- ``active_at(fecha)``: contratos vigentes ese día;
+- ``overlapping(inicio, fin)``: contratos cuya vigencia toca la ventana;
+- ``sum_power(ventana)``: MW de los contratos que tocan la ventana.
+
+Guarda las fechas de inicio y de fin ordenadas por separado, cada una con la
+suma acumulada de potencia. Un contrato toca ``[a, b]`` si ``inicio <= b`` y
+``fin >= a``; como todo contrato con ``fin < a`` también cumple
+``inicio <= b``, la potencia que toca la ventana es la acumulada de los
+inicios hasta ``b`` menos la de los fines antes de ``a``. Son dos búsquedas
+binarias por ventana, y ``sum_power`` acepta muchas ventanas a la vez.
+
+Las fechas se tratan por día y ``fecha_fin`` es inclusive. Lo usan la etapa
+``compromisos`` y la página Contratos (cacheado por ``load_contract_index``).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+CONTRACT_COLUMNS = ["origen", "cliente", "tipo_contrato", "fecha_inicio", "fecha_fin", "potencia_mw"]
+
+
+def clean_contracts(tables: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """Unir las tablas de contratos por ``origen`` y dejar solo vigencias y potencias válidas."""
+
+    frames = [df.assign(origen=origen) for origen, df in tables.items() if not df.empty]
+    if not frames:
+        return pd.DataFrame(columns=CONTRACT_COLUMNS)
+    out = pd.concat(frames, ignore_index=True).reindex(columns=CONTRACT_COLUMNS)
+    out["fecha_inicio"] = pd.to_datetime(out["fecha_inicio"], errors="coerce")
+    out["fecha_fin"] = pd.to_datetime(out["fecha_fin"], errors="coerce")
+    out["potencia_mw"] = pd.to_numeric(out["potencia_mw"], errors="coerce")
+    out = out.dropna(subset=["cliente", "fecha_inicio", "fecha_fin", "potencia_mw"])
+    out = out[out["fecha_fin"] >= out["fecha_inicio"]]
+    out[["cliente", "tipo_contrato"]] = out[["cliente", "tipo_contrato"]].astype(object).fillna("").astype(str).apply(lambda s: s.str.strip())
+    return out.reset_index(drop=True)
+
+
+def _days(value: Any) -> np.ndarray:
+    """Fecha(s) a ``datetime64[D]`` (siempre un arreglo)."""
+
+    return np.atleast_1d(pd.to_datetime(value).to_numpy()).astype("datetime64[D]")
+
+
+def _window(window: Any) -> Tuple[np.ndarray, np.ndarray]:
+    """Ventana ``(inicio, fin)`` inclusive desde un ``Period``, ``PeriodIndex``, tupla o fecha."""
+
+    if isinstance(window, (pd.Period, pd.PeriodIndex)):
+        return _days(window.start_time), _days(window.end_time)
+    if isinstance(window, tuple):
+        return _days(window[0]), _days(window[1])
+    return _days(window), _days(window)
+
+
+class ContractIndex:
+    """Inicios y fines ordenados, con potencia acumulada, sobre una tabla de contratos."""
+
+    def __init__(self, contracts: pd.DataFrame) -> None:
+        self.contracts = contracts.reset_index(drop=True)
+        self._inicio = _days(self.contracts["fecha_inicio"]) if len(self.contracts) else np.array([], dtype="datetime64[D]")
+        self._fin = _days(self.contracts["fecha_fin"]) if len(self.contracts) else np.array([], dtype="datetime64[D]")
+        potencia = self.contracts["potencia_mw"].to_numpy(dtype=float) if len(self.contracts) else np.array([])
+
+        self._by_start = np.argsort(self._inicio, kind="stable")
+        self._by_end = np.argsort(self._fin, kind="stable")
+        self._starts = self._inicio[self._by_start]
+        self._ends = self._fin[self._by_end]
+        self._power_starts = np.concatenate([[0.0], np.cumsum(potencia[self._by_start])])
+        self._power_ends = np.concatenate([[0.0], np.cumsum(potencia[self._by_end])])
+
+    @classmethod
+    def from_tables(cls, tables: Mapping[str, pd.DataFrame]) -> "ContractIndex":
+        return cls(clean_contracts(tables))
+
+    def __len__(self) -> int:
+        return len(self.contracts)
+
+    @property
+    def span(self) -> Tuple[pd.Timestamp, pd.Timestamp] | None:
+        """Primer inicio y último fin, o ``None`` sin contratos."""
+
+        if not len(self):
+            return None
+        return pd.Timestamp(self._starts[0]), pd.Timestamp(self._ends[-1])
+
+    def _bounds(self, start: np.ndarray, end: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # contratos con inicio <= end (prefijo de _by_start) y con fin < start (prefijo de _by_end)
+        return np.searchsorted(self._starts, end, side="right"), np.searchsorted(self._ends, start, side="left")
+
+    def overlapping(self, start: Any, end: Any) -> pd.DataFrame:
+        """Contratos cuya vigencia toca ``[start, end]`` (en el orden de la tabla)."""
+
+        a, b = _days(start)[0], _days(end)[0]
+        began, ended = (int(x[0]) for x in self._bounds(np.array([a]), np.array([b])))
+        # se filtra el lado con menos candidatos: los que ya empezaron o los que aún no terminan
+        if began <= len(self) - ended:
+            candidates = self._by_start[:began]
+            candidates = candidates[self._fin[candidates] >= a]
+        else:
+            candidates = self._by_end[ended:]
+            candidates = candidates[self._inicio[candidates] <= b]
+        return self.contracts.iloc[np.sort(candidates)]
+
+    def active_at(self, date: Any) -> pd.DataFrame:
+        """Contratos vigentes el día ``date``."""
+
+        return self.overlapping(date, date)
+
+    def sum_power(self, window: Any) -> float | np.ndarray:
+        """MW de los contratos que tocan la ventana (una fecha, tupla, ``Period`` o ``PeriodIndex``).
+
+        Con varias ventanas (``PeriodIndex`` o tupla de arreglos) devuelve un
+        arreglo con un total por ventana.
+        """
+
+        start, end = _window(window)
+        began, ended = self._bounds(start, end)
+        power = self._power_starts[began] - self._power_ends[ended]
+        return power if isinstance(window, pd.PeriodIndex) or len(power) > 1 else float(power[0])
+
+
+__all__ = ["CONTRACT_COLUMNS", "ContractIndex", "clean_contracts"]
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""Historial de rendimiento del ETL sobre ``logs/etl_runs.jsonl``.
+
+Cada corrida registra por etapa ``duration_ms``, ``input_bytes``,
+``rows_per_s`` y ``peak_rss_mb``. Una etapa se marca como regresión si su
+duración supera ``regression_factor`` × la mediana de las últimas ``window``
+corridas exitosas previas (sección ``perf`` de config.yml)::
+
+    python -m etl perf                      # últimas corridas + tendencias
+    python -m etl perf --factor 1.3 --last 30
+    python -m etl perf --fail-on-regression # exit 1 si la última corrida regresó
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from etl import config
+
+STAGE_COLUMNS = ["duration_ms", "files", "input_bytes", "rows_out", "rows_per_s", "peak_rss_mb"]
+
+
+def runs_log_path() -> Path:
+    return config.LOGS_DIR / "etl_runs.jsonl"
+
+
+def load_runs(path: Path | None = None) -> List[Dict[str, Any]]:
+    """Corridas registradas, en orden de escritura (líneas corruptas se ignoran)."""
+
+    path = path or runs_log_path()
+    if not path.exists():
+        return []
+    runs = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            runs.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return runs
+
+
+def stage_history(runs: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Una fila por corrida × etapa; las corridas sin ``stages`` (previas) se omiten."""
+
+    rows = [
+        {"run_id": run["run_id"], "started_at": run.get("started_at"), "status": run.get("status"), "stage": stage, **{c: stats.get(c) for c in STAGE_COLUMNS}}
+        for run in runs
+        for stage, stats in (run.get("stages") or {}).items()
+    ]
+    df = pd.DataFrame(rows, columns=["run_id", "started_at", "status", "stage", *STAGE_COLUMNS])
+    df["started_at"] = pd.to_datetime(df["started_at"], errors="coerce")
+    return df.sort_values(["started_at", "run_id"], kind="stable", ignore_index=True)
+
+
+def flag_regressions(history: pd.DataFrame, factor: float | None = None, window: int | None = None, min_history: int | None = None) -> pd.DataFrame:
+    """Agregar ``baseline_ms`` (mediana móvil previa), ``ratio`` y ``regression`` por etapa.
+
+    La línea base usa solo corridas exitosas anteriores (la propia corrida no
+    cuenta); con menos de ``min_history`` previas no se marca nada.
+    """
+
+    settings = config.perf_settings()
+    factor = settings["regression_factor"] if factor is None else factor
+    window = settings["window"] if window is None else window
+    min_history = settings["min_history"] if min_history is None else min_history
+
+    out = history.copy()
+    ok = out["duration_ms"].where(out["status"].eq("success"))
+    out["baseline_ms"] = ok.groupby(out["stage"]).transform(
+        lambda s: s.shift(1).rolling(window, min_periods=min_history).median()
+    )
+    out["ratio"] = out["duration_ms"] / out["baseline_ms"]
+    out["regression"] = out["ratio"].gt(factor).fillna(False)
+    return out
+
+
+def stage_trends(flagged: pd.DataFrame, window: int | None = None) -> pd.DataFrame:
+    """Por etapa: mediana reciente vs la ventana anterior, ms por MB y último estado."""
+
+    window = window or config.perf_settings()["window"]
+    rows = []
+    for stage, grp in flagged[flagged["status"].eq("success")].groupby("stage", sort=False):
+        recent, previous = grp.tail(window), grp.iloc[-2 * window : -window]
+        recent_ms = recent["duration_ms"].median()
+        previous_ms = previous["duration_ms"].median() if not previous.empty else None
+        mb = recent["input_bytes"].median() / 2**20
+        rows.append(
+            {
+                "stage": stage,
+                "runs": len(grp),
+                "median_ms": recent_ms,
+                "previous_ms": previous_ms,
+                "change_pct": (recent_ms / previous_ms - 1) * 100 if previous_ms else None,
+                "input_mb": mb,
+                "ms_per_mb": recent_ms / mb if mb else None,
+                "rows_per_s": recent["rows_per_s"].median(),
+                "peak_rss_mb": recent["peak_rss_mb"].max(),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _fmt(value: Any, spec: str) -> str:
+    return "-" if value is None or pd.isna(value) else format(value, spec)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m etl perf", description="Historial de rendimiento del ETL")
+    parser.add_argument("--log", help="Ruta a etl_runs.jsonl (default: logs/etl_runs.jsonl)")
+    parser.add_argument("--factor", type=float, help="Umbral sobre la mediana móvil (default: perf.regression_factor)")
+    parser.add_argument("--window", type=int, help="Corridas previas en la mediana (default: perf.window)")
+    parser.add_argument("--min-history", type=int, help="Corridas previas mínimas para evaluar (default: perf.min_history)")
+    parser.add_argument("--last", type=int, default=10, help="Corridas a listar")
+    parser.add_argument("--json", action="store_true", help="Imprimir el historial marcado como JSON")
+    parser.add_argument("--fail-on-regression", action="store_true", help="Salir con código 1 si la última corrida tiene regresiones")
+    args = parser.parse_args(argv)
+
+    history = stage_history(load_runs(Path(args.log) if args.log else None))
+    if history.empty:
+        print("Sin corridas con métricas por etapa en etl_runs.jsonl.")
+        return
+    flagged = flag_regressions(history, factor=args.factor, window=args.window, min_history=args.min_history)
+
+    if args.json:
+        print(flagged.to_json(orient="records", date_format="iso", force_ascii=False))
+    else:
+        last_runs = flagged["run_id"].drop_duplicates().tail(args.last)
+        table = flagged[flagged["run_id"].isin(last_runs)].pivot_table(index="run_id", columns="stage", values="duration_ms", sort=False)
+        print("Duración por etapa (s):")
+        print((table / 1000).round(2).to_string())
+        print()
+        print(f"{'etapa':<18}{'mediana s':>11}{'cambio':>9}{'MB':>9}{'ms/MB':>9}{'filas/s':>11}{'RSS MB':>9}")
+        for _, t in stage_trends(flagged, window=args.window).iterrows():
+            change = "-" if pd.isna(t["change_pct"]) else f"{t['change_pct']:+.0f}%"
+            print(
+                f"{t['stage']:<18}{_fmt(t['median_ms'] / 1000, '.2f'):>11}{change:>9}"
+                f"{_fmt(t['input_mb'], '.1f'):>9}{_fmt(t['ms_per_mb'], '.0f'):>9}{_fmt(t['rows_per_s'], ',.0f'):>11}{_fmt(t['peak_rss_mb'], '.0f'):>9}"
+            )
+        regressions = flagged[flagged["regression"] & flagged["run_id"].isin(last_runs)]
+        print()
+        for _, r in regressions.iterrows():
+            print(f"REGRESIÓN {r['run_id']} {r['stage']}: {r['duration_ms'] / 1000:.2f}s vs mediana {r['baseline_ms'] / 1000:.2f}s ({r['ratio']:.2f}x)")
+        if regressions.empty:
+            print("Sin regresiones en las corridas listadas.")
+
+    latest = flagged[flagged["run_id"].eq(flagged["run_id"].iloc[-1])]
+    if args.fail_on_regression and latest["regression"].any():
+        sys.exit(1)
+
+
+__all__ = [
+    "flag_regressions",
+    "load_runs",
+    "main",
+    "runs_log_path",
+    "stage_history",
+    "stage_trends",
+]
@@ -7,6 +7,13 @@ from .hidrologia import run_hidrologia
 from .facturacion import run_facturacion
 from .contratos import run_contratos
 from .balance_energia import run_balance_energia
+from .rollups import run_rollups
+from .indicadores import run_indicadores
+from .reconciliacion import run_reconciliacion
+from .compromisos import run_compromisos
+from .hidro_metricas import run_hidro_metricas
+from .pronostico import run_pronostico
+from .star_schema import run_star_schema
 
 __all__ = [
     "run_produccion",
@@ -14,4 +21,11 @@ __all__ = [
     "run_facturacion",
     "run_contratos",
     "run_balance_energia",
+    "run_rollups",
+    "run_indicadores",
+    "run_reconciliacion",
+    "run_compromisos",
+    "run_hidro_metricas",
+    "run_pronostico",
+    "run_star_schema",
 ]
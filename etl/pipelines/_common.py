@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+"""Lecturas compartidas por las etapas derivadas.
+
+Las etapas derivadas (reconciliación, compromisos, métricas hidrológicas,
+pronóstico) consumen tablas de etapas previas. Con ``--stages`` esas etapas
+pueden no haber corrido: la tabla se toma entonces del data mart.
+``DATA_MART`` y ``DATA_REFERENCE`` se reasignan desde
+:func:`etl.config._propagate`.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from ..config import DATA_MART, DATA_REFERENCE, OUTPUT_FILES
+
+Datasets = Dict[str, Tuple[pd.DataFrame, List[str]]]
+
+
+def mart_table(datasets: Datasets, name: str) -> pd.DataFrame:
+    """Tabla de la corrida o, si la etapa no corrió (``--stages``), la del data mart."""
+
+    if name in datasets:
+        return datasets[name][0]
+    path = DATA_MART / OUTPUT_FILES[name]
+    return pd.read_csv(path) if path.exists() else pd.DataFrame()
+
+
+def central_types() -> pd.Series:
+    """Tipo de cada central (``HIDRO``, ``TERMICA``, ...) indexado por ``central_id``."""
+
+    path = DATA_REFERENCE / "centrales_egasa.csv"
+    if not path.exists():
+        return pd.Series(dtype=object)
+    ref = pd.read_csv(path, dtype={"central_id": str})
+    return ref.set_index("central_id")["tipo"].astype(str).str.upper()
+
+
+__all__ = ["central_types", "mart_table"]
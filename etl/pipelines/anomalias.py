@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+
+"""Detección de anomalías en las series 15 min durante la ingesta.
+
+``_process_15min`` descarta negativos y vacíos sin avisar; medidores trabados,
+picos aislados o intervalos faltantes pasaban inadvertidos hasta verlos en un
+gráfico. :func:`detect_anomalies` revisa cada partición recién fusionada y
+devuelve un evento por fila con ``tipo``:
+
+- ``pico``: z-score robusto ``0.6745 · (x - mediana) / MAD`` sobre una ventana
+  centrada de ``ventana`` intervalos mayor que ``z_max``. Los intervalos
+  marcados consecutivos forman un solo evento; ``valor`` y ``referencia`` son
+  el dato y la mediana del intervalo con mayor ``score``.
+- ``plano``: el mismo valor distinto de cero repetido al menos
+  ``plano_min_intervalos`` veces seguidas (medidor trabado). Los ceros seguidos
+  son una unidad apagada y no cuentan.
+- ``hueco``: días con menos de los 96 intervalos esperados; ``intervalos`` son
+  los que faltan, ``valor`` los presentes y ``referencia`` los esperados. Los
+  negativos y vacíos descartados por el parser aparecen aquí.
+
+La serie de cada ``central_id``/``unidad`` se ubica en una grilla común
+(series × intervalos de 15 min entre el primer y el último dato de la
+partición), así los bordes de una partición incompleta no cuentan como huecos
+y todas las medidas salen de operaciones NumPy sobre la grilla.
+
+Los parámetros vienen de la sección ``anomalias`` de ``config.yml``. El
+resultado se guarda en ``anomalias_15min`` (se reemplazan los periodos de la
+corrida) y :func:`etl.quality_checks.write_metadata` resume los conteos en las
+``alertas`` de cada ``generacion_15min_YYYYMM``.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..aggregate import list_partitions
+from ..config import DATA_MART, OUTPUT_FILES, anomaly_settings
+from ..utils_io import validate_and_write
+
+logger = logging.getLogger(__name__)
+
+INTERVAL = np.timedelta64(15, "m")
+SERIES_KEYS = ["central_id", "central", "unidad"]
+ANOMALY_KEYS = ["periodo", "central_id", "unidad", "tipo", "fecha_hora_inicio"]
+ANOMALY_COLUMNS = [
+    "periodo",
+    *SERIES_KEYS,
+    "tipo",
+    "fecha_hora_inicio",
+    "fecha_hora_fin",
+    "intervalos",
+    "valor",
+    "referencia",
+    "score",
+]
+# piso relativo de la MAD: una ventana constante no vuelve infinito el z-score
+MAD_REL_FLOOR = 0.01
+
+
+def to_grid(df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, np.datetime64]:
+    """Series de la partición como grilla ``(series, intervalos)`` con NaN donde falta el dato.
+
+    Devuelve las claves de cada fila de la grilla, la grilla y el instante de la
+    primera columna.
+    """
+
+    codes = df.groupby(SERIES_KEYS, sort=True, dropna=False, observed=True).ngroup().to_numpy()
+    ts = df["fecha_hora"].to_numpy(dtype="datetime64[ns]")
+    t0 = ts.min()
+    slot = ((ts - t0) // INTERVAL).astype(np.int64)
+    grid = np.full((codes.max() + 1, slot.max() + 1), np.nan)
+    grid[codes, slot] = df["energia_mwh"].to_numpy(dtype=float)
+    series = df[SERIES_KEYS].iloc[np.unique(codes, return_index=True)[1]].reset_index(drop=True)
+    return series, grid, t0
+
+
+def _nanmedian(windows: np.ndarray) -> np.ndarray:
+    """Mediana en el último eje ignorando NaN (ordenar y tomar el centro de los válidos)."""
+
+    ordered = np.sort(windows, axis=-1)  # los NaN quedan al final
+    n = np.count_nonzero(~np.isnan(windows), axis=-1)
+    lo = np.take_along_axis(ordered, np.maximum((n - 1) // 2, 0)[..., None], axis=-1)[..., 0]
+    hi = np.take_along_axis(ordered, (n // 2)[..., None], axis=-1)[..., 0]
+    return np.where(n > 0, (lo + hi) / 2, np.nan)
+
+
+def robust_zscore(grid: np.ndarray, window: int, mad_min: float) -> Tuple[np.ndarray, np.ndarray]:
+    """z-score robusto de cada intervalo frente a su ventana centrada (mediana y MAD)."""
+
+    half = window // 2
+    padded = np.pad(grid, ((0, 0), (half, half)), constant_values=np.nan)
+    windows = sliding_window_view(padded, 2 * half + 1, axis=1)
+    median = _nanmedian(windows)
+    mad = _nanmedian(np.abs(windows - median[..., None]))
+    scale = np.maximum(np.nan_to_num(mad), np.maximum(mad_min, MAD_REL_FLOOR * np.abs(median)))
+    with np.errstate(invalid="ignore"):
+        return 0.6745 * (grid - median) / scale, median
+
+
+def runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Tramos de ``True`` consecutivos por fila: (fila, columna inicial, largo)."""
+
+    padded = np.pad(mask.astype(np.int8), ((0, 0), (1, 1)))
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _rows, ends = np.nonzero(edges == -1)  # mismo orden que los inicios
+    return rows, starts, ends - starts
+
+
+def _events(series: pd.DataFrame, tipo: str, rows: np.ndarray, start: np.ndarray, end: np.ndarray, t0: np.datetime64, **values: Any) -> pd.DataFrame:
+    out = series.iloc[rows].reset_index(drop=True)
+    out["tipo"] = tipo
+    out["fecha_hora_inicio"] = t0 + start * INTERVAL
+    out["fecha_hora_fin"] = t0 + end * INTERVAL
+    for name in ("intervalos", "valor", "referencia", "score"):
+        out[name] = values.get(name, np.nan)
+    return out
+
+
+def detect_anomalies(df: pd.DataFrame, settings: Mapping[str, Any] | None = None) -> pd.DataFrame:
+    """Picos, valores planos y huecos de una partición 15 min (una fila por evento)."""
+
+    cfg = {**anomaly_settings(), **(settings or {})}
+    df = df.dropna(subset=["fecha_hora"])
+    if df.empty:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS)
+    series, grid, t0 = to_grid(df)
+    present = ~np.isnan(grid)
+    frames = []
+
+    # picos: un evento por tramo de intervalos marcados, con el z máximo del tramo
+    z, median = robust_zscore(grid, int(cfg["ventana"]), float(cfg["mad_min_mwh"]))
+    score = np.abs(np.nan_to_num(z))
+    rows, start, length = runs(score > float(cfg["z_max"]))
+    if len(rows):
+        run_id = np.repeat(np.arange(len(rows)), length)
+        cols = np.repeat(start - np.cumsum(np.r_[0, length[:-1]]), length) + np.arange(length.sum())
+        flat = score[np.repeat(rows, length), cols]
+        # posición del máximo de cada tramo: orden estable por (tramo, -score)
+        best = np.lexsort((-flat, run_id))[np.r_[0, np.cumsum(length)[:-1]]]
+        r, c = np.repeat(rows, length)[best], cols[best]
+        frames.append(
+            _events(series, "pico", rows, start, start + length - 1, t0, intervalos=length, valor=grid[r, c], referencia=median[r, c], score=score[r, c])
+        )
+
+    # valores planos: tramos donde el valor (no nulo, distinto de cero) no cambia
+    same = np.zeros_like(present)
+    same[:, 1:] = (grid[:, 1:] == grid[:, :-1]) & (grid[:, 1:] != 0)
+    # un tramo de k repeticiones son k + 1 intervalos iguales
+    rows, start, length = runs(same)
+    keep = length + 1 >= int(cfg["plano_min_intervalos"])
+    rows, start, length = rows[keep], start[keep] - 1, length[keep] + 1
+    if len(rows):
+        frames.append(_events(series, "plano", rows, start, start + length - 1, t0, intervalos=length, valor=grid[rows, start]))
+
+    # huecos: intervalos presentes por día frente a los esperados en la grilla
+    slot_day = ((t0 + np.arange(grid.shape[1]) * INTERVAL).astype("datetime64[D]") - t0.astype("datetime64[D]")).astype(np.int64)
+    n_days = slot_day[-1] + 1
+    expected = np.bincount(slot_day, minlength=n_days)
+    r, c = np.nonzero(present)
+    counts = np.bincount(r * n_days + slot_day[c], minlength=grid.shape[0] * n_days).reshape(grid.shape[0], n_days)
+    rows, days = np.nonzero(counts < expected)
+    if len(rows):
+        first = np.r_[0, np.cumsum(expected)[:-1]]
+        frames.append(
+            _events(
+                series,
+                "hueco",
+                rows,
+                first[days],
+                first[days] + expected[days] - 1,
+                t0,
+                intervalos=expected[days] - counts[rows, days],
+                valor=counts[rows, days],
+                referencia=expected[days],
+            )
+        )
+
+    if not frames:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS)
+    out = pd.concat(frames, ignore_index=True)
+    out["periodo"] = out["fecha_hora_inicio"].dt.strftime("%Y%m")
+    return out[ANOMALY_COLUMNS]
+
+
+def run_anomalias(particiones: Dict[str, pd.DataFrame]) -> Tuple[pd.DataFrame, List[str]]:
+    """Revisar las particiones de la corrida y actualizar ``anomalias_15min``.
+
+    Se reemplazan los periodos revisados y se descartan los que ya no tienen
+    partición en el data mart.
+    """
+
+    path: Path = DATA_MART / OUTPUT_FILES["anomalias_15min"]
+    on_disk = {p.stem.rsplit("_", 1)[-1] for p in list_partitions(DATA_MART)}
+    previous = pd.DataFrame(columns=ANOMALY_COLUMNS)
+    if path.exists():
+        previous = pd.read_csv(path, dtype={"periodo": str, "central_id": str, "unidad": str})
+    kept = previous[previous["periodo"].isin(on_disk - set(particiones))]
+
+    fresh = []
+    for periodo, df_part in sorted(particiones.items()):
+        found = detect_anomalies(df_part).assign(periodo=periodo)
+        if not found.empty:
+            logger.warning("Anomalías 15min %s: %s", periodo, found["tipo"].value_counts().to_dict())
+        fresh.append(found)
+
+    frames = [df for df in (kept, *fresh) if not df.empty]
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ANOMALY_COLUMNS)
+    table = table.sort_values(ANOMALY_KEYS, ignore_index=True)
+    validate_and_write("anomalias_15min", table, path)
+    return table, ANOMALY_KEYS
+
+
+def alert_counts(table: pd.DataFrame) -> Dict[str, List[str]]:
+    """Alertas ``anomalias_<tipo>:<n>`` por partición ``generacion_15min_YYYYMM``."""
+
+    if table.empty:
+        return {}
+    counts = table.groupby([table["periodo"].astype(str), "tipo"], observed=True).size()
+    alerts: Dict[str, List[str]] = {}
+    for (periodo, tipo), n in counts.items():
+        alerts.setdefault(f"generacion_15min_{periodo}", []).append(f"anomalias_{tipo}:{n}")
+    return alerts
+
+
+__all__ = ["ANOMALY_KEYS", "alert_counts", "detect_anomalies", "robust_zscore", "run_anomalias", "runs", "to_grid"]
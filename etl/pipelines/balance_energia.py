@@ -11,7 +11,8 @@ from typing import Dict, Iterable, List, Tuple
 import pandas as pd
 
 from ..config import DATA_LANDING, DATA_MART, LANDING_FILES, OUTPUT_FILES, get_source
-from ..utils_io import list_matching_files, validate_and_write
+from ..profiling import timed
+from ..utils_io import excel_file, list_matching_files, read_excel, validate_and_write
 
 logger = logging.getLogger(__name__)
 
@@ -66,15 +67,15 @@ def _date_cols(cols: Iterable[object]) -> List[object]:
     return out
 
 
-def _process_perfil(path: Path) -> pd.DataFrame:
+def _process_perfil(xls: pd.ExcelFile) -> pd.DataFrame:
     """
     Lee hoja Perfil (valores en GWh mensual) y normaliza a formato largo:
     periodo (YYYYMM), fecha_mes, concepto, energia_mwh, energia_gwh
     """
-    preview = pd.read_excel(path, sheet_name="Perfil", header=None, nrows=60)
+    preview = read_excel(xls, sheet_name="Perfil", header=None, nrows=60)
     header_row = _find_header_row(preview, "Concepto")
 
-    df = pd.read_excel(path, sheet_name="Perfil", header=header_row)
+    df = read_excel(xls, sheet_name="Perfil", header=header_row)
     if df.empty:
         return pd.DataFrame(columns=["periodo", "fecha_mes", "concepto", "energia_mwh", "energia_gwh"])
 
@@ -132,14 +133,14 @@ def _process_perfil(path: Path) -> pd.DataFrame:
     return df_long.reset_index(drop=True)
 
 
-def _process_r(path: Path) -> pd.DataFrame:
+def _process_r(xls: pd.ExcelFile) -> pd.DataFrame:
     """
     Lee hoja R (segmentos COES/Regulados/Libres/Total, MWh mensual) y normaliza.
     """
-    preview = pd.read_excel(path, sheet_name="R", header=None, nrows=120)
+    preview = read_excel(xls, sheet_name="R", header=None, nrows=120)
     header_row = _find_header_row(preview, "Año")
 
-    df = pd.read_excel(path, sheet_name="R", header=header_row)
+    df = read_excel(xls, sheet_name="R", header=header_row)
     if df.empty:
         return pd.DataFrame(columns=["periodo", "fecha_mes", "segmento", "energia_mwh"])
 
@@ -211,8 +212,9 @@ def run_balance_energia() -> Tuple[List[Path], Dict[str, Tuple[pd.DataFrame, Ite
     path = balance_files[0]
     files_read.append(path)
 
-    perfil_df = _process_perfil(path)
-    r_df = _process_r(path)
+    with timed("parse", path.name, stage="balance_energia"), excel_file(path) as xls:
+        perfil_df = _process_perfil(xls)
+        r_df = _process_r(xls)
 
     validate_and_write("balance_perfil_mensual", perfil_df, DATA_MART / OUTPUT_FILES["balance_perfil_mensual"])
     validate_and_write("balance_r_mensual", r_df, DATA_MART / OUTPUT_FILES["balance_r_mensual"])
@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+"""Índice de completitud de las particiones 15 min.
+
+Cada partición ``generacion_15min_YYYYMM.csv`` lleva al lado un índice
+binario ``generacion_15min_YYYYMM.cobertura.npz`` con un bitmap por serie
+(``central_id``/``unidad``) y día sobre los 96 intervalos del día: el bit
+``k`` indica que hay dato en ``00:00 + 15 min · k``. Son 12 bytes por unidad y
+día, así que el índice de un mes pesa unos pocos KB.
+
+El índice sirve para:
+
+- :func:`adds_intervals`: el merge incremental de
+  :func:`etl.pipelines.produccion.run_produccion` omite la lectura y
+  reescritura de una partición cuando el archivo nuevo no trae intervalos que
+  falten (en un duplicado el merge conserva el dato previo, así que el
+  resultado sería el mismo).
+- :func:`coverage_table`: ``cobertura_15min`` tiene una fila por periodo,
+  serie y día con los intervalos presentes y el porcentaje de cobertura. La
+  página *Generación 15-min* dibuja el mapa de calor desde el índice sin leer
+  las filas de la partición.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..aggregate import list_partitions
+from ..config import DATA_MART, OUTPUT_FILES
+from ..utils_io import validate_and_write
+
+logger = logging.getLogger(__name__)
+
+INTERVAL = np.timedelta64(15, "m")
+SLOTS_PER_DAY = 96
+SERIES_KEYS = ["central_id", "unidad"]
+COVERAGE_KEYS = ["periodo", "central_id", "unidad", "fecha"]
+SUFFIX = ".cobertura.npz"
+
+# {"series": DataFrame(central_id, central, unidad), "inicio": datetime64[D], "slots": bool (series, días, 96)}
+Index = Dict[str, Any]
+
+
+def index_path(partition: Path) -> Path:
+    """Ruta del índice de una partición (``generacion_15min_YYYYMM.cobertura.npz``)."""
+
+    return partition.with_name(partition.stem + SUFFIX)
+
+
+def _slots(df: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray, np.ndarray]:
+    """Claves de serie (texto), día y casillero de 15 min de cada fila alineada a la grilla."""
+
+    ts = pd.to_datetime(df["fecha_hora"], errors="coerce").to_numpy(dtype="datetime64[ns]")
+    days = ts.astype("datetime64[D]")
+    offset = ts - days
+    aligned = ~np.isnat(ts) & (offset % INTERVAL == np.timedelta64(0, "ns"))
+    keys = df.loc[aligned, ["central_id", "central", "unidad"]].astype(object).fillna("").astype(str).reset_index(drop=True)
+    return keys, days[aligned], (offset[aligned] // INTERVAL).astype(np.int64), aligned
+
+
+def build_index(df: pd.DataFrame) -> Index | None:
+    """Bitmap de intervalos presentes por serie y día de una partición."""
+
+    keys, days, slot, _aligned = _slots(df)
+    if keys.empty:
+        return None
+    codes = keys.groupby(SERIES_KEYS, sort=True).ngroup().to_numpy()
+    start = days.min()
+    day = (days - start).astype(np.int64)
+    slots = np.zeros((codes.max() + 1, day.max() + 1, SLOTS_PER_DAY), dtype=bool)
+    slots[codes, day, slot] = True
+    series = keys.iloc[np.unique(codes, return_index=True)[1]].reset_index(drop=True)
+    return {"series": series, "inicio": start, "slots": slots}
+
+
+def write_index(index: Index, path: Path) -> None:
+    """Guardar el índice (reemplazo atómico: el previo puede ser un hardlink a la snapshot publicada)."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    series = index["series"]
+    with tempfile.NamedTemporaryFile(delete=False, dir=str(path.parent), prefix=f"{path.stem}_", suffix=".tmp") as tmp:
+        np.savez_compressed(
+            tmp,
+            central_id=series["central_id"].to_numpy(dtype=str),
+            central=series["central"].to_numpy(dtype=str),
+            unidad=series["unidad"].to_numpy(dtype=str),
+            inicio=np.array(str(index["inicio"])),
+            bits=np.packbits(index["slots"], axis=-1),
+        )
+    os.replace(tmp.name, path)
+
+
+def read_index(path: Path) -> Index | None:
+    """Índice guardado con :func:`write_index` (``None`` si falta o no se puede leer)."""
+
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            series = pd.DataFrame({col: data[col].astype(object) for col in ("central_id", "central", "unidad")})
+            start = np.datetime64(str(data["inicio"]), "D")
+            slots = np.unpackbits(data["bits"], axis=-1, count=SLOTS_PER_DAY).astype(bool)
+    except (OSError, KeyError, ValueError):
+        return None
+    return {"series": series, "inicio": start, "slots": slots}
+
+
+def adds_intervals(index: Index | None, df: pd.DataFrame) -> bool:
+    """``True`` si ``df`` trae algún intervalo (serie, día, casillero) que el índice no tiene."""
+
+    if index is None:
+        return True
+    keys, days, slot, aligned = _slots(df)
+    if not aligned.all():
+        return True  # horas fuera de la grilla de 15 min: no se pueden descartar
+    if keys.empty:
+        return False
+    known = pd.MultiIndex.from_frame(index["series"][SERIES_KEYS])
+    codes = known.get_indexer(pd.MultiIndex.from_frame(keys[SERIES_KEYS]))
+    day = (days - index["inicio"]).astype(np.int64)
+    slots = index["slots"]
+    inside = (codes >= 0) & (day >= 0) & (day < slots.shape[1])
+    if not inside.all():
+        return True
+    return not slots[codes, day, slot].all()
+
+
+def coverage_table(index: Index, periodo: str) -> pd.DataFrame:
+    """Intervalos presentes y porcentaje de cobertura por serie y día."""
+
+    counts = index["slots"].sum(axis=-1)
+    n_series, n_days = counts.shape
+    fechas = pd.Series(np.datetime_as_string(index["inicio"] + np.arange(n_days), unit="D"))
+    out = index["series"].iloc[np.repeat(np.arange(n_series), n_days)].reset_index(drop=True)
+    out.insert(0, "periodo", periodo)
+    out["fecha"] = np.tile(fechas.to_numpy(), n_series)
+    out["intervalos"] = counts.ravel()
+    out["cobertura_pct"] = out["intervalos"] * (100.0 / SLOTS_PER_DAY)
+    return out
+
+
+def run_cobertura(indices: Dict[str, Index | None]) -> Tuple[pd.DataFrame, List[str]]:
+    """Actualizar ``cobertura_15min`` con los índices de las particiones reescritas en la corrida."""
+
+    path = DATA_MART / OUTPUT_FILES["cobertura_15min"]
+    columns = ["periodo", "central_id", "central", "unidad", "fecha", "intervalos", "cobertura_pct"]
+    on_disk = {p.stem.rsplit("_", 1)[-1] for p in list_partitions(DATA_MART)}
+    previous = pd.DataFrame(columns=columns)
+    if path.exists():
+        previous = pd.read_csv(path, dtype={"periodo": str, "central_id": str, "unidad": str})
+    kept = previous[previous["periodo"].isin(on_disk - set(indices))]
+
+    fresh = [coverage_table(index, periodo) for periodo, index in sorted(indices.items()) if index is not None]
+    frames = [df for df in (kept, *fresh) if not df.empty]
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+    table = table.sort_values(COVERAGE_KEYS, ignore_index=True)
+    validate_and_write("cobertura_15min", table, path)
+    logger.info("Cobertura 15min: %s periodos actualizados", len(fresh))
+    return table, COVERAGE_KEYS
+
+
+__all__ = [
+    "adds_intervals",
+    "build_index",
+    "coverage_table",
+    "index_path",
+    "read_index",
+    "run_cobertura",
+    "write_index",
+]
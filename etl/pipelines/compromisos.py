@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""Compromiso mensual de potencia y energía de los contratos.
+
+Etapa derivada que expande la vigencia de cada contrato de
+``contratos_base`` y ``contratos_riesgo`` (``fecha_inicio`` a ``fecha_fin``,
+ambas inclusive) sobre una grilla mensual (``desde``/``hasta`` de la sección
+``compromisos`` de ``config.yml``, 2025–2036 por defecto) y escribe
+``contratos_compromiso_mensual`` con una fila por periodo, origen, cliente y
+tipo de contrato:
+
+- ``contratos``: contratos vigentes algún día del mes;
+- ``potencia_contratada_mw``: suma de la potencia de esos contratos;
+- ``potencia_media_mw``: potencia ponderada por los días vigentes del mes;
+- ``energia_mwh``: potencia × horas vigentes en el mes.
+
+Los días de solape contrato × mes salen de una sola operación de broadcasting
+(``contratos × meses``) y la suma por cliente y tipo es un producto de
+matrices; no hay bucles por contrato ni por mes. Antes se descartan, con
+:class:`etl.intervalos.ContractIndex`, los contratos que no tocan el
+horizonte. Con la tabla, contrastar lo comprometido con la generación
+esperada es un join por ``periodo``.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import DATA_MART, OUTPUT_FILES, commitment_settings
+from ..intervalos import ContractIndex, clean_contracts
+from ..utils_io import validate_and_write
+from ._common import mart_table
+
+logger = logging.getLogger(__name__)
+
+Datasets = Dict[str, Tuple[pd.DataFrame, List[str]]]
+
+COMMITMENT_KEYS = ["periodo", "origen", "cliente", "tipo_contrato"]
+ORIGENES = {"contratos_base": "base", "contratos_riesgo": "riesgo"}
+
+
+def month_grid(desde: int, hasta: int) -> pd.PeriodIndex:
+    """Meses ``desde``..``hasta`` (YYYYMM, ambos inclusive)."""
+
+    return pd.period_range(pd.Period(f"{str(desde)[:4]}-{str(desde)[4:]}", "M"), pd.Period(f"{str(hasta)[:4]}-{str(hasta)[4:]}", "M"), freq="M")
+
+
+def overlap_days(inicio: np.ndarray, fin: np.ndarray, months: pd.PeriodIndex) -> np.ndarray:
+    """Días de vigencia de cada contrato en cada mes, matriz ``(contratos, meses)``.
+
+    ``inicio`` y ``fin`` son ``datetime64[D]`` con ``fin`` inclusive.
+    """
+
+    m_start = months.start_time.to_numpy().astype("datetime64[D]")
+    m_end = (months + 1).start_time.to_numpy().astype("datetime64[D]")
+    start = np.maximum(inicio[:, None], m_start[None, :])
+    end = np.minimum(fin[:, None] + np.timedelta64(1, "D"), m_end[None, :])
+    return np.clip((end - start).astype(np.int64), 0, None)
+
+
+def contracts(datasets: Datasets) -> pd.DataFrame:
+    """Contratos con vigencia y potencia válidas de ``contratos_base`` y ``contratos_riesgo``."""
+
+    return clean_contracts({origen: mart_table(datasets, name) for name, origen in ORIGENES.items()})
+
+
+def commitment_matrix(df: pd.DataFrame, months: pd.PeriodIndex) -> pd.DataFrame:
+    """Compromiso mensual por origen, cliente y tipo (solo filas con contratos vigentes)."""
+
+    columns = [*COMMITMENT_KEYS, "contratos", "potencia_contratada_mw", "potencia_media_mw", "energia_mwh"]
+    if df.empty or not len(months):
+        return pd.DataFrame(columns=columns)
+
+    days = overlap_days(
+        df["fecha_inicio"].to_numpy().astype("datetime64[D]"),
+        df["fecha_fin"].to_numpy().astype("datetime64[D]"),
+        months,
+    )
+    potencia = df["potencia_mw"].to_numpy(dtype=float)[:, None]
+    active = days > 0
+    per_contract = {
+        "contratos": active.astype(float),
+        "potencia_contratada_mw": active * potencia,
+        "potencia_media_mw": potencia * days / months.days_in_month.to_numpy()[None, :],
+        "energia_mwh": potencia * days * 24.0,
+    }
+
+    # suma por grupo: matriz indicadora (grupos × contratos) @ (contratos × meses)
+    groups = df.groupby(["origen", "cliente", "tipo_contrato"], sort=True)
+    codes = groups.ngroup().to_numpy()
+    onehot = np.zeros((codes.max() + 1, len(df)))
+    onehot[codes, np.arange(len(df))] = 1.0
+    sums = {name: onehot @ values for name, values in per_contract.items()}
+
+    keys = df.iloc[np.unique(codes, return_index=True)[1]][["origen", "cliente", "tipo_contrato"]].reset_index(drop=True)
+    g, m = np.nonzero(sums["contratos"] > 0)
+    out = keys.iloc[g].reset_index(drop=True)
+    out.insert(0, "periodo", months.strftime("%Y%m")[m])
+    for name, values in sums.items():
+        out[name] = values[g, m]
+    out["contratos"] = out["contratos"].astype(int)
+    return out.sort_values(COMMITMENT_KEYS, ignore_index=True)[columns]
+
+
+def run_compromisos(datasets: Datasets) -> Tuple[List[Path], Datasets]:
+    """Escribir ``contratos_compromiso_mensual`` para el horizonte configurado."""
+
+    cfg = commitment_settings()
+    months = month_grid(cfg["desde"], cfg["hasta"])
+    # solo entran a la grilla los contratos que tocan el horizonte
+    index = ContractIndex(contracts(datasets))
+    table = commitment_matrix(index.overlapping(months[0].start_time, months[-1].end_time), months)
+    validate_and_write("contratos_compromiso_mensual", table, DATA_MART / OUTPUT_FILES["contratos_compromiso_mensual"])
+    logger.info("Compromiso de contratos: %s filas (%s a %s)", len(table), cfg["desde"], cfg["hasta"])
+    return [], {"contratos_compromiso_mensual": (table, COMMITMENT_KEYS)}
+
+
+__all__ = ["COMMITMENT_KEYS", "commitment_matrix", "contracts", "month_grid", "overlap_days", "run_compromisos"]
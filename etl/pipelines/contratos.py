@@ -11,14 +11,15 @@ from typing import Dict, Iterable, List, Tuple
 import pandas as pd
 
 from ..config import DATA_LANDING, DATA_MART, LANDING_FILES, OUTPUT_FILES, get_source
-from ..utils_io import list_matching_files, read_excel_safe, apply_table_rules, validate_and_write
+from ..profiling import timed
+from ..utils_io import excel_file, list_matching_files, read_excel_safe, apply_table_rules, validate_and_write
 
 logger = logging.getLogger(__name__)
 
 
 def _load_sheet(path: Path, target: str) -> pd.DataFrame:
     try:
-        xls = pd.ExcelFile(path)
+        xls = excel_file(path)
     except Exception:
         logger.exception("No se pudo abrir %s", path)
         raise
@@ -92,8 +93,9 @@ def run_contratos() -> Tuple[List[Path], Dict[str, Tuple[pd.DataFrame, Iterable[
         sheets = (source_cfg or {}).get("sheets", {})
 
         try:
-            base_df = _clean_contracts(_load_sheet(path, sheets.get("base", "CONTRATOS BASE DATOS")))
-            riesgo_df = _clean_contracts(_load_sheet(path, sheets.get("riesgo", "RIESGO")))
+            with timed("parse", path.name, stage="contratos"):
+                base_df = _clean_contracts(_load_sheet(path, sheets.get("base", "CONTRATOS BASE DATOS")))
+                riesgo_df = _clean_contracts(_load_sheet(path, sheets.get("riesgo", "RIESGO")))
         except Exception:
             logger.exception("Error procesando contratos en %s", path)
             raise ValueError(f"No se pudieron procesar hojas de contratos definidas en {path.name}")
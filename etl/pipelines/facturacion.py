@@ -8,15 +8,18 @@ import logging
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Tuple
 
 import pandas as pd
 
 from ..config import DATA_LANDING, DATA_MART, LANDING_FILES, OUTPUT_FILES, get_source
-from ..utils_io import detect_header_row, list_matching_files, apply_table_rules, validate_and_write
+from ..utils_io import detect_header_row, excel_file, list_matching_files, read_excel, apply_table_rules, validate_and_write, parse_files_cached
 
 logger = logging.getLogger(__name__)
 
+# Subir al cambiar la lógica de parseo para invalidar el cache por archivo.
+PARSER_VERSION = "2"
+
 MONTH_MAP = {
     "ENERO": "01",
     "FEBRERO": "02",
@@ -40,10 +43,9 @@ def _normalize_sheet_name(name: str) -> str:
     return re.sub(r"[^A-Z0-9]", "", str(name).upper())
 
 
-def _find_sheet(path: Path, target: str) -> str | None:
+def _find_sheet(xls: pd.ExcelFile, target: str) -> str | None:
     """Buscar hoja por nombre normalizado."""
 
-    xls = pd.ExcelFile(path)
     target_norm = _normalize_sheet_name(target)
     for sheet in xls.sheet_names:
         normalized = _normalize_sheet_name(sheet)
@@ -52,8 +54,8 @@ def _find_sheet(path: Path, target: str) -> str | None:
     return None
 
 
-def _read_with_header(path: Path, sheet_name: str, keywords: List[str]) -> pd.DataFrame:
-    preview = pd.read_excel(path, sheet_name=sheet_name, header=None, nrows=60)
+def _read_with_header(xls: pd.ExcelFile, sheet_name: str, keywords: List[str]) -> pd.DataFrame:
+    preview = read_excel(xls, sheet_name=sheet_name, header=None, nrows=60)
     header_row = detect_header_row(preview, keywords=keywords)
     if header_row == 0 and preview.iloc[0].isna().all():
         non_empty = preview.dropna(how="all")
@@ -65,19 +67,19 @@ def _read_with_header(path: Path, sheet_name: str, keywords: List[str]) -> pd.Da
             if {"codigo", "cliente"} & set(vals):
                 header_row = idx
                 break
-    df = pd.read_excel(path, sheet_name=sheet_name, header=header_row)
+    df = read_excel(xls, sheet_name=sheet_name, header=header_row)
     return df
 
 
-def _periodo_from_value(value: object) -> str | None:
+def _periodo_from_value(value: object, year: int | None = None) -> str | None:
     if isinstance(value, (pd.Timestamp, datetime)):
         return value.strftime("%Y%m")
     if isinstance(value, (int, float)) and not pd.isna(value):
         # excel serial? ignore
         return None
     text = str(value).strip().upper()
-    if text in MONTH_MAP:
-        return f"2025{MONTH_MAP[text]}"
+    if text in MONTH_MAP and year is not None:
+        return f"{year}{MONTH_MAP[text]}"
     return None
 
 
@@ -115,7 +117,7 @@ def _aggregate_sales(df: pd.DataFrame, value_name: str) -> pd.DataFrame:
     return grouped[["cliente", "periodo", "anio", "mes", value_name]]
 
 
-def _parse_sales(df: pd.DataFrame, value_name: str) -> pd.DataFrame:
+def _parse_sales(df: pd.DataFrame, value_name: str, year: int | None = None) -> pd.DataFrame:
     if df.empty:
         return pd.DataFrame(columns=["cliente", "periodo", value_name])
 
@@ -132,7 +134,7 @@ def _parse_sales(df: pd.DataFrame, value_name: str) -> pd.DataFrame:
 
     df_long = df.melt(id_vars=[entity_col], value_vars=month_cols, var_name="periodo_raw", value_name=value_name)
     df_long = df_long.rename(columns={entity_col: "cliente"})
-    df_long["periodo"] = df_long["periodo_raw"].map(_periodo_from_value)
+    df_long["periodo"] = df_long["periodo_raw"].map(lambda v: _periodo_from_value(v, year))
     df_long[value_name] = pd.to_numeric(df_long[value_name], errors="coerce")
     df_long = df_long.dropna(subset=["cliente", "periodo"])
     return df_long[["cliente", "periodo", value_name]]
@@ -174,10 +176,9 @@ def _parse_ingresos(df: pd.DataFrame, year: int | None) -> pd.DataFrame:
         return int(MONTH_MAP[text]) if text in MONTH_MAP else None
 
     df_long["mes"] = df_long["mes_raw"].map(_month_from_header)
-    anio_val = year or datetime.utcnow().year
     df_long["soles"] = pd.to_numeric(df_long["soles"], errors="coerce")
     df_long["cliente_o_concepto"] = df_long["cliente_o_concepto"].astype(str).str.strip()
-    df_long["anio"] = anio_val
+    df_long["anio"] = year
     df_long = df_long.dropna(subset=["cliente_o_concepto", "mes", "anio"])
     df_long["mes"] = df_long["mes"].astype(int)
 
@@ -194,56 +195,102 @@ def _parse_ingresos(df: pd.DataFrame, year: int | None) -> pd.DataFrame:
     return df_grouped[["anio", "mes", "cliente_o_concepto", "soles"]]
 
 
-def run_facturacion() -> Tuple[List[Path], Dict[str, Tuple[pd.DataFrame, Iterable[str]]]]:
-    """Ejecutar pipeline de facturación."""
+def _parse_fact_file(path: Path, sheets_cfg: Dict[str, Any]) -> Dict[str, pd.DataFrame]:
+    """Parsear un libro de facturación (un año) a ventas agregadas e ingresos.
 
-    files_read: List[Path] = []
-    datasets: Dict[str, Tuple[pd.DataFrame, Iterable[str]]] = {}
+    Los encabezados con nombre de mes usan el año del nombre del archivo; si el
+    nombre no lo trae el libro se rechaza en lugar de suponer un año (dos libros
+    sin año se pisarían al unir los años).
+    Se ejecuta en un proceso aparte, por eso recibe la config ya resuelta.
+    """
 
-    fact_cfg = get_source("facturacion")
-    fact_files = list_matching_files(DATA_LANDING, LANDING_FILES["facturacion"])
-    ventas_mwh = pd.DataFrame(columns=["cliente", "periodo", "mwh"])
-    ventas_soles = pd.DataFrame(columns=["cliente", "periodo", "soles"])
-    ingresos = pd.DataFrame(columns=["anio", "mes", "cliente_o_concepto", "soles"])
-    precio_medio = pd.DataFrame(columns=["periodo", "anio", "mes", "cliente", "precio_medio_soles_mwh"])
-
-    if fact_files:
-        path = fact_files[0]
-        files_read.append(path)
-        sheets_cfg = (fact_cfg or {}).get("sheets", {})
+    year = _extract_year_from_filename(path)
+    if year is None:
+        raise ValueError(f"No se detectó el año en el nombre de {path.name}; renómbrelo con el año (p. ej. 'Facturacion 2025.xlsx')")
 
+    with excel_file(path) as xls:
         try:
             sheet_name = sheets_cfg.get("ventas_mwh", "VENTAS (MWh)")
-            ventas_mwh_sheet = _read_with_header(path, sheet_name, ["cliente", "enero"])
-            ventas_mwh = _parse_sales(ventas_mwh_sheet, "mwh")
+            ventas_mwh_sheet = _read_with_header(xls, sheet_name, ["cliente", "enero"])
+            ventas_mwh = _aggregate_sales(_parse_sales(ventas_mwh_sheet, "mwh", year=year), "mwh")
         except Exception:
             logger.exception("Error procesando hoja de ventas MWh (%s)", sheet_name)
             raise ValueError(f"No se pudo procesar hoja de ventas MWh '{sheet_name}' en {path.name}")
 
         try:
             sheet_name = sheets_cfg.get("ventas_soles", "VENTAS (S)")
-            ventas_soles_sheet = _read_with_header(path, sheet_name, ["cliente", "enero"])
-            ventas_soles = _parse_sales(ventas_soles_sheet, "soles")
+            ventas_soles_sheet = _read_with_header(xls, sheet_name, ["cliente", "enero"])
+            ventas_soles = _aggregate_sales(_parse_sales(ventas_soles_sheet, "soles", year=year), "soles")
         except Exception:
             logger.exception("Error procesando hoja de ventas S (%s)", sheet_name)
             raise ValueError(f"No se pudo procesar hoja de ventas S '{sheet_name}' en {path.name}")
 
+        ingresos = pd.DataFrame(columns=["anio", "mes", "cliente_o_concepto", "soles"])
         try:
-            ingresos_sheet_name = sheets_cfg.get("ingresos") or _find_sheet(path, "Ingresos")
+            ingresos_sheet_name = sheets_cfg.get("ingresos") or _find_sheet(xls, "Ingresos")
             if ingresos_sheet_name:
-                ingresos_sheet = _read_with_header(path, ingresos_sheet_name, ["enero"])
-                ingresos = _parse_ingresos(ingresos_sheet, year=_extract_year_from_filename(path))
+                ingresos_sheet = _read_with_header(xls, ingresos_sheet_name, ["enero"])
+                ingresos = _parse_ingresos(ingresos_sheet, year=year)
             else:
                 logger.warning("Hoja Ingresos no encontrada en %s", path)
         except Exception:
             logger.exception("Error procesando hoja Ingresos")
             raise ValueError(f"No se pudo procesar hoja de Ingresos en {path.name}")
+
+    return {"ventas_mwh": ventas_mwh, "ventas_soles": ventas_soles, "ingresos": ingresos}
+
+
+def _merge_yearly(frames: List[pd.DataFrame], keys: List[str], columns: List[str], sort_by: List[str]) -> pd.DataFrame:
+    """Unir resultados por archivo; ante solapes gana el libro más reciente."""
+
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.drop_duplicates(subset=keys, keep="last")
+    return merged.sort_values(sort_by).reset_index(drop=True)[columns]
+
+
+def run_facturacion() -> Tuple[List[Path], Dict[str, Tuple[pd.DataFrame, Iterable[str]]]]:
+    """Ejecutar pipeline de facturación (un libro por año, todos los años)."""
+
+    files_read: List[Path] = []
+    datasets: Dict[str, Tuple[pd.DataFrame, Iterable[str]]] = {}
+
+    fact_cfg = get_source("facturacion")
+    fact_files = list_matching_files(DATA_LANDING, LANDING_FILES["facturacion"])
+    # Orden cronológico: los libros más recientes corrigen meses solapados.
+    fact_files = sorted(fact_files, key=lambda p: (_extract_year_from_filename(p) or 0, p.name))
+    precio_medio = pd.DataFrame(columns=["periodo", "anio", "mes", "cliente", "precio_medio_soles_mwh"])
+
+    parsed: List[Dict[str, pd.DataFrame]] = []
+    if fact_files:
+        files_read.extend(fact_files)
+        sheets_cfg = dict((fact_cfg or {}).get("sheets", {}))
+        parsed = parse_files_cached("facturacion", fact_files, _parse_fact_file, (sheets_cfg,), version=PARSER_VERSION)
     elif (fact_cfg or {}).get("required", True):
         raise FileNotFoundError(f"No se encontró archivo de facturación en {DATA_LANDING}")
 
+    ventas_mwh_agg = _merge_yearly(
+        [p["ventas_mwh"] for p in parsed],
+        keys=["cliente", "periodo"],
+        columns=["cliente", "periodo", "anio", "mes", "mwh"],
+        sort_by=["anio", "mes", "cliente"],
+    )
+    ventas_soles_agg = _merge_yearly(
+        [p["ventas_soles"] for p in parsed],
+        keys=["cliente", "periodo"],
+        columns=["cliente", "periodo", "anio", "mes", "soles"],
+        sort_by=["anio", "mes", "cliente"],
+    )
+    ingresos = _merge_yearly(
+        [p["ingresos"] for p in parsed],
+        keys=["anio", "mes", "cliente_o_concepto"],
+        columns=["anio", "mes", "cliente_o_concepto", "soles"],
+        sort_by=["anio", "mes", "cliente_o_concepto"],
+    )
+
     # Calcular precio medio
-    ventas_mwh_agg = _aggregate_sales(ventas_mwh, "mwh")
-    ventas_soles_agg = _aggregate_sales(ventas_soles, "soles")
     if not ventas_mwh_agg.empty or not ventas_soles_agg.empty:
         merged = ventas_mwh_agg.merge(
             ventas_soles_agg, on=["anio", "mes", "cliente", "periodo"], how="outer"
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""Métricas derivadas de la hidrología mensual.
+
+``hidro_volumen_mensual`` (por reservorio) y ``hidro_caudal_mensual`` (por
+estación) cubren décadas. Esta etapa precalcula, por serie, lo que la página
+de hidrología necesita y escribe ``hidro_metricas_mensual`` en formato largo
+(``variable`` = ``volumen_000m3`` o ``caudal_m3s``, ``serie``, ``periodo``):
+
+- climatología del mes calendario sobre toda la historia: ``clim_media`` y
+  los percentiles ``clim_p10``, ``clim_p50`` y ``clim_p90``;
+- ``anomalia`` y ``anomalia_pct`` frente a ``clim_media``;
+- ``dif_anual`` y ``dif_anual_pct`` frente al mismo mes del año anterior;
+- solo para volumen: ``capacidad_000m3`` y ``pct_capacidad``. La capacidad
+  es la última ``capacidad_util_max`` de ``represas_diario``, en millones de
+  m³; el código del reservorio se traduce con la sección ``hidro_metricas``
+  de ``config.yml``;
+- solo para caudal: ``aporte_000m3`` (caudal × segundos del mes) y
+  ``aporte_acumulado_000m3``, el aporte acumulado en el año.
+
+Todo se calcula con ``groupby().transform`` y ``reindex``, sin bucles por
+serie ni por mes.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import DATA_MART, OUTPUT_FILES, hydrology_metrics_settings
+from ..utils_io import validate_and_write
+from ._common import mart_table
+
+logger = logging.getLogger(__name__)
+
+Datasets = Dict[str, Tuple[pd.DataFrame, List[str]]]
+
+HYDRO_KEYS = ["variable", "serie", "periodo"]
+PERCENTILES = (10, 50, 90)
+COLUMNS = [
+    *HYDRO_KEYS,
+    "anio",
+    "mes",
+    "valor",
+    "clim_media",
+    *[f"clim_p{q}" for q in PERCENTILES],
+    "anomalia",
+    "anomalia_pct",
+    "dif_anual",
+    "dif_anual_pct",
+    "capacidad_000m3",
+    "pct_capacidad",
+    "aporte_000m3",
+    "aporte_acumulado_000m3",
+]
+
+
+def _long(df: pd.DataFrame, serie: str, variable: str) -> pd.DataFrame:
+    if df.empty:
+        return df
+    return pd.DataFrame(
+        {
+            "variable": variable,
+            "serie": df[serie].astype(str).str.strip(),
+            "periodo": pd.to_numeric(df["periodo"], errors="coerce"),
+            "valor": pd.to_numeric(df[variable], errors="coerce"),
+        }
+    ).dropna(subset=["periodo"])
+
+
+def capacities(represas: pd.DataFrame, reservorios: Dict[str, str]) -> pd.Series:
+    """Capacidad útil (000 m³) por código de reservorio, desde el último reporte diario."""
+
+    if represas.empty or "capacidad_util_max" not in represas.columns:
+        return pd.Series(dtype=float)
+    r = represas.assign(capacidad=pd.to_numeric(represas["capacidad_util_max"], errors="coerce")).dropna(subset=["capacidad"])
+    ultima = r.sort_values("fecha").groupby(r["reservorio"].astype(str).str.strip())["capacidad"].last() * 1_000
+    return pd.Series({codigo: ultima.get(nombre, np.nan) for codigo, nombre in reservorios.items()}, dtype=float).dropna()
+
+
+def hydrology_metrics(volumen: pd.DataFrame, caudal: pd.DataFrame, capacidad: pd.Series) -> pd.DataFrame:
+    """Climatología, anomalías, diferencia interanual, % de capacidad y aporte por serie y periodo."""
+
+    frames = [_long(volumen, "reservorio", "volumen_000m3"), _long(caudal, "estacion", "caudal_m3s")]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=COLUMNS)
+    df = pd.concat(frames, ignore_index=True)
+    df["periodo"] = df["periodo"].astype(int)
+    df = df.drop_duplicates(HYDRO_KEYS, keep="last").sort_values(HYDRO_KEYS, ignore_index=True)
+    df["anio"], df["mes"] = df["periodo"] // 100, df["periodo"] % 100
+
+    mensual = df.groupby(["variable", "serie", "mes"])["valor"]
+    df["clim_media"] = mensual.transform("mean")
+    for q in PERCENTILES:
+        df[f"clim_p{q}"] = mensual.transform("quantile", q / 100)
+
+    # mismo mes del año anterior por reindex de la clave (periodo - 100), aunque falten meses
+    valores = df.set_index(HYDRO_KEYS)["valor"]
+    previo = valores.reindex(pd.MultiIndex.from_arrays([df["variable"], df["serie"], df["periodo"] - 100])).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["anomalia"] = df["valor"] - df["clim_media"]
+        df["anomalia_pct"] = np.where(df["clim_media"].abs() > 0, df["anomalia"] / df["clim_media"].abs() * 100, np.nan)
+        df["dif_anual"] = df["valor"] - previo
+        df["dif_anual_pct"] = np.where(np.abs(previo) > 0, df["dif_anual"] / np.abs(previo) * 100, np.nan)
+
+    volumen_mask = df["variable"] == "volumen_000m3"
+    df["capacidad_000m3"] = df["serie"].map(capacidad).where(volumen_mask)
+    df["pct_capacidad"] = df["valor"] / df["capacidad_000m3"] * 100
+
+    segundos = pd.to_datetime(df["periodo"].astype(str), format="%Y%m").dt.days_in_month * 86_400
+    df["aporte_000m3"] = (df["valor"] * segundos / 1_000).where(~volumen_mask)
+    df["aporte_acumulado_000m3"] = df.groupby(["variable", "serie", "anio"])["aporte_000m3"].cumsum().where(df["aporte_000m3"].notna())
+    return df[COLUMNS]
+
+
+def run_hidro_metricas(datasets: Datasets) -> Tuple[List[Path], Datasets]:
+    """Escribir ``hidro_metricas_mensual`` desde las tablas mensuales de hidrología."""
+
+    cfg = hydrology_metrics_settings()
+    capacidad = capacities(mart_table(datasets, "represas_diario"), cfg["reservorios"])
+    table = hydrology_metrics(mart_table(datasets, "hidro_volumen_mensual"), mart_table(datasets, "hidro_caudal_mensual"), capacidad)
+    validate_and_write("hidro_metricas_mensual", table, DATA_MART / OUTPUT_FILES["hidro_metricas_mensual"])
+    logger.info("Métricas hidrológicas: %s filas, %s series (%s con capacidad)", len(table), table[["variable", "serie"]].drop_duplicates().shape[0], len(capacidad))
+    return [], {"hidro_metricas_mensual": (table, HYDRO_KEYS)}
+
+
+__all__ = ["HYDRO_KEYS", "PERCENTILES", "capacities", "hydrology_metrics", "run_hidro_metricas"]
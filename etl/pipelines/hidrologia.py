@@ -5,13 +5,16 @@ from __future__ import annotations
 
 import logging
 import re
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
 
 import pandas as pd
 
 from ..config import DATA_LANDING, DATA_MART, LANDING_FILES, OUTPUT_FILES, get_source
-from ..utils_io import detect_header_row, list_matching_files, apply_table_rules, validate_and_write
+from ..profiling import timed
+from ..represas_historico import upsert_represas, write_represas_consolidado
+from ..utils_io import detect_header_row, excel_file, list_matching_files, read_excel, apply_table_rules, validate_and_write
 
 logger = logging.getLogger(__name__)
 
@@ -74,103 +77,84 @@ def _melt_monthly(df: pd.DataFrame, id_var: str, value_name: str) -> pd.DataFram
     return df_out
 
 
+# Una sola pasada de regex para los formatos de fecha de INFORMEDIARIO:
+# yyyy.mm.dd, dd.mm.yyyy (separadores . / -) y "11 DE DICIEMBRE [DE] 2025".
+_REPORT_DATE_RE = re.compile(
+    r"\b(?:"
+    r"(?P<y1>20\d{2})[./-](?P<m1>\d{1,2})[./-](?P<d1>\d{1,2})"
+    r"|(?P<d2>\d{1,2})[./-](?P<m2>\d{1,2})[./-](?P<y2>20\d{2})"
+    r"|(?P<d3>\d{1,2})\s+DE\s+(?P<mes3>[A-ZÁÉÍÓÚÑ]+)\s+(?:DE\s+)?(?P<y3>20\d{2})"
+    r")\b"
+)
+_ACCENTS = str.maketrans("ÁÉÍÓÚ", "AEIOU")
+
+
+def _dates_in_text(text: str) -> Iterator[date]:
+    """Fechas válidas encontradas en un texto (en orden de aparición)."""
+    for m in _REPORT_DATE_RE.finditer(text.upper()):
+        if m.group("y1"):
+            y, mo, d = int(m.group("y1")), int(m.group("m1")), int(m.group("d1"))
+        elif m.group("y2"):
+            y, mo, d = int(m.group("y2")), int(m.group("m2")), int(m.group("d2"))
+        else:
+            mo = MONTHS_ES.get(m.group("mes3").translate(_ACCENTS))
+            if not mo:
+                continue
+            y, d = int(m.group("y3")), int(m.group("d3"))
+        try:
+            yield date(y, mo, d)
+        except ValueError:
+            continue
+
+
 def _try_parse_date_from_string(s: str) -> pd.Timestamp | None:
     """Intenta parsear fechas comunes (incluye formatos con meses en español)."""
     if not s:
         return None
+    found = next(_dates_in_text(str(s).strip()), None)
+    return pd.Timestamp(found) if found is not None else None
 
-    text = str(s).strip()
-    up = text.upper()
 
-    # 1) yyyy.mm.dd o yyyy-mm-dd o yyyy/mm/dd
-    m = re.search(r"\b(20\d{2})[./-](\d{1,2})[./-](\d{1,2})\b", up)
-    if m:
-        y, mo, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        try:
-            return pd.Timestamp(year=y, month=mo, day=d)
-        except Exception:
-            pass
-
-    # 2) dd.mm.yyyy o dd-mm-yyyy o dd/mm/yyyy
-    m = re.search(r"\b(\d{1,2})[./-](\d{1,2})[./-](20\d{2})\b", up)
-    if m:
-        d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        try:
-            return pd.Timestamp(year=y, month=mo, day=d)
-        except Exception:
-            pass
-
-    # 3) "AL 11 DE DICIEMBRE DE 2025"
-    m = re.search(
-        r"\b(?:AL\s*)?(\d{1,2})\s+DE\s+([A-ZÁÉÍÓÚÑ]+)\s+DE\s+(20\d{2})\b",
-        up,
-    )
-    if m:
-        d = int(m.group(1))
-        mes_txt = (
-            m.group(2)
-            .replace("Á", "A")
-            .replace("É", "E")
-            .replace("Í", "I")
-            .replace("Ó", "O")
-            .replace("Ú", "U")
-        )
-        y = int(m.group(3))
-        mo = MONTHS_ES.get(mes_txt)
-        if mo:
-            try:
-                return pd.Timestamp(year=y, month=mo, day=d)
-            except Exception:
-                pass
-
-    # 4) "11 DE DICIEMBRE 2025"
-    m = re.search(
-        r"\b(\d{1,2})\s+DE\s+([A-ZÁÉÍÓÚÑ]+)\s+(20\d{2})\b",
-        up,
-    )
-    if m:
-        d = int(m.group(1))
-        mes_txt = (
-            m.group(2)
-            .replace("Á", "A")
-            .replace("É", "E")
-            .replace("Í", "I")
-            .replace("Ó", "O")
-            .replace("Ú", "U")
-        )
-        y = int(m.group(3))
-        mo = MONTHS_ES.get(mes_txt)
-        if mo:
-            try:
-                return pd.Timestamp(year=y, month=mo, day=d)
-            except Exception:
-                pass
-
-    return None
-
-
-def _extract_report_date_from_text(path: Path) -> pd.Timestamp | None:
+def _extract_report_date(grid: pd.DataFrame, stop_row: int | None = None) -> pd.Timestamp | None:
     """
-    Extrae la fecha del reporte desde el contenido "INFORMEDIARIO":
+    Extrae la fecha del reporte desde la grilla ya leída de "INFORMEDIARIO":
     - Busca patrones: 'AL 11 DE DICIEMBRE DE 2025'
-    - O fechas tipo '2025.12.11' presentes en celdas
+    - O fechas tipo '2025.12.11' presentes en celdas (o celdas con fecha Excel)
+    Solo recorre el bloque de título (filas < ``stop_row``) y devuelve la más reciente.
     """
-    try:
-        preview = pd.read_excel(path, sheet_name="INFORMEDIARIO", header=None, nrows=120)
-    except Exception:
-        logger.exception("No se pudo abrir hoja INFORMEDIARIO para extraer fecha en %s", path)
-        return None
-
-    best: pd.Timestamp | None = None
-    for v in preview.values.ravel().tolist():
-        if pd.isna(v):
+    block = grid.values if stop_row is None else grid.values[:stop_row]
+
+    best: date | None = None
+    for v in block.ravel():
+        if isinstance(v, str):
+            candidates = _dates_in_text(v)
+        elif isinstance(v, datetime) and pd.notna(v):
+            candidates = iter((v.date(),))
+        else:
             continue
-        ts = _try_parse_date_from_string(str(v))
-        if ts is not None:
-            if best is None or ts > best:
-                best = ts
+        for found in candidates:
+            if best is None or found > best:
+                best = found
+
+    return pd.Timestamp(best) if best is not None else None
+
+
+def _frame_from_grid(grid: pd.DataFrame, header_row: int) -> pd.DataFrame:
+    """Equivalente a ``read_excel(header=header_row)`` sobre una grilla ``header=None``."""
+    names: List[object] = []
+    seen: Dict[object, int] = {}
+    for idx, value in enumerate(grid.iloc[header_row].tolist()):
+        name = f"Unnamed: {idx}" if pd.isna(value) else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
 
-    return best
+    body = grid.iloc[header_row + 1:].reset_index(drop=True)
+    body.columns = names
+    return body.infer_objects()
 
 
 def _procesar_control(path: Path, sheet_config: Dict[str, List[str]] | None = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -179,7 +163,7 @@ def _procesar_control(path: Path, sheet_config: Dict[str, List[str]] | None = No
     caudal_df = pd.DataFrame(columns=["estacion", "anio", "mes", "caudal_m3s"])
 
     try:
-        xls = pd.ExcelFile(path)
+        xls = excel_file(path)
     except Exception:
         logger.exception("No se pudo leer %s", path)
         raise
@@ -196,9 +180,9 @@ def _procesar_control(path: Path, sheet_config: Dict[str, List[str]] | None = No
         if sheet.upper() not in volumen_sheets:
             continue
 
-        preview = pd.read_excel(path, sheet_name=sheet, header=None, nrows=60)
+        preview = read_excel(xls, sheet_name=sheet, header=None, nrows=60)
         header_row = detect_header_row(preview, keywords=["año", "enero", "febrero"])
-        df_vol = pd.read_excel(path, sheet_name=sheet, header=header_row)
+        df_vol = read_excel(xls, sheet_name=sheet, header=header_row)
 
         if df_vol.empty:
             logger.warning("Hoja %s sin datos en Control Hidrológico", sheet)
@@ -220,9 +204,9 @@ def _procesar_control(path: Path, sheet_config: Dict[str, List[str]] | None = No
     caudal_sheet_candidates = [s for s in xls.sheet_names if s.upper() in {c.upper() for c in (sheet_config or {}).get("caudal", ["CAUDAL"])}]
     if caudal_sheet_candidates:
         sheet = caudal_sheet_candidates[0]
-        preview = pd.read_excel(path, sheet_name=sheet, header=None, nrows=80)
+        preview = read_excel(xls, sheet_name=sheet, header=None, nrows=80)
         header_row = detect_header_row(preview, keywords=["año", "enero", "febrero"])
-        df_cau = pd.read_excel(path, sheet_name=sheet, header=header_row)
+        df_cau = read_excel(xls, sheet_name=sheet, header=header_row)
 
         anio_col = next((c for c in df_cau.columns if str(c).upper().startswith("AÑO")), None)
         if anio_col is None:
@@ -246,12 +230,13 @@ def _normalize_colname(c: object) -> str:
 def _procesar_represas(path: Path, sheet_name: str = "INFORMEDIARIO") -> pd.DataFrame:
     """Procesar BDREPRESAS (INFORMEDIARIO) a tabla limpia para dashboard."""
     try:
-        preview = pd.read_excel(path, sheet_name=sheet_name, header=None, nrows=180)
+        # Lectura única: la grilla cruda sirve para header, fecha y datos.
+        grid = read_excel(path, sheet_name=sheet_name, header=None)
     except Exception:
         logger.exception("No se pudo abrir hoja %s en %s", sheet_name, path)
         raise ValueError(f"Hoja '{sheet_name}' no encontrada o ilegible en {path.name}")
 
-    fecha_val = _extract_report_date_from_text(path)
+    preview = grid.head(180)
 
     # Detectar fila de encabezado real
     header_row = None
@@ -266,7 +251,12 @@ def _procesar_represas(path: Path, sheet_name: str = "INFORMEDIARIO") -> pd.Data
     if header_row is None:
         header_row = detect_header_row(preview, keywords=["represa", "reservorio", "capacidad", "volumen"])
 
-    df = pd.read_excel(path, sheet_name=sheet_name, header=header_row)
+    # Bloque de título = filas sobre el header + header + sub-header (fechas de columnas)
+    fecha_val = _extract_report_date(preview, stop_row=header_row + 2)
+    if fecha_val is None:
+        fecha_val = _extract_report_date(preview.head(120))
+
+    df = _frame_from_grid(grid, header_row)
     if df.empty:
         return pd.DataFrame(columns=["fecha", "reservorio"])
 
@@ -404,7 +394,8 @@ def run_hidrologia() -> Tuple[List[Path], Dict[str, Tuple[pd.DataFrame, Iterable
 
     required = (source_cfg or {}).get("required", True)
     if control_files:
-        volumen_df, caudal_df = _procesar_control(control_files[0], sheet_config=(source_cfg or {}).get("sheets"))
+        with timed("parse", control_files[0].name, stage="hidrologia_control"):
+            volumen_df, caudal_df = _procesar_control(control_files[0], sheet_config=(source_cfg or {}).get("sheets"))
         files_read.append(control_files[0])
     elif required:
         raise FileNotFoundError(f"No se encontró archivo de hidrología control en {DATA_LANDING}")
@@ -438,7 +429,8 @@ def run_hidrologia() -> Tuple[List[Path], Dict[str, Tuple[pd.DataFrame, Iterable
 
     if represas_files:
         sheet = (represas_cfg or {}).get("sheet", "INFORMEDIARIO")
-        represas_df = _procesar_represas(represas_files[0], sheet_name=sheet)
+        with timed("parse", represas_files[0].name, stage="hidrologia_represas"):
+            represas_df = _procesar_represas(represas_files[0], sheet_name=sheet)
         files_read.append(represas_files[0])
     elif represas_required:
         raise FileNotFoundError(f"No se encontró archivo de represas en {DATA_LANDING}")
@@ -446,7 +438,9 @@ def run_hidrologia() -> Tuple[List[Path], Dict[str, Tuple[pd.DataFrame, Iterable
         represas_df["periodo"] = pd.Series(dtype=str)
 
     represas_df = apply_table_rules("represas_diario", represas_df)
-    validate_and_write("represas_diario", represas_df, DATA_MART / OUTPUT_FILES["represas_diario"])
+    # El reporte del día se acumula en el histórico anual; la tabla publicada es el histórico completo.
+    upsert_represas(represas_df, mart_dir=DATA_MART)
+    represas_df = write_represas_consolidado(mart_dir=DATA_MART)
     datasets["represas_diario"] = (represas_df, ["fecha", "reservorio"])
 
     return files_read, datasets
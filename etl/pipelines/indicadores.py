@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+"""Indicadores de planta desde la generación 15 min.
+
+Etapa derivada que escribe dos tablas chicas para el dashboard:
+
+- ``indicadores_15min_diario``: una fila por día y central/unidad.
+- ``indicadores_15min_mensual``: una fila por periodo y central/unidad.
+
+``nivel`` indica si la fila es de una ``unidad`` o del total de la
+``central``, que suma sus unidades en cada intervalo. Las medidas son:
+
+- energía (MWh), intervalos con dato y horas con generación cero u operando;
+- potencia pico (MW medio del mejor intervalo de 15 min);
+- rampas entre intervalos consecutivos (subida y bajada máximas, media absoluta);
+- para centrales con ``potencia_mw`` en ``data_reference/centrales_egasa.csv``,
+  ``factor_planta`` = energía / (potencia · horas del periodo).
+
+``disponibilidad`` es la fracción de horas del periodo con generación mayor a
+cero. Es una aproximación: no hay registro de indisponibilidades, así que una
+unidad disponible pero sin despacho cuenta como no disponible.
+
+Cada partición (un mes) se procesa de una vez con operaciones vectorizadas.
+Igual que en :mod:`etl.pipelines.rollups`, solo se recalculan los periodos
+actualizados por la corrida.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..aggregate import list_partitions
+from ..config import DATA_MART, DATA_REFERENCE, OUTPUT_FILES
+from ..utils_io import validate_and_write
+from .rollups import pending_periods
+
+logger = logging.getLogger(__name__)
+
+INTERVAL = pd.Timedelta(minutes=15)
+HOURS_PER_INTERVAL = 0.25
+UNIT_KEYS = ["central_id", "central", "unidad"]
+TABLE_KEYS = ["nivel", *UNIT_KEYS]
+
+Datasets = Dict[str, Tuple[pd.DataFrame, List[str]]]
+
+
+def read_intervals(path: Path) -> pd.DataFrame:
+    """Intervalos de una partición (claves como texto, sin nulos en las claves)."""
+
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [c for c in ("fecha_hora", *UNIT_KEYS, "energia_mwh") if c in header]
+    df = pd.read_csv(path, usecols=usecols, dtype={c: str for c in UNIT_KEYS if c in usecols}, low_memory=False)
+    for col in UNIT_KEYS:
+        if col not in df.columns:
+            df[col] = ""
+    df["fecha_hora"] = pd.to_datetime(df["fecha_hora"], format="ISO8601", errors="coerce")
+    df["energia_mwh"] = pd.to_numeric(df["energia_mwh"], errors="coerce")
+    df = df.dropna(subset=["fecha_hora"])
+    df[UNIT_KEYS] = df[UNIT_KEYS].fillna("")
+    return df
+
+
+def central_intervals(df: pd.DataFrame) -> pd.DataFrame:
+    """Suma de las unidades de cada central por intervalo."""
+
+    out = df.groupby(["central_id", "central", "fecha_hora"], sort=False, observed=True)["energia_mwh"].sum(min_count=1).reset_index()
+    out["unidad"] = ""
+    return out
+
+
+def interval_metrics(df: pd.DataFrame, grain: str, keys: List[str] = UNIT_KEYS) -> pd.DataFrame:
+    """Indicadores por ``keys`` + ``grain`` (``fecha`` o ``periodo``) sin bucles por serie."""
+
+    df = df.assign(_g=df.groupby(keys, sort=False, dropna=False).ngroup()).sort_values(["_g", "fecha_hora"], kind="stable")
+    mw = df["energia_mwh"].to_numpy(dtype=float) / HOURS_PER_INTERVAL
+    g = df["_g"].to_numpy()
+    ts = df["fecha_hora"].to_numpy()
+
+    # rampa solo entre intervalos consecutivos (15 min) de la misma serie
+    ramp = np.full(len(df), np.nan)
+    if len(df) > 1:
+        consecutive = (g[1:] == g[:-1]) & (ts[1:] - ts[:-1] == INTERVAL.to_timedelta64())
+        ramp[1:] = np.where(consecutive, mw[1:] - mw[:-1], np.nan)
+
+    # se agrupa por enteros (serie, día o periodo); las claves de texto se unen al final
+    work = pd.DataFrame({"_g": g}, index=df.index)
+    if grain == "fecha":
+        work["_t"] = df["fecha_hora"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    else:
+        work["_t"] = (df["fecha_hora"].dt.year * 100 + df["fecha_hora"].dt.month).to_numpy()
+    work["energia_mwh"] = df["energia_mwh"].to_numpy()
+    work["mw"] = mw
+    work["cero"] = mw <= 0
+    work["opera"] = mw > 0
+    work["subida"] = np.where(ramp > 0, ramp, 0.0)
+    work["bajada"] = np.where(ramp < 0, -ramp, 0.0)
+    work["rampa_abs"] = np.abs(ramp)
+    work.loc[np.isnan(ramp), ["subida", "bajada"]] = np.nan
+    work.loc[np.isnan(mw), ["cero", "opera"]] = False
+
+    out = work.groupby(["_g", "_t"], sort=True).agg(
+        energia_mwh=("energia_mwh", "sum"),
+        intervalos=("mw", "count"),
+        horas_cero=("cero", "sum"),
+        horas_operacion=("opera", "sum"),
+        pico_mw=("mw", "max"),
+        rampa_subida_max_mw=("subida", "max"),
+        rampa_bajada_max_mw=("bajada", "max"),
+        rampa_abs_media_mw=("rampa_abs", "mean"),
+    )
+    out[["horas_cero", "horas_operacion"]] = out[["horas_cero", "horas_operacion"]] * HOURS_PER_INTERVAL
+    out = out.reset_index()
+
+    series = df.drop_duplicates("_g").set_index("_g")[keys]
+    out = series.reindex(out["_g"]).reset_index(drop=True).join(out)
+    if grain == "fecha":
+        fecha = pd.to_datetime(out["_t"], unit="D")
+        out.insert(0, "fecha", fecha.dt.strftime("%Y-%m-%d"))
+        out.insert(0, "periodo", (fecha.dt.year * 100 + fecha.dt.month).astype(str))
+    else:
+        out.insert(0, "periodo", out["_t"].astype(str))
+    return out.drop(columns=["_g", "_t"])
+
+
+def partition_metrics(intervals: pd.DataFrame, potencia: pd.Series) -> Dict[str, pd.DataFrame]:
+    """Indicadores diarios y mensuales de una partición (unidades y centrales)."""
+
+    centrales = central_intervals(intervals)
+    days = intervals["fecha_hora"].dt.normalize()
+    covered = (days.max() - days.min()).days + 1 if len(days) else 0
+    out = {}
+    for grain in ("fecha", "periodo"):
+        frames = []
+        for nivel, df in (("unidad", intervals), ("central", centrales)):
+            metrics = interval_metrics(df, grain).assign(nivel=nivel)
+            # 24 h por día; el mes cuenta los días que cubre la partición (puede estar en curso)
+            metrics["horas_periodo"] = 24.0 if grain == "fecha" else covered * 24.0
+            if nivel == "central":
+                metrics["potencia_mw"] = metrics["central_id"].map(potencia)
+                metrics["factor_planta"] = metrics["energia_mwh"] / (metrics["potencia_mw"] * metrics["horas_periodo"])
+            frames.append(metrics)
+        table = pd.concat(frames, ignore_index=True)
+        table["disponibilidad"] = table["horas_operacion"] / table["horas_periodo"]
+        out[grain] = table
+    return out
+
+
+def _potencia() -> Tuple[pd.Series, List[Path]]:
+    path = DATA_REFERENCE / "centrales_egasa.csv"
+    if not path.exists():
+        return pd.Series(dtype=float), []
+    ref = pd.read_csv(path, dtype={"central_id": str})
+    return pd.to_numeric(ref.set_index("central_id")["potencia_mw"], errors="coerce"), [path]
+
+
+def _order(df: pd.DataFrame, keys: List[str]) -> pd.DataFrame:
+    columns = [
+        *keys,
+        "energia_mwh",
+        "intervalos",
+        "horas_periodo",
+        "horas_operacion",
+        "horas_cero",
+        "disponibilidad",
+        "potencia_mw",
+        "factor_planta",
+        "pico_mw",
+        "rampa_subida_max_mw",
+        "rampa_bajada_max_mw",
+        "rampa_abs_media_mw",
+    ]
+    df = df.reindex(columns=columns)
+    return df.sort_values(keys, ignore_index=True, na_position="last")
+
+
+def run_indicadores(datasets: Datasets) -> Tuple[List[Path], Datasets]:
+    """Actualizar los indicadores diarios y mensuales con los periodos 15 min de la corrida."""
+
+    potencia, files = _potencia()
+    tables = {"fecha": "indicadores_15min_diario", "periodo": "indicadores_15min_mensual"}
+    keys = {"fecha": ["periodo", "fecha", *TABLE_KEYS], "periodo": ["periodo", *TABLE_KEYS]}
+
+    kept, pending = {}, set()
+    for grain, name in tables.items():
+        kept[grain], todo = pending_periods(DATA_MART / OUTPUT_FILES[name], datasets, keys[grain])
+        pending.update(todo)
+
+    fresh: Dict[str, List[pd.DataFrame]] = {grain: [] for grain in tables}
+    partitions = list_partitions(DATA_MART, periods=sorted(pending))
+    for path in partitions:
+        for grain, df in partition_metrics(read_intervals(path), potencia).items():
+            fresh[grain].append(df)
+
+    out: Datasets = {}
+    for grain, name in tables.items():
+        previous = kept[grain][~kept[grain]["periodo"].isin(pending)]
+        frames = [df for df in (previous, *fresh[grain]) if not df.empty]
+        table = _order(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(), keys[grain])
+        validate_and_write(name, table, DATA_MART / OUTPUT_FILES[name])
+        out[name] = (table, keys[grain])
+    logger.info("Indicadores 15min: %s periodos recalculados", len(partitions))
+    return files + partitions, out
+
+
+__all__ = ["interval_metrics", "partition_metrics", "read_intervals", "run_indicadores"]
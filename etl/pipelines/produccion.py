@@ -4,19 +4,37 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
 import re
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
 
+import numpy as np
 import pandas as pd
 
 from ..config import DATA_LANDING, DATA_MART, DATA_REFERENCE, LANDING_FILES, OUTPUT_FILES, get_source
+from ..profiling import timed
 from ..utils_cleaning import load_centrales_reference, map_central_id
-from ..utils_io import detect_header_row, list_matching_files, validate_and_write, safe_write_csv
+from ..utils_io import (
+    detect_header_row,
+    excel_file,
+    list_matching_files,
+    open_sheet_stream,
+    parse_files_cached,
+    read_excel,
+    read_numeric_block,
+    safe_write_csv,
+    validate_and_write,
+)
+from .anomalias import run_anomalias
+from .cobertura import adds_intervals, build_index, index_path, read_index, run_cobertura, write_index
 
 logger = logging.getLogger(__name__)
 
+# Subir al cambiar la lógica de parseo 15-min para invalidar el cache por archivo.
+PARSER_VERSION = "2"
+
 
 CENTRALES_DEFAULT = [
     ("CH1", "CHARCANI I", "HIDRO", 1905, 1.76, "SUR"),
@@ -58,7 +76,7 @@ def ensure_centrales_reference() -> Path:
 def _process_historico(path: Path, centrales_df: pd.DataFrame) -> pd.DataFrame:
     """Procesar energía mensual desde Excel histórico."""
     try:
-        xls = pd.ExcelFile(path)
+        xls = excel_file(path)
     except Exception:
         logger.exception("No se pudo abrir histórico %s", path)
         raise
@@ -88,9 +106,9 @@ def _process_historico(path: Path, centrales_df: pd.DataFrame) -> pd.DataFrame:
         if year < 2010 or year > 2025:
             continue
 
-        preview = pd.read_excel(path, sheet_name=sheet, header=None, nrows=80)
+        preview = read_excel(xls, sheet_name=sheet, header=None, nrows=80)
         header_row = detect_header_row(preview, keywords=["central", "enero", "diciembre"])
-        df_sheet = pd.read_excel(path, sheet_name=sheet, header=header_row)
+        df_sheet = read_excel(xls, sheet_name=sheet, header=header_row)
         df_sheet = df_sheet.rename(columns=lambda c: str(c).strip().upper())
 
         if df_sheet.empty:
@@ -219,28 +237,56 @@ def _clean_header_str(x: object) -> str:
     return re.sub(r"\s+", " ", str(x).strip())
 
 
-def _process_15min(path: Path, centrales_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-    """Procesar archivos 15-min y retornarlos particionados por periodo real (YYYYMM)."""
-    df_raw = pd.read_excel(path, header=None)
-    if df_raw.empty or df_raw.shape[0] < 3:
-        logger.warning("Archivo 15min %s sin filas útiles", path)
-        return {}
+def _read_15min_stream(path: Path) -> Tuple[List[object], List[object], np.ndarray, np.ndarray] | None:
+    """Leer un archivo 15-min en streaming (``open_sheet_stream``).
+
+    Retorna ``(fila_centrales, fila_medidores, timestamps_raw, valores)``
+    donde ``valores`` es float64 ``[n_filas, n_columnas-1]``. Las filas de
+    header se resuelven al vuelo; con openpyxl el DOM completo nunca se carga
+    en memoria.
+    """
+    with open_sheet_stream(path) as ws:
+        rows = ws.iter_rows(values_only=True)
+        head: List[Tuple[object, ...]] = []
+        for row in rows:
+            head.append(row)
+            if len(head) == 12:
+                break
+        if len(head) < 3:
+            logger.warning("Archivo 15min %s sin filas útiles", path)
+            return None
+
+        # Intento de detectar si el archivo no empieza exactamente en fila 0
+        header_row = 0
+        a1 = head[0][0] if head[0] else None
+        if isinstance(a1, str) and "FECHA" not in a1.upper():
+            header_row = detect_header_row(pd.DataFrame(head), keywords=["fecha", "hora"])
+        head = head[header_row:]
+
+        if len(head) < 2:
+            head.extend(next(rows, ()) for _ in range(2 - len(head)))
+
+        # Fila 0 = grupos (centrales), fila 1 = medidores
+        central_row = list(head[0])
+        unidad_row = list(head[1])
+        width = max(len(central_row), len(unidad_row))
+        central_row += [None] * (width - len(central_row))
+
+        data_rows = itertools.chain(head[2:], rows)
+        timestamps_raw, values = read_numeric_block(data_rows, width, capacity=ws.max_row or 0)
+
+    if len(timestamps_raw) < 1:
+        logger.warning("Archivo 15min %s no tiene datos tras header", path)
+        return None
+    return central_row, unidad_row, timestamps_raw, values
 
-    # Intento de detectar si el archivo no empieza exactamente en fila 0
-    header_row = 0
-    a1 = df_raw.iloc[0, 0]
-    if isinstance(a1, str) and "FECHA" not in a1.upper():
-        header_row = detect_header_row(df_raw.head(12), keywords=["fecha", "hora"])
-    if header_row and header_row > 0:
-        df_raw = df_raw.iloc[header_row:].reset_index(drop=True)
 
-    if df_raw.shape[0] < 3:
-        logger.warning("Archivo 15min %s no tiene datos tras header", path)
+def _process_15min(path: Path, centrales_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Procesar archivos 15-min y retornarlos particionados por periodo real (YYYYMM)."""
+    stream = _read_15min_stream(path)
+    if stream is None:
         return {}
-
-    # Fila 0 = grupos (centrales), fila 1 = medidores
-    raw_central_row = df_raw.iloc[0].tolist()
-    unidad_row = df_raw.iloc[1].tolist() if df_raw.shape[0] > 1 else []
+    raw_central_row, unidad_row, timestamps_raw, values = stream
 
     # Forward-fill horizontal robusto (para evitar central_raw nan)
     cleaned_row: List[str] = []
@@ -303,47 +349,37 @@ def _process_15min(path: Path, centrales_df: pd.DataFrame) -> Dict[str, pd.DataF
             ignored[:10],
         )
 
-    # Datos desde fila 2
-    data = df_raw.iloc[2:].reset_index(drop=True)
-    data = data.rename(columns={0: "FECHA_HORA"})
-    data["FECHA_HORA"] = pd.to_datetime(data["FECHA_HORA"], errors="coerce")
-    if data["FECHA_HORA"].isna().all():
+    # Las horas son fórmulas (=A2+1/96) y arrastran error de punto flotante:
+    # cada motor redondea distinto el serial (20:44:59.999 vs 20:45:00).
+    fechas = pd.to_datetime(pd.Series(timestamps_raw, dtype=object), errors="coerce").dt.round("s")
+    if fechas.isna().all():
         logger.warning("No se pudieron parsear timestamps en %s", path)
         return {}
 
-    records: List[pd.DataFrame] = []
-    for info in col_info:
-        if info.get("tipo") != "dato":
-            continue
-
-        col_idx = int(info["col"])
-        series = pd.to_numeric(data.get(col_idx), errors="coerce")
-
-        # Primero filtrar valores útiles
-        mask = series.notna() & (series >= 0) & data["FECHA_HORA"].notna()
-        if not mask.any():
-            continue
-
-        tmp = pd.DataFrame(
-            {
-                "fecha_hora": data.loc[mask, "FECHA_HORA"],
-                "central": info["central"],
-                "central_raw": info["central_raw"],
-                "unidad": info["unidad"],
-                "energia_mwh": series.loc[mask] / 1000,
-            }
-        )
-
-        # Mapear central_id (ya no debería haber central vacía aquí)
-        mapped = map_central_id(tmp.copy(), centrales_df, source_col="central")
-        records.append(mapped)
-
-    records = [df for df in records if df is not None and not df.empty]
-    if not records:
+    cols = pd.DataFrame([info for info in col_info if info.get("tipo") == "dato"])
+    if cols.empty:
+        return {}
+    # central_id una vez por columna (no por fila)
+    cols = map_central_id(cols, centrales_df, source_col="central")
+
+    # Primero filtrar valores útiles; orden columna-mayor (igual al concat por columna)
+    vals = values[:, cols["col"].to_numpy(dtype=int) - 1]
+    with np.errstate(invalid="ignore"):
+        mask = ~np.isnan(vals) & (vals >= 0) & fechas.notna().to_numpy()[:, None]
+    col_pos, row_pos = np.nonzero(mask.T)
+    if not len(row_pos):
         return {}
 
-    df_all = pd.concat(records, ignore_index=True)
-    df_all = df_all.dropna(subset=["fecha_hora"])
+    df_all = pd.DataFrame(
+        {
+            "fecha_hora": fechas.to_numpy()[row_pos],
+            "central": cols["central"].to_numpy()[col_pos],
+            "central_raw": cols["central_raw"].to_numpy()[col_pos],
+            "unidad": cols["unidad"].to_numpy()[col_pos],
+            "energia_mwh": vals[row_pos, col_pos] / 1000,
+            "central_id": cols["central_id"].to_numpy()[col_pos],
+        }
+    )
     df_all["periodo"] = df_all["fecha_hora"].dt.strftime("%Y%m")
     df_all = df_all.dropna(subset=["periodo"])
     df_all = df_all.sort_values(["fecha_hora", "central", "unidad"])
@@ -375,7 +411,8 @@ def run_produccion() -> Tuple[pd.DataFrame, List[Path], Dict[str, Tuple[pd.DataF
         raise FileNotFoundError(f"No se encontró archivo histórico de producción en {DATA_LANDING}")
     historico_df = pd.DataFrame(columns=["central_id", "central", "anio", "mes", "periodo", "energia_mwh"])
     if historicos:
-        historico_df = _process_historico(historicos[0], centrales_df)
+        with timed("parse", historicos[0].name, stage="produccion_historica"):
+            historico_df = _process_historico(historicos[0], centrales_df)
         files_read.append(historicos[0])
 
     validate_and_write("generacion_mensual", historico_df, DATA_MART / OUTPUT_FILES["generacion_mensual"])
@@ -388,15 +425,37 @@ def run_produccion() -> Tuple[pd.DataFrame, List[Path], Dict[str, Tuple[pd.DataF
         raise FileNotFoundError(f"No se encontraron archivos 15min en {DATA_LANDING}")
     particiones: Dict[str, pd.DataFrame] = {}
 
-    for archivo in archivos_15:
+    # Parseo en paralelo (lector streaming, memoria acotada por archivo); el merge
+    # incremental por partición sigue siendo secuencial y en orden de archivo.
+    ref_hash = int(pd.util.hash_pandas_object(centrales_df, index=False).sum()) if not centrales_df.empty else 0
+    parsed_15 = parse_files_cached(
+        "produccion_15min",
+        archivos_15,
+        _process_15min,
+        (centrales_df,),
+        version=f"{PARSER_VERSION}-{ref_hash}",
+    )
+
+    # Índice de cobertura por partición: si el archivo no trae intervalos que
+    # falten, el merge (que conserva el dato previo) no cambiaría la partición.
+    indices: Dict[str, dict | None] = {}
+    omitidas = 0
+
+    for archivo, particiones_archivo in zip(archivos_15, parsed_15):
         files_read.append(archivo)
-        particiones_archivo = _process_15min(archivo, centrales_df)
 
         for periodo, df_part in particiones_archivo.items():
             existing_path = DATA_MART / OUTPUT_FILES["generacion_15min_template"].format(yyyymm=periodo)
 
+            if existing_path.exists() and periodo not in indices:
+                indices[periodo] = read_index(index_path(existing_path))
+            if existing_path.exists() and not adds_intervals(indices.get(periodo), df_part):
+                omitidas += 1
+                continue
+
             if existing_path.exists():
-                prev = pd.read_csv(existing_path, parse_dates=["fecha_hora"], low_memory=False)
+                prev = pd.read_csv(existing_path, low_memory=False)
+                prev["fecha_hora"] = pd.to_datetime(prev["fecha_hora"], format="ISO8601").dt.round("s")
             else:
                 prev = pd.DataFrame(columns=df_part.columns)
 
@@ -417,10 +476,22 @@ def run_produccion() -> Tuple[pd.DataFrame, List[Path], Dict[str, Tuple[pd.DataF
 
             validate_and_write(f"generacion_15min_{periodo}", merged, existing_path)
             particiones[periodo] = merged
+            indices[periodo] = build_index(merged)
+            if indices[periodo] is not None:
+                write_index(indices[periodo], index_path(existing_path))
+
+    if omitidas:
+        logger.info("Particiones 15min sin intervalos nuevos (merge omitido): %s", omitidas)
 
     for periodo, df_part in particiones.items():
         datasets[f"generacion_15min_{periodo}"] = (df_part, ["fecha_hora", "central_id", "unidad"])
 
+    # Anomalías sobre las particiones fusionadas (picos, valores planos, huecos)
+    if particiones:
+        with timed("anomalias", "generacion_15min", stage="produccion_15min"):
+            datasets["anomalias_15min"] = run_anomalias(particiones)
+        datasets["cobertura_15min"] = run_cobertura({periodo: indices[periodo] for periodo in particiones})
+
     return historico_df, files_read, datasets
 
 
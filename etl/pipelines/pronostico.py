@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+"""Pronóstico de la generación mensual por central.
+
+Modelo por central (y para ``TOTAL``, la suma de centrales)::
+
+    energia_mwh = alfa[mes] + beta_caudal · anomalía de caudal + beta_volumen · anomalía de volumen
+
+- ``alfa[mes]`` es la línea base estacional: la generación esperada en el
+  mes calendario con hidrología normal;
+- las anomalías son el caudal medio de las estaciones de
+  ``hidro_caudal_mensual`` y el volumen de la serie ``volumen_serie`` de
+  ``hidro_volumen_mensual``, ambos menos su media del mes calendario. Un
+  volumen ``<= 0`` se toma como mes sin reporte;
+- las centrales cuyo ``tipo`` en ``data_reference/centrales_egasa.csv`` no es
+  HIDRO ajustan solo la línea base.
+
+El ajuste es por mínimos cuadrados con las ecuaciones normales de todas las
+centrales resueltas juntas (``np.linalg.solve`` sobre un lote), con una
+regularización mínima para los meses sin datos. Usa los últimos
+``historia_meses`` y pronostica ``horizonte_meses`` después del último mes con
+generación, con las anomalías en cero (hidrología climatológica).
+
+Salidas:
+
+- ``pronostico_parametros``: por central, la línea base ``mes_01``..``mes_12``
+  (MWh), ``beta_caudal`` (MWh por m³/s) y ``beta_volumen`` (MWh por 000 m³),
+  el ajuste (``n_obs``, ``r2``, ``rmse_mwh``) y la ``huella`` de sus entradas;
+- ``pronostico_generacion_mensual``: por periodo y central, la generación
+  observada, la línea base, el pronóstico y su banda de ±1.96 · rmse.
+
+Solo se reajustan las centrales cuya ``huella`` cambió (su serie de
+generación, las covariables si las usa o la configuración); el resto conserva
+sus filas y ``ajustado_en``. El dashboard solo lee estas tablas.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import DATA_MART, DATA_REFERENCE, OUTPUT_FILES, forecast_settings
+from ..utils_io import validate_and_write
+from ._common import central_types, mart_table
+
+logger = logging.getLogger(__name__)
+
+Datasets = Dict[str, Tuple[pd.DataFrame, List[str]]]
+
+# sube si cambia el modelo: invalida todas las huellas
+MODEL_VERSION = 1
+TOTAL_ID = "TOTAL"
+COVARIATES = ["caudal_m3s", "volumen_000m3"]
+RIDGE = 1e-6
+Z_BANDA = 1.96
+MESES = [f"mes_{m:02d}" for m in range(1, 13)]
+PARAM_COLUMNS = [
+    "central_id",
+    "central",
+    "usa_hidrologia",
+    *MESES,
+    "beta_caudal",
+    "beta_volumen",
+    "n_obs",
+    "r2",
+    "rmse_mwh",
+    "desde",
+    "hasta",
+    "huella",
+    "ajustado_en",
+]
+FORECAST_KEYS = ["periodo", "central_id"]
+FORECAST_COLUMNS = [
+    *FORECAST_KEYS,
+    "central",
+    "tipo",
+    "energia_mwh",
+    "linea_base_mwh",
+    "pronostico_mwh",
+    "pronostico_inf_mwh",
+    "pronostico_sup_mwh",
+    "caudal_anomalia",
+    "volumen_anomalia",
+]
+
+
+def generation_matrix(gen: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    """Generación ``periodo × central`` (más la columna ``TOTAL``) y el nombre de cada central.
+
+    Termina en el último mes con generación.
+    """
+
+    g = gen.dropna(subset=["central_id", "periodo"])
+    g = g.assign(periodo=pd.to_numeric(g["periodo"]).astype(int), central_id=g["central_id"].astype(str))
+    wide = g.pivot_table(index="periodo", columns="central_id", values="energia_mwh", aggfunc="sum")
+    wide[TOTAL_ID] = wide.sum(axis=1, min_count=1)
+    # un mes con toda la flota en 0 es un mes sin reporte, no una parada
+    wide[wide[TOTAL_ID].fillna(0) <= 0] = np.nan
+    wide = wide.loc[: wide[TOTAL_ID].last_valid_index()] if wide[TOTAL_ID].notna().any() else wide.iloc[:0]
+    nombres = g.groupby("central_id")["central"].first().astype(str)
+    nombres[TOTAL_ID] = "Total EGASA"
+    return wide, nombres
+
+
+def covariates(caudal: pd.DataFrame, volumen: pd.DataFrame, volumen_serie: str) -> pd.DataFrame:
+    """Caudal medio de las estaciones y volumen de ``volumen_serie`` por periodo."""
+
+    out = []
+    if not caudal.empty:
+        c = caudal.assign(periodo=pd.to_numeric(caudal["periodo"], errors="coerce"), caudal_m3s=pd.to_numeric(caudal["caudal_m3s"], errors="coerce"))
+        out.append(c.dropna(subset=["periodo"]).groupby(c["periodo"].dropna().astype(int))["caudal_m3s"].mean())
+    if not volumen.empty:
+        v = volumen[volumen["reservorio"].astype(str).str.strip() == volumen_serie]
+        v = v.assign(periodo=pd.to_numeric(v["periodo"], errors="coerce"), volumen_000m3=pd.to_numeric(v["volumen_000m3"], errors="coerce"))
+        v = v.dropna(subset=["periodo"])
+        # 0 en la serie total marca meses sin reporte
+        out.append(v.groupby(v["periodo"].astype(int))["volumen_000m3"].mean().where(lambda s: s > 0))
+    cov = pd.concat(out, axis=1) if out else pd.DataFrame()
+    return cov.reindex(columns=COVARIATES)
+
+
+def _anomalies(cov: pd.DataFrame, grid: pd.Index) -> pd.DataFrame:
+    """Covariables menos su media del mes calendario, sobre la grilla de periodos (NaN sin dato)."""
+
+    if cov.empty:
+        return pd.DataFrame(np.nan, index=grid, columns=COVARIATES)
+    # climatología sobre toda la historia de la covariable, no solo la de la generación
+    anomalies = cov - cov.groupby(cov.index.to_numpy() % 100).transform("mean")
+    return anomalies.reindex(grid)
+
+
+def fingerprint(y: pd.Series, cov: pd.DataFrame | None, settings: Mapping[str, Any], origin: int) -> str:
+    """Huella de las entradas de una central: su serie, las covariables (si las usa) y la configuración.
+
+    ``origin`` es el último periodo de la grilla: la ventana de ``historia_meses``
+    y los meses pronosticados dependen de él aunque la serie de la central no
+    cambie (p. ej. cuando otra central reporta un mes más).
+    """
+
+    h = hashlib.sha1(f"{MODEL_VERSION}|{origin}|{json.dumps(settings, sort_keys=True, default=str)}".encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(y.dropna(), index=True).to_numpy().tobytes())
+    if cov is not None:
+        h.update(pd.util.hash_pandas_object(cov, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def fit_models(y: pd.DataFrame, anomalies: pd.DataFrame, hydro: np.ndarray, train: np.ndarray) -> Dict[str, np.ndarray]:
+    """Ajustar todas las columnas de ``y`` (periodo × central) en un solo lote.
+
+    ``hydro`` (por central) indica si usa las covariables y ``train`` (por
+    periodo) qué periodos entran al ajuste. Devuelve coeficientes
+    (centrales × 14), ajustes sobre toda la grilla y métricas por central.
+    """
+
+    periods = y.index.to_numpy()
+    dummies = (periods[:, None] % 100 == np.arange(1, 13)[None, :]).astype(float)
+    anom = anomalies.reindex(y.index).to_numpy(dtype=float)
+    scale = pd.DataFrame(anom[train]).std(ddof=0).to_numpy()
+    scale = np.where(np.isfinite(scale) & (scale > 0), scale, 1.0)
+    z = anom / scale
+
+    # diseño por central: dummies de mes + anomalías (en cero para centrales sin hidrología)
+    Y = y.to_numpy(dtype=float).T  # (c, t)
+    X = np.broadcast_to(np.concatenate([dummies, np.nan_to_num(z)], axis=1), (len(hydro), len(periods), 14)).copy()
+    X[~hydro, :, 12:] = 0.0
+    W = (np.isfinite(Y) & train[None, :]).astype(float)
+    W[hydro] *= np.isfinite(z).all(axis=1)[None, :]
+
+    A = np.einsum("ct,ctk,ctj->ckj", W, X, X) + RIDGE * np.eye(14)[None]
+    b = np.einsum("ct,ctk,ct->ck", W, X, np.nan_to_num(Y))
+    coef = np.linalg.solve(A, b[..., None])[..., 0]
+
+    fitted = np.einsum("ctk,ck->ct", X, coef)
+    baseline = dummies @ coef[:, :12].T  # (t, c)
+    n_obs = W.sum(axis=1)
+    resid = np.where(W > 0, np.nan_to_num(Y) - fitted, 0.0)
+    sse = (resid**2).sum(axis=1)
+    mean_y = np.where(n_obs > 0, (W * np.nan_to_num(Y)).sum(axis=1) / np.maximum(n_obs, 1), np.nan)
+    sst = (W * (np.nan_to_num(Y) - mean_y[:, None]) ** 2).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r2 = np.where(sst > 0, 1 - sse / sst, np.nan)
+        rmse = np.where(n_obs > 14, np.sqrt(sse / np.maximum(n_obs - 14, 1)), np.sqrt(sse / np.maximum(n_obs, 1)))
+    betas = coef[:, 12:] / scale[None, :]
+    return {"coef": np.concatenate([coef[:, :12], betas], axis=1), "fitted": fitted.T, "baseline": baseline, "n_obs": n_obs, "r2": r2, "rmse": rmse}
+
+
+def forecast(
+    gen: pd.DataFrame,
+    caudal: pd.DataFrame,
+    volumen: pd.DataFrame,
+    tipos: pd.Series,
+    settings: Mapping[str, Any],
+    only: List[str] | None = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Parámetros y pronósticos de las centrales de ``gen`` (o solo de ``only``)."""
+
+    wide, nombres = generation_matrix(gen)
+    if wide.empty:
+        return pd.DataFrame(columns=PARAM_COLUMNS), pd.DataFrame(columns=FORECAST_COLUMNS)
+    if only is not None:
+        wide = wide[[c for c in wide.columns if c in only]]
+
+    last = pd.Period(str(wide.index.max()), "M")
+    future = pd.period_range(last + 1, periods=int(settings["horizonte_meses"]), freq="M")
+    grid = pd.Index(wide.index.tolist() + [int(p.strftime("%Y%m")) for p in future], name="periodo")
+    y = wide.reindex(grid)
+    anomalies = _anomalies(covariates(caudal, volumen, str(settings["volumen_serie"])), grid)
+
+    historia = pd.period_range(end=last, periods=int(settings["historia_meses"]), freq="M")
+    train = grid.isin([int(p.strftime("%Y%m")) for p in historia])
+    hydro = np.array([c == TOTAL_ID or tipos.get(c, "HIDRO") == "HIDRO" for c in y.columns]) if len(tipos) else np.ones(y.shape[1], bool)
+    fit = fit_models(y, anomalies, hydro, train)
+
+    params = pd.DataFrame(fit["coef"], columns=[*MESES, "beta_caudal", "beta_volumen"])
+    params.insert(0, "usa_hidrologia", hydro)
+    params.insert(0, "central", nombres.reindex(y.columns).to_numpy())
+    params.insert(0, "central_id", list(y.columns))
+    params["n_obs"] = fit["n_obs"].astype(int)
+    params["r2"], params["rmse_mwh"] = fit["r2"], fit["rmse"]
+    params["desde"], params["hasta"] = int(historia[0].strftime("%Y%m")), int(last.strftime("%Y%m"))
+
+    rows = pd.DataFrame(
+        {
+            "periodo": np.repeat(grid.to_numpy(), y.shape[1]),
+            "central_id": np.tile(y.columns.to_numpy(), len(grid)),
+            "energia_mwh": y.to_numpy().ravel(),
+            "linea_base_mwh": fit["baseline"].ravel(),
+            "pronostico_mwh": fit["fitted"].ravel(),
+            "caudal_anomalia": np.repeat(anomalies["caudal_m3s"].to_numpy(), y.shape[1]),
+            "volumen_anomalia": np.repeat(anomalies["volumen_000m3"].to_numpy(), y.shape[1]),
+        }
+    )
+    rows["central"] = rows["central_id"].map(nombres)
+    rows["tipo"] = np.where(rows["periodo"] > int(last.strftime("%Y%m")), "pronostico", "historico")
+    banda = rows["central_id"].map(params.set_index("central_id")["rmse_mwh"]) * Z_BANDA
+    rows["pronostico_inf_mwh"] = rows["pronostico_mwh"] - banda
+    rows["pronostico_sup_mwh"] = rows["pronostico_mwh"] + banda
+    sin_hidro = ~rows["central_id"].map(dict(zip(params["central_id"], hydro)))
+    rows.loc[sin_hidro, ["caudal_anomalia", "volumen_anomalia"]] = np.nan
+    return params, rows[FORECAST_COLUMNS]
+
+
+def run_pronostico(datasets: Datasets) -> Tuple[List[Path], Datasets]:
+    """Reajustar las centrales con entradas nuevas y escribir parámetros y pronósticos."""
+
+    cfg = forecast_settings()
+    params_path = DATA_MART / OUTPUT_FILES["pronostico_parametros"]
+    forecast_path = DATA_MART / OUTPUT_FILES["pronostico_generacion_mensual"]
+    files = [DATA_REFERENCE / "centrales_egasa.csv"] if (DATA_REFERENCE / "centrales_egasa.csv").exists() else []
+
+    gen = mart_table(datasets, "generacion_mensual")
+    caudal = mart_table(datasets, "hidro_caudal_mensual")
+    volumen = mart_table(datasets, "hidro_volumen_mensual")
+    tipos = central_types()
+
+    huellas: Dict[str, str] = {}
+    if not gen.empty:
+        wide, _nombres = generation_matrix(gen)
+        cov = covariates(caudal, volumen, str(cfg["volumen_serie"]))
+        for central in wide.columns:
+            usa = central == TOTAL_ID or not len(tipos) or tipos.get(central, "HIDRO") == "HIDRO"
+            huellas[central] = fingerprint(wide[central], cov if usa else None, {**cfg, "tipo": tipos.get(central)}, int(wide.index.max()))
+
+    prev_params = pd.read_csv(params_path, dtype={"central_id": str}) if params_path.exists() else pd.DataFrame(columns=PARAM_COLUMNS)
+    prev_rows = pd.read_csv(forecast_path, dtype={"central_id": str}) if forecast_path.exists() else pd.DataFrame(columns=FORECAST_COLUMNS)
+    previas = dict(zip(prev_params["central_id"], prev_params["huella"]))
+    changed = [c for c, h in huellas.items() if previas.get(c) != h or not (prev_rows["central_id"] == c).any()]
+
+    params, rows = forecast(gen, caudal, volumen, tipos, cfg, only=changed) if changed else (pd.DataFrame(columns=PARAM_COLUMNS), pd.DataFrame(columns=FORECAST_COLUMNS))
+    if not params.empty:
+        params["huella"] = params["central_id"].map(huellas)
+        params["ajustado_en"] = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
+
+    kept = [c for c in huellas if c not in changed]
+    params_frames = [df for df in (prev_params[prev_params["central_id"].isin(kept)], params) if not df.empty]
+    rows_frames = [df for df in (prev_rows[prev_rows["central_id"].isin(kept)], rows) if not df.empty]
+    params_table = pd.concat(params_frames, ignore_index=True) if params_frames else pd.DataFrame(columns=PARAM_COLUMNS)
+    rows_table = pd.concat(rows_frames, ignore_index=True) if rows_frames else pd.DataFrame(columns=FORECAST_COLUMNS)
+    params_table = params_table.reindex(columns=PARAM_COLUMNS).sort_values("central_id", ignore_index=True)
+    rows_table = rows_table.reindex(columns=FORECAST_COLUMNS).sort_values(FORECAST_KEYS, ignore_index=True)
+
+    validate_and_write("pronostico_parametros", params_table, params_path)
+    validate_and_write("pronostico_generacion_mensual", rows_table, forecast_path)
+    logger.info("Pronóstico de generación: %s centrales reajustadas, %s sin cambios", len(changed), len(kept))
+    return files, {
+        "pronostico_parametros": (params_table, ["central_id"]),
+        "pronostico_generacion_mensual": (rows_table, FORECAST_KEYS),
+    }
+
+
+__all__ = ["FORECAST_KEYS", "covariates", "fingerprint", "fit_models", "forecast", "generation_matrix", "run_pronostico"]
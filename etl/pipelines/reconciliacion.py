@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""Conciliación mensual de la generación entre fuentes independientes.
+
+Hay tres fuentes de generación mensual que nadie contrasta:
+
+- la suma de los intervalos 15 min, tomada del resumen
+  ``generacion_15min_mensual`` (:mod:`etl.pipelines.rollups`), así la
+  conciliación nunca recorre las particiones 15 min;
+- ``generacion_mensual`` del libro histórico;
+- ``balance_perfil_mensual``, PRODUCCION HIDRAULICA / TERMICA.
+
+``reconciliacion_mensual`` las lleva a un grano común por periodo:
+
+- ``nivel = central``: cada ``central_id``, 15 min frente al histórico;
+- ``nivel = tecnologia``: las centrales sumadas por ``tipo`` de
+  ``data_reference/centrales_egasa.csv`` (HIDRO / TERMICA), 15 min frente al
+  histórico e histórico frente al balance.
+
+Una diferencia está en tolerancia si ``|dif| <= max(tolerancia_mwh,
+tolerancia_pct · |referencia|)`` (sección ``reconciliacion`` de
+``config.yml``). ``estado`` resume la fila: ``ok``, ``diferencia``,
+``incompleto`` (la cobertura 15 min del mes está bajo ``cobertura_min``, por
+ejemplo un mes en curso) o ``sin_comparacion`` (hay una sola fuente).
+
+Solo se reemplazan los periodos cuya conciliación cambió; el resto conserva
+su fila y su ``revisado_en``.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config import DATA_MART, DATA_REFERENCE, OUTPUT_FILES, reconciliation_settings
+from ..utils_io import validate_and_write
+from ._common import central_types, mart_table
+
+logger = logging.getLogger(__name__)
+
+Datasets = Dict[str, Tuple[pd.DataFrame, List[str]]]
+
+RECONCILIATION_KEYS = ["periodo", "nivel", "clave"]
+SOURCES = ["energia_15min_mwh", "energia_historico_mwh", "energia_balance_mwh"]
+# concepto del balance Perfil por ``tipo`` de central
+BALANCE_CONCEPTOS = {"HIDRO": "PRODUCCION HIDRAULICA", "TERMICA": "PRODUCCION TERMICA"}
+COLUMNS = [
+    *RECONCILIATION_KEYS,
+    "nombre",
+    *SOURCES,
+    "cobertura_15min",
+    "dif_15min_historico_mwh",
+    "dif_15min_historico_pct",
+    "tolerancia_15min_historico_mwh",
+    "dif_historico_balance_mwh",
+    "dif_historico_balance_pct",
+    "tolerancia_historico_balance_mwh",
+    "estado",
+    "revisado_en",
+]
+
+
+def monthly_sources(rollup: pd.DataFrame, mensual: pd.DataFrame, balance: pd.DataFrame, tipos: pd.Series) -> pd.DataFrame:
+    """Energía de cada fuente por periodo y central/tecnología (una columna por fuente)."""
+
+    frames, names = [], []
+    if not mensual.empty:
+        m = mensual.dropna(subset=["central_id"])
+        m = m.assign(periodo=m["periodo"].astype(str), central_id=m["central_id"].astype(str))
+        hist = m.groupby(["periodo", "central_id"], observed=True).agg(nombre=("central", "first"), energia_historico_mwh=("energia_mwh", "sum"))
+        names.append(hist.pop("nombre"))
+        frames.append(hist)
+    if not rollup.empty:
+        r = rollup.assign(periodo=rollup["periodo"].astype(str), central_id=rollup["central_id"].astype(str))
+        r = r.assign(_esperados=pd.to_datetime(r["periodo"], format="%Y%m").dt.days_in_month * 96)
+        quince = r.groupby(["periodo", "central_id"], observed=True).agg(
+            nombre=("central", "first"),
+            energia_15min_mwh=("energia_mwh_sum", "sum"),
+            _intervalos=("energia_mwh_count", "sum"),
+            _esperados=("_esperados", "sum"),
+        )
+        quince["cobertura_15min"] = quince.pop("_intervalos") / quince.pop("_esperados")
+        names.append(quince.pop("nombre"))
+        frames.append(quince)
+    if not frames:
+        return pd.DataFrame(columns=[*RECONCILIATION_KEYS, "nombre", *SOURCES, "cobertura_15min"])
+
+    # nombre del histórico si existe; si no, el de los 15 min
+    nombre = pd.concat(names)
+    centrales = pd.concat(frames, axis=1).assign(nombre=nombre[~nombre.index.duplicated()])
+    centrales = centrales.reset_index().rename(columns={"central_id": "clave"}).assign(nivel="central")
+
+    # tecnología: suma de centrales por tipo (sin tipo conocido no entra) y el balance Perfil
+    tec = centrales.assign(clave=centrales["clave"].map(tipos)).dropna(subset=["clave"])
+    tec = tec[tec["clave"].isin(list(BALANCE_CONCEPTOS))]
+    tec = tec.groupby(["periodo", "clave"]).agg(
+        energia_15min_mwh=("energia_15min_mwh", lambda s: s.sum(min_count=1)),
+        energia_historico_mwh=("energia_historico_mwh", lambda s: s.sum(min_count=1)),
+        cobertura_15min=("cobertura_15min", "min"),
+    )
+    if not balance.empty:
+        b = balance.assign(periodo=balance["periodo"].astype(str), concepto=balance["concepto"].astype(str).str.upper())
+        b = b[b["concepto"].isin(BALANCE_CONCEPTOS.values())]
+        b = b.assign(clave=b["concepto"].map({v: k for k, v in BALANCE_CONCEPTOS.items()}))
+        tec = tec.join(b.groupby(["periodo", "clave"])["energia_mwh"].sum().rename("energia_balance_mwh"), how="outer")
+    tec = tec.reset_index().assign(nivel="tecnologia")
+    tec["nombre"] = tec["clave"].map(BALANCE_CONCEPTOS)
+
+    out = pd.concat([centrales, tec], ignore_index=True)
+    return out.reindex(columns=[*RECONCILIATION_KEYS, "nombre", *SOURCES, "cobertura_15min"])
+
+
+def reconcile(sources: pd.DataFrame, settings: Mapping[str, Any] | None = None) -> pd.DataFrame:
+    """Diferencias, tolerancias y ``estado`` por fila (sin bucles por fila)."""
+
+    cfg = {**reconciliation_settings(), **(settings or {})}
+    out = sources.copy()
+    tol_mwh, tol_pct = float(cfg["tolerancia_mwh"]), float(cfg["tolerancia_pct"]) / 100
+
+    flags = []
+    for left, right, name in (
+        ("energia_15min_mwh", "energia_historico_mwh", "15min_historico"),
+        ("energia_historico_mwh", "energia_balance_mwh", "historico_balance"),
+    ):
+        dif = out[left] - out[right]
+        out[f"dif_{name}_mwh"] = dif
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[f"dif_{name}_pct"] = np.where(out[right].abs() > 0, dif / out[right].abs() * 100, np.nan)
+        out[f"tolerancia_{name}_mwh"] = np.maximum(tol_mwh, tol_pct * out[right].abs())
+        flags.append((dif.abs() > out[f"tolerancia_{name}_mwh"]).to_numpy() & dif.notna().to_numpy())
+
+    compared = out[["dif_15min_historico_mwh", "dif_historico_balance_mwh"]].notna().any(axis=1).to_numpy()
+    partial = (out["cobertura_15min"] < float(cfg["cobertura_min"])).to_numpy()
+    out["estado"] = np.select(
+        [~compared, partial, flags[0] | flags[1]],
+        ["sin_comparacion", "incompleto", "diferencia"],
+        default="ok",
+    )
+    return out
+
+
+def _changed_periods(previous: pd.DataFrame, fresh: pd.DataFrame) -> set:
+    """Periodos cuyas filas (claves, fuentes o resultado) difieren de la tabla previa."""
+
+    compare = [c for c in COLUMNS if c not in ("revisado_en", "nombre")]
+    prev = previous.reindex(columns=compare).set_index(RECONCILIATION_KEYS)
+    new = fresh.reindex(columns=compare).set_index(RECONCILIATION_KEYS)
+    both = prev.join(new, how="outer", lsuffix="_prev", rsuffix="_new", sort=False)
+    differs = pd.Series(False, index=both.index)
+    for col in compare[len(RECONCILIATION_KEYS):]:
+        a, b = both[f"{col}_prev"], both[f"{col}_new"]
+        if a.dtype.kind in "fi" and b.dtype.kind in "fi":
+            same = np.isclose(a, b, rtol=1e-9, atol=1e-6, equal_nan=True)
+        else:
+            same = (a.astype(str) == b.astype(str)).to_numpy()
+        differs |= ~same
+    return set(both.index[differs.to_numpy()].get_level_values("periodo"))
+
+
+def run_reconciliacion(datasets: Datasets) -> Tuple[List[Path], Datasets]:
+    """Actualizar ``reconciliacion_mensual`` con los periodos cuyas fuentes cambiaron."""
+
+    path = DATA_MART / OUTPUT_FILES["reconciliacion_mensual"]
+    files = [DATA_REFERENCE / "centrales_egasa.csv"] if (DATA_REFERENCE / "centrales_egasa.csv").exists() else []
+    sources = monthly_sources(
+        mart_table(datasets, "generacion_15min_mensual"),
+        mart_table(datasets, "generacion_mensual"),
+        mart_table(datasets, "balance_perfil_mensual"),
+        central_types(),
+    )
+    fresh = reconcile(sources)
+
+    previous = pd.DataFrame(columns=COLUMNS)
+    if path.exists():
+        previous = pd.read_csv(path, dtype={"periodo": str, "clave": str})
+    changed = _changed_periods(previous, fresh)
+    fresh = fresh[fresh["periodo"].isin(changed)].assign(revisado_en=datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S"))
+    kept = previous[~previous["periodo"].isin(changed)]
+
+    frames = [df for df in (kept, fresh) if not df.empty]
+    table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=COLUMNS)
+    table = table.reindex(columns=COLUMNS).sort_values(RECONCILIATION_KEYS, ignore_index=True)
+    validate_and_write("reconciliacion_mensual", table, path)
+
+    diferencias = int((fresh["estado"] == "diferencia").sum())
+    logger.info("Conciliación mensual: %s periodos revisados, %s filas con diferencia", len(changed), diferencias)
+    return files, {"reconciliacion_mensual": (table, RECONCILIATION_KEYS)}
+
+
+__all__ = ["RECONCILIATION_KEYS", "monthly_sources", "reconcile", "run_reconciliacion"]
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""Resúmenes de la generación 15 min calculados por bloques (:mod:`etl.aggregate`).
+
+``generacion_15min_mensual`` tiene una fila por periodo y unidad con energía
+total, intervalos con dato, mínimo, máximo y cuantiles p50/p95. Cada corrida
+recalcula solo los periodos cuyas particiones actualizó (o que faltan en el
+resumen); el resto se conserva, así la historia completa nunca se carga a la
+vez.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from ..aggregate import aggregate_15min, list_partitions
+from ..config import DATA_MART, OUTPUT_FILES
+from ..utils_io import validate_and_write
+
+logger = logging.getLogger(__name__)
+
+_PARTITION = re.compile(r"generacion_15min_(\d{6})")
+ROLLUP_KEYS = ["periodo", "central_id", "central", "unidad"]
+ROLLUP_QUANTILES = (0.5, 0.95)
+
+Datasets = Dict[str, Tuple[pd.DataFrame, List[str]]]
+
+
+def pending_periods(path: Path, datasets: Datasets, columns: List[str]) -> Tuple[pd.DataFrame, List[str]]:
+    """Filas de un resumen por periodo que se conservan y periodos a recalcular.
+
+    Se recalculan los periodos cuyas particiones actualizó la corrida y los que
+    faltan en ``path``; se descartan los que ya no tienen partición.
+    """
+
+    on_disk = {p.stem.rsplit("_", 1)[-1] for p in list_partitions(DATA_MART)}
+    updated = {m.group(1) for m in map(_PARTITION.fullmatch, datasets) if m}
+
+    previous = pd.DataFrame(columns=columns)
+    if path.exists():
+        previous = pd.read_csv(path, dtype={"periodo": str})
+    kept = previous[previous["periodo"].isin(on_disk - updated)]
+    return kept, sorted(on_disk - set(kept["periodo"]))
+
+
+def run_rollups(datasets: Datasets) -> Tuple[List[Path], Datasets]:
+    """Actualizar ``generacion_15min_mensual`` con los periodos 15 min de la corrida."""
+
+    path = DATA_MART / OUTPUT_FILES["generacion_15min_mensual"]
+    kept, pending = pending_periods(path, datasets, ROLLUP_KEYS)
+
+    fresh = aggregate_15min(ROLLUP_KEYS, metrics=["sum", "count", "min", "max"], quantiles=ROLLUP_QUANTILES, mart=DATA_MART, periods=pending)
+    fresh["periodo"] = fresh["periodo"].astype(str)
+    frames = [df for df in (kept, fresh) if not df.empty]
+    rollup = pd.concat(frames, ignore_index=True) if frames else fresh
+    rollup = rollup.sort_values(ROLLUP_KEYS, ignore_index=True, na_position="last")
+
+    validate_and_write("generacion_15min_mensual", rollup, path)
+    logger.info("Resumen 15min: %s periodos recalculados, %s conservados", len(pending), kept["periodo"].nunique())
+    files = list_partitions(DATA_MART, periods=pending)
+    return files, {"generacion_15min_mensual": (rollup, ["periodo", "central_id", "unidad"])}
+
+
+__all__ = ["ROLLUP_KEYS", "pending_periods", "run_rollups"]
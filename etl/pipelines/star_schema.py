@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""Pipeline del modelo estrella (``data_mart/star/``).
+
+Etapa derivada: recibe los datasets planos que produjeron las etapas previas
+de la corrida y escribe dimensiones con claves enteras estables y hechos con
+solo claves y medidas (ver :mod:`etl.star`). Los CSV planos siguen siendo el
+contrato del dashboard; el modelo estrella es una salida adicional.
+
+Las particiones de ``fact_generacion_15min_YYYYMM`` solo se reescriben para
+los meses que la corrida actualizó, igual que las particiones planas.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from ..config import DATA_MART, DATA_REFERENCE
+from ..star import DIMENSIONS, STAR_DIR, build_dim_periodo, dimension_keys, fact_name, fact_spec, periodo_keys, to_fact, upsert_dimension
+from ..utils_io import validate_and_write
+
+logger = logging.getLogger(__name__)
+
+Datasets = Dict[str, Tuple[pd.DataFrame, List[str]]]
+
+
+def star_path(name: str) -> Path:
+    return DATA_MART / STAR_DIR / f"{name}.csv"
+
+
+def _existing_dimension(name: str) -> pd.DataFrame | None:
+    path = star_path(name)
+    if not path.exists():
+        return None
+    _key, natural = DIMENSIONS[name]
+    return pd.read_csv(path, dtype={col: str for col in natural})
+
+
+def _frames(datasets: Datasets, table: str) -> List[pd.DataFrame]:
+    """Tabla plana ``table`` o todas sus particiones ``table_YYYYMM``."""
+
+    pattern = re.compile(rf"{re.escape(table)}(_\d{{6}})?")
+    return [df for name, (df, _keys) in datasets.items() if pattern.fullmatch(name)]
+
+
+def _column_values(datasets: Datasets, tables: List[str], columns: List[str]) -> pd.DataFrame:
+    frames = [df[columns] for table in tables for df in _frames(datasets, table) if set(columns) <= set(df.columns)]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True).drop_duplicates()
+
+
+def _build_dimensions(datasets: Datasets, files_read: List[Path]) -> Dict[str, pd.DataFrame]:
+    dims: Dict[str, pd.DataFrame] = {}
+
+    ref_path = DATA_REFERENCE / "centrales_egasa.csv"
+    centrales = pd.DataFrame(columns=["central_id", "central"])
+    if ref_path.exists():
+        centrales = pd.read_csv(ref_path, dtype={"central_id": str}).rename(columns={"central_nombre": "central"})
+        files_read.append(ref_path)
+    dims["dim_central"] = upsert_dimension(_existing_dimension("dim_central"), centrales, "dim_central")
+
+    unidades = _column_values(datasets, ["generacion_15min"], ["central_raw", "central", "unidad", "central_id"])
+    unidades = unidades.drop_duplicates(subset=["central_raw"], keep="last")
+    unidades["central_key"] = dimension_keys(unidades, dims["dim_central"], "dim_central")
+    dims["dim_unidad"] = upsert_dimension(_existing_dimension("dim_unidad"), unidades, "dim_unidad")
+
+    clientes = _column_values(datasets, ["ventas_mensual_mwh", "ventas_mensual_soles", "precio_medio_mensual", "contratos_base"], ["cliente"])
+    dims["dim_cliente"] = upsert_dimension(_existing_dimension("dim_cliente"), clientes, "dim_cliente")
+
+    reservorios = _column_values(datasets, ["hidro_volumen_mensual", "represas_diario"], ["reservorio"])
+    dims["dim_reservorio"] = upsert_dimension(_existing_dimension("dim_reservorio"), reservorios, "dim_reservorio")
+
+    # dim_periodo es un calendario: se reconstruye cubriendo los periodos existentes y los nuevos
+    periodos = _column_values(datasets, ["generacion_mensual", "ventas_mensual_mwh", "ventas_mensual_soles", "precio_medio_mensual", "hidro_volumen_mensual"], ["periodo"])
+    keys = periodo_keys(periodos["periodo"])
+    previous = _existing_dimension("dim_periodo")
+    if previous is not None:
+        keys = pd.concat([keys, previous["periodo_key"].astype("Int32")], ignore_index=True)
+    dims["dim_periodo"] = build_dim_periodo(keys)
+    return dims
+
+
+def run_star_schema(datasets: Datasets) -> Tuple[List[Path], Datasets]:
+    """Escribir dimensiones y hechos a partir de los datasets planos de la corrida."""
+
+    files_read: List[Path] = []
+    star: Datasets = {}
+    (DATA_MART / STAR_DIR).mkdir(parents=True, exist_ok=True)
+
+    dims = _build_dimensions(datasets, files_read)
+    for name, dim in dims.items():
+        key, _natural = DIMENSIONS[name]
+        validate_and_write(name, dim, star_path(name))
+        star[name] = (dim, [key])
+
+    for table, (df, keys) in datasets.items():
+        spec = fact_spec(table)
+        if spec is None or df.empty:
+            continue
+        fact = to_fact(table, df, dims)
+        fact_keys = [DIMENSIONS[d][0] for d in spec["dims"]] + [k for k in keys if k in fact.columns]
+        name = fact_name(table)
+        validate_and_write(name, fact, star_path(name))
+        star[name] = (fact, list(dict.fromkeys(fact_keys)))
+
+    logger.info("Modelo estrella: %s dimensiones, %s hechos", len(dims), len(star) - len(dims))
+    return files_read, star
+
+
+__all__ = ["run_star_schema", "star_path"]
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+
+"""Perfilado del ETL (``python -m etl --profile``).
+
+Por cada etapa registra:
+
+- duración y top de funciones (cProfile, por tiempo propio y acumulado),
+  más el tiempo propio agrupado por paquete (openpyxl, pandas, pandera...);
+- pico de RSS del proceso (muestreado cada 50 ms) y top de asignaciones
+  retenidas según tracemalloc;
+- tiempos por archivo parseado y por tabla validada/escrita, que los
+  pipelines reportan con :func:`record_timing` / :func:`timed`.
+
+El reporte completo se escribe en ``reports/profile_<run_id>.json``.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from etl import config
+
+logger = logging.getLogger(__name__)
+
+_STATE: Dict[str, Any] = {"enabled": False, "timings": []}
+
+
+def profiling_enabled() -> bool:
+    return bool(_STATE["enabled"])
+
+
+def record_timing(kind: str, name: str, seconds: float, **extra: Any) -> None:
+    """Registrar un tiempo (``kind``: parse | validate | write) si hay perfil activo."""
+
+    if _STATE["enabled"]:
+        _STATE["timings"].append({"kind": kind, "name": name, "seconds": round(seconds, 4), **extra})
+
+
+@contextmanager
+def timed(kind: str, name: str, **extra: Any) -> Iterator[None]:
+    if not _STATE["enabled"]:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(kind, name, time.perf_counter() - t0, **extra)
+
+
+def _drain_timings() -> List[Dict[str, Any]]:
+    timings = list(_STATE["timings"])
+    _STATE["timings"].clear()
+    return timings
+
+
+def current_rss_mb() -> float | None:
+    """RSS actual del proceso en MB (``/proc`` en Linux, ``ru_maxrss`` como respaldo)."""
+
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 2**20 if sys.platform == "darwin" else maxrss / 1024
+
+
+class _RssSampler(threading.Thread):
+    """Hilo que muestrea el RSS y conserva el máximo observado."""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        super().__init__(name="rss-sampler", daemon=True)
+        self.interval = interval
+        self.peak = current_rss_mb() or 0.0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb() or 0.0)
+
+    def stop(self) -> float:
+        self._stop_event.set()
+        self.join()
+        return max(self.peak, current_rss_mb() or 0.0)
+
+
+def _package_of(filename: str) -> str:
+    if filename.startswith(("~", "<")):
+        return "builtins"
+    parts = Path(filename).parts
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            idx = parts.index(marker)
+            return parts[idx + 1].removesuffix(".py") if idx + 1 < len(parts) else marker
+    try:
+        return Path(filename).resolve().relative_to(config.BASE_DIR).parts[0].removesuffix(".py")
+    except ValueError:
+        return "stdlib"
+
+
+def _function_label(key: tuple) -> str:
+    filename, line, func = key
+    if filename.startswith("~"):
+        return func
+    return f"{Path(filename).name}:{line}({func})"
+
+
+def _cprofile_summary(prof: cProfile.Profile, top_n: int) -> Dict[str, Any]:
+    stats = pstats.Stats(prof).stats  # type: ignore[attr-defined]
+    rows = [
+        {"function": _function_label(key), "ncalls": nc, "tottime_s": round(tt, 4), "cumtime_s": round(ct, 4)}
+        for key, (_cc, nc, tt, ct, _callers) in stats.items()
+    ]
+    by_package: Dict[str, float] = {}
+    for (filename, _line, _func), (_cc, _nc, tt, _ct, _callers) in stats.items():
+        pkg = _package_of(filename)
+        by_package[pkg] = by_package.get(pkg, 0.0) + tt
+    return {
+        "top_tottime": sorted(rows, key=lambda r: r["tottime_s"], reverse=True)[:top_n],
+        "top_cumtime": sorted(rows, key=lambda r: r["cumtime_s"], reverse=True)[:top_n],
+        "tottime_by_package": {k: round(v, 4) for k, v in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)},
+    }
+
+
+_TRACE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _allocation_summary(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, top_n: int) -> List[Dict[str, Any]]:
+    diff = after.filter_traces(_TRACE_FILTERS).compare_to(before.filter_traces(_TRACE_FILTERS), "lineno")
+    out: List[Dict[str, Any]] = []
+    for stat in diff[:top_n]:
+        frame = stat.traceback[0]
+        out.append(
+            {
+                "where": f"{frame.filename}:{frame.lineno}",
+                "size_kb": round(stat.size / 1024, 1),
+                "size_diff_kb": round(stat.size_diff / 1024, 1),
+                "count_diff": stat.count_diff,
+            }
+        )
+    return out
+
+
+class RunProfiler:
+    """Perfil de una corrida del ETL; con ``enabled=False`` solo mide duración y RSS por etapa."""
+
+    def __init__(self, run_id: str, enabled: bool = False, top_n: int = 25) -> None:
+        self.run_id = run_id
+        self.enabled = enabled
+        self.top_n = top_n
+        self.stages: List[Dict[str, Any]] = []
+        self.started_at: str | None = None
+        self._tracemalloc_owner = False
+
+    def start(self) -> None:
+        if not self.enabled:
+            return
+        self.started_at = datetime.utcnow().isoformat()
+        _STATE["enabled"] = True
+        _drain_timings()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracemalloc_owner = True
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Medir una etapa; al salir el dict entregado trae ``duration_ms`` y ``peak_rss_mb``.
+
+        La duración y el pico de RSS se miden siempre (van al registro de la
+        corrida); cProfile y tracemalloc solo con el perfil activo.
+        """
+
+        metrics: Dict[str, Any] = {}
+        rss_start = current_rss_mb()
+        sampler = _RssSampler(interval=0.05 if self.enabled else 0.2)
+        sampler.start()
+        if not self.enabled:
+            t0 = time.perf_counter()
+            try:
+                yield metrics
+            finally:
+                metrics["duration_ms"] = int((time.perf_counter() - t0) * 1000)
+                peak_rss = sampler.stop()
+                metrics["peak_rss_mb"] = round(peak_rss, 1) if peak_rss else None
+            return
+
+        _drain_timings()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        prof = cProfile.Profile()
+        t0 = time.perf_counter()
+        prof.enable()
+        try:
+            yield metrics
+        finally:
+            prof.disable()
+            duration = time.perf_counter() - t0
+            peak_rss = sampler.stop()
+            metrics["duration_ms"] = int(duration * 1000)
+            metrics["peak_rss_mb"] = round(peak_rss, 1) if peak_rss else None
+            _current, traced_peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            timings = _drain_timings()
+            self.stages.append(
+                {
+                    "stage": name,
+                    "duration_ms": metrics["duration_ms"],
+                    "rss_start_mb": round(rss_start, 1) if rss_start is not None else None,
+                    "peak_rss_mb": metrics["peak_rss_mb"],
+                    "tracemalloc_peak_mb": round(traced_peak / 2**20, 2),
+                    "top_allocations": _allocation_summary(before, after, self.top_n),
+                    "cprofile": _cprofile_summary(prof, self.top_n),
+                    "files": [t for t in timings if t["kind"] == "parse"],
+                    "tables": [t for t in timings if t["kind"] != "parse"],
+                }
+            )
+
+    def summary(self, report_path: Path | None = None) -> Dict[str, Any]:
+        """Resumen compacto para ``etl_runs.jsonl``."""
+
+        peaks = [s["peak_rss_mb"] for s in self.stages if s.get("peak_rss_mb")]
+        return {
+            "report": str(report_path) if report_path else None,
+            "peak_rss_mb": max(peaks) if peaks else None,
+            "stages": {
+                s["stage"]: {
+                    "duration_ms": s["duration_ms"],
+                    "peak_rss_mb": s["peak_rss_mb"],
+                    "tracemalloc_peak_mb": s["tracemalloc_peak_mb"],
+                    "parse_s": round(sum(f["seconds"] for f in s["files"]), 3),
+                    "top_package": next(iter(s["cprofile"]["tottime_by_package"]), None),
+                }
+                for s in self.stages
+            },
+        }
+
+    def finish(self) -> Dict[str, Any] | None:
+        """Escribir ``reports/profile_<run_id>.json`` y devolver el resumen."""
+
+        if not self.enabled:
+            return None
+        _STATE["enabled"] = False
+        if self._tracemalloc_owner:
+            tracemalloc.stop()
+            self._tracemalloc_owner = False
+
+        from etl.utils_io import excel_engine
+
+        config.REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        path = config.REPORTS_DIR / f"profile_{self.run_id}.json"
+        payload = {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "finished_at": datetime.utcnow().isoformat(),
+            "python": sys.version.split()[0],
+            "excel_engine": excel_engine(),
+            "stages": self.stages,
+        }
+        path.write_text(json.dumps(payload, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+        logger.info("Perfil escrito en %s", path)
+        return self.summary(path)
+
+
+__all__ = [
+    "RunProfiler",
+    "current_rss_mb",
+    "profiling_enabled",
+    "record_timing",
+    "timed",
+]
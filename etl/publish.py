@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+
+"""Publicación atómica del data mart con snapshots versionados.
+
+Cada corrida escribe en ``<output>/.staging/<run_id>/``. Esa carpeta nace con
+hardlinks a la snapshot vigente, así los pipelines incrementales leen lo
+publicado y las tablas que la corrida no toca se conservan sin copiar datos.
+Todas las escrituras del ETL reemplazan archivos (temporal + ``os.replace``),
+por lo que nunca modifican la snapshot enlazada.
+
+Al terminar sin errores, la carpeta pasa a ``<output>/snapshots/<run_id>/`` y
+``<output>/manifest.json`` se reescribe atómicamente para apuntar a ella: ese
+reemplazo es el único instante en que cambia lo que ven los lectores. Si la
+corrida falla, el staging se borra y el manifest queda igual. Se conservan las
+últimas ``publish.keep`` snapshots para volver atrás al instante::
+
+    python -m etl snapshots               # listar
+    python -m etl snapshots --rollback    # volver a la snapshot anterior
+    python -m etl snapshots --rollback 20250101120000
+
+Sin manifest (mart antiguo o ``publish.snapshots: false``) los lectores usan
+la raíz de ``<output>`` como antes.
+
+Una sola corrida publica a la vez: :func:`staged` toma un lock exclusivo sobre
+``<output>/.publish.lock`` desde que siembra el staging hasta que publica. Una
+corrida que se superpone (p. ej. ``python -m etl watch`` y una manual) espera
+y siembra su staging desde lo que publicó la anterior.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+from etl import config
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+STAGING_DIR = ".staging"
+SNAPSHOTS_DIR = "snapshots"
+LOCK_FILE = ".publish.lock"
+# contenido de la raíz que no es parte de una snapshot
+_RESERVED = {MANIFEST, STAGING_DIR, SNAPSHOTS_DIR, LOCK_FILE, ".cache"}
+# raíces cuyo lock tiene este proceso (``prune`` dentro de ``publish``)
+_HELD: set = set()
+
+
+def output_root() -> Path:
+    """Raíz del mart (``paths.output``), aunque la corrida esté escribiendo en staging."""
+
+    return config.PATHS["output"]
+
+
+def read_manifest(root: Path | None = None) -> Dict[str, Any] | None:
+    path = (root or output_root()) / MANIFEST
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        logger.warning("Manifest ilegible en %s; se usa la raíz del mart", path)
+        return None
+
+
+def current_snapshot(root: Path | None = None) -> Tuple[Path, Dict[str, Any] | None]:
+    """Carpeta publicada vigente y el manifest que la señala, leídos una sola vez."""
+
+    root = root or output_root()
+    manifest = read_manifest(root)
+    if manifest and (root / manifest["path"]).is_dir():
+        return root / manifest["path"], manifest
+    return root, manifest
+
+
+def current_dir(root: Path | None = None) -> Path:
+    """Carpeta publicada vigente (la raíz si no hay manifest)."""
+
+    return current_snapshot(root)[0]
+
+
+def _try_lock(fh: Any) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(fh: Any) -> None:
+    if fcntl is not None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+    else:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def publish_lock(root: Path | None = None, wait: bool = True) -> Iterator[bool]:
+    """Lock exclusivo de publicación de ``root``; entrega si se obtuvo.
+
+    Con ``wait`` espera a que lo libere la otra corrida. El sistema operativo lo
+    suelta si el proceso muere, así una corrida interrumpida no lo deja tomado.
+    """
+
+    root = root or output_root()
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / LOCK_FILE, "a+b") as fh:
+        acquired = _try_lock(fh)
+        if not acquired and wait:
+            logger.info("Otra corrida está publicando en %s; esperando el lock", root)
+            while not acquired:
+                time.sleep(0.5)
+                acquired = _try_lock(fh)
+        if acquired:
+            _HELD.add(root.resolve())
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                _HELD.discard(root.resolve())
+                _unlock(fh)
+
+
+def _write_manifest(root: Path, manifest: Dict[str, Any]) -> None:
+    tmp = root / f".{MANIFEST}.tmp"
+    tmp.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, root / MANIFEST)
+
+
+def _link_tree(src: Path, dst: Path) -> int:
+    """Replicar ``src`` en ``dst`` con hardlinks (copia si el FS no los soporta)."""
+
+    count = 0
+    for path in src.rglob("*"):
+        rel = path.relative_to(src)
+        if rel.parts[0] in _RESERVED or not path.is_file() or path.name.endswith(".tmp"):
+            continue
+        target = dst / rel
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copy2(path, target)
+        count += 1
+    return count
+
+
+def begin(run_id: str, root: Path | None = None) -> Path:
+    """Crear ``.staging/<run_id>`` sembrado con la snapshot vigente."""
+
+    root = root or output_root()
+    name, n = run_id, 1
+    # dos corridas en el mismo segundo no deben pisar la snapshot vigente
+    while (root / SNAPSHOTS_DIR / name).exists() or (root / STAGING_DIR / name).exists():
+        n += 1
+        name = f"{run_id}_{n}"
+    staging = root / STAGING_DIR / name
+    staging.mkdir(parents=True)
+    files = _link_tree(current_dir(root), staging)
+    logger.info("Staging %s sembrado con %s archivos", staging, files)
+    return staging
+
+
+def abort(staging: Path) -> None:
+    """Descartar un staging (corrida fallida): lo publicado no cambia."""
+
+    shutil.rmtree(staging, ignore_errors=True)
+    logger.info("Staging descartado: %s", staging)
+
+
+def file_etag(path: Path) -> str:
+    """Versión de un archivo (mtime + tamaño).
+
+    Las tablas que una corrida no reescribe son hardlinks y conservan la
+    versión entre snapshots.
+    """
+
+    stat = path.stat()
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def _snapshot_tables(snapshot: Path) -> Dict[str, Dict[str, Any]]:
+    return {
+        str(p.relative_to(snapshot)).replace(os.sep, "/"): {"bytes": p.stat().st_size, "etag": file_etag(p)}
+        for p in sorted(snapshot.rglob("*.csv"))
+    }
+
+
+def publish(staging: Path, root: Path | None = None, keep: int | None = None) -> Path:
+    """Mover el staging a ``snapshots/<run_id>`` y apuntar el manifest a él."""
+
+    root = root or output_root()
+    run_id = staging.name
+    keep = max(int(keep if keep is not None else config.publish_settings()["keep"]), 1)
+    snapshot = root / SNAPSHOTS_DIR / run_id
+    snapshot.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(staging, snapshot)
+
+    previous = read_manifest(root) or {}
+    history = [r for r in previous.get("history", []) if r != run_id] + [run_id]
+    manifest = {
+        "current": run_id,
+        "path": f"{SNAPSHOTS_DIR}/{run_id}",
+        "published_at": datetime.utcnow().isoformat(),
+        "previous": previous.get("current"),
+        "tables": _snapshot_tables(snapshot),
+        "history": history[-keep:],
+    }
+    _write_manifest(root, manifest)
+    logger.info("Publicada snapshot %s (%s tablas)", run_id, len(manifest["tables"]))
+    prune(root, keep)
+    return snapshot
+
+
+def prune(root: Path | None = None, keep: int | None = None) -> List[str]:
+    """Borrar snapshots fuera del historial del manifest (nunca la vigente)."""
+
+    root = root or output_root()
+    manifest = read_manifest(root) or {}
+    keep = max(int(keep if keep is not None else config.publish_settings()["keep"]), 1)
+    retained = set(manifest.get("history", [])[-keep:]) | {manifest.get("current")}
+    removed = []
+    snapshots = root / SNAPSHOTS_DIR
+    for path in sorted(snapshots.iterdir()) if snapshots.exists() else []:
+        if path.is_dir() and path.name not in retained:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path.name)
+    prune_staging(root)
+    return removed
+
+
+def prune_staging(root: Path | None = None) -> List[str]:
+    """Borrar staging huérfanos de corridas interrumpidas.
+
+    Si el lock está libre (o lo tiene este proceso) ninguna otra corrida está
+    escribiendo y todo staging restante es huérfano. Si lo tiene otro proceso,
+    solo se borran los que superan ``publish.staging_max_age_h`` sin cambios.
+    """
+
+    root = root or output_root()
+    staging_root = root / STAGING_DIR
+    if not staging_root.exists():
+        return []
+    if root.resolve() in _HELD:
+        return _remove_staging(staging_root, max_age_s=None)
+    with publish_lock(root, wait=False) as free:
+        max_age_s = None if free else float(config.publish_settings()["staging_max_age_h"]) * 3600
+        return _remove_staging(staging_root, max_age_s)
+
+
+def _remove_staging(staging_root: Path, max_age_s: float | None) -> List[str]:
+    removed = []
+    now = time.time()
+    for path in sorted(staging_root.iterdir()):
+        if max_age_s is not None and now - path.stat().st_mtime < max_age_s:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed.append(path.name)
+    if removed:
+        logger.info("Staging huérfanos borrados: %s", ", ".join(removed))
+    return removed
+
+
+@contextmanager
+def staged(run_id: str) -> Iterator[Path]:
+    """Correr un bloque de escrituras del ETL contra un staging y publicarlo al salir.
+
+    Dentro del bloque ``config.DATA_MART`` apunta al staging; si el bloque
+    lanza una excepción el staging se descarta. Todo el bloque, desde la
+    siembra hasta la publicación, corre con :func:`publish_lock` tomado. Con
+    ``publish.snapshots`` desactivado se escribe directo en la raíz, como antes.
+    """
+
+    root = output_root()
+    if not config.publish_settings()["snapshots"]:
+        yield root
+        return
+    with publish_lock(root):
+        staging = begin(run_id, root)
+        config.use_output_dir(staging)
+        try:
+            yield staging
+        except BaseException:
+            abort(staging)
+            raise
+        else:
+            publish(staging, root)
+        finally:
+            config.use_output_dir(root)
+
+
+def list_snapshots(root: Path | None = None) -> List[str]:
+    root = root or output_root()
+    snapshots = root / SNAPSHOTS_DIR
+    return sorted(p.name for p in snapshots.iterdir() if p.is_dir()) if snapshots.exists() else []
+
+
+def rollback(to: str | None = None, root: Path | None = None) -> str:
+    """Apuntar el manifest a ``to`` (default: la snapshot anterior a la vigente)."""
+
+    root = root or output_root()
+    manifest = read_manifest(root)
+    if not manifest:
+        raise RuntimeError("No hay manifest: el mart no tiene snapshots publicadas")
+    available = list_snapshots(root)
+    if to is None:
+        history = manifest.get("history", [])
+        position = history.index(manifest["current"]) if manifest["current"] in history else len(history)
+        older = [r for r in history[:position] if r in available]
+        if not older:
+            raise RuntimeError("No hay una snapshot anterior a la vigente")
+        to = older[-1]
+    if to not in available:
+        raise RuntimeError(f"Snapshot {to} no existe; disponibles: {', '.join(available) or '-'}")
+    updated = {
+        **manifest,
+        "current": to,
+        "path": f"{SNAPSHOTS_DIR}/{to}",
+        "published_at": datetime.utcnow().isoformat(),
+        "previous": manifest["current"],
+        "tables": _snapshot_tables(root / SNAPSHOTS_DIR / to),
+    }
+    _write_manifest(root, updated)
+    logger.info("Rollback: %s -> %s", manifest["current"], to)
+    return to
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m etl snapshots", description="Snapshots publicadas del data mart")
+    parser.add_argument("--config", help="Ruta alternativa a config.yml|toml")
+    parser.add_argument("--rollback", nargs="?", const="", metavar="RUN_ID", help="Volver a la snapshot anterior (o a RUN_ID)")
+    args = parser.parse_args(argv)
+    config.apply_runtime_overrides(config_path=Path(args.config) if args.config else None)
+
+    if args.rollback is not None:
+        target = rollback(args.rollback or None)
+        print(f"Snapshot vigente: {target}")
+        return
+    manifest = read_manifest() or {}
+    for run_id in list_snapshots():
+        mark = "*" if run_id == manifest.get("current") else " "
+        tables = len(_snapshot_tables(output_root() / SNAPSHOTS_DIR / run_id))
+        print(f"{mark} {run_id}  {tables} tablas")
+    if not manifest:
+        print(f"Sin manifest: los lectores usan {output_root()}")
+
+
+__all__ = [
+    "abort",
+    "begin",
+    "current_dir",
+    "current_snapshot",
+    "file_etag",
+    "list_snapshots",
+    "main",
+    "output_root",
+    "prune",
+    "prune_staging",
+    "publish",
+    "publish_lock",
+    "read_manifest",
+    "rollback",
+    "staged",
+]
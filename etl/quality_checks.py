@@ -6,6 +6,8 @@ from __future__ import annotations
 
 import json
 import logging
+import os
+import re
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Iterable, List, Tuple
@@ -125,8 +127,13 @@ def write_metadata(
     path: Path | None,
     datasets_info: Dict[str, Tuple[pd.DataFrame, Iterable[str]]],
     files_read: Iterable[Path],
+    keep_existing: bool = False,
 ) -> None:
-    """Escribir metadata.json con métricas básicas."""
+    """Escribir metadata.json con métricas básicas.
+
+    Con ``keep_existing`` (corridas parciales, ``--stages``) se conservan los
+    datasets y archivos de la metadata previa que esta corrida no tocó.
+    """
 
     from .config import DATA_MART
 
@@ -142,6 +149,27 @@ def write_metadata(
         "datasets": {},
     }
 
+    previous: Dict = {}
+    if metadata_path.exists():
+        try:
+            previous = json.loads(metadata_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            previous = {}
+
+    if keep_existing:
+        current = {item["nombre"] for item in payload["archivos_leidos"]}
+        payload["archivos_leidos"] = [f for f in previous.get("archivos_leidos", []) if f.get("nombre") not in current] + payload["archivos_leidos"]
+        payload["datasets"].update(previous.get("datasets", {}))
+    else:
+        # particiones 15 min que el merge omitió (sin intervalos nuevos): siguen en disco sin cambios
+        payload["datasets"].update(
+            {
+                name: meta
+                for name, meta in previous.get("datasets", {}).items()
+                if re.fullmatch(r"generacion_15min_\d{6}", name) and (DATA_MART / f"{name}.csv").exists()
+            }
+        )
+
     for name, (df, keys) in datasets_info.items():
         min_fecha, max_fecha = _date_bounds(df)
         meta = {
@@ -154,8 +182,20 @@ def write_metadata(
         meta.update(_quality_counters(df))
         payload["datasets"][name] = meta
 
-    with metadata_path.open("w", encoding="utf-8") as f:
+    if "anomalias_15min" in datasets_info:
+        from .pipelines.anomalias import alert_counts
+
+        for name, alerts in alert_counts(datasets_info["anomalias_15min"][0]).items():
+            if name in payload["datasets"]:
+                payload["datasets"][name]["alertas"] = [
+                    a for a in payload["datasets"][name]["alertas"] if not a.startswith("anomalias_")
+                ] + alerts
+
+    # reemplazo atómico: el archivo previo puede ser un hardlink a la snapshot publicada
+    tmp_path = metadata_path.with_name(f".{metadata_path.name}.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, metadata_path)
 
     logger.info("Metadata escrita en %s", metadata_path)
 
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""Histórico diario de represas (BDREPRESAS) particionado por año.
+
+Cada corrida agrega el reporte INFORMEDIARIO del día al almacén
+``data_mart/represas_historico/represas_diario_<YYYY>.csv`` con upsert por
+``(fecha, reservorio)``: solo se reescriben las particiones de los años
+tocados. ``represas_diario.csv`` se regenera como la unión de todas las
+particiones para que el dashboard tenga la evolución histórica.
+
+Backfill de reportes archivados::
+
+    python -m etl backfill-represas --archive ruta/a/reportes
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+from etl import config, publish
+from etl.utils_io import default_log_extra, list_matching_files, parse_files_cached, validate_and_write
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS = ["fecha", "reservorio"]
+
+
+def history_dir(mart_dir: Path | None = None) -> Path:
+    return (mart_dir or config.DATA_MART) / "represas_historico"
+
+
+def partition_path(year: int, mart_dir: Path | None = None) -> Path:
+    name = config.OUTPUT_FILES["represas_historico_template"].format(yyyy=year)
+    return (mart_dir or config.DATA_MART) / name
+
+
+def _read_partition(path: Path) -> pd.DataFrame:
+    if not path.exists():
+        return pd.DataFrame(columns=KEY_COLUMNS)
+    return pd.read_csv(path, parse_dates=["fecha"], low_memory=False)
+
+
+def upsert_represas(df: pd.DataFrame, mart_dir: Path | None = None) -> List[int]:
+    """Insertar/actualizar filas en el histórico; retorna los años reescritos.
+
+    Ante una misma ``(fecha, reservorio)`` prevalece la fila nueva.
+    Las filas sin fecha no pueden indexarse y se descartan con advertencia.
+    """
+
+    if df.empty:
+        return []
+
+    df = df.copy()
+    df["fecha"] = pd.to_datetime(df["fecha"], errors="coerce")
+    sin_fecha = int(df["fecha"].isna().sum())
+    if sin_fecha:
+        logger.warning("Represas: %s filas sin fecha de reporte no se agregan al histórico", sin_fecha)
+        df = df.dropna(subset=["fecha"])
+
+    years: List[int] = []
+    for year, new_rows in df.groupby(df["fecha"].dt.year):
+        path = partition_path(int(year), mart_dir)
+        prev = _read_partition(path)
+        frames = [f for f in (prev, new_rows) if not f.empty]
+        merged = (
+            pd.concat(frames, ignore_index=True)
+            .drop_duplicates(subset=KEY_COLUMNS, keep="last")
+            .sort_values(KEY_COLUMNS)
+            .reset_index(drop=True)
+        )
+        validate_and_write("represas_diario", merged, path)
+        years.append(int(year))
+
+    return years
+
+
+def load_represas_history(mart_dir: Path | None = None) -> pd.DataFrame:
+    """Unir todas las particiones anuales del histórico."""
+
+    base = history_dir(mart_dir)
+    parts = sorted(base.glob("represas_diario_*.csv")) if base.exists() else []
+    frames = [_read_partition(p) for p in parts]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=KEY_COLUMNS)
+    return pd.concat(frames, ignore_index=True).sort_values(KEY_COLUMNS).reset_index(drop=True)
+
+
+def backfill_represas(archive: Path, pattern: str | None = None, sheet_name: str | None = None) -> int:
+    """Ingerir en paralelo todos los reportes diarios de ``archive``.
+
+    Retorna la cantidad de filas agregadas/actualizadas en el histórico.
+    """
+
+    from etl.pipelines.hidrologia import _procesar_represas
+
+    represas_cfg = config.get_source("hidrologia_represas")
+    pattern = pattern or (represas_cfg or {}).get("archive_pattern", "BDREPRESAS")
+    sheet = sheet_name or (represas_cfg or {}).get("sheet", "INFORMEDIARIO")
+
+    files = [p for p in list_matching_files(archive, pattern) if p.suffix.lower() in {".xlsx", ".xlsm", ".xls"}]
+    if not files:
+        logger.warning("No se encontraron reportes de represas en %s (patrón %s)", archive, pattern)
+        return 0
+
+    parsed = parse_files_cached("represas", files, _procesar_represas, (sheet,))
+    frames = [df for df in parsed if df is not None and not df.empty]
+    if not frames:
+        return 0
+
+    nuevos = pd.concat(frames, ignore_index=True)
+    years = upsert_represas(nuevos)
+    write_represas_consolidado()
+    logger.info(
+        "Backfill represas: %s archivos, años %s",
+        len(files),
+        years,
+        extra=default_log_extra(stage="represas_backfill", file=str(archive), rows_in=len(files), rows_out=len(nuevos)),
+    )
+    return len(nuevos)
+
+
+def write_represas_consolidado(mart_dir: Path | None = None) -> pd.DataFrame:
+    """Regenerar ``represas_diario.csv`` desde el histórico completo."""
+
+    history = load_represas_history(mart_dir)
+    validate_and_write("represas_diario", history, (mart_dir or config.DATA_MART) / config.OUTPUT_FILES["represas_diario"])
+    return history
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m etl backfill-represas", description="Backfill del histórico diario de represas")
+    parser.add_argument("--archive", required=True, help="Carpeta con reportes BDREPRESAS archivados")
+    parser.add_argument("--pattern", help="Patrón de nombre de archivo (default: sources.hidrologia_represas.archive_pattern)")
+    parser.add_argument("--config", help="Ruta alternativa a config.yml|toml")
+    parser.add_argument("--output", help="Directorio data_mart override")
+    args = parser.parse_args(argv)
+
+    from etl.logging_utils import setup_logging
+    from etl.utils_io import set_run_context
+
+    config.apply_runtime_overrides(
+        config_path=Path(args.config) if args.config else None,
+        paths_override={"output": args.output},
+    )
+    run_id = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    set_run_context(run_id=run_id, strict=True)
+    config.ensure_directories()
+    setup_logging(config.LOG_FILE, run_id=run_id)
+
+    with publish.staged(run_id):
+        rows = backfill_represas(Path(args.archive), pattern=args.pattern)
+    logger.info("Backfill represas finalizado: %s filas", rows, extra=default_log_extra(stage="represas_backfill"))
+
+
+__all__ = [
+    "upsert_represas",
+    "load_represas_history",
+    "backfill_represas",
+    "write_represas_consolidado",
+]
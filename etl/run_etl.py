@@ -7,12 +7,12 @@ from __future__ import annotations
 import argparse
 import logging
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
 
-from etl import pipelines, config
+from etl import pipelines, config, publish
 from etl.logging_utils import setup_logging
+from etl.profiling import RunProfiler
 from etl.utils_io import set_run_context, default_log_extra, record_etl_run, ensure_runs_log
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -20,6 +20,52 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 
+# (etapa, función en etl.pipelines, mensaje de cierre)
+STAGES = [
+    ("produccion", "run_produccion", "Producción completada"),
+    ("hidrologia", "run_hidrologia", "Hidrología completada"),
+    ("facturacion", "run_facturacion", "Facturación completada"),
+    ("contratos", "run_contratos", "Contratos completados"),
+    ("balance_energia", "run_balance_energia", "Balance energía completado"),
+]
+
+# fuentes de config.LANDING_FILES que lee cada etapa (las usa ``etl watch``)
+STAGE_SOURCES = {
+    "produccion": ["produccion_historica", "produccion_15min"],
+    "hidrologia": ["hidrologia_control", "hidrologia_represas"],
+    "facturacion": ["facturacion"],
+    "contratos": ["contratos"],
+    "balance_energia": ["balance_energia"],
+}
+
+# Etapas que se calculan a partir de los datasets de las etapas previas
+# (reciben ``datasets`` y devuelven ``(files_read, datasets)``)
+DERIVED_STAGES = [
+    ("rollups", "run_rollups", "Resúmenes 15min completados"),
+    ("indicadores", "run_indicadores", "Indicadores de planta completados"),
+    ("reconciliacion", "run_reconciliacion", "Conciliación mensual completada"),
+    ("compromisos", "run_compromisos", "Compromiso de contratos completado"),
+    ("hidro_metricas", "run_hidro_metricas", "Métricas hidrológicas completadas"),
+    ("pronostico", "run_pronostico", "Pronóstico de generación completado"),
+    ("star_schema", "run_star_schema", "Modelo estrella completado"),
+]
+
+
+def _stage_record(metrics: dict, files: list, rows_out: int) -> dict:
+    """Duración, bytes de entrada, filas/s y pico de RSS de una etapa (para etl_runs.jsonl)."""
+
+    input_bytes = sum(Path(f).stat().st_size for f in files if Path(f).exists())
+    seconds = metrics["duration_ms"] / 1000
+    return {
+        "duration_ms": metrics["duration_ms"],
+        "files": len(files),
+        "input_bytes": input_bytes,
+        "rows_out": rows_out,
+        "rows_per_s": round(rows_out / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mb": metrics["peak_rss_mb"],
+    }
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Orquestador ETL EGASA")
     parser.add_argument("--input", help="Directorio data_landing override")
@@ -27,6 +73,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--config", help="Ruta alternativa a config.yml|toml")
     parser.add_argument("--month", help="Mes objetivo (YYYYMM) opcional", default=None)
     parser.add_argument("--force", action="store_true", help="Forzar re-procesamiento (placeholder)")
+    parser.add_argument("--profile", action="store_true", help="Perfilar etapas (cProfile, RSS, tracemalloc) en reports/profile_<run_id>.json")
+    parser.add_argument("--stages", help="Correr solo estas etapas de origen, separadas por coma (las derivadas corren siempre)")
     strict_group = parser.add_mutually_exclusive_group()
     strict_group.add_argument("--strict", action="store_true", help="Fallar si hay errores de validación (default)")
     strict_group.add_argument("--non-strict", action="store_true", help="Solo advertir validaciones fallidas")
@@ -36,6 +84,10 @@ def parse_args() -> argparse.Namespace:
 def main() -> None:
     args = parse_args()
     strict = False if args.non_strict else True
+    selected = [s.strip() for s in args.stages.split(",") if s.strip()] if args.stages else None
+    unknown = set(selected or []) - {name for name, _fn, _msg in STAGES}
+    if unknown:
+        raise SystemExit(f"Etapas desconocidas: {', '.join(sorted(unknown))}")
     run_id = datetime.utcnow().strftime("%Y%m%d%H%M%S")
     # Aplicar overrides tempranos
     config.apply_runtime_overrides(
@@ -51,70 +103,69 @@ def main() -> None:
     cfg_path = config.BASE_DIR / "config.yml"
     logger.info("Config cargada: %s", cfg_path if cfg_path.exists() else "defaults", extra=default_log_extra(stage="orchestrator", run_id=run_id))
     logger.info("run_id=%s strict=%s", run_id, strict, extra=default_log_extra(stage="orchestrator", run_id=run_id))
+    if selected:
+        logger.info("Etapas seleccionadas: %s", ",".join(selected), extra=default_log_extra(stage="orchestrator", run_id=run_id))
+
+    profiler = RunProfiler(run_id, enabled=args.profile)
+    io_cfg = config.CONFIG.setdefault("io", {})
+    prev_workers = io_cfg.get("max_workers")
+    if args.profile:
+        # Parseo en línea: cProfile y tracemalloc solo ven el proceso principal
+        io_cfg["max_workers"] = 1
+        logger.info("Modo profile activo (parseo en línea)", extra=default_log_extra(stage="orchestrator", run_id=run_id))
+    profiler.start()
 
     files_read = []
     datasets = {}
     tables_rows: dict = {}
+    stage_stats: dict = {}
     started_at = datetime.utcnow().isoformat()
 
     try:
-        t0 = time.perf_counter()
-        prod_df, prod15_files, prod_datasets = pipelines.run_produccion()
-        duration = int((time.perf_counter() - t0) * 1000)
-        files_read.extend(prod15_files)
-        datasets.update(prod_datasets)
-        tables_rows.update({k: len(v[0]) for k, v in prod_datasets.items()})
-        logger.info("Producción completada", extra=default_log_extra(stage="produccion", file="*", rows_in=len(prod15_files), rows_out=len(prod_df), duration_ms=duration))
-
-        t0 = time.perf_counter()
-        hidro_files, hidro_datasets = pipelines.run_hidrologia()
-        duration = int((time.perf_counter() - t0) * 1000)
-        files_read.extend(hidro_files)
-        datasets.update(hidro_datasets)
-        tables_rows.update({k: len(v[0]) for k, v in hidro_datasets.items()})
-        logger.info("Hidrología completada", extra=default_log_extra(stage="hidrologia", file="*", rows_in=len(hidro_files), rows_out=sum(len(v[0]) for v in hidro_datasets.values()), duration_ms=duration))
-
-        t0 = time.perf_counter()
-        fact_files, fact_datasets = pipelines.run_facturacion()
-        duration = int((time.perf_counter() - t0) * 1000)
-        files_read.extend(fact_files)
-        datasets.update(fact_datasets)
-        tables_rows.update({k: len(v[0]) for k, v in fact_datasets.items()})
-        logger.info("Facturación completada", extra=default_log_extra(stage="facturacion", file="*", rows_in=len(fact_files), rows_out=sum(len(v[0]) for v in fact_datasets.values()), duration_ms=duration))
-
-        t0 = time.perf_counter()
-        contratos_files, contratos_datasets = pipelines.run_contratos()
-        duration = int((time.perf_counter() - t0) * 1000)
-        files_read.extend(contratos_files)
-        datasets.update(contratos_datasets)
-        tables_rows.update({k: len(v[0]) for k, v in contratos_datasets.items()})
-        logger.info("Contratos completados", extra=default_log_extra(stage="contratos", file="*", rows_in=len(contratos_files), rows_out=sum(len(v[0]) for v in contratos_datasets.values()), duration_ms=duration))
-
-        t0 = time.perf_counter()
-        balance_files, balance_datasets = pipelines.run_balance_energia()
-        duration = int((time.perf_counter() - t0) * 1000)
-        files_read.extend(balance_files)
-        datasets.update(balance_datasets)
-        tables_rows.update({k: len(v[0]) for k, v in balance_datasets.items()})
-        logger.info("Balance energía completado", extra=default_log_extra(stage="balance_energia", file="*", rows_in=len(balance_files), rows_out=sum(len(v[0]) for v in balance_datasets.values()), duration_ms=duration))
-
-        from etl.quality_checks import write_metadata
-
-        write_metadata(
-            path=None,  # no se usa, mantenido para compatibilidad
-            datasets_info=datasets,
-            files_read=files_read,
-        )
+        # Todo se escribe en staging; se publica con un solo cambio de manifest
+        with publish.staged(run_id):
+            derived = {name for name, _fn, _msg in DERIVED_STAGES}
+            stages = [s for s in STAGES if selected is None or s[0] in selected]
+            for stage, fn_name, message in stages + DERIVED_STAGES:
+                with profiler.stage(stage) as metrics:
+                    fn = getattr(pipelines, fn_name)
+                    result = fn(dict(datasets)) if stage in derived else fn()
+                if stage == "produccion":
+                    prod_df, stage_files, stage_datasets = result
+                    rows_out = len(prod_df)
+                else:
+                    stage_files, stage_datasets = result
+                    rows_out = sum(len(v[0]) for v in stage_datasets.values())
+                files_read.extend(stage_files)
+                datasets.update(stage_datasets)
+                tables_rows.update({k: len(v[0]) for k, v in stage_datasets.items()})
+                stage_stats[stage] = _stage_record(metrics, stage_files, rows_out)
+                logger.info(message, extra=default_log_extra(stage=stage, file="*", rows_in=len(stage_files), rows_out=rows_out, duration_ms=metrics["duration_ms"]))
+
+            from etl.quality_checks import write_metadata
+
+            write_metadata(
+                path=None,  # no se usa, mantenido para compatibilidad
+                datasets_info=datasets,
+                files_read=files_read,
+                keep_existing=selected is not None,
+            )
 
         logger.info("ETL finalizado.", extra=default_log_extra(stage="orchestrator", run_id=run_id))
         finished_at = datetime.utcnow().isoformat()
-        record_etl_run(run_id=run_id, started_at=started_at, finished_at=finished_at, status="success", tables=tables_rows)
+        record_etl_run(run_id=run_id, started_at=started_at, finished_at=finished_at, status="success", tables=tables_rows, stages=stage_stats, profile=profiler.finish())
     except Exception as exc:
         finished_at = datetime.utcnow().isoformat()
         suggestion = "Verifica config.yml (patrones y sheets) y la existencia de archivos en data_landing."
         logger.error("ETL falló: %s | Sugerencia: %s", exc, suggestion, extra=default_log_extra(stage="orchestrator", run_id=run_id))
-        record_etl_run(run_id=run_id, started_at=started_at, finished_at=finished_at, status="failed", tables=tables_rows, error=str(exc))
+        record_etl_run(run_id=run_id, started_at=started_at, finished_at=finished_at, status="failed", tables=tables_rows, error=str(exc), stages=stage_stats, profile=profiler.finish())
         raise SystemExit(1) from exc
+    finally:
+        # main() también corre en proceso (benchmarks): no dejar la config alterada
+        if prev_workers is None:
+            io_cfg.pop("max_workers", None)
+        else:
+            io_cfg["max_workers"] = prev_workers
 
 
 if __name__ == "__main__":
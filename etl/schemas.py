@@ -4,9 +4,16 @@
 
 from __future__ import annotations
 
+import re
+from typing import Dict
+
+import numpy as np
+import pandas as pd
 import pandera as pa
 from pandera import Column, DataFrameSchema, Check
 
+from .star import DIMENSIONS, FACTS
+
 
 SCHEMAS = {
     "ventas_mensual_mwh": DataFrameSchema(
@@ -113,6 +120,216 @@ SCHEMAS = {
 }
 
 
+# Política de tipos compactos por tabla: ``category`` para etiquetas de baja
+# cardinalidad, int16/int32 para anio/mes/periodo y float32 donde la precisión
+# alcanza (energía, volúmenes, caudales, precios; no montos en soles).
+_INDICADORES_DTYPES = {
+    "periodo": "int32",
+    "nivel": "category",
+    "central_id": "category",
+    "central": "category",
+    "unidad": "category",
+    "intervalos": "int16",
+    **{
+        col: "float32"
+        for col in (
+            "energia_mwh",
+            "horas_periodo",
+            "horas_operacion",
+            "horas_cero",
+            "disponibilidad",
+            "potencia_mw",
+            "factor_planta",
+            "pico_mw",
+            "rampa_subida_max_mw",
+            "rampa_bajada_max_mw",
+            "rampa_abs_media_mw",
+        )
+    },
+}
+
+DTYPES: Dict[str, Dict[str, str]] = {
+    "generacion_mensual": {"central_id": "category", "central": "category", "anio": "int16", "mes": "int16", "periodo": "int32", "energia_mwh": "float32"},
+    "generacion_15min": {
+        "central": "category",
+        "central_raw": "category",
+        "unidad": "category",
+        "central_id": "category",
+        "periodo": "int32",
+        "energia_mwh": "float32",
+    },
+    "generacion_15min_mensual": {
+        "periodo": "int32",
+        "central_id": "category",
+        "central": "category",
+        "unidad": "category",
+        "energia_mwh_sum": "float32",
+        "energia_mwh_count": "int16",
+        "energia_mwh_min": "float32",
+        "energia_mwh_max": "float32",
+        "energia_mwh_p50": "float32",
+        "energia_mwh_p95": "float32",
+    },
+    "indicadores_15min_diario": _INDICADORES_DTYPES,
+    "indicadores_15min_mensual": _INDICADORES_DTYPES,
+    "anomalias_15min": {
+        "periodo": "int32",
+        "central_id": "category",
+        "central": "category",
+        "unidad": "category",
+        "tipo": "category",
+        "intervalos": "int16",
+        "valor": "float32",
+        "referencia": "float32",
+        "score": "float32",
+    },
+    "cobertura_15min": {
+        "periodo": "int32",
+        "central_id": "category",
+        "central": "category",
+        "unidad": "category",
+        "intervalos": "int16",
+        "cobertura_pct": "float32",
+    },
+    "reconciliacion_mensual": {
+        "periodo": "int32",
+        "nivel": "category",
+        "clave": "category",
+        "nombre": "category",
+        "estado": "category",
+    },
+    "ventas_mensual_mwh": {"cliente": "category", "periodo": "int32", "anio": "int16", "mes": "int16", "mwh": "float32"},
+    "ventas_mensual_soles": {"cliente": "category", "periodo": "int32", "anio": "int16", "mes": "int16"},
+    "ingresos_mensual": {"anio": "int16", "mes": "int16", "cliente_o_concepto": "category"},
+    "precio_medio_mensual": {"periodo": "int32", "anio": "int16", "mes": "int16", "cliente": "category", "precio_medio_soles_mwh": "float32"},
+    "represas_diario": {
+        "reservorio": "category",
+        "capacidad_util_max": "float32",
+        "volumen_ref": "float32",
+        "volumen_actual": "float32",
+        "pct_llenado": "float32",
+        "volumen_dia_anterior_m3": "float32",
+    },
+    # mes es texto de dos dígitos ("01") en hidrología: se conserva como categoría
+    "hidro_volumen_mensual": {"reservorio": "category", "anio": "int16", "mes": "category", "periodo": "int32", "volumen_000m3": "float32"},
+    "hidro_caudal_mensual": {"estacion": "category", "anio": "int16", "mes": "category", "periodo": "int32", "caudal_m3s": "float32"},
+    "balance_perfil_mensual": {"periodo": "int32", "concepto": "category", "energia_mwh": "float32", "energia_gwh": "float32"},
+    "balance_r_mensual": {"periodo": "int32", "segmento": "category", "energia_mwh": "float32"},
+    "contratos_base": {"cliente": "category", "tipo_contrato": "category", "potencia_mw": "float32", "precio_hp_usd_mwh": "float32", "precio_fp_usd_mwh": "float32"},
+    "contratos_riesgo": {"cliente": "category", "tipo_contrato": "category", "potencia_mw": "float32", "precio_hp_usd_mwh": "float32", "precio_fp_usd_mwh": "float32"},
+    "contratos_compromiso_mensual": {
+        "periodo": "int32",
+        "origen": "category",
+        "cliente": "category",
+        "tipo_contrato": "category",
+        "contratos": "int16",
+        "potencia_contratada_mw": "float32",
+        "potencia_media_mw": "float32",
+        "energia_mwh": "float32",
+    },
+    "hidro_metricas_mensual": {
+        "variable": "category",
+        "serie": "category",
+        "periodo": "int32",
+        "anio": "int16",
+        "mes": "int8",
+        "valor": "float32",
+        "clim_media": "float32",
+        "clim_p10": "float32",
+        "clim_p50": "float32",
+        "clim_p90": "float32",
+        "anomalia": "float32",
+        "anomalia_pct": "float32",
+        "dif_anual": "float32",
+        "dif_anual_pct": "float32",
+        "capacidad_000m3": "float32",
+        "pct_capacidad": "float32",
+        "aporte_000m3": "float32",
+        "aporte_acumulado_000m3": "float32",
+    },
+    "pronostico_parametros": {
+        "central_id": "category",
+        "central": "category",
+        "n_obs": "int16",
+        "desde": "int32",
+        "hasta": "int32",
+    },
+    "pronostico_generacion_mensual": {
+        "periodo": "int32",
+        "central_id": "category",
+        "central": "category",
+        "tipo": "category",
+        "energia_mwh": "float32",
+        "linea_base_mwh": "float32",
+        "pronostico_mwh": "float32",
+        "pronostico_inf_mwh": "float32",
+        "pronostico_sup_mwh": "float32",
+        "caudal_anomalia": "float32",
+        "volumen_anomalia": "float32",
+    },
+}
+
+# Modelo estrella (etl.star): claves enteras y, en los hechos, las columnas que
+# conservan de la tabla plana con su misma política
+STAR_KEY_DTYPES = {"central_key": "int16", "unidad_key": "int16", "cliente_key": "int16", "reservorio_key": "int16", "periodo_key": "int32"}
+for _dim, (_key, _natural) in DIMENSIONS.items():
+    DTYPES[_dim] = {_key: STAR_KEY_DTYPES[_key]}
+DTYPES["dim_central"].update(anio_puesta="int16", potencia_mw="float32")
+DTYPES["dim_unidad"].update(central_key="int16", central_id="category", central="category")
+for _table, _spec in FACTS.items():
+    _replaced = {col for dim in _spec["dims"] for col in DIMENSIONS[dim][1]} | set(_spec["drop"])
+    DTYPES[f"fact_{_table}"] = {
+        **{DIMENSIONS[dim][0]: STAR_KEY_DTYPES[DIMENSIONS[dim][0]] for dim in _spec["dims"]},
+        **{col: dtype for col, dtype in DTYPES.get(_table, {}).items() if col not in _replaced},
+    }
+
+_PARTITION_SUFFIX = re.compile(r"_\d{6}$")
+
+
+def dtype_policy(dataset: str) -> Dict[str, str]:
+    """Política de tipos de un dataset (``generacion_15min_YYYYMM`` usa la de ``generacion_15min``)."""
+
+    name = dataset[:-4] if dataset.endswith(".csv") else dataset
+    return DTYPES.get(name) or DTYPES.get(_PARTITION_SUFFIX.sub("", name), {})
+
+
+def _compact_int(values: pd.Series, dtype: str) -> pd.Series | None:
+    num = pd.to_numeric(values, errors="coerce")
+    if num.isna().all():
+        return None
+    valid = num.dropna()
+    info = np.iinfo(dtype)
+    if (valid % 1 != 0).any() or valid.min() < info.min or valid.max() > info.max:
+        return None
+    # con nulos se usa el entero nullable (Int16/Int32)
+    return num.astype(dtype if len(valid) == len(num) else dtype.capitalize())
+
+
+def apply_dtypes(df: pd.DataFrame, dataset: str, *, floats: bool = True) -> pd.DataFrame:
+    """Aplicar :data:`DTYPES` a ``df`` (columnas ausentes o fuera de rango se dejan igual).
+
+    Con ``floats=False`` no se reduce a float32: así lo usa el ETL al escribir,
+    para que el CSV conserve la precisión completa.
+    """
+
+    policy = dtype_policy(dataset)
+    if not policy or df.empty:
+        return df
+    out = df.copy(deep=False)
+    for col, dtype in policy.items():
+        if col not in out.columns or str(out[col].dtype) == dtype:
+            continue
+        if dtype == "category":
+            out[col] = out[col].astype("category")
+        elif dtype.startswith("int"):
+            compact = _compact_int(out[col], dtype)
+            if compact is not None:
+                out[col] = compact
+        elif floats:
+            out[col] = pd.to_numeric(out[col], errors="coerce").astype(dtype)
+    return out
+
+
 def get_schema(dataset: str) -> DataFrameSchema | None:
     """Obtener el esquema pandera para un dataset conocido."""
     if dataset in SCHEMAS:
@@ -121,4 +338,4 @@ def get_schema(dataset: str) -> DataFrameSchema | None:
     return None
 
 
-__all__ = ["get_schema", "SCHEMAS"]
+__all__ = ["apply_dtypes", "dtype_policy", "get_schema", "DTYPES", "SCHEMAS"]
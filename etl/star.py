@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""Definición del modelo estrella del data mart (``data_mart/star/``).
+
+Las dimensiones tienen claves enteras estables entre corridas: cada corrida
+relee la dimensión existente y solo agrega claves nuevas al final. La clave
+``0`` es el miembro "sin dato" (p. ej. una central sin ``central_id``).
+``dim_periodo`` usa ``YYYYMM`` como clave entera.
+
+Los hechos guardan solo claves y medidas; :func:`join_dimensions` reconstruye
+la vista plana al leer. El pipeline que escribe estas tablas está en
+:mod:`etl.pipelines.star_schema`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Mapping, Tuple
+
+import pandas as pd
+
+STAR_DIR = "star"
+UNKNOWN_KEY = 0
+
+# dimensión -> (clave, columnas naturales)
+DIMENSIONS: Dict[str, Tuple[str, List[str]]] = {
+    "dim_central": ("central_key", ["central_id"]),
+    "dim_unidad": ("unidad_key", ["central_raw"]),
+    "dim_cliente": ("cliente_key", ["cliente"]),
+    "dim_reservorio": ("reservorio_key", ["reservorio"]),
+    "dim_periodo": ("periodo_key", ["periodo"]),
+}
+
+# tabla plana -> hecho: dimensiones que reemplazan columnas naturales y
+# columnas derivables de una dimensión que no se guardan en el hecho
+FACTS: Dict[str, Dict[str, object]] = {
+    "generacion_mensual": {"dims": ["dim_central", "dim_periodo"], "drop": ["central", "anio", "mes"]},
+    "generacion_15min": {"dims": ["dim_unidad"], "drop": ["central", "unidad", "central_id", "periodo"]},
+    "ventas_mensual_mwh": {"dims": ["dim_cliente", "dim_periodo"], "drop": ["anio", "mes"]},
+    "ventas_mensual_soles": {"dims": ["dim_cliente", "dim_periodo"], "drop": ["anio", "mes"]},
+    "precio_medio_mensual": {"dims": ["dim_cliente", "dim_periodo"], "drop": ["anio", "mes"]},
+    "hidro_volumen_mensual": {"dims": ["dim_reservorio", "dim_periodo"], "drop": ["anio", "mes"]},
+    "represas_diario": {"dims": ["dim_reservorio"], "drop": []},
+    "contratos_base": {"dims": ["dim_cliente"], "drop": []},
+}
+
+_PARTITION_SUFFIX = re.compile(r"_(\d{6})$")
+
+
+def fact_name(table: str) -> str:
+    """``generacion_15min_202501`` -> ``fact_generacion_15min_202501``."""
+
+    return f"fact_{table}"
+
+
+def fact_spec(name: str) -> Dict[str, object] | None:
+    """Especificación de un hecho por nombre de tabla plana o de hecho (acepta particiones)."""
+
+    base = _PARTITION_SUFFIX.sub("", name.removeprefix("fact_"))
+    return FACTS.get(base)
+
+
+def periodo_keys(periodo: pd.Series) -> pd.Series:
+    """Clave de ``dim_periodo`` (entero YYYYMM) a partir de un periodo texto/numérico."""
+
+    text = periodo.astype("string").str.extract(r"(\d{6})", expand=False)
+    return pd.to_numeric(text, errors="coerce").astype("Int32")
+
+
+def build_dim_periodo(keys: pd.Series) -> pd.DataFrame:
+    """Calendario mensual continuo entre el menor y el mayor periodo."""
+
+    valid = keys.dropna().astype(int)
+    if valid.empty:
+        return pd.DataFrame(columns=["periodo_key", "periodo", "anio", "mes", "trimestre", "fecha_mes", "dias_mes", "intervalos_15min"])
+    start = pd.Timestamp(year=valid.min() // 100, month=valid.min() % 100, day=1)
+    end = pd.Timestamp(year=valid.max() // 100, month=valid.max() % 100, day=1)
+    months = pd.date_range(start, end, freq="MS")
+    return pd.DataFrame(
+        {
+            "periodo_key": (months.year * 100 + months.month).astype("int32"),
+            "periodo": months.strftime("%Y%m"),
+            "anio": months.year.astype("int16"),
+            "mes": months.month.astype("int16"),
+            "trimestre": months.quarter.astype("int16"),
+            "fecha_mes": months,
+            "dias_mes": months.days_in_month.astype("int16"),
+            "intervalos_15min": (months.days_in_month * 96).astype("int32"),
+        }
+    )
+
+
+def upsert_dimension(existing: pd.DataFrame | None, candidates: pd.DataFrame, name: str) -> pd.DataFrame:
+    """Agregar a ``existing`` los miembros nuevos de ``candidates`` con claves correlativas.
+
+    Los atributos de miembros ya conocidos se actualizan; sus claves no cambian.
+    """
+
+    key, natural = DIMENSIONS[name]
+    candidates = candidates.dropna(subset=natural).drop_duplicates(subset=natural, keep="last")
+    if existing is None or existing.empty:
+        unknown = pd.DataFrame({key: [UNKNOWN_KEY], **{col: ["(sin dato)"] for col in natural}})
+        existing = unknown
+    existing = existing.copy()
+    for col in natural:
+        existing[col] = existing[col].astype(str)
+        candidates = candidates.assign(**{col: candidates[col].astype(str)})
+
+    merged = candidates.merge(existing[[key, *natural]], on=natural, how="left")
+    new = merged[merged[key].isna()].sort_values(natural)
+    start = int(existing[key].max()) + 1
+    new = new.assign(**{key: range(start, start + len(new))})
+    known = merged[merged[key].notna()]
+
+    # atributos al día para los conocidos, sin tocar los que no vinieron en esta corrida
+    updated = existing.set_index(key)
+    if not known.empty:
+        known = known.set_index(known[key].astype(int)).drop(columns=[key])
+        for col in known.columns:
+            if col not in updated.columns:
+                updated[col] = pd.NA
+        updated.update(known)
+    out = pd.concat([updated.reset_index(), new], ignore_index=True)
+    out[key] = out[key].astype(int)
+    return out[[key, *[c for c in out.columns if c != key]]].sort_values(key, ignore_index=True)
+
+
+def dimension_keys(values: pd.DataFrame, dim: pd.DataFrame, name: str) -> pd.Series:
+    """Clave de ``dim`` para cada fila de ``values`` (miembro desconocido: 0)."""
+
+    key, natural = DIMENSIONS[name]
+    lookup = dim[[key, *natural]].copy()
+    probe = values[natural].copy()
+    for col in natural:
+        lookup[col] = lookup[col].astype(str)
+        probe[col] = probe[col].astype("string").fillna("\0").astype(str)
+    keys = probe.merge(lookup, on=natural, how="left")[key]
+    return keys.fillna(UNKNOWN_KEY).astype(int).set_axis(values.index)
+
+
+def to_fact(table: str, df: pd.DataFrame, dims: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """Reemplazar las columnas naturales de ``df`` por claves enteras."""
+
+    spec = fact_spec(table)
+    if spec is None:
+        raise KeyError(f"{table} no tiene hecho en el modelo estrella")
+    out = df.copy()
+    for pos, name in enumerate(spec["dims"]):
+        key, natural = DIMENSIONS[name]
+        if name == "dim_periodo":
+            keys = periodo_keys(out["periodo"])
+        else:
+            keys = dimension_keys(out, dims[name], name)
+        out = out.drop(columns=[c for c in natural if c in out.columns])
+        out.insert(pos, key, keys.to_numpy())
+    return out.drop(columns=[c for c in spec["drop"] if c in out.columns])
+
+
+def join_dimensions(fact: pd.DataFrame, table: str, dims: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """Vista plana de un hecho: une sus dimensiones por clave (left join)."""
+
+    spec = fact_spec(table)
+    if spec is None or fact.empty:
+        return fact
+    out = fact
+    for name in spec["dims"]:
+        key, _natural = DIMENSIONS[name]
+        dim = dims.get(name)
+        if dim is None or dim.empty or key not in out.columns:
+            continue
+        attrs = dim.drop(columns=[c for c in dim.columns if c in out.columns and c != key])
+        out = out.merge(attrs, on=key, how="left", validate="many_to_one")
+    return out
+
+
+__all__ = [
+    "DIMENSIONS",
+    "FACTS",
+    "STAR_DIR",
+    "UNKNOWN_KEY",
+    "build_dim_periodo",
+    "dimension_keys",
+    "fact_name",
+    "fact_spec",
+    "join_dimensions",
+    "periodo_keys",
+    "to_fact",
+    "upsert_dimension",
+]
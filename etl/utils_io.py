@@ -4,19 +4,28 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
+import pickle
 import re
 import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
+import numpy as np
 import pandas as pd
 
+from . import config as etl_config
 from .config import table_rules, REPORTS_DIR, LOGS_DIR
-from etl.schemas import get_schema
+from .profiling import record_timing, timed
+from etl.schemas import apply_dtypes, get_schema
 import json
-from datetime import datetime
 logger = logging.getLogger(__name__)
 
 _RUN_CONTEXT: dict = {
@@ -73,17 +82,225 @@ def read_excel_safe(
         return pd.DataFrame()
 
     try:
-        preview = pd.read_excel(path, sheet_name=sheet_name, nrows=30, header=None)
-        header_row = 0
-        if expected_columns or header_keywords:
-            header_row = detect_header_row(preview, expected_columns, header_keywords)
-        df = pd.read_excel(path, sheet_name=sheet_name, header=header_row, **kwargs)
+        with excel_file(path) as xls:
+            preview = read_excel(xls, sheet_name=sheet_name, nrows=30, header=None)
+            header_row = 0
+            if expected_columns or header_keywords:
+                header_row = detect_header_row(preview, expected_columns, header_keywords)
+            df = read_excel(xls, sheet_name=sheet_name, header=header_row, **kwargs)
         return df
     except Exception:
         logger.exception("Error leyendo Excel %s sheet=%s", path, sheet_name)
         raise
 
 
+EXCEL_ENGINES = ("auto", "calamine", "openpyxl")
+_ENGINE_WARNED: set = set()
+
+
+@lru_cache(maxsize=1)
+def _calamine_available() -> bool:
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def excel_engine(requested: str | None = None) -> str:
+    """Resolver el motor de lectura Excel (``io.excel_engine``).
+
+    ``auto`` usa python-calamine (lector en Rust) si está instalado y cae a
+    openpyxl en caso contrario; ``calamine`` sin el paquete instalado también
+    cae a openpyxl, con una advertencia.
+    """
+
+    name = str(requested or etl_config.io_settings().get("excel_engine") or "auto").strip().lower()
+    if name not in EXCEL_ENGINES:
+        raise ValueError(f"io.excel_engine inválido: {name!r} (opciones: {', '.join(EXCEL_ENGINES)})")
+    if name == "openpyxl":
+        return name
+    if _calamine_available():
+        return "calamine"
+    if name == "calamine" and name not in _ENGINE_WARNED:
+        _ENGINE_WARNED.add(name)
+        logger.warning("python-calamine no está instalado; se usa openpyxl para leer Excel")
+    return "openpyxl"
+
+
+def _engine_for(path: Path, engine: str | None = None) -> str | None:
+    resolved = excel_engine(engine)
+    # openpyxl no lee .xls: se deja que pandas elija (xlrd) como antes
+    if resolved == "openpyxl" and Path(path).suffix.lower() == ".xls":
+        return None
+    return resolved
+
+
+def excel_file(path: Path, engine: str | None = None) -> pd.ExcelFile:
+    """``pd.ExcelFile`` con el motor configurado (reutilizable entre hojas)."""
+
+    return pd.ExcelFile(path, engine=_engine_for(path, engine))
+
+
+def read_excel(
+    path: Path | pd.ExcelFile,
+    sheet_name: str | int | None = 0,
+    engine: str | None = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """``pd.read_excel`` con el motor configurado.
+
+    Acepta un ``pd.ExcelFile`` ya abierto (ver :func:`excel_file`) para no
+    reabrir el libro por cada hoja o preview.
+    """
+
+    if isinstance(path, pd.ExcelFile):
+        return pd.read_excel(path, sheet_name=sheet_name, **kwargs)
+    return pd.read_excel(path, sheet_name=sheet_name, engine=_engine_for(path, engine), **kwargs)
+
+
+def _calamine_cell(value: object) -> object:
+    """Normalizar una celda de calamine a lo que entrega openpyxl."""
+
+    if isinstance(value, str):
+        return value if value else None
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return datetime(value.year, value.month, value.day)
+    return value
+
+
+class _CalamineSheet:
+    """Hoja calamine con la interfaz de ``ws`` que usan los lectores streaming."""
+
+    def __init__(self, sheet) -> None:
+        self._sheet = sheet
+        end = sheet.end
+        self.max_row = end[0] + 1 if end else 0
+        # calamine omite las columnas vacías a la izquierda del rango usado
+        self._col_offset = (None,) * (sheet.start[1] if sheet.start else 0)
+
+    def iter_rows(self, values_only: bool = True) -> Iterator[Tuple[object, ...]]:
+        pad = self._col_offset
+        for row in self._sheet.iter_rows():
+            yield pad + tuple(_calamine_cell(v) for v in row)
+
+
+@contextmanager
+def open_sheet_stream(path: Path, sheet_name: str | int = 0, engine: str | None = None):
+    """Abrir una hoja en modo streaming.
+
+    Con openpyxl se usa ``read_only``: no carga el DOM completo del libro y
+    las filas se leen del XML a medida que se iteran
+    (``ws.iter_rows(values_only=True)``). Con calamine se expone la misma
+    interfaz (``max_row``, ``iter_rows``) con celdas normalizadas (vacío ->
+    ``None``, fecha -> ``datetime``). El libro se cierra al salir del contexto.
+    """
+
+    if _engine_for(path, engine) == "calamine":
+        from python_calamine import CalamineWorkbook
+
+        wb = CalamineWorkbook.from_path(str(path))
+        try:
+            sheet = wb.get_sheet_by_index(sheet_name) if isinstance(sheet_name, int) else wb.get_sheet_by_name(sheet_name)
+            yield _CalamineSheet(sheet)
+        finally:
+            wb.close()
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[sheet_name] if isinstance(sheet_name, int) else wb[sheet_name]
+        yield ws
+    finally:
+        wb.close()
+
+
+def _cell_to_float(value: object) -> float:
+    """Coerción por celda equivalente a ``pd.to_numeric(errors="coerce")``."""
+
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            return np.nan
+    return np.nan
+
+
+def iter_row_batches(
+    rows: Iterable[Sequence[object]],
+    width: int,
+    batch_size: int = 1024,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Agrupar filas en lotes ``(primera_columna, valores)``.
+
+    ``valores`` es un buffer float64 preasignado de ``batch_size x (width-1)``
+    que se reutiliza entre lotes (el consumidor debe copiarlo). Las filas se
+    rellenan/recortan a ``width``; celdas no numéricas quedan como NaN.
+    """
+
+    labels = np.empty(batch_size, dtype=object)
+    buffer = np.empty((batch_size, max(width - 1, 0)), dtype=np.float64)
+    pending: List[Sequence[object]] = []
+
+    def _pad(row: Sequence[object]) -> Tuple[object, ...]:
+        vals = tuple(row[1:width])
+        return vals + (None,) * (width - 1 - len(vals))
+
+    def _flush() -> Tuple[np.ndarray, np.ndarray]:
+        n = len(pending)
+        block = [_pad(r) for r in pending]
+        try:
+            buffer[:n] = np.array(block, dtype=np.float64)  # None -> NaN
+        except (TypeError, ValueError):
+            for i, row in enumerate(block):
+                buffer[i] = [_cell_to_float(v) for v in row]
+        for i, row in enumerate(pending):
+            labels[i] = row[0] if row else None
+        pending.clear()
+        return labels[:n], buffer[:n]
+
+    for row in rows:
+        pending.append(row)
+        if len(pending) == batch_size:
+            yield _flush()
+    if pending:
+        yield _flush()
+
+
+def read_numeric_block(
+    rows: Iterable[Sequence[object]],
+    width: int,
+    capacity: int = 0,
+    batch_size: int = 1024,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Leer filas en arreglos preasignados: ``(primera_columna, valores float64)``.
+
+    ``capacity`` (p. ej. ``ws.max_row``) evita realocaciones; si se queda
+    corto, el arreglo crece al doble.
+    """
+
+    capacity = max(int(capacity or 0), batch_size)
+    labels = np.empty(capacity, dtype=object)
+    values = np.empty((capacity, max(width - 1, 0)), dtype=np.float64)
+    n = 0
+    for batch_labels, batch_values in iter_row_batches(rows, width, batch_size):
+        m = len(batch_labels)
+        if n + m > capacity:
+            capacity = max(capacity * 2, n + m)
+            labels = np.resize(labels, capacity)
+            grown = np.empty((capacity, values.shape[1]), dtype=np.float64)
+            grown[:n] = values[:n]
+            values = grown
+        labels[n:n + m] = batch_labels
+        values[n:n + m] = batch_values
+        n += m
+    return labels[:n], values[:n]
+
+
 def list_matching_files(base_dir: Path, pattern: str) -> List[Path]:
     """Listar archivos que cumplan el patrón (substring o regex)."""
 
@@ -142,7 +359,8 @@ def safe_write_csv(df: pd.DataFrame, path: Path) -> int:
     """
 
     sanitized = path.with_name(sanitize_filename(path.name))
-    _atomic_write_csv(df, sanitized)
+    with timed("write", sanitized.name, rows=len(df)):
+        _atomic_write_csv(df, sanitized)
     return len(df)
 
 
@@ -157,6 +375,100 @@ def record_file_info(files: Iterable[Path]) -> List[Tuple[str, float, int]]:
     return info
 
 
+def run_parallel(fn: Callable[..., Any], calls: Sequence[Tuple[Any, ...]], max_workers: int | None = None) -> List[Any]:
+    """Ejecutar ``fn(*args)`` para cada tupla de ``calls`` en procesos separados.
+
+    El orden del resultado coincide con ``calls``. Con una sola llamada o
+    ``max_workers <= 1`` se ejecuta en línea (sin levantar procesos).
+    ``fn`` debe ser una función de módulo (picklable en Windows).
+    """
+
+    calls = list(calls)
+    workers = max_workers if max_workers is not None else int(etl_config.io_settings().get("max_workers") or 1)
+    if len(calls) <= 1 or workers <= 1:
+        return [fn(*args) for args in calls]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(calls))) as pool:
+        futures = [pool.submit(fn, *args) for args in calls]
+        return [future.result() for future in futures]
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any) -> Tuple[float, Any]:
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - t0, result
+
+
+def _args_digest(extra_args: Tuple[Any, ...]) -> str:
+    """Huella estable de los argumentos extra del parser (configuración, referencias)."""
+
+    h = hashlib.sha1()
+    for arg in extra_args:
+        if isinstance(arg, pd.DataFrame):
+            h.update(repr(list(arg.columns)).encode("utf-8"))
+            h.update(pd.util.hash_pandas_object(arg, index=False).to_numpy().tobytes())
+        else:
+            h.update(json.dumps(arg, sort_keys=True, default=repr).encode("utf-8"))
+        h.update(b"|")
+    return h.hexdigest()
+
+
+def _parse_cache_path(namespace: str, path: Path, version: str, args_digest: str = "") -> Path:
+    stat = path.stat()
+    raw = f"{namespace}|{path.name}|{stat.st_size}|{stat.st_mtime_ns}|{version}|{args_digest}"
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return etl_config.cache_dir() / namespace / f"{digest}.pkl"
+
+
+def parse_files_cached(
+    namespace: str,
+    paths: Sequence[Path],
+    parser: Callable[..., Any],
+    extra_args: Tuple[Any, ...] = (),
+    version: str = "1",
+) -> List[Any]:
+    """Parsear archivos reutilizando resultados previos si el archivo no cambió.
+
+    La clave del cache combina nombre, tamaño, mtime, ``version`` del parser
+    (súbela cuando cambie la lógica de parseo) y una huella de ``extra_args``:
+    editar la configuración que recibe el parser invalida el cache. Los archivos sin cache se
+    parsean en paralelo con :func:`run_parallel` como ``parser(path, *extra_args)``.
+    """
+
+    use_cache = bool(etl_config.io_settings().get("parse_cache", True))
+    results: List[Any] = [None] * len(paths)
+    pending: List[int] = []
+    args_digest = _args_digest(extra_args) if use_cache else ""
+
+    for idx, path in enumerate(paths):
+        cache_path = _parse_cache_path(namespace, path, version, args_digest) if use_cache else None
+        if cache_path is not None and cache_path.exists():
+            try:
+                t0 = time.perf_counter()
+                with cache_path.open("rb") as fh:
+                    results[idx] = pickle.load(fh)
+                record_timing("parse", path.name, time.perf_counter() - t0, stage=namespace, cached=True)
+                logger.info("Cache de parseo reutilizado para %s", path.name, extra=default_log_extra(stage=namespace, file=path.name))
+                continue
+            except Exception:
+                logger.warning("Cache de parseo ilegible para %s; se vuelve a parsear", path.name)
+        pending.append(idx)
+
+    parsed = run_parallel(_timed_call, [(parser, paths[idx], *extra_args) for idx in pending])
+    for idx, (seconds, result) in zip(pending, parsed):
+        results[idx] = result
+        record_timing("parse", paths[idx].name, seconds, stage=namespace, cached=False)
+        if not use_cache:
+            continue
+        cache_path = _parse_cache_path(namespace, paths[idx], version, args_digest)
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(delete=False, dir=str(cache_path.parent), suffix=".tmp") as tmp:
+            pickle.dump(result, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp.name, cache_path)
+
+    return results
+
+
 def apply_table_rules(dataset: str, df: pd.DataFrame) -> pd.DataFrame:
     """
     Aplica reglas declaradas en config.yml/config.toml:
@@ -255,20 +567,25 @@ def _write_validation_report(dataset: str, error: Exception, total_rows: int) ->
 
 
 def validate_and_write(dataset: str, df: pd.DataFrame, path: Path) -> int:
-    """Valida (pandera) y escribe CSV. En modo estricto, falla si hay errores."""
+    """Valida (pandera) y escribe CSV. En modo estricto, falla si hay errores.
+
+    Antes de escribir se aplica la política de tipos compactos
+    (:data:`etl.schemas.DTYPES`) sin bajar a float32.
+    """
 
     schema = get_schema(dataset)
     strict = bool(_RUN_CONTEXT.get("strict", True))
 
     if schema is None:
-        return safe_write_csv(df, path)
+        return safe_write_csv(apply_dtypes(df, dataset, floats=False), path)
 
     if df.empty:
         # No validamos datasets vacíos; solo escribimos para mantener contratos de salida.
         return safe_write_csv(df, path)
 
     try:
-        validated = schema.validate(df, lazy=True)
+        with timed("validate", dataset, rows=len(df)):
+            validated = schema.validate(df, lazy=True)
     except Exception as exc:  # pandera SchemaErrors o similares
         report, summary = _write_validation_report(dataset, exc, total_rows=len(df))
         summary_txt = ""
@@ -287,7 +604,7 @@ def validate_and_write(dataset: str, df: pd.DataFrame, path: Path) -> int:
         # modo non-strict: escribir de todos modos
         return safe_write_csv(df, path)
 
-    return safe_write_csv(validated, path)
+    return safe_write_csv(apply_dtypes(validated, dataset, floats=False), path)
 
 
 def default_log_extra(**kwargs) -> dict:
@@ -312,8 +629,22 @@ def ensure_runs_log() -> Path:
     return path
 
 
-def record_etl_run(run_id: str, started_at: str, finished_at: str, status: str, tables: dict, warnings: list[str] | None = None, error: str | None = None) -> Path:
-    """Append run metadata to etl_runs.jsonl."""
+def record_etl_run(
+    run_id: str,
+    started_at: str,
+    finished_at: str,
+    status: str,
+    tables: dict,
+    warnings: list[str] | None = None,
+    error: str | None = None,
+    profile: dict | None = None,
+    stages: dict | None = None,
+) -> Path:
+    """Append run metadata to etl_runs.jsonl.
+
+    ``stages`` trae por etapa duration_ms, files, input_bytes, rows_out,
+    rows_per_s y peak_rss_mb; el total de la corrida se deriva de ahí.
+    """
 
     path = ensure_runs_log()
     payload = {
@@ -326,6 +657,14 @@ def record_etl_run(run_id: str, started_at: str, finished_at: str, status: str,
     }
     if error:
         payload["error"] = error
+    if stages:
+        payload["stages"] = stages
+        payload["duration_ms"] = sum(st["duration_ms"] for st in stages.values())
+        payload["input_bytes"] = sum(st["input_bytes"] for st in stages.values())
+        peaks = [st["peak_rss_mb"] for st in stages.values() if st.get("peak_rss_mb")]
+        payload["peak_rss_mb"] = max(peaks) if peaks else None
+    if profile:
+        payload["profile"] = profile
     with path.open("a", encoding="utf-8") as fh:
         fh.write(json.dumps(payload, ensure_ascii=False) + "\n")
     return path
@@ -334,9 +673,18 @@ def record_etl_run(run_id: str, started_at: str, finished_at: str, status: str,
 __all__ = [
     "detect_header_row",
     "read_excel_safe",
+    "EXCEL_ENGINES",
+    "excel_engine",
+    "excel_file",
+    "read_excel",
     "list_matching_files",
+    "open_sheet_stream",
+    "iter_row_batches",
+    "read_numeric_block",
     "safe_write_csv",
     "record_file_info",
+    "run_parallel",
+    "parse_files_cached",
     "apply_table_rules",
     "validate_and_write",
     "set_run_context",
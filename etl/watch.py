@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+
+"""Modo watch: corre el ETL incremental cuando llegan archivos a ``data_landing``.
+
+Cada ``interval_s`` se toma una foto (nombre, tamaño, mtime) de los archivos
+que calzan con los patrones de ``config.LANDING_FILES``. Si una fuente tiene
+archivos nuevos o modificados respecto de la última corrida procesada, se
+espera a que la carpeta lleve ``debounce_s`` sin cambios y a que los archivos
+se puedan abrir (copia terminada); luego se corre ``python -m etl --stages``
+solo con las etapas que leen esas fuentes (ver ``run_etl.STAGE_SOURCES``)::
+
+    python -m etl watch                      # daemon
+    python -m etl watch --once --debounce 0  # procesa lo pendiente y sale
+
+La foto procesada se guarda en ``logs/watch_state.json``: al reiniciar, lo
+que llegó mientras el watch estaba detenido se procesa en la primera vuelta.
+Se usa polling (no inotify) para funcionar igual en Windows y carpetas de red.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+from etl import config
+from etl.run_etl import STAGE_SOURCES, STAGES
+from etl.utils_io import list_matching_files
+
+logger = logging.getLogger(__name__)
+
+# fuente -> nombre de archivo -> [tamaño, mtime_ns]
+Snapshot = Dict[str, Dict[str, List[int]]]
+
+# archivos temporales de Office / descargas que no se deben procesar
+_TEMP_PREFIXES = ("~$", ".~")
+_TEMP_SUFFIXES = (".tmp", ".part", ".crdownload", ".partial")
+
+
+def state_path() -> Path:
+    return config.LOGS_DIR / "watch_state.json"
+
+
+def _is_temp(path: Path) -> bool:
+    return path.name.startswith(_TEMP_PREFIXES) or path.name.lower().endswith(_TEMP_SUFFIXES)
+
+
+def snapshot(landing: Path | None = None) -> Snapshot:
+    """Archivos de cada fuente con tamaño y mtime."""
+
+    landing = landing or config.DATA_LANDING
+    out: Snapshot = {}
+    for source, pattern in config.LANDING_FILES.items():
+        if not pattern:
+            continue
+        files = {}
+        for path in list_matching_files(landing, pattern):
+            if not path.is_file() or _is_temp(path):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:  # borrado entre el listado y el stat
+                continue
+            files[path.name] = [stat.st_size, stat.st_mtime_ns]
+        out[source] = files
+    return out
+
+
+def changed_sources(previous: Snapshot, current: Snapshot) -> List[str]:
+    """Fuentes con archivos nuevos o modificados (los borrados no disparan corridas)."""
+
+    return sorted(
+        source
+        for source, files in current.items()
+        if any(previous.get(source, {}).get(name) != info for name, info in files.items())
+    )
+
+
+def stages_for(sources: Sequence[str]) -> List[str]:
+    """Etapas de origen afectadas, en el orden de ``run_etl.STAGES``."""
+
+    wanted = set(sources)
+    return [name for name, _fn, _msg in STAGES if wanted & set(STAGE_SOURCES.get(name, []))]
+
+
+def files_ready(landing: Path, current: Snapshot, sources: Sequence[str]) -> bool:
+    """Los archivos cambiados existen, no están vacíos y se pueden abrir (copia terminada)."""
+
+    for source in sources:
+        for name, (size, _mtime) in current.get(source, {}).items():
+            if size == 0:
+                return False
+            try:
+                with (landing / name).open("rb") as fh:
+                    fh.read(1)
+            except OSError:  # en Windows el archivo en copia está bloqueado
+                return False
+    return True
+
+
+def load_state() -> Snapshot:
+    path = state_path()
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        logger.warning("Estado de watch ilegible en %s; se reprocesa todo", path)
+        return {}
+
+
+def save_state(state: Snapshot) -> None:
+    path = state_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(path)
+
+
+def run_stages_subprocess(stages: Sequence[str], etl_args: Sequence[str] = ()) -> int:
+    """Correr ``python -m etl --stages ...`` en un proceso aparte (aísla memoria y fallas)."""
+
+    cmd = [sys.executable, "-m", "etl", "--stages", ",".join(stages), *etl_args]
+    logger.info("Ejecutando %s", " ".join(cmd))
+    return subprocess.call(cmd, cwd=config.BASE_DIR)
+
+
+def watch(
+    interval: float | None = None,
+    debounce: float | None = None,
+    once: bool = False,
+    runner: Callable[[Sequence[str]], int] = run_stages_subprocess,
+    max_polls: int | None = None,
+) -> int:
+    """Bucle de vigilancia; devuelve la cantidad de corridas lanzadas.
+
+    Con ``once`` procesa lo pendiente (respetando el debounce) y sale.
+    """
+
+    settings = config.watch_settings()
+    interval = settings["interval_s"] if interval is None else interval
+    debounce = settings["debounce_s"] if debounce is None else debounce
+    landing = config.DATA_LANDING
+
+    state = load_state()
+    last_snap: Snapshot | None = None
+    failed_snap: Snapshot | None = None
+    quiet_since = time.monotonic()
+    runs = polls = 0
+    logger.info("Vigilando %s cada %ss (debounce %ss)", landing, interval, debounce)
+
+    while max_polls is None or polls < max_polls:
+        polls += 1
+        snap = snapshot(landing)
+        if snap != last_snap:
+            quiet_since = time.monotonic()
+            last_snap = snap
+        sources = changed_sources(state, snap)
+
+        if not sources:
+            if state != snap:
+                save_state(snap)  # solo hubo borrados
+                state = snap
+            if once:
+                break
+        elif snap != failed_snap and time.monotonic() - quiet_since >= debounce and files_ready(landing, snap, sources):
+            stages = stages_for(sources)
+            logger.info("Cambios en %s -> etapas %s", ",".join(sources), ",".join(stages) or "-")
+            code = runner(stages) if stages else 0
+            runs += bool(stages)
+            if code == 0:
+                state = snap
+                save_state(state)
+                failed_snap = None
+            else:
+                # no reintentar en bucle: se espera a que cambien los archivos
+                logger.error("La corrida incremental falló (exit %s); se reintenta cuando cambie data_landing", code)
+                failed_snap = snap
+                if once:
+                    break
+        elif once and snap == failed_snap:
+            break
+        time.sleep(interval)
+    return runs
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m etl watch", description="Correr el ETL incremental al llegar archivos a data_landing")
+    parser.add_argument("--config", help="Ruta alternativa a config.yml|toml")
+    parser.add_argument("--interval", type=float, help="Segundos entre revisiones (default: watch.interval_s)")
+    parser.add_argument("--debounce", type=float, help="Segundos sin cambios antes de correr (default: watch.debounce_s)")
+    parser.add_argument("--once", action="store_true", help="Procesar lo pendiente y salir")
+    parser.add_argument("--non-strict", action="store_true", help="Pasar --non-strict a las corridas")
+    parser.add_argument("--dry-run", action="store_true", help="Solo mostrar qué etapas se correrían")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s - %(message)s")
+    config.apply_runtime_overrides(config_path=Path(args.config) if args.config else None)
+
+    etl_args = [*(["--config", args.config] if args.config else []), *(["--non-strict"] if args.non_strict else [])]
+    if args.dry_run:
+        sources = changed_sources(load_state(), snapshot())
+        print(f"Fuentes con cambios: {', '.join(sources) or '-'}")
+        print(f"Etapas: {', '.join(stages_for(sources)) or '-'}")
+        return
+    try:
+        watch(args.interval, args.debounce, once=args.once, runner=lambda stages: run_stages_subprocess(stages, etl_args))
+    except KeyboardInterrupt:
+        logger.info("Watch detenido")
+
+
+__all__ = [
+    "changed_sources",
+    "files_ready",
+    "main",
+    "snapshot",
+    "stages_for",
+    "watch",
+]
@@ -1,4 +1,4 @@
-// Placeholder frontend entrypoint. The production dashboard usa Streamlit (streamlit_app.py/pages/*).
+// Placeholder frontend entrypoint. The production dashboard usa Streamlit (streamlit_app.py/paginas/*).
 // Si se decide migrar a Vite/React, usar este punto de entrada.
 
 export const placeholder = true;
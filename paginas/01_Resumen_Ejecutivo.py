@@ -1,12 +1,24 @@
+import pandas as pd
 import streamlit as st
-import plotly.express as px
 
-from app.charts.theme import AxisFormat, PLOTLY_CONFIG, apply_exec_style, apply_soft_markers, apply_thin_lines, format_axis_units
-from app.ui_components import kpi, line_chart, bar_chart
+from app.ui_components import (
+    AxisFormat,
+    apply_exec_style,
+    apply_soft_markers,
+    apply_thin_lines,
+    bar_chart,
+    format_axis_units,
+    kpi,
+    line_chart,
+    plotly_chart,
+    px,
+)
+from app.warmup import start_warmup
 from utils.data import load_csv, load_centrales, metadata_token
-from utils.filters import sidebar_periodo_selector, filter_by_periodo
+from utils.filters import ensure_periodo_str, sidebar_periodo_selector, filter_by_periodo
 
 st.set_page_config(layout="wide")
+start_warmup()
 st.title("📌 Resumen Ejecutivo")
 
 meta_token = metadata_token()
@@ -17,7 +29,6 @@ precio = load_csv("precio_medio_mensual.csv", meta_token=meta_token)
 rep = load_csv("represas_diario.csv", meta_token=meta_token)
 
 # periodos base
-from utils.filters import ensure_periodo_str
 gen = ensure_periodo_str(gen, "periodo")
 periodos = sorted(gen["periodo"].unique())
 p_ini, p_fin = sidebar_periodo_selector(periodos, "Generación")
@@ -77,12 +88,12 @@ if mix is not None and not mix.empty:
         source="EGASA · Data Mart",
         hovermode="closest",
     )
-    c2.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(c2, fig)
 
 c3, c4 = st.columns(2)
 
 if not seg_f.empty:
-    s2 = seg_f.groupby(["periodo", "segmento"])["energia_mwh"].sum().reset_index()
+    s2 = seg_f.groupby(["periodo", "segmento"], observed=True)["energia_mwh"].sum().reset_index()
     bar_chart(
         c3,
         s2,
@@ -96,7 +107,10 @@ if not seg_f.empty:
     )
 
 if not rep.empty and "pct_llenado" in rep.columns:
-    rep_sorted = rep.sort_values("pct_llenado", ascending=False)
+    # represas_diario guarda el histórico: mostrar solo el último reporte
+    rep_fecha = pd.to_datetime(rep["fecha"], errors="coerce")
+    rep_ultimo = rep[rep_fecha == rep_fecha.max()] if rep_fecha.notna().any() else rep
+    rep_sorted = rep_ultimo.sort_values("pct_llenado", ascending=False)
     fig = px.bar(rep_sorted, x="reservorio", y="pct_llenado", title="Estado diario represas")
     format_axis_units(
         fig,
@@ -110,4 +124,4 @@ if not rep.empty and "pct_llenado" in rep.columns:
         source="EGASA · Data Mart",
         hovermode="x unified",
     )
-    c4.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(c4, fig)
@@ -1,14 +1,14 @@
-import plotly.express as px
 import streamlit as st
 
-from app.charts.theme import (
+from app.ui_components import (
     AxisFormat,
-    PLOTLY_CONFIG,
     apply_exec_style,
     apply_soft_markers,
     apply_thin_lines,
     apply_unified_hover,
     format_axis_units,
+    plotly_chart,
+    px,
 )
 from utils.data import load_csv, load_centrales
 from utils.filters import sidebar_periodo_selector, filter_by_periodo
@@ -45,12 +45,12 @@ apply_exec_style(
     subtitle="Energia generada por periodo (MWh)",
     source="EGASA · Data Mart",
 )
-st.plotly_chart(fig_total, use_container_width=True, config=PLOTLY_CONFIG)
+plotly_chart(st, fig_total)
 
 st.markdown("### 2) Por central (Top N)")
 top_n = st.sidebar.slider("Top N centrales", 3, 12, 9)
-byc = gen.groupby(["periodo", "central"])["energia_mwh"].sum().reset_index()
-rank = byc.groupby("central")["energia_mwh"].sum().sort_values(ascending=False).head(top_n).index
+byc = gen.groupby(["periodo", "central"], observed=True)["energia_mwh"].sum().reset_index()
+rank = byc.groupby("central", observed=True)["energia_mwh"].sum().sort_values(ascending=False).head(top_n).index
 byc = byc[byc["central"].isin(rank)]
 fig_top = px.bar(byc, x="periodo", y="energia_mwh", color="central", title="Top centrales (MWh)")
 apply_unified_hover(fig_top, fmt=":,.0f", units="MWh")
@@ -65,7 +65,7 @@ apply_exec_style(
     subtitle="Ordenadas por aporte acumulado",
     source="EGASA · Data Mart",
 )
-st.plotly_chart(fig_top, use_container_width=True, config=PLOTLY_CONFIG)
+plotly_chart(st, fig_top)
 
 st.markdown("### 3) Mix Hidro vs Térmica")
 if not centrales.empty:
@@ -84,7 +84,7 @@ if not centrales.empty:
         subtitle="Hidro vs Térmica",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig_mix, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig_mix)
 
 st.markdown("### 4) Estacionalidad (heatmap)")
 gen["anio"] = gen["periodo"].astype(str).str[:4].astype(int)
@@ -103,4 +103,4 @@ apply_exec_style(
     source="EGASA · Data Mart",
     hovermode="closest",
 )
-st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+plotly_chart(st, fig)
@@ -1,18 +1,18 @@
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
-from app.charts.theme import (
+from app.ui_components import (
     AxisFormat,
-    PLOTLY_CONFIG,
     apply_exec_style,
     apply_soft_markers,
     apply_thin_lines,
     apply_unified_hover,
     format_axis_units,
+    plotly_chart,
+    px,
     short_spanish_date,
 )
-from utils.data import load_generacion_15min, list_yyyymm_15min, metadata_token
+from utils.data import load_cobertura_15min, load_csv, load_generacion_15min, list_yyyymm_15min, metadata_token
 
 st.set_page_config(layout="wide")
 st.title("⏱️ Generación 15-min (2025)")
@@ -70,7 +70,7 @@ apply_exec_style(
     subtitle=f"Energía por intervalo — {short_spanish_date(df_dia['fecha_hora'].iloc[0])}",
     source="EGASA · Data Mart",
 )
-st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+plotly_chart(st, fig)
 
 st.markdown("### Agregado horario")
 df_dia["hora"] = df_dia["fecha_hora"].dt.floor("H")
@@ -85,7 +85,7 @@ format_axis_units(
     y=AxisFormat(title="Energía (MWh)", tickformat=",.2f"),
 )
 apply_exec_style(fig_h, title="Energía por hora", subtitle="Promedio por intervalo horario", source="EGASA · Data Mart")
-st.plotly_chart(fig_h, use_container_width=True, config=PLOTLY_CONFIG)
+plotly_chart(st, fig_h)
 
 st.markdown("### Comparación Día vs Día")
 dia2 = st.sidebar.selectbox("Comparar con", dias, index=max(0, len(dias) - 2))
@@ -118,4 +118,38 @@ apply_exec_style(
     subtitle="Energía consolidada por día",
     source="EGASA · Data Mart",
 )
-st.plotly_chart(fig_comp, use_container_width=True, config=PLOTLY_CONFIG)
+plotly_chart(st, fig_comp)
+
+st.markdown("### Indicadores del mes por central")
+ind = load_csv("indicadores_15min_mensual.csv", meta_token=meta_token)
+if ind.empty:
+    st.info("Aún no hay indicadores_15min_mensual.csv (se generan en el ETL).")
+else:
+    ind = ind[(ind["periodo"].astype(str) == str(yyyymm)) & (ind["nivel"] == "central")]
+    if central != "(Todas)":
+        ind = ind[ind["central"] == central]
+    cols = ["central", "energia_mwh", "factor_planta", "disponibilidad", "horas_cero", "pico_mw", "rampa_subida_max_mw", "rampa_bajada_max_mw"]
+    st.dataframe(ind[cols], use_container_width=True, hide_index=True)
+
+st.markdown("### Cobertura de intervalos")
+cob = load_cobertura_15min(yyyymm, meta_token=meta_token)
+if cob.empty:
+    st.info("Aún no hay índice de cobertura para este periodo (se genera en el ETL).")
+else:
+    if central != "(Todas)":
+        cob = cob[cob["central"] == central]
+    hm = cob.pivot_table(index="unidad", columns="fecha", values="cobertura_pct")
+    fig_cov = px.imshow(hm, zmin=0, zmax=100, color_continuous_scale="RdYlGn", aspect="auto", title="Cobertura por unidad y día (%)")
+    format_axis_units(
+        fig_cov,
+        x=AxisFormat(title="Día"),
+        y=AxisFormat(title="Unidad"),
+    )
+    apply_exec_style(
+        fig_cov,
+        title="Cobertura de intervalos",
+        subtitle="% de los 96 intervalos del día con dato",
+        source="EGASA · Data Mart",
+        hovermode="closest",
+    )
+    plotly_chart(st, fig_cov)
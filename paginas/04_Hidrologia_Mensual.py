@@ -0,0 +1,166 @@
+import pandas as pd
+import streamlit as st
+
+from app.ui_components import (
+    AxisFormat,
+    apply_exec_style,
+    apply_soft_markers,
+    apply_thin_lines,
+    apply_unified_hover,
+    format_axis_units,
+    plotly_chart,
+    px,
+)
+from utils.data import load_csv
+from utils.filters import sidebar_periodo_selector, filter_by_periodo, ensure_periodo_str
+
+st.set_page_config(layout="wide")
+st.title("💧 Hidrología mensual")
+
+# climatología, anomalías, YoY y % de capacidad vienen precalculados por el ETL (etapa hidro_metricas)
+met = load_csv("hidro_metricas_mensual.csv")
+
+if met.empty:
+    st.warning("No hay hidro_metricas_mensual.csv en data_mart (se genera en el ETL).")
+    st.stop()
+
+met = ensure_periodo_str(met, "periodo")
+vol = met[met["variable"] == "volumen_000m3"]
+cau = met[met["variable"] == "caudal_m3s"]
+
+periodos = sorted((vol if not vol.empty else cau)["periodo"].unique())
+p_ini, p_fin = sidebar_periodo_selector(periodos, "Periodo Hidro")
+
+vol_f = filter_by_periodo(vol, "periodo", p_ini, p_fin) if not vol.empty else vol
+cau_f = filter_by_periodo(cau, "periodo", p_ini, p_fin) if not cau.empty else cau
+
+st.markdown("## 1) Volúmenes mensuales (000 m³)")
+
+if not vol_f.empty:
+    reservorios = sorted(vol_f["serie"].dropna().astype(str).unique())
+    sel = st.sidebar.multiselect("Reservorios", reservorios, default=reservorios[:3] if len(reservorios) >= 3 else reservorios)
+
+    df = vol_f[vol_f["serie"].astype(str).isin(sel)].rename(columns={"serie": "reservorio"})
+    df["fecha_mes"] = pd.to_datetime(df["periodo"] + "01", format="%Y%m%d", errors="coerce")
+    df["volumen_mm3"] = df["valor"] / 1_000
+
+    fig = px.line(df, x="fecha_mes", y="volumen_mm3", color="reservorio", title="Volumen mensual por reservorio")
+    apply_thin_lines(fig)
+    apply_soft_markers(fig)
+    apply_unified_hover(fig, fmt=":,.2f", units="millones de m³")
+    format_axis_units(
+        fig,
+        x=AxisFormat(title="Fecha", tickformat="%d %b %Y"),
+        y=AxisFormat(title="Volumen útil (millones de m³)", tickformat=",.2f"),
+    )
+    apply_exec_style(
+        fig,
+        title="Volumen útil por reservorio",
+        subtitle="Serie mensual — unidades en millones de m³",
+        source="EGASA · Data Mart",
+    )
+    plotly_chart(st, fig)
+
+    if df["pct_capacidad"].notna().any():
+        fig_cap = px.line(df, x="fecha_mes", y="pct_capacidad", color="reservorio", title="Llenado (% de capacidad útil)")
+        apply_thin_lines(fig_cap)
+        apply_unified_hover(fig_cap, fmt=":,.1f", units="%")
+        format_axis_units(
+            fig_cap,
+            x=AxisFormat(title="Fecha", tickformat="%b %Y"),
+            y=AxisFormat(title="% de capacidad útil", tickformat=",.0f"),
+        )
+        apply_exec_style(
+            fig_cap,
+            title="Llenado de reservorios",
+            subtitle="Volumen mensual sobre la capacidad útil del último reporte diario",
+            source="EGASA · Data Mart",
+        )
+        plotly_chart(st, fig_cap)
+
+    fig_an = px.bar(df, x="fecha_mes", y="anomalia_pct", color="reservorio", barmode="group", title="Anomalía vs climatología (%)")
+    apply_unified_hover(fig_an, fmt=":,.1f", units="%")
+    format_axis_units(
+        fig_an,
+        x=AxisFormat(title="Fecha", tickformat="%b %Y"),
+        y=AxisFormat(title="Anomalía (%)", tickformat=",.0f"),
+    )
+    apply_exec_style(
+        fig_an,
+        title="Anomalía de volumen",
+        subtitle="Frente a la media histórica del mismo mes",
+        source="EGASA · Data Mart",
+    )
+    plotly_chart(st, fig_an)
+
+    st.markdown("### Comparativo YoY (mismo mes, por año)")
+    mes_sel = st.selectbox("Mes", sorted(df["mes"].unique()))
+    yoy = df[df["mes"] == mes_sel]
+    fig_yoy = px.line(yoy, x="anio", y="volumen_mm3", color="reservorio", title=f"YoY Volumen (mes={mes_sel})")
+    apply_thin_lines(fig_yoy)
+    apply_soft_markers(fig_yoy)
+    apply_unified_hover(fig_yoy, fmt=":,.2f", units="millones de m³")
+    format_axis_units(
+        fig_yoy,
+        x=AxisFormat(title="Año", tickformat="d"),
+        y=AxisFormat(title="Volumen útil (millones de m³)", tickformat=",.2f"),
+    )
+    apply_exec_style(
+        fig_yoy,
+        title="Comparativo YoY de volumen útil",
+        subtitle=f"Mes seleccionado: {mes_sel}",
+        source="EGASA · Data Mart",
+    )
+    plotly_chart(st, fig_yoy)
+
+    ultimo = df.dropna(subset=["valor"]).sort_values("periodo").groupby("reservorio", observed=True).tail(1)
+    st.dataframe(
+        ultimo[["reservorio", "periodo", "volumen_mm3", "pct_capacidad", "anomalia_pct", "dif_anual_pct"]],
+        use_container_width=True,
+        hide_index=True,
+    )
+else:
+    st.info("No hay datos de volumen en el rango seleccionado.")
+
+st.markdown("## 2) Caudal mensual (m³/s)")
+
+if not cau_f.empty:
+    df = cau_f.rename(columns={"serie": "estacion"})
+    df["fecha_mes"] = pd.to_datetime(df["periodo"] + "01", format="%Y%m%d", errors="coerce")
+    fig = px.line(df, x="fecha_mes", y="valor", color="estacion", title="Caudal mensual")
+    # banda climatológica p10–p90 del mes calendario
+    for estacion, g in df.groupby("estacion", observed=True):
+        fig.add_scatter(x=g["fecha_mes"], y=g["clim_p90"], mode="lines", line={"width": 0}, showlegend=False, name=f"{estacion} p90")
+        fig.add_scatter(x=g["fecha_mes"], y=g["clim_p10"], mode="lines", line={"width": 0}, fill="tonexty", fillcolor="rgba(120,120,120,0.15)", name=f"{estacion} p10–p90")
+    apply_thin_lines(fig)
+    apply_unified_hover(fig, fmt=":,.2f", units="m³/s")
+    format_axis_units(
+        fig,
+        x=AxisFormat(title="Fecha", tickformat="%d %b %Y"),
+        y=AxisFormat(title="Caudal (m³/s)", tickformat=",.2f"),
+    )
+    apply_exec_style(
+        fig,
+        title="Caudal mensual por estación",
+        subtitle="Serie mensual — m³/s, con la banda histórica p10–p90",
+        source="EGASA · Data Mart",
+    )
+    plotly_chart(st, fig)
+
+    fig_ap = px.line(df, x="fecha_mes", y="aporte_acumulado_000m3", color="estacion", title="Aporte acumulado en el año (000 m³)")
+    apply_thin_lines(fig_ap)
+    apply_unified_hover(fig_ap, fmt=":,.0f", units="000 m³")
+    format_axis_units(
+        fig_ap,
+        x=AxisFormat(title="Fecha", tickformat="%b %Y"),
+        y=AxisFormat(title="Aporte acumulado (000 m³)", tickformat=",.0f"),
+    )
+    apply_exec_style(
+        fig_ap,
+        title="Aporte acumulado",
+        subtitle="Caudal × segundos del mes, acumulado desde enero",
+        source="EGASA · Data Mart",
+    )
+    plotly_chart(st, fig_ap)
+else:
+    st.info("No hay datos de caudal en el rango seleccionado.")
@@ -1,17 +1,17 @@
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
 
-from app.charts.theme import (
-    AxisFormat,
+from app.ui_components import (
     EXEC_THEME,
-    PLOTLY_CONFIG,
+    AxisFormat,
     apply_exec_style,
     apply_soft_markers,
     apply_thin_lines,
     apply_unified_hover,
     format_axis_units,
+    go,
+    plotly_chart,
+    px,
     short_spanish_date,
 )
 from utils.data import load_csv
@@ -62,7 +62,7 @@ if "pct_llenado" in df.columns:
         subtitle=f"Corte: {fecha_sel}",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig)
 
 # Tabla operativa
 st.markdown("### Tabla operativa")
@@ -127,7 +127,7 @@ if not hist.empty:
         subtitle=f"{reservorio_sel} — {short_spanish_date(hist['fecha'].min())} a {short_spanish_date(hist['fecha'].max())}",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig_dual, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig_dual)
 else:
     st.info("Sin historial para el reservorio seleccionado.")
 
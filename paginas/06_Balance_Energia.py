@@ -1,14 +1,14 @@
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
-from app.charts.theme import (
+from app.ui_components import (
     AxisFormat,
-    PLOTLY_CONFIG,
     apply_exec_style,
     apply_thin_lines,
     apply_unified_hover,
     format_axis_units,
+    plotly_chart,
+    px,
 )
 from utils.data import load_csv
 from utils.filters import ensure_periodo_str, filter_by_periodo, sidebar_periodo_selector
@@ -67,7 +67,7 @@ if not perfil_f.empty:
         subtitle="Componentes del perfil (MWh)",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig)
 
     # líneas clave si existen
     claves = df[df["concepto"].str.upper().isin({"ENERGIA DISPONIBLE", "VENTA DE ENERGIA"})].copy()
@@ -86,7 +86,7 @@ if not perfil_f.empty:
             subtitle="Energía disponible vs venta de energía",
             source="EGASA · Data Mart",
         )
-        st.plotly_chart(fig2, use_container_width=True, config=PLOTLY_CONFIG)
+        plotly_chart(st, fig2)
 else:
     st.info("Sin datos de Perfil en el rango seleccionado.")
 
@@ -107,7 +107,7 @@ if not r_f.empty:
         subtitle="Mercado R mensual",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig)
 
     total = df[df["segmento"].str.upper().eq("TOTAL")].groupby("periodo")["energia_mwh"].sum().reset_index()
     if not total.empty:
@@ -125,6 +125,6 @@ if not r_f.empty:
             subtitle="Energía vendida (MWh)",
             source="EGASA · Data Mart",
         )
-        st.plotly_chart(fig_total, use_container_width=True, config=PLOTLY_CONFIG)
+        plotly_chart(st, fig_total)
 else:
     st.info("Sin datos de R en el rango seleccionado.")
@@ -1,15 +1,15 @@
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
-from app.charts.theme import (
+from app.ui_components import (
     AxisFormat,
-    PLOTLY_CONFIG,
     apply_exec_style,
     apply_soft_markers,
     apply_thin_lines,
     apply_unified_hover,
     format_axis_units,
+    plotly_chart,
+    px,
 )
 from utils.data import load_csv
 from utils.filters import ensure_periodo_str, filter_by_periodo, sidebar_periodo_selector
@@ -75,11 +75,11 @@ if not ventas_mwh_f.empty:
         subtitle="Energía vendida (MWh)",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig)
 
     # top clientes
     top_n = st.sidebar.slider("Top N clientes", 5, 30, 10)
-    top = ventas_mwh_f.groupby("cliente")["mwh"].sum().sort_values(ascending=False).head(top_n).reset_index()
+    top = ventas_mwh_f.groupby("cliente", observed=True)["mwh"].sum().sort_values(ascending=False).head(top_n).reset_index()
     fig_top = px.bar(top, x="cliente", y="mwh", title=f"Top {top_n} clientes (MWh)")
     apply_unified_hover(fig_top, fmt=":,.0f", units="MWh")
     format_axis_units(
@@ -93,7 +93,7 @@ if not ventas_mwh_f.empty:
         subtitle="Ordenado por MWh acumulados",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig_top, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig_top)
 else:
     st.info("No hay ventas_mensual_mwh en el rango.")
 
@@ -117,7 +117,7 @@ if not precio_f.empty:
         subtitle="Soles por MWh",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig_precio, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig_precio)
 
     # dispersión por cliente (último periodo)
     last_p = precio_f["periodo"].max()
@@ -137,7 +137,7 @@ if not precio_f.empty:
             source="EGASA · Data Mart",
             hovermode="closest",
         )
-        st.plotly_chart(fig_disp, use_container_width=True, config=PLOTLY_CONFIG)
+        plotly_chart(st, fig_disp)
 else:
     st.info("No hay precio_medio_mensual en el rango.")
 
@@ -0,0 +1,136 @@
+import pandas as pd
+import streamlit as st
+
+from app.ui_components import AxisFormat, apply_exec_style, format_axis_units, plotly_chart, px
+from utils.data import load_contract_index, load_csv, metadata_token
+
+st.set_page_config(layout="wide")
+st.title("📄 Contratos (2025–2036)")
+
+con = load_csv("contratos_base.csv")
+
+if con.empty:
+    st.warning("No existe contratos_base.csv en data_mart.")
+    st.stop()
+
+# intenta parse fechas comunes si están
+for c in con.columns:
+    if "fecha" in c.lower() or "inicio" in c.lower() or "fin" in c.lower():
+        con[c] = pd.to_datetime(con[c], errors="coerce")
+
+# identificar cliente
+cliente_col = next((c for c in con.columns if "cliente" in c.lower()), None)
+if cliente_col is None:
+    cliente_col = con.columns[0]
+
+clientes = sorted([x for x in con[cliente_col].dropna().astype(str).unique() if x.strip() != ""])
+sel_clientes = st.sidebar.multiselect("Clientes", clientes, default=clientes[:10] if len(clientes) > 10 else clientes)
+
+df = con[con[cliente_col].astype(str).isin(sel_clientes)].copy()
+# el índice y el compromiso mensual vienen del ETL, que recorta espacios en ``cliente``
+sel_norm = {c.strip() for c in sel_clientes}
+
+# vigencias por periodo desde el índice cacheado (no recorre la tabla en cada cambio del slider)
+index = load_contract_index(meta_token=metadata_token())
+periodos = pd.period_range(*index.span, freq="M") if index.span else pd.PeriodIndex([], freq="M")
+periodo = None
+if len(periodos):
+    actual = pd.Timestamp.today().to_period("M")
+    periodo = st.sidebar.select_slider(
+        "Periodo de vigencia",
+        options=list(periodos),
+        value=actual if actual in periodos else periodos[-1],
+        format_func=lambda p: p.strftime("%b %Y"),
+    )
+
+st.markdown("## 1) Tabla")
+st.dataframe(df, use_container_width=True)
+
+st.markdown("## 2) Resumen")
+col1, col2, col3 = st.columns(3)
+col1.metric("Contratos", f"{len(df):,}")
+col2.metric("Clientes", f"{df[cliente_col].nunique():,}")
+if periodo is not None:
+    # la tabla y el filtro de clientes son de contratos_base; riesgo solo se informa aparte
+    todos = index.overlapping(periodo.start_time, periodo.end_time)
+    base = todos[todos["origen"] == "base"]
+    riesgo = todos[todos["origen"] == "riesgo"]
+    vigentes = base[base["cliente"].isin(sel_norm)]
+    col3.metric(
+        f"MW vigentes {periodo.strftime('%b %Y')}",
+        f"{vigentes['potencia_mw'].sum():,.1f}",
+        help=(
+            f"Todos los clientes: {base['potencia_mw'].sum():,.1f} MW en {len(base):,} contratos base; "
+            f"riesgo: {riesgo['potencia_mw'].sum():,.1f} MW en {len(riesgo):,} contratos"
+        ),
+    )
+    with st.expander(f"Contratos vigentes en {periodo.strftime('%b %Y')} ({len(vigentes):,})"):
+        st.dataframe(vigentes, use_container_width=True)
+
+# Timeline si encontramos inicio/fin
+inicio_col = next((c for c in df.columns if "inicio" in c.lower()), None)
+fin_col = next((c for c in df.columns if "fin" in c.lower()), None)
+
+if inicio_col and fin_col:
+    d2 = df.dropna(subset=[inicio_col, fin_col]).copy()
+    if not d2.empty:
+        d2[inicio_col] = pd.to_datetime(d2[inicio_col], errors="coerce")
+        d2[fin_col] = pd.to_datetime(d2[fin_col], errors="coerce")
+        d2 = d2.dropna(subset=[inicio_col, fin_col])
+
+        fig = px.timeline(
+            d2,
+            x_start=inicio_col,
+            x_end=fin_col,
+            y=cliente_col,
+            title="Vigencias (timeline)",
+        )
+        fig.update_yaxes(autorange="reversed")
+        format_axis_units(
+            fig,
+            x=AxisFormat(title="Vigencia", tickformat="%d %b %Y"),
+            y=AxisFormat(title="Cliente"),
+        )
+        apply_exec_style(
+            fig,
+            title="Vigencias de contratos",
+            subtitle="Inicio y fin declarados",
+            source="EGASA · Data Mart",
+            hovermode="closest",
+        )
+        plotly_chart(st, fig)
+else:
+    st.info("No se detectaron columnas de inicio/fin para graficar timeline.")
+
+st.markdown("## 3) Compromiso mensual")
+comp = load_csv("contratos_compromiso_mensual.csv")
+if comp.empty:
+    st.info("Aún no hay contratos_compromiso_mensual.csv (se genera en el ETL).")
+else:
+    comp = comp[comp["cliente"].astype(str).isin(sel_norm)].copy()
+    comp["mes"] = pd.to_datetime(comp["periodo"].astype(str), format="%Y%m")
+    por_tipo = comp.groupby(["mes", "tipo_contrato"], observed=True)["potencia_media_mw"].sum().reset_index()
+    fig_c = px.area(por_tipo, x="mes", y="potencia_media_mw", color="tipo_contrato", title="Potencia comprometida (MW medios)")
+    format_axis_units(
+        fig_c,
+        x=AxisFormat(title="Mes", tickformat="%b %Y"),
+        y=AxisFormat(title="Potencia (MW)", tickformat=",.1f"),
+    )
+    apply_exec_style(fig_c, title="Potencia comprometida", subtitle="MW medios por tipo de contrato", source="EGASA · Data Mart")
+    plotly_chart(st, fig_c)
+
+    # comprometido vs generado: join por periodo con la generación mensual
+    gen = load_csv("generacion_mensual.csv")
+    if not gen.empty:
+        gen_mes = gen.groupby("periodo")["energia_mwh"].sum().rename("generacion_mwh")
+        cmp = comp.groupby("periodo")["energia_mwh"].sum().rename("comprometido_mwh").to_frame().join(gen_mes, how="inner").reset_index()
+        if not cmp.empty:
+            cmp["mes"] = pd.to_datetime(cmp["periodo"].astype(str), format="%Y%m")
+            fig_g = px.line(cmp, x="mes", y=["comprometido_mwh", "generacion_mwh"], title="Energía comprometida vs generada (MWh)")
+            format_axis_units(
+                fig_g,
+                x=AxisFormat(title="Mes", tickformat="%b %Y"),
+                y=AxisFormat(title="Energía (MWh)", tickformat=",.0f"),
+            )
+            apply_exec_style(fig_g, title="Comprometido vs generado", subtitle="Clientes seleccionados vs generación total", source="EGASA · Data Mart")
+            plotly_chart(st, fig_g)
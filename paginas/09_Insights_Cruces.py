@@ -1,17 +1,16 @@
-import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
 
-from app.charts.theme import (
+from app.ui_components import (
     AxisFormat,
-    PLOTLY_CONFIG,
     apply_exec_style,
     apply_soft_markers,
     apply_thin_lines,
     apply_unified_hover,
     format_axis_units,
+    go,
+    plotly_chart,
+    px,
 )
 from utils.data import load_csv
 from utils.filters import ensure_periodo_str, filter_by_periodo, sidebar_periodo_selector
@@ -49,23 +48,18 @@ def scatter_with_fit(df: pd.DataFrame, x: str, y: str, title: str) -> go.Figure:
 
     fig.add_trace(go.Scatter(x=d[x], y=d[y], mode="markers", name="Datos"))
 
-    # Fit lineal si se puede
-    if d[x].nunique() >= 2:
-        try:
-            a, b = np.polyfit(d[x].astype(float).values, d[y].astype(float).values, 1)
-            x_line = np.linspace(d[x].min(), d[x].max(), 50)
-            y_line = a * x_line + b
-            fig.add_trace(go.Scatter(x=x_line, y=y_line, mode="lines", name="Tendencia"))
-        except Exception:
-            # si algo raro pasa, no bloquea el dashboard
-            pass
+    # generación explicada por el modelo del ETL (etapa pronostico); aquí no se ajusta nada
+    if "modelo_mwh" in df.columns:
+        m = df[[x, "modelo_mwh"]].dropna().sort_values(x)
+        if not m.empty:
+            fig.add_trace(go.Scatter(x=m[x], y=m["modelo_mwh"], mode="markers", name="Modelo", marker={"symbol": "x"}))
 
     format_axis_units(
         fig,
         x=AxisFormat(title=friendly_labels.get(x, x), tickformat=friendly_formats.get(x, ",.2f")),
         y=AxisFormat(title=friendly_labels.get(y, y), tickformat=friendly_formats.get(y, ",.2f")),
     )
-    apply_exec_style(fig, title=title, subtitle="Relación simple", hovermode="closest")
+    apply_exec_style(fig, title=title, subtitle="Datos y ajuste del modelo de pronóstico", hovermode="closest")
     apply_soft_markers(fig)
     apply_thin_lines(fig)
     return fig
@@ -80,6 +74,7 @@ cau = load_csv("hidro_caudal_mensual.csv")
 ventas = load_csv("ventas_mensual_mwh.csv")
 precio = load_csv("precio_medio_mensual.csv")
 r = load_csv("balance_r_mensual.csv")
+pron = load_csv("pronostico_generacion_mensual.csv")
 
 # -----------------------------
 # Normalizar periodos (CORRECTO)
@@ -96,6 +91,8 @@ if not precio.empty and "periodo" in precio.columns:
     precio = ensure_periodo_str(precio, "periodo")
 if not r.empty and "periodo" in r.columns:
     r = ensure_periodo_str(r, "periodo")
+if not pron.empty:
+    pron = ensure_periodo_str(pron, "periodo")
 
 # -----------------------------
 # construir tabla mensual “macro”
@@ -138,11 +135,19 @@ if not vol.empty and "volumen_000m3" in vol.columns:
     vol_total = vol.groupby("periodo")["volumen_000m3"].sum().reset_index()
     vol_total["volumen_millones_m3"] = vol_total["volumen_000m3"] / 1_000
 
+modelo_total = pd.DataFrame(columns=["periodo", "modelo_mwh"])
+if not pron.empty:
+    modelo_total = (
+        pron[(pron["central_id"].astype(str) == "TOTAL") & (pron["tipo"].astype(str) == "historico")][["periodo", "pronostico_mwh"]]
+        .rename(columns={"pronostico_mwh": "modelo_mwh"})
+    )
+
 base = (
     gen_total.merge(ventas_total, on="periodo", how="left")
     .merge(precio_total, on="periodo", how="left")
     .merge(caudal_total, on="periodo", how="left")
     .merge(vol_total, on="periodo", how="left")
+    .merge(modelo_total, on="periodo", how="left")
 )
 
 periodos = sorted(base["periodo"].dropna().unique())
@@ -169,7 +174,7 @@ if "ventas_mwh" in base.columns and base["ventas_mwh"].notna().any():
         subtitle="Energía (MWh) consolidada",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig)
 else:
     st.info("No hay ventas para cruzar (ventas_mensual_mwh).")
 
@@ -180,20 +185,12 @@ st.markdown("## 2) Hidrología vs Generación")
 c1, c2 = st.columns(2)
 
 if "caudal_m3s" in base.columns and base["caudal_m3s"].notna().any():
-    c1.plotly_chart(
-        scatter_with_fit(base, "caudal_m3s", "gen_mwh", "Caudal vs Generación"),
-        use_container_width=True,
-        config=PLOTLY_CONFIG,
-    )
+    plotly_chart(c1, scatter_with_fit(base, "caudal_m3s", "gen_mwh", "Caudal vs Generación"))
 else:
     c1.info("Sin caudal para el rango.")
 
 if "volumen_millones_m3" in base.columns and base["volumen_millones_m3"].notna().any():
-    c2.plotly_chart(
-        scatter_with_fit(base.rename(columns={"volumen_millones_m3": "Volumen útil (Mm³)"}), "Volumen útil (Mm³)", "gen_mwh", "Volumen útil vs Generación"),
-        use_container_width=True,
-        config=PLOTLY_CONFIG,
-    )
+    plotly_chart(c2, scatter_with_fit(base.rename(columns={"volumen_millones_m3": "Volumen útil (Mm³)"}), "Volumen útil (Mm³)", "gen_mwh", "Volumen útil vs Generación"))
 else:
     c2.info("Sin volumen para el rango.")
 
@@ -217,6 +214,52 @@ if "precio_medio" in base.columns and base["precio_medio"].notna().any():
         subtitle="Soles por MWh",
         source="EGASA · Data Mart",
     )
-    st.plotly_chart(fig, use_container_width=True, config=PLOTLY_CONFIG)
+    plotly_chart(st, fig)
 else:
     st.info("No hay precio medio para el rango.")
+
+# -----------------------------
+# 4) Pronóstico de generación (precalculado en el ETL)
+# -----------------------------
+st.markdown("## 4) Pronóstico de generación")
+if pron.empty:
+    st.info("Aún no hay pronostico_generacion_mensual.csv (se genera en el ETL).")
+else:
+    centrales = pron[["central_id", "central"]].drop_duplicates().astype(str)
+    etiquetas = dict(zip(centrales["central_id"], centrales["central"]))
+    opciones = sorted(etiquetas, key=lambda c: (c != "TOTAL", c))
+    sel = st.selectbox("Central", opciones, format_func=lambda c: f"{etiquetas[c]} ({c})")
+
+    d = pron[pron["central_id"].astype(str) == sel].copy()
+    d = d[(d["periodo"] >= p_ini) | (d["tipo"].astype(str) == "pronostico")] if p_ini else d
+    d["fecha_mes"] = pd.to_datetime(d["periodo"] + "01", format="%Y%m%d", errors="coerce")
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=d["fecha_mes"], y=d["pronostico_sup_mwh"], mode="lines", line={"width": 0}, showlegend=False, name="Banda sup."))
+    fig.add_trace(
+        go.Scatter(x=d["fecha_mes"], y=d["pronostico_inf_mwh"], mode="lines", line={"width": 0}, fill="tonexty", fillcolor="rgba(120,120,120,0.15)", name="Banda 95%")
+    )
+    fig.add_trace(go.Scatter(x=d["fecha_mes"], y=d["energia_mwh"], mode="lines+markers", name="Observada"))
+    fig.add_trace(go.Scatter(x=d["fecha_mes"], y=d["pronostico_mwh"], mode="lines", name="Modelo / pronóstico", line={"dash": "dot"}))
+    fig.add_trace(go.Scatter(x=d["fecha_mes"], y=d["linea_base_mwh"], mode="lines", name="Línea base estacional", line={"dash": "dash"}))
+    apply_thin_lines(fig)
+    apply_unified_hover(fig, fmt=":,.0f", units="MWh")
+    format_axis_units(
+        fig,
+        x=AxisFormat(title="Mes", tickformat="%b %Y"),
+        y=AxisFormat(title="Energía (MWh)", tickformat=",.0f"),
+    )
+    apply_exec_style(
+        fig,
+        title=f"Pronóstico de generación — {etiquetas[sel]}",
+        subtitle="Línea base estacional + caudal y volumen; hidrología climatológica en el horizonte",
+        source="EGASA · Data Mart",
+    )
+    plotly_chart(st, fig)
+
+    params = load_csv("pronostico_parametros.csv")
+    if not params.empty:
+        st.dataframe(
+            params[["central_id", "central", "usa_hidrologia", "beta_caudal", "beta_volumen", "n_obs", "r2", "rmse_mwh", "desde", "hasta", "ajustado_en"]],
+            use_container_width=True,
+            hide_index=True,
+        )
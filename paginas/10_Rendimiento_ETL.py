@@ -0,0 +1,60 @@
+import streamlit as st
+
+from app.ui_components import AxisFormat, apply_exec_style, apply_soft_markers, apply_thin_lines, format_axis_units, kpi, plotly_chart, px
+from etl import config
+from etl.perf import flag_regressions, load_runs, runs_log_path, stage_history, stage_trends
+
+st.set_page_config(layout="wide")
+st.title("⏲️ Rendimiento del ETL")
+
+history = stage_history(load_runs())
+if history.empty:
+    st.warning(f"Sin corridas con métricas por etapa en {runs_log_path()}.")
+    st.stop()
+
+settings = config.perf_settings()
+factor = st.sidebar.slider("Umbral de regresión (× mediana)", 1.1, 3.0, float(settings["regression_factor"]), 0.1)
+window = st.sidebar.slider("Ventana de la mediana (corridas)", 3, 30, int(settings["window"]))
+flagged = flag_regressions(history, factor=factor, window=window)
+flagged["duration_s"] = flagged["duration_ms"] / 1000
+
+last = flagged[flagged["run_id"].eq(flagged["run_id"].iloc[-1])]
+c1, c2, c3, c4 = st.columns(4)
+kpi(c1, "Última corrida", str(last["run_id"].iloc[0]))
+kpi(c2, "Duración (s)", f"{last['duration_s'].sum():,.1f}")
+kpi(c3, "Pico RSS (MB)", f"{last['peak_rss_mb'].max():,.0f}")
+kpi(c4, "Etapas en regresión", f"{int(last['regression'].sum())}")
+
+st.markdown("### 1) Duración por etapa")
+fig = px.line(flagged, x="started_at", y="duration_s", color="stage", title="Duración por etapa")
+regressions = flagged[flagged["regression"]]
+if not regressions.empty:
+    fig.add_scatter(x=regressions["started_at"], y=regressions["duration_s"], mode="markers", name="Regresión", marker={"color": "#D64545", "size": 11, "symbol": "x"})
+apply_thin_lines(fig)
+apply_soft_markers(fig)
+format_axis_units(fig, x=AxisFormat(title="Corrida"), y=AxisFormat(title="Segundos", tickformat=",.1f"))
+apply_exec_style(fig, title="Duración por etapa", subtitle=f"Regresión: > {factor:.1f}× mediana de {window} corridas previas", source="logs/etl_runs.jsonl")
+plotly_chart(st, fig)
+
+st.markdown("### 2) Volumen y memoria")
+c1, c2 = st.columns(2)
+fig = px.line(flagged, x="started_at", y="rows_per_s", color="stage", title="Filas por segundo")
+apply_thin_lines(fig)
+format_axis_units(fig, x=AxisFormat(title="Corrida"), y=AxisFormat(title="Filas/s", tickformat=",.0f"))
+apply_exec_style(fig, title="Throughput", subtitle="Filas escritas por segundo", source="logs/etl_runs.jsonl")
+plotly_chart(c1, fig)
+fig = px.line(flagged, x="started_at", y="peak_rss_mb", color="stage", title="Pico de memoria")
+apply_thin_lines(fig)
+format_axis_units(fig, x=AxisFormat(title="Corrida"), y=AxisFormat(title="RSS (MB)", tickformat=",.0f"))
+apply_exec_style(fig, title="Pico de memoria", subtitle="RSS máximo por etapa", source="logs/etl_runs.jsonl")
+plotly_chart(c2, fig)
+
+st.markdown("### 3) Tendencias")
+st.dataframe(stage_trends(flagged, window=window).round(1), use_container_width=True, hide_index=True)
+
+st.markdown("### 4) Regresiones")
+if regressions.empty:
+    st.success("Sin regresiones con el umbral actual.")
+else:
+    cols = ["run_id", "stage", "duration_s", "baseline_ms", "ratio", "input_bytes"]
+    st.dataframe(regressions[cols].iloc[::-1].round(2), use_container_width=True, hide_index=True)
@@ -1,15 +1,42 @@
+import functools
+from pathlib import Path
+
 import streamlit as st
 
-st.set_page_config(page_title="EGASA | Boletín Operativo", layout="wide")
+from app.instrumentation import run_page
+from app.warmup import start_warmup
+
+PAGES_DIR = Path(__file__).resolve().parent / "paginas"
+
+start_warmup()
+
+if st.query_params.get("admin") == "perf":
+    from app import admin_perf
+
+    st.set_page_config(page_title="EGASA | Rendimiento", layout="wide")
+    admin_perf.render()
+    st.stop()
 
-st.title("EGASA — Boletín Operativo (Streamlit + Plotly)")
-st.markdown(
-    """
+
+def inicio():
+    st.set_page_config(page_title="EGASA | Boletín Operativo", layout="wide")
+    st.title("EGASA — Boletín Operativo (Streamlit + Plotly)")
+    st.markdown(
+        """
 Este aplicativo consolida **Generación**, **Hidrología**, **Balance Energético**, **Comercial** y **Contratos**.
 Usa el menú lateral (páginas) para navegar.
 
 ✅ Fuente: `data_mart/*.csv` (ETL).
 """
-)
+    )
+
+    st.info("Siguiente paso: abre **📌 Resumen Ejecutivo** y valida consistencia mes a mes.")
+
+
+def pagina(path: Path) -> st.Page:
+    # "01_Resumen_Ejecutivo.py" -> título "Resumen Ejecutivo", URL /Resumen_Ejecutivo
+    name = path.stem.split("_", 1)[1]
+    return st.Page(functools.partial(run_page, path), title=name.replace("_", " "), url_path=name)
+
 
-st.info("Siguiente paso: abre **📌 Resumen Ejecutivo** y valida consistencia mes a mes.")
+st.navigation([st.Page(inicio, title="Inicio", default=True), *map(pagina, sorted(PAGES_DIR.glob("[0-9][0-9]_*.py")))]).run()
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from etl.aggregate import ChunkedAggregator, aggregate_15min, main
+from etl.pipelines import rollups
+
+
+def _write_partitions(mart: Path, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for periodo in ("202412", "202501"):
+        ts = pd.date_range(f"{periodo[:4]}-{periodo[4:]}-01 00:15", periods=200, freq="15min")
+        df = pd.DataFrame(
+            {
+                "fecha_hora": np.repeat(ts, 2),
+                "central": np.tile(["CHARCANI V", "SIN MAPEO"], len(ts)),
+                "central_raw": np.tile(["C.H. CHARCANI V | CHAV1 -kWh", "X | X1"], len(ts)),
+                "unidad": np.tile(["CHAV1", "X1"], len(ts)),
+                "energia_mwh": rng.gamma(2.0, 3.0, 2 * len(ts)),
+                "central_id": np.tile(["CH5", None], len(ts)),
+                "periodo": int(periodo),
+            }
+        )
+        df.to_csv(mart / f"generacion_15min_{periodo}.csv", index=False)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_merged_partials_match_exact_aggregates():
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({"k": rng.choice(["a", "b", None], 20_000), "v": rng.lognormal(0, 1, 20_000)})
+    left, right = ChunkedAggregator(["k"], "v", quantiles=[0.5, 0.95]), ChunkedAggregator(["k"], "v", quantiles=[0.5, 0.95])
+    left.update(df.iloc[:7_000])
+    right.update(df.iloc[7_000:])
+    out = left.merge(right).result().set_index("k")
+
+    exact = df.groupby("k", dropna=False)["v"]
+    pd.testing.assert_series_equal(out["v_sum"], exact.sum(), check_names=False)
+    assert out["v_count"].tolist() == exact.count().tolist()
+    assert out["v_max"].tolist() == exact.max().tolist()
+    for q in (0.5, 0.95):
+        rel = (out[f"v_p{q * 100:g}"] / exact.quantile(q) - 1).abs()
+        assert (rel < 0.02).all()
+
+
+def test_aggregate_15min_chunked_equals_full_read(tmp_path: Path):
+    full = _write_partitions(tmp_path)
+    by_partition = aggregate_15min(["central_id", "anio"], mart=tmp_path)
+    chunked = aggregate_15min(["central_id", "anio"], mart=tmp_path, chunksize=150)
+    pd.testing.assert_frame_equal(by_partition, chunked)
+
+    full["anio"] = full["periodo"] // 100
+    exact = full.groupby(["central_id", "anio"], dropna=False)["energia_mwh"].sum()
+    assert np.allclose(by_partition["energia_mwh_sum"], exact.to_numpy())
+
+    hourly = aggregate_15min(["hora"], metrics=["count"], mart=tmp_path, start="202501")
+    assert hourly["energia_mwh_count"].sum() == 400
+
+
+def test_rollup_recomputes_only_updated_periods(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(rollups, "DATA_MART", tmp_path)
+    _write_partitions(tmp_path)
+    _files, first = rollups.run_rollups({})
+    rollup = first["generacion_15min_mensual"][0]
+    assert sorted(rollup["periodo"].unique()) == ["202412", "202501"]
+    assert len(rollup) == 4
+
+    # 202412 cambia en disco pero la corrida solo actualizó 202501: 202412 se conserva
+    _write_partitions(tmp_path, seed=7)
+    files, second = rollups.run_rollups({"generacion_15min_202501": (pd.DataFrame(), [])})
+    rollup2 = second["generacion_15min_mensual"][0].set_index(["periodo", "unidad"])
+    rollup1 = rollup.set_index(["periodo", "unidad"])
+    assert [p.name for p in files] == ["generacion_15min_202501.csv"]
+    assert rollup2.loc["202412", "energia_mwh_sum"].tolist() == rollup1.loc["202412", "energia_mwh_sum"].tolist()
+    assert rollup2.loc["202501", "energia_mwh_sum"].tolist() != rollup1.loc["202501", "energia_mwh_sum"].tolist()
+
+
+def test_cli_writes_csv(tmp_path: Path, capsys):
+    _write_partitions(tmp_path)
+    out = tmp_path / "out.csv"
+    main(["--by", "unidad,mes", "--metrics", "sum,max", "--quantiles", "0.95", "--mart", str(tmp_path), "--output", str(out)])
+    result = pd.read_csv(out)
+    assert list(result.columns) == ["unidad", "mes", "energia_mwh_sum", "energia_mwh_max", "energia_mwh_p95"]
+    assert len(result) == 4
+    assert "4 filas" in capsys.readouterr().out
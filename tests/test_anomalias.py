@@ -0,0 +1,89 @@
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl import config, quality_checks
+from etl.pipelines import anomalias
+
+
+def _series(unidad: str, mwh: np.ndarray, start: str = "2025-01-01 00:15") -> pd.DataFrame:
+    ts = pd.date_range(start, periods=len(mwh), freq="15min")
+    return pd.DataFrame({"fecha_hora": ts, "central_id": "CH1", "central": "CHARCANI I", "unidad": unidad, "energia_mwh": mwh})
+
+
+def test_detects_spike_flatline_and_gap():
+    rng = np.random.default_rng(0)
+    base = 1.0 + 0.02 * rng.standard_normal(96 * 3)
+    base[100] = 3.0  # pico aislado
+    base[150:162] = 0.9  # medidor trabado 3 h
+    base[:48] = 0.0  # unidad apagada: no es plano
+    df = _series("G1", base)
+    df = df.drop(index=range(200, 210))  # 10 intervalos faltantes
+
+    out = anomalias.detect_anomalies(df)
+    by_tipo = {tipo: g.reset_index(drop=True) for tipo, g in out.groupby("tipo")}
+    assert set(by_tipo) == {"pico", "plano", "hueco"}
+
+    pico = by_tipo["pico"].iloc[0]
+    assert len(by_tipo["pico"]) == 1 and pico["valor"] == 3.0 and pico["intervalos"] == 1
+    assert pico["fecha_hora_inicio"] == df.loc[100, "fecha_hora"] and pico["referencia"] == pytest.approx(1.0, abs=0.05)
+
+    plano = by_tipo["plano"].iloc[0]
+    assert len(by_tipo["plano"]) == 1 and plano["intervalos"] == 12 and plano["valor"] == 0.9
+    assert plano["fecha_hora_inicio"] == df.loc[150, "fecha_hora"]
+
+    hueco = by_tipo["hueco"].iloc[0]
+    assert len(by_tipo["hueco"]) == 1 and hueco["intervalos"] == 10 and hueco["referencia"] == 96
+    assert hueco["fecha_hora_inicio"].normalize() == pd.Timestamp("2025-01-03")
+
+
+def test_partition_edges_and_steps_are_not_anomalies():
+    # escalón sostenido y partición que empieza y termina a mitad de día
+    mwh = np.r_[np.full(60, 2.0), np.full(60, 8.0)] + np.linspace(0, 0.1, 120)
+    df = pd.concat([_series("G1", mwh, "2025-01-10 09:00"), _series("G2", mwh, "2025-01-10 09:00")], ignore_index=True)
+    assert anomalias.detect_anomalies(df).empty
+
+    # una unidad sin los datos que sí tienen las demás: hueco frente a la grilla común
+    partial = pd.concat([_series("G1", mwh, "2025-01-10 09:00"), _series("G2", mwh[:80], "2025-01-10 09:00")], ignore_index=True)
+    out = anomalias.detect_anomalies(partial)
+    assert out["tipo"].tolist() == ["hueco"] and out["unidad"].tolist() == ["G2"] and out["intervalos"].tolist() == [40]
+
+
+def test_month_of_all_meters_is_fast():
+    rng = np.random.default_rng(1)
+    n = 31 * 96
+    frames = [_series(f"G{i}", rng.gamma(2.0, 1.0, n)) for i in range(40)]
+    df = pd.concat(frames, ignore_index=True)
+    anomalias.detect_anomalies(df.head(1000))
+    t0 = time.perf_counter()
+    anomalias.detect_anomalies(df)
+    assert time.perf_counter() - t0 < 1.0
+
+
+def test_table_replaces_run_periods_and_feeds_metadata_alerts(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(anomalias, "DATA_MART", tmp_path)
+    monkeypatch.setattr(config, "DATA_MART", tmp_path)
+    noise = 1.0 + 0.01 * np.random.default_rng(2).standard_normal(96)
+    ene = _series("G1", np.r_[noise[:40], 9.0, noise[40:80]])
+    feb = _series("G1", noise, "2025-02-01 00:15").drop(index=range(10, 15))
+    for periodo, df in (("202501", ene), ("202502", feb)):
+        df.to_csv(tmp_path / f"generacion_15min_{periodo}.csv", index=False)
+
+    table, _keys = anomalias.run_anomalias({"202501": ene, "202502": feb})
+    assert sorted(zip(table["periodo"], table["tipo"])) == [("202501", "pico"), ("202502", "hueco")]
+
+    fixed = _series("G1", noise[:81])
+    table, keys = anomalias.run_anomalias({"202501": fixed})
+    assert table["periodo"].tolist() == ["202502"]
+
+    datasets = {
+        "generacion_15min_202502": (feb, ["fecha_hora", "central_id", "unidad"]),
+        "anomalias_15min": (table, keys),
+    }
+    quality_checks.write_metadata(None, datasets, [])
+    meta = json.loads((tmp_path / "metadata.json").read_text(encoding="utf-8"))
+    assert "anomalias_hueco:1" in meta["datasets"]["generacion_15min_202502"]["alertas"]
@@ -0,0 +1,125 @@
+import gzip
+import http.client
+import io
+import json
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from app import api
+from etl import config, publish
+from etl.utils_io import safe_write_csv
+
+
+def _partition(periodo: str) -> pd.DataFrame:
+    ts = pd.date_range(f"{periodo[:4]}-{periodo[4:]}-01", periods=4, freq="15min")
+    return pd.DataFrame({"fecha_hora": ts.strftime("%Y-%m-%d %H:%M:%S").repeat(2), "central_id": ["CH1", "CT1"] * 4, "energia_mwh": range(8)})
+
+
+@pytest.fixture
+def server(tmp_path: Path, monkeypatch):
+    mart = tmp_path / "mart"
+    mart.mkdir()
+    pd.DataFrame({"central": ["A", "B", "A"], "periodo": [202312, 202401, 202402], "energia_mwh": [1.0, 2.0, 3.0]}).to_csv(
+        mart / "generacion_mensual.csv", index=False
+    )
+    for periodo in ("202401", "202402", "202403"):
+        _partition(periodo).to_csv(mart / f"generacion_15min_{periodo}.csv", index=False)
+    monkeypatch.setitem(config.PATHS, "output", mart)
+    with publish.staged("r1"):
+        pass
+
+    srv = api.make_server(port=0, mart=mart)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{srv.server_port}", mart
+    srv.shutdown()
+    srv.server_close()
+    config.apply_runtime_overrides()
+
+
+def _get(url: str, **headers):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as resp:
+            return resp.status, dict(resp.headers), resp.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, dict(exc.headers), exc.read()
+
+
+def test_json_with_column_period_and_value_filters(server):
+    base, _mart = server
+    status, headers, body = _get(f"{base}/tables/generacion_mensual?columns=central,energia_mwh&desde=202401&central=A")
+    assert status == 200 and headers["Content-Type"].startswith("application/json")
+    assert json.loads(body) == [{"central": "A", "energia_mwh": 3.0}]
+
+    status, _h, body = _get(f"{base}/tables/generacion_mensual?columns=nope")
+    assert status == 400 and "nope" in json.loads(body)["error"]
+    assert _get(f"{base}/tables/../metadata")[0] == 404
+    assert "generacion_15min_202401" in json.loads(_get(f"{base}/tables")[2])["tables"]
+
+
+def test_etag_changes_only_when_table_is_republished(server):
+    base, mart = server
+    url = f"{base}/tables/generacion_mensual?format=csv"
+    _s, headers, body = _get(url)
+    assert body.decode("utf-8").splitlines()[0] == "central,periodo,energia_mwh"
+    etag = headers["ETag"]
+    assert _get(url, **{"If-None-Match": etag})[0] == 304
+
+    # nueva snapshot que solo reescribe otra tabla: el ETag se mantiene
+    with publish.staged("r2"):
+        safe_write_csv(_partition("202404"), config.DATA_MART / "generacion_15min_202404.csv")
+    assert _get(url, **{"If-None-Match": etag})[0] == 304
+
+    with publish.staged("r3"):
+        safe_write_csv(pd.DataFrame({"central": ["C"], "periodo": [202405], "energia_mwh": [9.0]}), config.DATA_MART / "generacion_mensual.csv")
+    status, headers, body = _get(url, **{"If-None-Match": etag})
+    assert status == 200 and headers["ETag"] != etag and b"C,202405" in body
+
+
+def test_15min_range_streams_as_gzip_arrow(server):
+    base, _mart = server
+    status, headers, body = _get(f"{base}/tables/generacion_15min?format=arrow&desde=202402&hasta=2024&central_id=CH1", **{"Accept-Encoding": "gzip"})
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+    table = pa.ipc.open_stream(io.BytesIO(gzip.decompress(body))).read_all()
+    assert table.num_rows == 8  # 202402 y 202403, 4 filas CH1 cada una
+    assert pa.types.is_timestamp(table.schema.field("fecha_hora").type)
+    assert set(table.column("central_id").to_pylist()) == {"CH1"}
+
+
+def test_every_partition_is_validated_before_headers(server):
+    base, mart = server
+    current = publish.current_dir(mart)
+    _partition("202403").drop(columns="central_id").to_csv(current / "generacion_15min_202403.csv", index=False)
+
+    status, _h, body = _get(f"{base}/tables/generacion_15min?central_id=CH1")
+    assert status == 400 and "generacion_15min_202403" in json.loads(body)["error"]
+
+
+def test_unexpected_errors_are_500_before_headers_and_abort_after(server, monkeypatch):
+    base, _mart = server
+
+    def broken_resolve(*_args, **_kwargs):
+        raise RuntimeError("manifest roto")
+
+    with monkeypatch.context() as m:
+        m.setattr(api, "resolve", broken_resolve)
+        status, _h, body = _get(f"{base}/tables/generacion_mensual")
+    assert status == 500 and json.loads(body) == {"error": "Error interno del servidor"}
+
+    read = api._read
+
+    def fail_on_last(path: Path) -> pd.DataFrame:
+        if path.name.endswith("202403.csv"):
+            raise RuntimeError("partición ilegible")
+        return read(path)
+
+    monkeypatch.setattr(api, "_read", fail_on_last)
+    # el 200 ya salió con la primera partición: el cliente ve la conexión cortada, no un JSON válido
+    with pytest.raises((ConnectionError, http.client.IncompleteRead, urllib.error.URLError)):
+        _get(f"{base}/tables/generacion_15min?format=csv")
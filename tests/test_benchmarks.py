@@ -0,0 +1,31 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks import bench_etl
+from benchmarks.generate_landing import scale_params
+from etl import config, publish
+
+
+def test_scale_params_grow_with_scale():
+    small, big = scale_params(1), scale_params(50)
+    cells = lambda p: p["months_15min"] * p["meters_15min"]  # noqa: E731
+    assert 40 <= cells(big) / cells(small) <= 60
+    assert big["hist_years"] == 16  # hojas 2010-2025
+
+
+def test_bench_scale_runs_every_stage_on_generated_landing(tmp_path: Path):
+    try:
+        result = bench_etl.bench_scale(tmp_path, scale=0.05, repeat=1, excel_engine="openpyxl")
+    finally:
+        config.apply_runtime_overrides()
+
+    assert set(result["stages"]) == {name for name, _ in bench_etl._stages(tmp_path)}
+    assert result["full_etl"]["median"] > 0
+
+    mart = publish.current_dir(tmp_path / "run_0.05" / "mart")
+    metadata = json.loads((mart / "metadata.json").read_text(encoding="utf-8"))
+    for dataset in ("generacion_mensual", "hidro_volumen_mensual", "represas_diario", "ventas_mensual_mwh", "contratos_base", "balance_r_mensual"):
+        assert not pd.read_csv(mart / config.OUTPUT_FILES[dataset]).empty, dataset
+    assert any(name.startswith("generacion_15min_") for name in metadata["datasets"])
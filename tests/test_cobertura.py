@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl import config
+from etl.pipelines import cobertura
+
+
+def _day(unidad: str, fecha: str, periods: int = 96) -> pd.DataFrame:
+    ts = pd.date_range(fecha, periods=periods, freq="15min")
+    return pd.DataFrame({"fecha_hora": ts, "central_id": "CH1", "central": "CHARCANI I", "unidad": unidad, "energia_mwh": 1.0})
+
+
+def test_index_roundtrip_and_coverage_table(tmp_path: Path):
+    df = pd.concat([_day("G1", "2025-01-01"), _day("G2", "2025-01-01 06:00", 48), _day("G1", "2025-01-02", 24)], ignore_index=True)
+    index = cobertura.build_index(df)
+    path = cobertura.index_path(tmp_path / "generacion_15min_202501.csv")
+    assert path.name == "generacion_15min_202501.cobertura.npz"
+    cobertura.write_index(index, path)
+    assert path.stat().st_size < 2048
+
+    loaded = cobertura.read_index(path)
+    assert np.array_equal(loaded["slots"], index["slots"])
+    table = cobertura.coverage_table(loaded, "202501").set_index(["unidad", "fecha"])
+    assert table.loc[("G1", "2025-01-01"), "cobertura_pct"] == 100
+    assert table.loc[("G1", "2025-01-02"), "intervalos"] == 24
+    assert table.loc[("G2", "2025-01-01"), "cobertura_pct"] == 50
+    assert table.loc[("G2", "2025-01-02"), "intervalos"] == 0  # día sin datos de la unidad
+    assert cobertura.read_index(tmp_path / "no_existe.npz") is None
+
+
+def test_adds_intervals_only_for_missing_slots():
+    index = cobertura.build_index(pd.concat([_day("G1", "2025-01-01"), _day("G2", "2025-01-01", 40)], ignore_index=True))
+
+    assert not cobertura.adds_intervals(index, _day("G1", "2025-01-01 10:00", 8))
+    assert cobertura.adds_intervals(index, _day("G2", "2025-01-01 09:00", 8))  # G2 sin dato desde las 10:00
+    assert cobertura.adds_intervals(index, _day("G3", "2025-01-01", 1))  # unidad nueva
+    assert cobertura.adds_intervals(index, _day("G1", "2025-01-02", 1))  # día fuera del índice
+    assert cobertura.adds_intervals(index, _day("G1", "2025-01-01 00:07", 1))  # fuera de la grilla
+    assert cobertura.adds_intervals(None, _day("G1", "2025-01-01", 1))
+
+
+def test_run_cobertura_replaces_only_rewritten_periods(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(cobertura, "DATA_MART", tmp_path)
+    monkeypatch.setattr(config, "DATA_MART", tmp_path)
+    for periodo in ("202501", "202502"):
+        (tmp_path / f"generacion_15min_{periodo}.csv").write_text("fecha_hora\n")
+
+    ene, feb = cobertura.build_index(_day("G1", "2025-01-31", 48)), cobertura.build_index(_day("G1", "2025-02-01"))
+    table, _keys = cobertura.run_cobertura({"202501": ene, "202502": feb})
+    assert table["cobertura_pct"].tolist() == [50, 100]
+
+    table, _keys = cobertura.run_cobertura({"202501": cobertura.build_index(_day("G1", "2025-01-31"))})
+    assert table["cobertura_pct"].tolist() == pytest.approx([100, 100])
+    assert table["periodo"].astype(str).tolist() == ["202501", "202502"]
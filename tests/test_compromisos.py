@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl.pipelines import _common, compromisos
+
+
+def _contratos() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "cliente": ["A", "A", "B", None],
+            "tipo_contrato": ["LIBRE", "LIBRE", "LICITACIÓN", "OTRO"],
+            "fecha_inicio": ["2024-06-01", "2025-01-16", "2025-02-01", "2025-01-01"],
+            "fecha_fin": ["2025-01-31", "2025-02-28", "2025-02-28", "2025-12-31"],
+            "potencia_mw": [10.0, 4.0, 2.0, 1.0],
+        }
+    )
+
+
+def test_overlap_days_by_broadcasting():
+    months = compromisos.month_grid(202501, 202503)
+    days = compromisos.overlap_days(
+        np.array(["2025-01-16", "2024-01-01"], dtype="datetime64[D]"),
+        np.array(["2025-02-10", "2025-01-01"], dtype="datetime64[D]"),
+        months,
+    )
+    assert days.tolist() == [[16, 10, 0], [1, 0, 0]]
+
+
+def test_commitment_per_client_and_type():
+    df = compromisos.contracts({"contratos_base": (_contratos(), [])})
+    assert len(df) == 3  # sin cliente: descartado
+    out = compromisos.commitment_matrix(df, compromisos.month_grid(202501, 202503)).set_index(["periodo", "cliente"])
+
+    ene = out.loc[("202501", "A")]
+    assert ene["contratos"] == 2 and ene["potencia_contratada_mw"] == 14
+    assert ene["potencia_media_mw"] == pytest.approx(10 + 4 * 16 / 31)
+    assert ene["energia_mwh"] == pytest.approx((10 * 31 + 4 * 16) * 24)
+    assert out.loc[("202502", "A"), "potencia_media_mw"] == pytest.approx(4.0)
+    assert out.loc[("202502", "B"), "energia_mwh"] == pytest.approx(2 * 28 * 24)
+    assert "202503" not in out.index.get_level_values("periodo")  # sin contratos vigentes
+
+
+def test_run_reads_mart_when_contracts_stage_did_not_run(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(compromisos, "DATA_MART", tmp_path)
+    monkeypatch.setattr(_common, "DATA_MART", tmp_path)
+    _contratos().to_csv(tmp_path / "contratos_base.csv", index=False)
+    _files, out = compromisos.run_compromisos({})
+    table = out["contratos_compromiso_mensual"][0]
+    assert set(table["origen"]) == {"base"} and table["periodo"].min() == "202501"
+    assert (tmp_path / "contratos_compromiso_mensual.csv").exists()
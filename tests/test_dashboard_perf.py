@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app import instrumentation
+from app.instrumentation import instrument_page, instrumented_loader, loader_stats, note_bytes_read, page_percentiles, phase, read_perf_log
+
+
+@pytest.fixture
+def perf_log(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "dashboard_perf.jsonl"
+    monkeypatch.setenv("EGASA_PERF_LOG", str(path))
+    return path
+
+
+def test_instrument_page_records_phases_cache_and_bytes(tmp_path: Path, perf_log: Path):
+    csv = tmp_path / "tabla.csv"
+    pd.DataFrame({"a": range(100)}).to_csv(csv, index=False)
+
+    @instrumented_loader
+    def _load(path: str) -> pd.DataFrame:
+        note_bytes_read(Path(path).stat().st_size)
+        return pd.read_csv(path)
+
+    _load.clear()
+    for _ in range(2):
+        with instrument_page("demo"):
+            df = _load(str(csv))
+            with phase("figure"):
+                df.describe()
+
+    first, second = read_perf_log(perf_log)
+    assert first["loaders"][0]["cache"] == "miss" and first["bytes_read"] == csv.stat().st_size
+    assert second["loaders"][0]["cache"] == "hit" and second["bytes_read"] == 0
+    assert first["loaders"][0]["rows"] == 100
+    assert set(first["phases_ms"]) == set(instrumentation.PHASES)
+    assert first["phases_ms"]["figure"] > 0
+    assert first["total_ms"] >= sum(first["phases_ms"].values()) - 1
+
+    pages = page_percentiles([first, second])
+    assert pages.loc[0, "page"] == "demo" and pages.loc[0, "reruns"] == 2
+    assert loader_stats([first, second]).loc[0, "hit_rate"] == 0.5
+
+
+def test_perf_log_rotates_and_can_be_disabled(perf_log: Path, monkeypatch):
+    monkeypatch.setattr(instrumentation, "PERF_LOG_MAX_BYTES", 400)
+    for _ in range(5):
+        with instrument_page("demo"):
+            pass
+    assert perf_log.with_name(perf_log.name + ".1").exists()
+    assert all(json.loads(line)["page"] == "demo" for line in perf_log.read_text(encoding="utf-8").splitlines())
+
+    monkeypatch.setenv("EGASA_PERF_LOG", "off")
+    before = len(read_perf_log(perf_log))
+    with instrument_page("demo") as record:
+        assert record == {}
+    assert len(read_perf_log(perf_log)) == before
+
+
+def test_stop_is_recorded_as_status(perf_log: Path):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_string(
+        "import streamlit as st\n"
+        "from app.instrumentation import instrument_page\n"
+        "with instrument_page('vacia'):\n"
+        "    st.stop()\n"
+    ).run()
+    assert not at.exception
+    assert read_perf_log(perf_log)[-1]["status"] == "stop"
+
+
+def test_run_page_records_the_whole_script(tmp_path: Path, perf_log: Path):
+    from streamlit.testing.v1 import AppTest
+
+    page = tmp_path / "99_Sin_Bloque.py"
+    page.write_text(
+        "import pandas as pd\n"
+        "import streamlit as st\n"
+        "from app.ui_components import apply_thin_lines, plotly_chart, px\n"
+        "st.session_state.setdefault('n', 0)\n"
+        "st.session_state.n += 1\n"
+        "if st.session_state.n == 1:\n"
+        "    st.rerun()\n"
+        "fig = px.line(pd.DataFrame({'x': range(50), 'y': range(50)}), x='x', y='y')\n"
+        "apply_thin_lines(fig)\n"
+        "plotly_chart(st, fig)\n",
+        encoding="utf-8",
+    )
+    AppTest.from_string(f"from pathlib import Path\nfrom app.instrumentation import run_page\nrun_page(Path({str(page)!r}))\n").run()
+
+    rerun, done = read_perf_log(perf_log)
+    assert rerun["page"] == done["page"] == "99_Sin_Bloque"
+    assert rerun["status"] == "rerun" and done["status"] == "ok"
+    assert done["phases_ms"]["figure"] > 0 and done["phases_ms"]["render"] > 0
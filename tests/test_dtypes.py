@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from etl.schemas import DTYPES, SCHEMAS, apply_dtypes, dtype_policy
+
+
+def test_dtype_policy_resolves_tables_and_partitions():
+    assert set(SCHEMAS) <= set(DTYPES)
+    assert dtype_policy("generacion_15min_202501") == DTYPES["generacion_15min"]
+    assert dtype_policy("generacion_mensual.csv") == DTYPES["generacion_mensual"]
+    assert dtype_policy("desconocida") == {}
+
+
+def test_apply_dtypes_compacts_labels_ints_and_floats():
+    df = pd.DataFrame(
+        {
+            "central_id": ["CH1", "CH1", "CT1"],
+            "central": ["Charcani I", "Charcani I", "Chilina"],
+            "anio": [2025.0, np.nan, 2025.0],
+            "mes": [1, 2, 3],
+            "periodo": ["202501", "202502", "202503"],
+            "energia_mwh": [1.5, 2.25, 3.0],
+        }
+    )
+    out = apply_dtypes(df, "generacion_mensual")
+    assert str(out["central"].dtype) == "category" and str(out["central_id"].dtype) == "category"
+    assert str(out["anio"].dtype) == "Int16" and out["anio"].isna().sum() == 1
+    assert str(out["mes"].dtype) == "int16" and str(out["periodo"].dtype) == "int32"
+    assert out["energia_mwh"].dtype == np.float32
+    assert df["central"].dtype == object  # no modifica el original
+
+    # al escribir (floats=False) se conserva float64; enteros fuera de rango no se tocan
+    kept = apply_dtypes(df.assign(mes=[1, 2, 70000]), "generacion_mensual", floats=False)
+    assert kept["energia_mwh"].dtype == np.float64
+    assert kept["mes"].dtype == np.int64
+
+
+def test_load_table_reads_compact_frames(tmp_path: Path, monkeypatch):
+    from app import data_access
+
+    n = 96 * 31
+    df = pd.DataFrame(
+        {
+            "fecha_hora": pd.date_range("2025-01-01", periods=n, freq="15min").astype(str).tolist() * 4,
+            "central": ["CHARCANI V"] * n * 2 + ["C.T. CHILINA"] * n * 2,
+            "central_raw": [f"C.H. CHARCANI V | G{i} -kWh" for i in (1, 2) for _ in range(n)] + [f"C.T. CHILINA | TV{i} -kWh" for i in (1, 2) for _ in range(n)],
+            "unidad": [f"G{i}" for i in (1, 2) for _ in range(n)] * 2,
+            "energia_mwh": np.random.default_rng(0).random(n * 4),
+            "central_id": ["CH5"] * n * 2 + ["CT1"] * n * 2,
+            "periodo": "202501",
+        }
+    )
+    df.to_csv(tmp_path / "generacion_15min_202501.csv", index=False)
+    monkeypatch.setattr(data_access, "DATA_MART", tmp_path)
+    data_access.load_generacion_15min.clear()
+
+    loaded = data_access.load_generacion_15min("202501")
+    assert str(loaded["unidad"].dtype) == "category" and loaded["energia_mwh"].dtype == np.float32
+    plain = pd.read_csv(tmp_path / "generacion_15min_202501.csv", low_memory=False)
+    plain["fecha_hora"] = pd.to_datetime(plain["fecha_hora"])
+    assert plain.memory_usage(deep=True).sum() / loaded.memory_usage(deep=True).sum() >= 3
+    pd.testing.assert_frame_equal(
+        loaded.astype({c: plain[c].dtype for c in plain.columns}).reset_index(drop=True),
+        plain.reset_index(drop=True),
+        check_exact=False,
+        rtol=1e-6,
+    )
@@ -11,6 +11,7 @@ if str(PROJECT_ROOT) not in sys.path:
 
 from etl.run_etl import main
 from etl.config import ensure_directories
+from etl.publish import current_dir
 import pandas as pd
 
 
@@ -39,7 +40,7 @@ def test_run_etl_creates_outputs(tmp_path, monkeypatch):
     with pd.ExcelWriter(prod_file, engine="openpyxl") as writer:
         pd.DataFrame({"CENTRAL": ["CH1"], "ENERO": [1000]}).to_excel(writer, sheet_name="2010", index=False)
 
-    fact_file = data_landing / "FACT_TEST.xlsx"
+    fact_file = data_landing / "FACT_TEST 2025.xlsx"
     with pd.ExcelWriter(fact_file, engine="openpyxl") as writer:
         pd.DataFrame({"CLIENTE": ["ABC"], "ENERO": [10]}).to_excel(writer, sheet_name="VENTAS (MWh)", index=False)
         pd.DataFrame({"CLIENTE": ["ABC"], "ENERO": [1000]}).to_excel(writer, sheet_name="VENTAS (S)", index=False)
@@ -63,6 +64,7 @@ def test_run_etl_creates_outputs(tmp_path, monkeypatch):
         "contratos_base.csv",
         "contratos_riesgo.csv",
     ]
+    published = current_dir(data_mart)
     for fname in expected:
-        path = data_mart / fname
+        path = published / fname
         assert path.exists(), f"{fname} no fue generado"
@@ -3,7 +3,7 @@ import pandas as pd
 import sys
 from pathlib import Path
 
-from etl import run_etl
+from etl import publish, run_etl
 
 
 def _write_excel(path: Path, sheets: dict[str, pd.DataFrame]) -> None:
@@ -36,7 +36,7 @@ def test_etl_creates_outputs_and_metadata(tmp_path: Path, monkeypatch):
     _write_excel(prod_file, {"2010": df_hist})
 
     # Facturación
-    fact_file = landing / "FACT_TEST.xlsx"
+    fact_file = landing / "FACT_TEST 2025.xlsx"
     ventas_df = pd.DataFrame({"CLIENTE": ["ABC"], "ENERO": [10]})
     _write_excel(
         fact_file,
@@ -62,6 +62,10 @@ def test_etl_creates_outputs_and_metadata(tmp_path: Path, monkeypatch):
     monkeypatch.setattr(sys, "argv", argv)
     run_etl.main()
 
+    # Las salidas se publican como snapshot apuntada por manifest.json
+    assert (mart / publish.MANIFEST).exists()
+    mart = publish.current_dir(mart)
+
     # Validar archivos generados
     expected_files = [
         mart / "generacion_mensual.csv",
@@ -76,3 +80,12 @@ def test_etl_creates_outputs_and_metadata(tmp_path: Path, monkeypatch):
     metadata = json.loads((mart / "metadata.json").read_text(encoding="utf-8"))
     assert "generacion_mensual" in metadata.get("datasets", {})
     assert "ventas_mensual_mwh" in metadata.get("datasets", {})
+
+    # Registro de corrida con métricas por etapa
+    run = json.loads((logs / "etl_runs.jsonl").read_text(encoding="utf-8").splitlines()[-1])
+    assert run["status"] == "success"
+    assert set(run["stages"]) == {name for name, _fn, _msg in run_etl.STAGES + run_etl.DERIVED_STAGES}
+    produccion = run["stages"]["produccion"]
+    assert produccion["files"] >= 1 and produccion["input_bytes"] > 0
+    assert produccion["duration_ms"] >= 0 and produccion["peak_rss_mb"] > 0
+    assert run["input_bytes"] >= produccion["input_bytes"]
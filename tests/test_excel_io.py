@@ -0,0 +1,182 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+from pathlib import Path
+from openpyxl import Workbook
+
+from etl import config, utils_io
+from etl.pipelines import balance_energia, facturacion, hidrologia
+from etl.pipelines import produccion
+from etl.pipelines.produccion import _process_15min, _process_historico
+from etl.utils_cleaning import load_centrales_reference
+from etl.utils_io import excel_engine, excel_file, open_sheet_stream, read_excel, read_numeric_block
+
+LANDING = Path(__file__).resolve().parent.parent / "data_landing"
+
+
+def test_read_numeric_block_grows_and_coerces():
+    rows = [("t0", 1, "2.5"), ("t1", None, "x"), ("t2", 3.0)] * 3
+    labels, values = read_numeric_block(rows, width=3, capacity=2, batch_size=2)
+
+    assert list(labels[:3]) == ["t0", "t1", "t2"]
+    assert values.shape == (9, 2)
+    np.testing.assert_array_equal(values[:3], [[1.0, 2.5], [np.nan, np.nan], [3.0, np.nan]])
+
+
+def test_process_15min_streaming_layout(tmp_path: Path):
+    path = tmp_path / "PRODUCCIÓN DE ENERGÍA_ENERO 2025.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["FECHA/HORA", "C.H. CHARCANI V", None, "C.T. PISCO"])
+    ws.append([None, "CHAV1 -kWh", "CHAV2 -kWh", "PIS1 -kWh"])
+    ws.append([pd.Timestamp("2025-01-01 00:15"), 1000, -5, 2000])
+    ws.append([pd.Timestamp("2025-01-01 00:30"), 1500, 500, None])
+    ws.append(["TOTAL ENERGÍA", 2500, 495, 2000])
+    wb.save(path)
+
+    centrales = pd.DataFrame({"central_id": ["CH5", "CT2"], "central_nombre": ["CHARCANI V", "C.T. PISCO"]})
+    centrales["central_nombre_norm"] = ["CHARCANI V", "C T PISCO"]
+
+    parts = _process_15min(path, centrales)
+
+    df = parts["202501"]
+    assert len(df) == 4  # negativos, vacíos y la fila TOTAL se descartan
+    assert set(df["unidad"]) == {"CHAV1", "CHAV2", "PIS1"}
+    assert set(df["central_id"]) == {"CH5", "CT2"}
+    assert df["energia_mwh"].sum() == 5.0
+
+
+def test_excel_engine_resolution(monkeypatch):
+    assert excel_engine("openpyxl") == "openpyxl"
+    with pytest.raises(ValueError):
+        excel_engine("xlrd")
+
+    monkeypatch.setattr(utils_io, "_calamine_available", lambda: False)
+    assert excel_engine("auto") == "openpyxl"
+    assert excel_engine("calamine") == "openpyxl"
+
+
+# --- Paridad calamine vs openpyxl -------------------------------------------
+
+def _centrales() -> pd.DataFrame:
+    return load_centrales_reference(produccion.DATA_REFERENCE / "centrales_egasa.csv")
+
+
+def _with_engine(monkeypatch, engine: str) -> None:
+    monkeypatch.setitem(config.CONFIG, "io", {**config.io_settings(), "excel_engine": engine})
+
+
+def _both_engines(monkeypatch, fn):
+    pytest.importorskip("python_calamine")
+    results = []
+    for engine in ("openpyxl", "calamine"):
+        _with_engine(monkeypatch, engine)
+        results.append(fn())
+    return results
+
+
+def test_engine_parity_datetime_headers_and_offsets(tmp_path: Path, monkeypatch):
+    path = tmp_path / "balance.xlsx"
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Perfil"
+    ws["B3"] = "Concepto"
+    for i, month in enumerate(range(1, 4)):
+        ws.cell(row=3, column=3 + i, value=dt.datetime(2025, month, 1))
+    ws.append([None, "Producción", 10.5, 11, None])
+    ws.append([None, "Compras", 1, 2.25, 3])
+    ws.cell(row=6, column=2, value=dt.date(2025, 1, 31))
+    wb.save(path)
+
+    def _read():
+        with excel_file(path) as xls:
+            grid = read_excel(xls, sheet_name="Perfil", header=None)
+            framed = read_excel(xls, sheet_name="Perfil", header=2)
+        with open_sheet_stream(path) as ws_stream:
+            rows = list(ws_stream.iter_rows(values_only=True))
+        return grid, framed, rows
+
+    (grid_o, framed_o, rows_o), (grid_c, framed_c, rows_c) = _both_engines(monkeypatch, _read)
+
+    pd.testing.assert_frame_equal(grid_o, grid_c)
+    pd.testing.assert_frame_equal(framed_o, framed_c)
+    assert balance_energia._date_cols(framed_o.columns) == balance_energia._date_cols(framed_c.columns)
+    assert len(balance_energia._date_cols(framed_c.columns)) == 3
+    assert [tuple(r) for r in rows_o] == [tuple(r) for r in rows_c]
+
+
+def _fact_sheet(wb: Workbook, title: str, entity: str, rows: list) -> None:
+    ws = wb.create_sheet(title)
+    ws.append([f"{title} 2025"])
+    ws.append([])
+    # encabezados mixtos: nombre de mes y fecha real, como en los libros de origen
+    ws.append([entity, "ENERO", "Febrero", dt.datetime(2025, 3, 1), "TOTAL"])
+    for row in rows:
+        ws.append(row)
+
+
+def test_engine_parity_facturacion_month_headers(tmp_path: Path, monkeypatch):
+    path = tmp_path / "Facturacion 2025.xlsx"
+    wb = Workbook()
+    wb.remove(wb.active)
+    _fact_sheet(wb, "VENTAS (MWh)", "CLIENTE", [["Cliente A ", 100.5, 90, 80.25, 270.75], ["Cliente B", None, "12", 14, 26]])
+    _fact_sheet(wb, "VENTAS (S)", "CLIENTE", [["Cliente A ", 20100, 18000, 16050, 54150], ["Cliente B", 3000, 2400, None, 5400]])
+    _fact_sheet(wb, "Ingresos", "CONCEPTO", [["Energía", 5000, 5100.5, 5200, 15300.5], ["TOTAL INGRESOS", 5000, 5100.5, 5200, 15300.5]])
+    wb.save(path)
+    sheets_cfg = dict(config.get_source("facturacion")["sheets"])
+
+    def _parse():
+        with excel_file(path) as xls:
+            raw = facturacion._read_with_header(xls, sheets_cfg["ventas_mwh"], ["cliente", "enero"])
+        return facturacion._parse_sales(raw, "mwh", year=2025), facturacion._parse_fact_file(path, sheets_cfg)
+
+    (sales_o, parsed_o), (sales_c, parsed_c) = _both_engines(monkeypatch, _parse)
+
+    pd.testing.assert_frame_equal(sales_o, sales_c)
+    assert sorted(sales_c["periodo"].unique()) == ["202501", "202502", "202503"]
+    assert parsed_o.keys() == parsed_c.keys()
+    for key in parsed_o:
+        assert not parsed_c[key].empty
+        pd.testing.assert_frame_equal(parsed_o[key], parsed_c[key])
+    assert parsed_c["ingresos"]["mes"].tolist() == [1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["balance 2025.xlsx", "Control Hidrológico.xlsx", "PRODUCCIÓN DE ENERGÍA_ABRIL 2025.xlsx"],
+)
+def test_engine_parity_landing_fixtures(name: str, monkeypatch):
+    path = LANDING / name
+    if not path.exists():
+        pytest.skip(f"fixture {name} no disponible")
+
+    if name.startswith("balance"):
+        def _parse():
+            with excel_file(path) as xls:
+                return [balance_energia._process_perfil(xls), balance_energia._process_r(xls)]
+    elif name.startswith("Control"):
+        def _parse():
+            return list(hidrologia._procesar_control(path))
+    else:
+        centrales = _centrales()
+
+        def _parse():
+            return list(_process_15min(path, centrales).values())
+
+    expected, got = _both_engines(monkeypatch, _parse)
+    assert len(expected) == len(got)
+    for a, b in zip(expected, got):
+        assert not a.empty
+        pd.testing.assert_frame_equal(a, b)
+
+
+def test_engine_parity_historico(monkeypatch):
+    path = LANDING / "PRODUCCION EGASA DESDE 2010 (NOV2025).xlsx"
+    if not path.exists():
+        pytest.skip("fixture histórico no disponible")
+    centrales = _centrales()
+
+    expected, got = _both_engines(monkeypatch, lambda: _process_historico(path, centrales))
+    pd.testing.assert_frame_equal(expected, got)
@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+from pathlib import Path
+
+from etl import config
+from etl.pipelines import facturacion
+from etl.utils_io import parse_files_cached, set_run_context
+
+
+def _write_fact(path: Path, mwh: dict, soles: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        pd.DataFrame({"CLIENTE": ["ABC"], **mwh}).to_excel(writer, sheet_name="VENTAS (MWh)", index=False)
+        pd.DataFrame({"CLIENTE": ["ABC"], **soles}).to_excel(writer, sheet_name="VENTAS (S)", index=False)
+        pd.DataFrame({"CONCEPTO": ["Linea"], "ENERO": [500]}).to_excel(writer, sheet_name="Ingresos", index=False)
+
+
+def _patch_dirs(monkeypatch, landing: Path, mart: Path) -> None:
+    monkeypatch.setattr(facturacion, "DATA_LANDING", landing)
+    monkeypatch.setattr(facturacion, "DATA_MART", mart)
+    monkeypatch.setattr(config, "DATA_MART", mart)
+    monkeypatch.setitem(facturacion.LANDING_FILES, "facturacion", "Facturacion")
+
+
+def test_run_facturacion_merges_years_and_reuses_cache(tmp_path: Path, monkeypatch):
+    landing = tmp_path / "landing"
+    mart = tmp_path / "mart"
+    _patch_dirs(monkeypatch, landing, mart)
+    set_run_context(run_id="test_fact", strict=True)
+
+    _write_fact(landing / "Facturacion 2024.xlsx", {"ENERO": [10], "FEBRERO": [20]}, {"ENERO": [100], "FEBRERO": [200]})
+    _write_fact(landing / "Facturacion 2025.xlsx", {"ENERO": [30]}, {"ENERO": [300]})
+
+    files, datasets = facturacion.run_facturacion()
+    assert len(files) == 2
+
+    ventas = datasets["ventas_mensual_mwh"][0]
+    assert list(ventas["periodo"]) == ["202401", "202402", "202501"]
+    assert list(ventas["mwh"]) == [10, 20, 30]
+
+    ingresos = datasets["ingresos_mensual"][0]
+    assert sorted(ingresos["anio"].unique()) == [2024, 2025]
+
+    def _fail(*_args, **_kwargs):
+        raise AssertionError("no debería re-parsear archivos sin cambios")
+
+    monkeypatch.setattr(facturacion, "_parse_fact_file", _fail)
+    _, cached = facturacion.run_facturacion()
+    pd.testing.assert_frame_equal(cached["ventas_mensual_mwh"][0], ventas)
+
+
+def test_workbook_without_year_fails_instead_of_guessing(tmp_path: Path, monkeypatch):
+    landing = tmp_path / "landing"
+    _patch_dirs(monkeypatch, landing, tmp_path / "mart")
+    set_run_context(run_id="test_fact_sin_anio", strict=True)
+    _write_fact(landing / "Facturacion 2024.xlsx", {"ENERO": [10]}, {"ENERO": [100]})
+    _write_fact(landing / "Facturacion ultima.xlsx", {"ENERO": [30]}, {"ENERO": [300]})
+
+    with pytest.raises(ValueError, match="Facturacion ultima.xlsx"):
+        facturacion.run_facturacion()
+    assert facturacion._periodo_from_value("ENERO") is None
+
+
+def _parse_with(path: Path, cfg: dict) -> dict:
+    return {"file": path.name, **cfg}
+
+
+def test_parse_cache_key_includes_parser_config(tmp_path: Path, monkeypatch):
+    monkeypatch.setitem(config.CONFIG, "paths", {**config.CONFIG.get("paths", {}), "cache": str(tmp_path / "cache")})
+    source = tmp_path / "Facturacion 2025.xlsx"
+    source.write_bytes(b"x")
+
+    assert parse_files_cached("test", [source], _parse_with, ({"hoja": "A"},)) == [{"file": source.name, "hoja": "A"}]
+    # misma versión y mismo archivo, otra configuración de hojas: no se sirve el pickle anterior
+    assert parse_files_cached("test", [source], _parse_with, ({"hoja": "B"},)) == [{"file": source.name, "hoja": "B"}]
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl import config
+from etl.pipelines import _common, hidro_metricas
+
+
+def _volumen(rows):
+    return pd.DataFrame([{"reservorio": r, "anio": p // 100, "mes": f"{p % 100:02d}", "volumen_000m3": v, "periodo": p} for r, p, v in rows])
+
+
+def _caudal(rows):
+    return pd.DataFrame([{"estacion": e, "anio": p // 100, "mes": f"{p % 100:02d}", "caudal_m3s": v, "periodo": p} for e, p, v in rows])
+
+
+def test_climatology_anomaly_and_year_over_year():
+    vol = _volumen([("AB", 202201, 100.0), ("AB", 202301, 200.0), ("AB", 202401, 300.0), ("AB", 202402, 50.0), ("EF", 202401, 10.0)])
+    out = hidro_metricas.hydrology_metrics(vol, pd.DataFrame(), pd.Series({"AB": 400.0})).set_index(["serie", "periodo"])
+
+    ene = out.loc[("AB", 202401)]
+    assert ene["clim_media"] == 200 and ene["clim_p50"] == 200 and ene["clim_p10"] == pytest.approx(120)
+    assert ene["anomalia"] == 100 and ene["anomalia_pct"] == pytest.approx(50)
+    assert ene["dif_anual"] == 100 and ene["dif_anual_pct"] == pytest.approx(50)
+    assert ene["pct_capacidad"] == pytest.approx(75)
+
+    assert np.isnan(out.loc[("AB", 202402), "dif_anual"])  # sin febrero 2023
+    assert out.loc[("AB", 202402), "clim_media"] == 50  # climatología por mes calendario
+    assert np.isnan(out.loc[("EF", 202401), "pct_capacidad"])  # sin capacidad conocida
+
+
+def test_inflow_accumulates_within_the_year():
+    cau = _caudal([("Aguada Blanca", 202412, 1.0), ("Aguada Blanca", 202501, 10.0), ("Aguada Blanca", 202502, np.nan), ("Aguada Blanca", 202503, 2.0)])
+    out = hidro_metricas.hydrology_metrics(pd.DataFrame(), cau, pd.Series(dtype=float)).set_index("periodo")
+
+    assert out.loc[202501, "aporte_000m3"] == pytest.approx(10 * 31 * 86_400 / 1_000)
+    assert out.loc[202503, "aporte_acumulado_000m3"] == pytest.approx((10 * 31 + 2 * 31) * 86_400 / 1_000)
+    assert np.isnan(out.loc[202502, "aporte_acumulado_000m3"])
+    assert out["capacidad_000m3"].isna().all()
+
+
+def test_run_takes_capacity_from_daily_report(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(hidro_metricas, "DATA_MART", tmp_path)
+    monkeypatch.setattr(_common, "DATA_MART", tmp_path)
+    represas = pd.DataFrame(
+        {"fecha": ["2025-12-10", "2025-12-11"], "reservorio": ["Aguada Blanca", "Aguada Blanca"], "capacidad_util_max": [20.0, 22.5]}
+    )
+    datasets = {
+        "hidro_volumen_mensual": (_volumen([("AB", 202511, 9_000.0)]), []),
+        "hidro_caudal_mensual": (_caudal([("Aguada Blanca", 202511, 13.2)]), []),
+        "represas_diario": (represas, []),
+    }
+    _files, out = hidro_metricas.run_hidro_metricas(datasets)
+    table = out["hidro_metricas_mensual"][0].set_index("variable")
+    assert table.loc["volumen_000m3", "capacidad_000m3"] == pytest.approx(22_500)
+    assert table.loc["volumen_000m3", "pct_capacidad"] == pytest.approx(40)
+    assert (tmp_path / config.OUTPUT_FILES["hidro_metricas_mensual"]).exists()
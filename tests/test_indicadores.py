@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl import config
+from etl.pipelines import indicadores
+
+
+def _day(central_id: str, unidad: str, fecha: str, mw: np.ndarray) -> pd.DataFrame:
+    ts = pd.date_range(fecha, periods=len(mw), freq="15min")
+    return pd.DataFrame({"fecha_hora": ts, "central_id": central_id, "central": central_id, "unidad": unidad, "energia_mwh": mw / 4})
+
+
+def test_metrics_per_unit_and_central():
+    mw = np.r_[np.zeros(8), np.full(88, 10.0)]  # 2 h apagada, luego 10 MW
+    g2 = np.full(96, 2.0)
+    df = pd.concat([_day("CH4", "G1", "2025-01-01", mw), _day("CH4", "G2", "2025-01-01", g2)], ignore_index=True)
+
+    out = indicadores.partition_metrics(df, pd.Series({"CH4": 14.4}))
+    diario = out["fecha"].set_index(["nivel", "unidad"])
+
+    g1 = diario.loc[("unidad", "G1")]
+    assert g1["energia_mwh"] == pytest.approx(10 * 22)
+    assert g1["horas_cero"] == 2 and g1["horas_operacion"] == 22
+    assert g1["pico_mw"] == 10 and g1["rampa_subida_max_mw"] == 10 and g1["rampa_bajada_max_mw"] == 0
+    assert np.isnan(g1["factor_planta"])  # sin potencia por unidad
+
+    central = diario.loc[("central", "")]
+    assert central["pico_mw"] == 12
+    assert central["factor_planta"] == pytest.approx((220 + 48) / (14.4 * 24))
+    assert central["disponibilidad"] == 1.0
+
+
+def test_ramps_skip_gaps_between_intervals():
+    mw = np.array([0.0, 5.0, 5.0, 40.0])
+    df = _day("CH1", "G1", "2025-01-01", mw)
+    df.loc[3, "fecha_hora"] += pd.Timedelta(hours=1)  # hueco: no es rampa
+    row = indicadores.interval_metrics(df, "fecha").iloc[0]
+    assert row["rampa_subida_max_mw"] == 5
+    assert row["rampa_abs_media_mw"] == pytest.approx(2.5)
+
+
+def test_run_recomputes_only_updated_periods(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(indicadores, "DATA_MART", tmp_path)
+    monkeypatch.setattr(indicadores, "DATA_REFERENCE", tmp_path)
+    monkeypatch.setattr("etl.pipelines.rollups.DATA_MART", tmp_path)
+    monkeypatch.setattr(config, "DATA_MART", tmp_path)
+    pd.DataFrame({"central_id": ["CH1"], "potencia_mw": [2.0]}).to_csv(tmp_path / "centrales_egasa.csv", index=False)
+    for periodo, fecha in (("202501", "2025-01-01"), ("202502", "2025-02-01")):
+        _day("CH1", "G1", fecha, np.full(96, 1.0)).to_csv(tmp_path / f"generacion_15min_{periodo}.csv", index=False)
+
+    _files, out = indicadores.run_indicadores({})
+    mensual = out["indicadores_15min_mensual"][0]
+    assert sorted(mensual["periodo"].astype(str).unique()) == ["202501", "202502"]
+    assert mensual.loc[mensual["nivel"] == "central", "factor_planta"].tolist() == pytest.approx([0.5, 0.5])
+
+    _day("CH1", "G1", "2025-02-01", np.full(96, 2.0)).to_csv(tmp_path / "generacion_15min_202502.csv", index=False)
+    files, out = indicadores.run_indicadores({"generacion_15min_202502": (pd.DataFrame(), [])})
+    assert [p.name for p in files if p.name.startswith("generacion")] == ["generacion_15min_202502.csv"]
+    mensual = out["indicadores_15min_mensual"][0].set_index(["periodo", "nivel"])
+    assert mensual.loc[("202502", "central"), "factor_planta"] == pytest.approx(1.0)
+    assert mensual.loc[("202501", "central"), "factor_planta"] == pytest.approx(0.5)
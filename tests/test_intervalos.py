@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl.intervalos import ContractIndex, clean_contracts
+
+
+def _random_contracts(n: int = 300, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    inicio = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 5000, n), unit="D")
+    fin = inicio + pd.to_timedelta(rng.integers(0, 2000, n), unit="D")
+    return pd.DataFrame(
+        {
+            "cliente": [f"C{i % 17}" for i in range(n)],
+            "tipo_contrato": "LIBRE",
+            "fecha_inicio": inicio,
+            "fecha_fin": fin,
+            "potencia_mw": rng.uniform(0.5, 20, n).round(3),
+        }
+    )
+
+
+def test_queries_match_a_full_scan():
+    index = ContractIndex.from_tables({"base": _random_contracts()})
+    c = index.contracts
+    for a, b in [("2019-06-01", "2019-12-31"), ("2024-02-01", "2024-02-29"), ("2031-05-10", "2031-05-10"), ("2020-01-01", "2040-01-01")]:
+        expected = c[(c["fecha_inicio"] <= b) & (c["fecha_fin"] >= a)]
+        got = index.overlapping(a, b)
+        assert got.index.tolist() == expected.index.tolist()
+        assert index.sum_power((a, b)) == pytest.approx(expected["potencia_mw"].sum())
+
+    day = pd.Timestamp("2026-07-01")
+    assert len(index.active_at(day)) == int(((c["fecha_inicio"] <= day) & (c["fecha_fin"] >= day)).sum())
+
+
+def test_sum_power_over_many_periods_and_inclusive_end():
+    index = ContractIndex(
+        clean_contracts(
+            {
+                "base": pd.DataFrame(
+                    {
+                        "cliente": ["A", "B", None],
+                        "tipo_contrato": ["LIBRE", "REGULADO", "LIBRE"],
+                        "fecha_inicio": ["2025-01-01", "2025-02-15", "2025-01-01"],
+                        "fecha_fin": ["2025-01-31", "2025-03-01", "2025-12-31"],
+                        "potencia_mw": [10.0, 5.0, 99.0],
+                    }
+                )
+            }
+        )
+    )
+    assert len(index) == 2
+    months = pd.period_range("2025-01", "2025-04", freq="M")
+    assert index.sum_power(months).tolist() == [10.0, 5.0, 5.0, 0.0]
+    assert index.sum_power(pd.Timestamp("2025-01-31")) == 10.0  # fin inclusive
+    assert index.active_at("2025-03-02").empty
+    assert ContractIndex(clean_contracts({})).span is None
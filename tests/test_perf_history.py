@@ -0,0 +1,47 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from etl import perf
+
+
+def _write_runs(path: Path, durations: list[int], status: str = "success") -> None:
+    with path.open("w", encoding="utf-8") as fh:
+        for i, ms in enumerate(durations):
+            stages = {
+                "produccion": {"duration_ms": ms, "files": 1, "input_bytes": 2**20, "rows_out": 100, "rows_per_s": 100 / (ms / 1000), "peak_rss_mb": 150.0},
+                "hidrologia": {"duration_ms": 500, "files": 1, "input_bytes": 2**19, "rows_out": 10, "rows_per_s": 20.0, "peak_rss_mb": 120.0},
+            }
+            run_status = status if i == len(durations) - 1 else "success"
+            fh.write(json.dumps({"run_id": f"run{i:02d}", "started_at": f"2026-01-{i + 1:02d}T08:00:00", "status": run_status, "tables": {}, "stages": stages}) + "\n")
+        fh.write(json.dumps({"run_id": "legacy", "started_at": "2025-12-01T08:00:00", "status": "success", "tables": {}}) + "\n")
+
+
+def test_flag_regressions_uses_prior_successful_median(tmp_path: Path):
+    path = tmp_path / "etl_runs.jsonl"
+    _write_runs(path, [1000, 1100, 900, 1000, 1050, 2000])
+    history = perf.stage_history(perf.load_runs(path))
+    assert "legacy" not in set(history["run_id"])
+
+    flagged = perf.flag_regressions(history, factor=1.5, window=10, min_history=3)
+    prod = flagged[flagged["stage"] == "produccion"].reset_index(drop=True)
+    assert prod["baseline_ms"].iloc[:3].isna().all()  # sin historia suficiente
+    assert prod["baseline_ms"].iloc[-1] == 1000
+    assert prod["regression"].tolist() == [False] * 5 + [True]
+    assert not flagged.loc[flagged["stage"] == "hidrologia", "regression"].any()
+
+    assert not perf.flag_regressions(history, factor=2.5, window=10, min_history=3)["regression"].any()
+
+
+def test_perf_cli_fails_on_latest_regression(tmp_path: Path, capsys):
+    path = tmp_path / "etl_runs.jsonl"
+    _write_runs(path, [1000, 1000, 1000, 1000, 3000])
+    with pytest.raises(SystemExit) as exc:
+        perf.main(["--log", str(path), "--fail-on-regression"])
+    assert exc.value.code == 1
+    assert "REGRESIÓN run04 produccion" in capsys.readouterr().out
+
+    _write_runs(path, [1000, 1000, 1000, 1000, 1100])
+    perf.main(["--log", str(path), "--fail-on-regression"])
+    assert "Sin regresiones" in capsys.readouterr().out
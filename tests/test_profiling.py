@@ -0,0 +1,33 @@
+import json
+import sys
+from pathlib import Path
+
+from benchmarks import bench_etl
+from benchmarks.generate_landing import generate_landing
+from etl import config, run_etl
+
+
+def test_profile_run_writes_report_and_summary(tmp_path: Path, monkeypatch):
+    manifest = generate_landing(tmp_path / "gen", scale=0.05, seed=1)
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    cfg = bench_etl._write_config(run_dir, Path(manifest["landing"]), "openpyxl")
+
+    monkeypatch.setattr(sys, "argv", ["run_etl", "--config", str(cfg), "--non-strict", "--profile"])
+    try:
+        run_etl.main()
+        assert config.io_settings()["max_workers"] == 4  # --profile no deja el parseo en línea
+    finally:
+        config.apply_runtime_overrides()
+
+    runs = [json.loads(line) for line in (run_dir / "logs" / "etl_runs.jsonl").read_text(encoding="utf-8").splitlines()]
+    summary = runs[-1]["profile"]
+    assert set(summary["stages"]) == {name for name, _fn, _msg in run_etl.STAGES + run_etl.DERIVED_STAGES}
+    assert summary["peak_rss_mb"] > 0
+
+    report = json.loads(Path(summary["report"]).read_text(encoding="utf-8"))
+    assert Path(summary["report"]).name == f"profile_{runs[-1]['run_id']}.json"
+    produccion = next(s for s in report["stages"] if s["stage"] == "produccion")
+    assert produccion["files"] and all(f["seconds"] >= 0 for f in produccion["files"])
+    assert "openpyxl" in produccion["cprofile"]["tottime_by_package"]
+    assert any(t["kind"] == "write" for t in produccion["tables"])
@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from etl import config
+from etl.pipelines import _common, pronostico
+
+SETTINGS = {"horizonte_meses": 6, "historia_meses": 60, "volumen_serie": "TOTAL"}
+PERIODS = [int(p.strftime("%Y%m")) for p in pd.period_range("2020-01", "2024-12", freq="M")]
+
+
+def _inputs(seed: int = 3):
+    rng = np.random.default_rng(seed)
+    caudal = pd.Series(10 + 3 * np.sin(np.arange(len(PERIODS)) * 2 * np.pi / 12) + rng.normal(0, 2, len(PERIODS)), index=PERIODS)
+    volumen = pd.Series(200_000 + rng.normal(0, 20_000, len(PERIODS)), index=PERIODS)
+    mes = np.array(PERIODS) % 100
+    # anomalías respecto de la media del mes calendario, como el modelo
+    anom_c = caudal - caudal.groupby(mes).transform("mean")
+    anom_v = volumen - volumen.groupby(mes).transform("mean")
+    hidro = 1_000 + 50 * mes + 40 * anom_c + 0.002 * anom_v
+    termica = 300 + 10 * mes + 25 * anom_c.to_numpy()  # la térmica no usa hidrología: el término queda como ruido
+    gen = pd.concat(
+        [
+            pd.DataFrame({"periodo": PERIODS, "central_id": "CH1", "central": "Charcani I", "energia_mwh": hidro.to_numpy()}),
+            pd.DataFrame({"periodo": PERIODS, "central_id": "CT1", "central": "Chilina", "energia_mwh": termica}),
+        ],
+        ignore_index=True,
+    )
+    cau = pd.DataFrame({"estacion": "Aguada Blanca", "periodo": PERIODS, "caudal_m3s": caudal.to_numpy()})
+    vol = pd.DataFrame({"reservorio": "TOTAL", "periodo": PERIODS, "volumen_000m3": volumen.to_numpy()})
+    return gen, cau, vol
+
+
+TIPOS = pd.Series({"CH1": "HIDRO", "CT1": "TERMICA"})
+
+
+def test_fit_recovers_seasonal_baseline_and_hydrology_effect():
+    gen, cau, vol = _inputs()
+    params, rows = pronostico.forecast(gen, cau, vol, TIPOS, SETTINGS)
+    ch1 = params.set_index("central_id").loc["CH1"]
+
+    assert ch1["mes_01"] == pytest.approx(1_050, rel=1e-4) and ch1["mes_12"] == pytest.approx(1_600, rel=1e-4)
+    assert ch1["beta_caudal"] == pytest.approx(40, rel=1e-4) and ch1["beta_volumen"] == pytest.approx(0.002, rel=1e-3)
+    assert ch1["r2"] == pytest.approx(1.0) and ch1["rmse_mwh"] < 1e-3
+
+    ct1 = params.set_index("central_id").loc["CT1"]
+    assert not ct1["usa_hidrologia"] and ct1["beta_caudal"] == 0
+    assert ct1["mes_06"] == pytest.approx(360, abs=25)  # línea base media del mes
+
+    futuro = rows[rows["tipo"] == "pronostico"]
+    assert sorted(futuro["periodo"].unique()) == [202501, 202502, 202503, 202504, 202505, 202506]
+    enero = futuro[(futuro["central_id"] == "CH1") & (futuro["periodo"] == 202501)].iloc[0]
+    assert enero["pronostico_mwh"] == pytest.approx(enero["linea_base_mwh"])  # hidrología climatológica
+    assert set(params["central_id"]) == {"CH1", "CT1", "TOTAL"}
+
+
+def test_months_without_report_are_missing_and_end_the_history():
+    gen, cau, vol = _inputs()
+    gen.loc[gen["periodo"].isin([202301, 202412]), "energia_mwh"] = 0.0
+    wide, _nombres = pronostico.generation_matrix(gen)
+    assert wide.index.max() == 202411
+    assert wide.loc[202301].isna().all()
+
+    params, rows = pronostico.forecast(gen, cau, vol, TIPOS, SETTINGS)
+    assert rows.loc[rows["tipo"] == "pronostico", "periodo"].min() == 202412
+    assert params.set_index("central_id").loc["CH1", "n_obs"] == 58
+
+
+def test_run_refits_only_centrals_whose_inputs_changed(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(pronostico, "DATA_MART", tmp_path)
+    monkeypatch.setattr(pronostico, "DATA_REFERENCE", tmp_path)
+    monkeypatch.setattr(_common, "DATA_MART", tmp_path)
+    monkeypatch.setattr(_common, "DATA_REFERENCE", tmp_path)
+    monkeypatch.setattr(pronostico, "forecast_settings", lambda: dict(SETTINGS))
+    pd.DataFrame({"central_id": ["CH1", "CT1"], "tipo": ["HIDRO", "TERMICA"]}).to_csv(tmp_path / "centrales_egasa.csv", index=False)
+    gen, cau, vol = _inputs()
+    datasets = {"generacion_mensual": (gen, []), "hidro_caudal_mensual": (cau, []), "hidro_volumen_mensual": (vol, [])}
+
+    _files, out = pronostico.run_pronostico(datasets)
+    first = out["pronostico_parametros"][0].set_index("central_id")
+
+    # solo cambia la hidrología: la térmica no la usa y conserva su ajuste
+    cau = cau.assign(caudal_m3s=cau["caudal_m3s"] * 1.1)
+    datasets["hidro_caudal_mensual"] = (cau, [])
+    monkeypatch.setattr(pronostico, "datetime", type("T", (), {"utcnow": staticmethod(lambda: pd.Timestamp("2030-01-01"))}))
+    _files, out = pronostico.run_pronostico(datasets)
+    params = out["pronostico_parametros"][0].set_index("central_id")
+
+    assert params.loc["CT1", "ajustado_en"] == first.loc["CT1", "ajustado_en"]
+    assert params.loc["CH1", "ajustado_en"] == "2030-01-01T00:00:00"
+    assert params.loc["TOTAL", "huella"] != first.loc["TOTAL", "huella"]
+    assert len(out["pronostico_generacion_mensual"][0]) == 3 * (len(PERIODS) + 6)
+    assert (tmp_path / config.OUTPUT_FILES["pronostico_generacion_mensual"]).exists()
+
+
+def test_new_month_of_another_central_moves_the_forecast_origin(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(pronostico, "DATA_MART", tmp_path)
+    monkeypatch.setattr(_common, "DATA_REFERENCE", tmp_path)
+    monkeypatch.setattr(pronostico, "forecast_settings", lambda: dict(SETTINGS))
+    pd.DataFrame({"central_id": ["CH1", "CT1"], "tipo": ["HIDRO", "TERMICA"]}).to_csv(tmp_path / "centrales_egasa.csv", index=False)
+    gen, cau, vol = _inputs()
+    datasets = {"generacion_mensual": (gen, []), "hidro_caudal_mensual": (cau, []), "hidro_volumen_mensual": (vol, [])}
+    first = pronostico.run_pronostico(datasets)[1]["pronostico_parametros"][0].set_index("central_id")
+
+    # solo CH1 reporta enero 2025: la serie de CT1 no cambia, pero su origen y su ventana sí
+    extra = pd.DataFrame({"periodo": [202501], "central_id": ["CH1"], "central": ["Charcani I"], "energia_mwh": [1_100.0]})
+    datasets["generacion_mensual"] = (pd.concat([gen, extra], ignore_index=True), [])
+    _files, out = pronostico.run_pronostico(datasets)
+    params = out["pronostico_parametros"][0].set_index("central_id")
+    rows = out["pronostico_generacion_mensual"][0]
+
+    assert params.loc["CT1", "huella"] != first.loc["CT1", "huella"]
+    assert params.loc["CT1", "hasta"] == 202501
+    futuro = rows[(rows["central_id"] == "CT1") & (rows["tipo"] == "pronostico")]
+    assert futuro["periodo"].min() == 202502
@@ -0,0 +1,134 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from app import data_access
+from etl import config, publish
+from etl.utils_io import safe_write_csv
+
+
+@pytest.fixture
+def root(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "mart"
+    (path / "star").mkdir(parents=True)
+    pd.DataFrame({"a": [1]}).to_csv(path / "tabla.csv", index=False)
+    pd.DataFrame({"k": [1]}).to_csv(path / "star" / "dim.csv", index=False)
+    monkeypatch.setitem(config.PATHS, "output", path)
+    config.use_output_dir(path)
+    yield path
+    config.apply_runtime_overrides()
+
+_HOLD_LOCK = """
+import sys
+from pathlib import Path
+from etl import publish
+with publish.publish_lock(Path(sys.argv[1])):
+    print("ok", flush=True)
+    sys.stdin.readline()
+"""
+
+
+def _run(run_id: str, value: int) -> Path:
+    with publish.staged(run_id) as staging:
+        assert config.DATA_MART == staging
+        safe_write_csv(pd.DataFrame({"a": [value]}), config.DATA_MART / "tabla.csv")
+    return publish.current_dir()
+
+
+def test_publish_swaps_manifest_and_keeps_previous_snapshot_intact(root: Path):
+    first = _run("r1", 2)
+    assert first == root / "snapshots" / "r1"
+    assert config.DATA_MART == root
+    assert not any((root / publish.STAGING_DIR).iterdir())
+    # lo no reescrito se hereda de la raíz legada (incluidas subcarpetas)
+    assert (first / "star" / "dim.csv").exists()
+    assert pd.read_csv(root / "tabla.csv")["a"].tolist() == [1]
+
+    second = _run("r2", 3)
+    assert pd.read_csv(second / "tabla.csv")["a"].tolist() == [3]
+    assert pd.read_csv(first / "tabla.csv")["a"].tolist() == [2]  # el hardlink no se modificó
+    manifest = publish.read_manifest()
+    assert manifest["current"] == "r2" and manifest["previous"] == "r1"
+    assert "star/dim.csv" in manifest["tables"]
+
+
+def test_failed_run_leaves_published_snapshot_untouched(root: Path):
+    _run("r1", 2)
+    before = (root / publish.MANIFEST).read_text(encoding="utf-8")
+
+    with pytest.raises(RuntimeError):
+        with publish.staged("r2"):
+            safe_write_csv(pd.DataFrame({"a": [99]}), config.DATA_MART / "tabla.csv")
+            raise RuntimeError("etapa rota")
+
+    assert (root / publish.MANIFEST).read_text(encoding="utf-8") == before
+    assert publish.list_snapshots() == ["r1"]
+    assert pd.read_csv(publish.current_dir() / "tabla.csv")["a"].tolist() == [2]
+    assert config.DATA_MART == root
+
+
+def test_prune_keeps_last_snapshots_and_rollback(root: Path, monkeypatch):
+    monkeypatch.setitem(config.CONFIG, "publish", {"snapshots": True, "keep": 2})
+    for i, run_id in enumerate(["r1", "r2", "r3"]):
+        _run(run_id, i)
+    assert publish.list_snapshots() == ["r2", "r3"]
+
+    assert publish.rollback() == "r2"
+    assert publish.current_dir() == root / "snapshots" / "r2"
+    with pytest.raises(RuntimeError):
+        publish.rollback()  # r1 ya fue podada
+    assert publish.rollback("r3") == "r3"
+
+    # misma marca de tiempo: no pisa la snapshot vigente
+    _run("r3", 7)
+    assert publish.read_manifest()["current"] == "r3_2"
+    assert publish.list_snapshots() == ["r3", "r3_2"]
+
+
+def test_dashboard_reads_through_manifest(root: Path, monkeypatch):
+    monkeypatch.setattr(data_access, "DATA_MART", root)
+    data_access.load_table.clear()
+    assert data_access.mart_dir() == root
+
+    _run("r1", 5)
+    token = data_access.metadata_token()
+    assert token == (root / publish.MANIFEST).stat().st_mtime
+    assert data_access.load_table("tabla.csv", meta_token=token)["a"].tolist() == [5]
+
+    manifest = json.loads((root / publish.MANIFEST).read_text(encoding="utf-8"))
+    assert data_access.mart_dir() == root / manifest["path"]
+    data_access.load_table.clear()
+
+
+def test_prune_keeps_staging_of_live_run(root: Path):
+    staging_root = root / publish.STAGING_DIR
+    fresh, stale = staging_root / "viva", staging_root / "huerfana"
+    fresh.mkdir(parents=True)
+    stale.mkdir()
+    old = time.time() - 48 * 3600
+    os.utime(stale, (old, old))
+
+    # otra corrida (otro proceso) tiene el lock mientras escribe su staging
+    holder = subprocess.Popen(
+        [sys.executable, "-c", _HOLD_LOCK, str(root)],
+        cwd=Path(__file__).resolve().parents[1],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    try:
+        assert holder.stdout.readline().strip() == b"ok"
+        with publish.publish_lock(root, wait=False) as acquired:
+            assert not acquired
+        assert publish.prune_staging(root) == ["huerfana"]
+        assert fresh.exists() and not stale.exists()
+    finally:
+        holder.communicate(b"\n", timeout=10)
+
+    # sin nadie escribiendo, lo que queda es huérfano
+    assert publish.prune_staging(root) == ["viva"]
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from etl import config
+from etl.pipelines import _common, reconciliacion
+
+
+def _rollup(rows):
+    return pd.DataFrame(
+        [
+            {"periodo": p, "central_id": c, "central": c, "unidad": "G1", "energia_mwh_sum": e, "energia_mwh_count": n}
+            for p, c, e, n in rows
+        ]
+    )
+
+
+def _mensual(rows):
+    return pd.DataFrame([{"periodo": int(p), "central_id": c, "central": f"Central {c}", "energia_mwh": e} for p, c, e in rows])
+
+
+def _balance(rows):
+    return pd.DataFrame([{"periodo": int(p), "concepto": k, "energia_mwh": e} for p, k, e in rows])
+
+
+TIPOS = pd.Series({"CH1": "HIDRO", "CH2": "HIDRO", "CT1": "TERMICA"})
+FULL = 31 * 96
+
+
+def test_reconcile_flags_differences_per_central_and_technology():
+    sources = reconciliacion.monthly_sources(
+        _rollup([("202501", "CH1", 100.0, FULL), ("202501", "CH2", 50.0, FULL), ("202501", "CT1", 10.0, FULL)]),
+        _mensual([("202501", "CH1", 100.5), ("202501", "CH2", 40.0), ("202501", "CT1", 10.0)]),
+        _balance([("202501", "PRODUCCION HIDRAULICA", 140.5), ("202501", "PRODUCCION TERMICA", 30.0)]),
+        TIPOS,
+    )
+    out = reconciliacion.reconcile(sources, {"tolerancia_pct": 1.0, "tolerancia_mwh": 1.0}).set_index(["nivel", "clave"])
+
+    assert out.loc[("central", "CH1"), "estado"] == "ok"  # 0.5 MWh < 1 MWh
+    assert out.loc[("central", "CH1"), "nombre"] == "Central CH1"
+    assert out.loc[("central", "CH2"), "estado"] == "diferencia"
+    assert out.loc[("central", "CH2"), "dif_15min_historico_pct"] == pytest.approx(25.0)
+
+    hidro = out.loc[("tecnologia", "HIDRO")]
+    assert hidro["energia_15min_mwh"] == 150 and hidro["energia_historico_mwh"] == 140.5
+    assert hidro["dif_historico_balance_mwh"] == 0 and hidro["estado"] == "diferencia"  # 15 min vs histórico
+    termica = out.loc[("tecnologia", "TERMICA")]
+    assert termica["dif_historico_balance_mwh"] == -20 and termica["estado"] == "diferencia"
+
+
+def test_partial_month_and_single_source():
+    sources = reconciliacion.monthly_sources(
+        _rollup([("202502", "CH1", 5.0, 96)]),
+        _mensual([("202502", "CH1", 120.0), ("202502", "CH9", 1.0)]),
+        pd.DataFrame(),
+        TIPOS,
+    )
+    out = reconciliacion.reconcile(sources).set_index(["nivel", "clave"])
+    assert out.loc[("central", "CH1"), "cobertura_15min"] == pytest.approx(96 / (28 * 96))
+    assert out.loc[("central", "CH1"), "estado"] == "incompleto"
+    assert out.loc[("central", "CH9"), "estado"] == "sin_comparacion"
+
+
+def test_run_replaces_only_changed_periods(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(reconciliacion, "DATA_MART", tmp_path)
+    monkeypatch.setattr(reconciliacion, "DATA_REFERENCE", tmp_path)
+    monkeypatch.setattr(_common, "DATA_MART", tmp_path)
+    monkeypatch.setattr(_common, "DATA_REFERENCE", tmp_path)
+    pd.DataFrame({"central_id": ["CH1"], "tipo": ["HIDRO"]}).to_csv(tmp_path / "centrales_egasa.csv", index=False)
+    datasets = {
+        "generacion_15min_mensual": (_rollup([("202501", "CH1", 100.0, FULL), ("202502", "CH1", 90.0, 28 * 96)]), []),
+        "generacion_mensual": (_mensual([("202501", "CH1", 100.0), ("202502", "CH1", 90.0)]), []),
+    }
+    _files, out = reconciliacion.run_reconciliacion(datasets)
+    first = out["reconciliacion_mensual"][0].set_index(["periodo", "nivel", "clave"])["revisado_en"]
+
+    datasets["generacion_15min_mensual"] = (_rollup([("202501", "CH1", 100.0, FULL), ("202502", "CH1", 70.0, 28 * 96)]), [])
+    monkeypatch.setattr(reconciliacion, "datetime", type("T", (), {"utcnow": staticmethod(lambda: pd.Timestamp("2030-01-01"))}))
+    _files, out = reconciliacion.run_reconciliacion(datasets)
+    table = out["reconciliacion_mensual"][0].set_index(["periodo", "nivel", "clave"])
+
+    assert table.loc[("202501", "central", "CH1"), "revisado_en"] == first.loc[("202501", "central", "CH1")]
+    assert table.loc[("202502", "central", "CH1"), "revisado_en"] == "2030-01-01T00:00:00"
+    assert table.loc[("202502", "central", "CH1"), "estado"] == "diferencia"
+    assert (tmp_path / config.OUTPUT_FILES["reconciliacion_mensual"]).exists()
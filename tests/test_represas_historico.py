@@ -0,0 +1,68 @@
+import pandas as pd
+from pathlib import Path
+from openpyxl import Workbook
+
+from etl import config, represas_historico
+from etl.pipelines.hidrologia import _extract_report_date, _procesar_represas
+from etl.utils_io import set_run_context
+
+
+def _write_informe(path: Path, titulo: str, volumen: float) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "INFORMEDIARIO"
+    ws.append([titulo])
+    ws.append([])
+    ws.append([None, "REPRESA", None, None, None, None, None, "VOLUMEN", None])
+    ws.append([None, "Aguada Blanca", 22.5, 11.0, volumen, 0.44, 0.01, None, 9.9])
+    ws.append([None, "El Frayle", 127.2, 50.0, 60.0, 0.47, 0.02, None, 59.0])
+    wb.save(path)
+
+
+def test_procesar_represas_extrae_fecha_y_columnas(tmp_path: Path):
+    path = tmp_path / "BDREPRESAS.xlsx"
+    _write_informe(path, "INFORME DIARIO DE REPRESAS AL 11 DE DICIEMBRE DE 2025", 10.0)
+
+    df = _procesar_represas(path)
+
+    assert list(df["reservorio"]) == ["Aguada Blanca", "El Frayle"]
+    assert (df["fecha"] == pd.Timestamp("2025-12-11")).all()
+    assert list(df["volumen_actual"]) == [10.0, 60.0]
+
+
+def test_extract_report_date_usa_bloque_de_titulo():
+    grid = pd.DataFrame(
+        [
+            ["INFORME DIARIO DE REPRESAS", None, None],
+            [None, "REPRESA", "VOLUMEN"],
+            [None, "2024.12.11", "2025.12.11"],
+            [None, "Aguada Blanca", "nota 01/01/2030"],
+        ]
+    )
+    assert _extract_report_date(grid, stop_row=3) == pd.Timestamp("2025-12-11")
+
+
+def test_backfill_and_upsert_partitions_by_year(tmp_path: Path, monkeypatch):
+    mart = tmp_path / "mart"
+    archive = tmp_path / "archivo"
+    monkeypatch.setattr(config, "DATA_MART", mart)
+    set_run_context(run_id="test_represas", strict=True)
+
+    _write_informe(archive / "BDREPRESAS 2024-12-31.xlsx", "INFORME DIARIO AL 31 DE DICIEMBRE DE 2024", 10.0)
+    _write_informe(archive / "BDREPRESAS 2025-01-01.xlsx", "INFORME DIARIO AL 1 DE ENERO DE 2025", 11.0)
+
+    assert represas_historico.backfill_represas(archive) == 4
+    assert (mart / "represas_historico" / "represas_diario_2024.csv").exists()
+    assert (mart / "represas_historico" / "represas_diario_2025.csv").exists()
+
+    # Reproceso del mismo día: reemplaza en lugar de duplicar
+    corregido = _procesar_represas(archive / "BDREPRESAS 2025-01-01.xlsx")
+    corregido["volumen_actual"] = 12.0
+    assert represas_historico.upsert_represas(corregido) == [2025]
+
+    consolidado = represas_historico.write_represas_consolidado()
+    assert len(consolidado) == 4
+    ab_2025 = consolidado[(consolidado["reservorio"] == "Aguada Blanca") & (consolidado["fecha"].dt.year == 2025)]
+    assert list(ab_2025["volumen_actual"]) == [12.0]
+    assert (mart / "represas_diario.csv").exists()
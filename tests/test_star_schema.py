@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pandas as pd
+
+from etl.pipelines import star_schema
+from etl.star import join_dimensions, upsert_dimension
+
+
+def _datasets(unidades):
+    rows = [
+        {"fecha_hora": ts, "central": central, "central_raw": raw, "unidad": unidad, "energia_mwh": 1.25 * i, "central_id": cid, "periodo": "202501"}
+        for i, ts in enumerate(pd.date_range("2025-01-01 00:15", periods=4, freq="15min"))
+        for raw, central, unidad, cid in unidades
+    ]
+    gen15 = pd.DataFrame(rows)
+    mensual = pd.DataFrame(
+        {"central_id": ["CH1", "CT1", None], "central": ["CHARCANI I", "C.T. Chilina", "SIN MAPEO"], "anio": 2025, "mes": 1, "periodo": "202501", "energia_mwh": [10.0, 20.0, 5.0]}
+    )
+    ventas = pd.DataFrame({"cliente": ["B", "A"], "periodo": ["202412", "202501"], "anio": [2024, 2025], "mes": [12, 1], "mwh": [3.0, 4.0]})
+    return {
+        "generacion_15min_202501": (gen15, ["fecha_hora", "central_id", "unidad"]),
+        "generacion_mensual": (mensual, ["central_id", "anio", "mes", "periodo"]),
+        "ventas_mensual_mwh": (ventas, ["cliente", "periodo"]),
+    }
+
+
+def _run(tmp_path: Path, monkeypatch, datasets):
+    monkeypatch.setattr(star_schema, "DATA_MART", tmp_path / "mart")
+    monkeypatch.setattr(star_schema, "DATA_REFERENCE", tmp_path / "ref")
+    (tmp_path / "ref").mkdir(exist_ok=True)
+    pd.DataFrame(
+        {"central_id": ["CH1", "CT1"], "central_nombre": ["CHARCANI I", "C.T. CHILINA"], "tipo": ["HIDRO", "TERMICA"], "anio_puesta": [1905, 1981], "potencia_mw": [1.76, 22.0], "zona": "SUR"}
+    ).to_csv(tmp_path / "ref" / "centrales_egasa.csv", index=False)
+    return star_schema.run_star_schema(datasets)
+
+
+def test_upsert_dimension_keeps_existing_keys():
+    first = upsert_dimension(None, pd.DataFrame({"cliente": ["B", "A"]}), "dim_cliente")
+    assert dict(zip(first["cliente"], first["cliente_key"])) == {"(sin dato)": 0, "A": 1, "B": 2}
+
+    second = upsert_dimension(first, pd.DataFrame({"cliente": ["C", "B", "AA"]}), "dim_cliente")
+    assert dict(zip(second["cliente"], second["cliente_key"])) == {"(sin dato)": 0, "A": 1, "B": 2, "AA": 3, "C": 4}
+
+
+def test_star_schema_keys_stable_and_join_rebuilds_flat(tmp_path: Path, monkeypatch):
+    unidades = [("C.H. CHARCANI I | CHAI1 -kWh", "CHARCANI I", "CHAI1", "CH1"), ("C.T. CHILINA | TV2 -kWh", "C.T. CHILINA", "TV2", "CT1")]
+    datasets = _datasets(unidades)
+    _files, first = _run(tmp_path, monkeypatch, datasets)
+
+    # segunda corrida con una unidad nueva: las claves previas no cambian
+    _files, second = _run(tmp_path, monkeypatch, _datasets([("C.H. CHARCANI V | CHAV1 -kWh", "CHARCANI V", "CHAV1", "CH5"), *unidades]))
+    before = first["dim_unidad"][0].set_index("central_raw")["unidad_key"]
+    after = second["dim_unidad"][0].set_index("central_raw")["unidad_key"]
+    assert after.loc[before.index].tolist() == before.tolist()
+    assert after["C.H. CHARCANI V | CHAV1 -kWh"] == before.max() + 1
+
+    star_dir = tmp_path / "mart" / "star"
+    fact = pd.read_csv(star_dir / "fact_generacion_15min_202501.csv", parse_dates=["fecha_hora"])
+    assert list(fact.columns) == ["unidad_key", "fecha_hora", "energia_mwh"]
+    dims = {name: pd.read_csv(star_dir / f"{name}.csv") for name in ("dim_unidad", "dim_central", "dim_periodo")}
+    rebuilt = join_dimensions(fact, "fact_generacion_15min_202501", dims)
+    flat = _datasets([("C.H. CHARCANI V | CHAV1 -kWh", "CHARCANI V", "CHAV1", "CH5"), *unidades])["generacion_15min_202501"][0]
+    cols = ["fecha_hora", "central_raw", "unidad", "central_id", "energia_mwh"]
+    pd.testing.assert_frame_equal(
+        rebuilt[cols].sort_values(cols, ignore_index=True), flat[cols].sort_values(cols, ignore_index=True), check_dtype=False
+    )
+
+    # mensual: central sin mapeo -> miembro 0; periodo como clave YYYYMM
+    mensual = join_dimensions(pd.read_csv(star_dir / "fact_generacion_mensual.csv"), "fact_generacion_mensual", dims)
+    assert sorted(mensual["central_key"]) == [0, 1, 2]
+    assert mensual.set_index("central_key").loc[2, "central"] == "C.T. CHILINA"
+    assert set(mensual["anio"]) == {2025}
+    periodo = pd.read_csv(star_dir / "dim_periodo.csv")
+    assert periodo["periodo_key"].tolist() == [202412, 202501]
+    assert periodo["intervalos_15min"].tolist() == [31 * 96, 31 * 96]
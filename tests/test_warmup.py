@@ -0,0 +1,59 @@
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from app import data_access, warmup
+from app.instrumentation import read_perf_log
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def mart(tmp_path: Path, monkeypatch) -> Path:
+    target = tmp_path / "data_mart"
+    shutil.copytree(ROOT / "data_mart", target, ignore=shutil.ignore_patterns(".cache"))
+    monkeypatch.setattr(data_access, "DATA_MART", target)
+    monkeypatch.setenv("EGASA_PERF_LOG", str(tmp_path / "dashboard_perf.jsonl"))
+    monkeypatch.setenv("EGASA_WARMUP", "off")
+    data_access.load_table.clear()
+    data_access.load_generacion_15min.clear()
+    yield target
+    data_access.load_table.clear()
+    data_access.load_generacion_15min.clear()
+
+
+def test_warmed_cache_serves_executive_summary_without_misses(mart: Path, tmp_path: Path):
+    from streamlit.testing.v1 import AppTest
+
+    status = warmup.warm_cache()
+    assert not status["errors"]
+    assert "generacion_mensual.csv" in status["tables"]
+
+    page = ROOT / "paginas" / "01_Resumen_Ejecutivo.py"
+    at = AppTest.from_string(f"from pathlib import Path\nfrom app.instrumentation import run_page\nrun_page(Path({str(page)!r}))\n", default_timeout=60).run()
+    assert not at.exception
+    record = read_perf_log(tmp_path / "dashboard_perf.jsonl")[-1]
+    assert record["page"] == "01_Resumen_Ejecutivo"
+    assert record["cache_misses"] == 0 and record["cache_hits"] == 5
+
+
+def test_background_thread_rewarms_when_metadata_changes(mart: Path, monkeypatch):
+    monkeypatch.setenv("EGASA_WARMUP", "on")
+    assert warmup.start_warmup(poll_seconds=0.05)
+    assert not warmup.start_warmup(poll_seconds=0.05)  # un hilo por proceso
+    try:
+        deadline = time.time() + 30
+        while not warmup.warmup_status() and time.time() < deadline:
+            time.sleep(0.05)
+        first = warmup.warmup_status()["meta_token"]
+
+        meta = mart / "metadata.json"
+        os.utime(meta, (meta.stat().st_atime, meta.stat().st_mtime + 60))
+        while warmup.warmup_status()["meta_token"] == first and time.time() < deadline:
+            time.sleep(0.05)
+        assert warmup.warmup_status()["meta_token"] == meta.stat().st_mtime
+    finally:
+        warmup.stop_warmup(timeout=5)
@@ -0,0 +1,78 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks import bench_etl
+from benchmarks.generate_landing import generate_landing
+from etl import config, publish, run_etl, watch
+
+
+@pytest.fixture
+def landing(tmp_path: Path, monkeypatch) -> Path:
+    path = tmp_path / "landing"
+    path.mkdir()
+    monkeypatch.setattr(config, "DATA_LANDING", path)
+    monkeypatch.setattr(config, "LOGS_DIR", tmp_path / "logs")
+    monkeypatch.setattr(config, "LANDING_FILES", {"produccion_15min": "PROD15", "hidrologia_represas": "BDREPRESAS", "facturacion": r"Facturacion \d{4}"})
+    return path
+
+
+def test_stages_for_maps_sources_in_stage_order():
+    assert watch.stages_for(["hidrologia_represas", "produccion_15min"]) == ["produccion", "hidrologia"]
+    assert watch.stages_for(["desconocida"]) == []
+
+
+def test_watch_runs_only_affected_stages_once_per_change(landing: Path):
+    calls = []
+    runner = lambda stages: calls.append(list(stages)) or 0  # noqa: E731
+
+    (landing / "PROD15_ENERO.xlsx").write_bytes(b"x" * 10)
+    (landing / "~$PROD15_ENERO.xlsx").write_bytes(b"lock")  # temporal de Excel
+    assert watch.watch(interval=0, debounce=0, once=True, runner=runner) == 1
+    assert calls == [["produccion"]]
+
+    # sin cambios: nada que correr
+    assert watch.watch(interval=0, debounce=0, once=True, runner=runner) == 0
+
+    (landing / "BDREPRESAS.xlsx").write_bytes(b"y" * 10)
+    (landing / "Facturacion 2025.xlsx").write_bytes(b"z" * 10)
+    watch.watch(interval=0, debounce=0, once=True, runner=runner)
+    assert calls[-1] == ["hidrologia", "facturacion"]
+
+    state = json.loads((config.LOGS_DIR / "watch_state.json").read_text(encoding="utf-8"))
+    assert set(state["produccion_15min"]) == {"PROD15_ENERO.xlsx"}
+
+
+def test_watch_waits_for_debounce_and_keeps_failed_changes_pending(landing: Path):
+    calls = []
+    (landing / "PROD15_FEB.xlsx").write_bytes(b"x" * 10)
+
+    # dentro de la ventana de debounce no se corre nada
+    assert watch.watch(interval=0, debounce=3600, runner=lambda s: calls.append(s) or 0, max_polls=3) == 0
+    (landing / "PROD15_VACIO.xlsx").write_bytes(b"")  # copia en curso: tamaño 0
+    assert watch.watch(interval=0, debounce=0, runner=lambda s: calls.append(s) or 0, max_polls=2) == 0
+    (landing / "PROD15_VACIO.xlsx").unlink()
+
+    assert watch.watch(interval=0, debounce=0, once=True, runner=lambda s: 1) == 1
+    assert not (config.LOGS_DIR / "watch_state.json").exists()
+    assert watch.watch(interval=0, debounce=0, once=True, runner=lambda s: 0) == 1
+
+
+def test_partial_run_keeps_metadata_of_other_stages(tmp_path: Path, monkeypatch):
+    manifest = generate_landing(tmp_path / "gen", scale=0.05, seed=3)
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+    cfg = bench_etl._write_config(run_dir, Path(manifest["landing"]), "openpyxl")
+    try:
+        for extra in ([], ["--stages", "hidrologia"]):
+            monkeypatch.setattr(sys, "argv", ["run_etl", "--config", str(cfg), "--non-strict", *extra])
+            run_etl.main()
+    finally:
+        config.apply_runtime_overrides()
+
+    runs = [json.loads(line) for line in (run_dir / "logs" / "etl_runs.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert set(runs[-1]["stages"]) == {"hidrologia", *(name for name, _fn, _msg in run_etl.DERIVED_STAGES)}
+    metadata = json.loads((publish.current_dir(run_dir / "mart") / "metadata.json").read_text(encoding="utf-8"))
+    assert {"generacion_mensual", "ventas_mensual_mwh", "represas_diario"} <= set(metadata["datasets"])
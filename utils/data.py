@@ -8,6 +8,8 @@ import streamlit as st
 from app.data_access import (
     load_table as load_csv,
     load_generacion_15min,
+    load_cobertura_15min,
+    load_contract_index,
     list_yyyymm_15min,
     get_metadata,
     metadata_token,
@@ -35,6 +37,8 @@ def load_centrales() -> pd.DataFrame:
 __all__ = [
     "load_csv",
     "load_generacion_15min",
+    "load_cobertura_15min",
+    "load_contract_index",
     "list_yyyymm_15min",
     "load_centrales",
     "get_metadata",